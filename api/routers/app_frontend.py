@@ -17,7 +17,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query
 
 from api.schemas import SubmitRequest  # Request schemas
 
@@ -28,6 +28,12 @@ from api.schemas.responses import (
     StandardResponse,
     SubmitAccepted,
 )
+from storage.core.pagination import (
+    InvalidCursorError,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+)
 
 # Initialize router with app plane configuration
 router = APIRouter(
@@ -79,17 +85,27 @@ async def search_memories(
     space_id: Optional[str] = Query(None, description="Memory space to search"),
     limit: int = Query(10, ge=1, le=100, description="Maximum results"),
     include_trace: bool = Query(False, description="Include search trace"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
     # current_user: UserProfile = Depends(get_current_user)
 ) -> RecallResponse:
     """
     Search through user's memories.
 
     Provides user-friendly memory search with relevance ranking,
-    filtering, and personalized results.
+    filtering, and personalized results. Pages continue after the
+    (score, id) of the last item through an opaque keyset cursor.
     """
     # TODO: Route to QueryFacadePort with user permissions
     from api.schemas.responses import RecallItem, TraceInfo
 
+    scope = cursor_scope("memories_search", q, space_id)
+    try:
+        after = decode_cursor(cursor, scope, 2) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     mock_items = [
         RecallItem(
             id=f"usr_mem_{i}",
@@ -100,8 +116,17 @@ async def search_memories(
             space_id=space_id or "personal:default",
             payload={"content": f"Full memory content for: {q}", "type": "personal"},
         )
-        for i in range(min(limit, 3))
+        for i in range(3)
     ]
+    if after is not None:
+        score, item_id = after
+        mock_items = [
+            item for item in mock_items if (item.score, item.id) < (score, item_id)
+        ]
+    next_cursor = None
+    if len(mock_items) > limit:
+        mock_items = mock_items[:limit]
+        next_cursor = encode_cursor(scope, [mock_items[-1].score, mock_items[-1].id])
 
     trace_info = None
     if include_trace:
@@ -111,7 +136,7 @@ async def search_memories(
             ranker={"model": "personal-bert"},
         )
 
-    return RecallResponse(items=mock_items, trace=trace_info)
+    return RecallResponse(items=mock_items, trace=trace_info, next_cursor=next_cursor)
 
 
 @router.get("/memories/{memory_id}")
@@ -122,6 +122,9 @@ class RecallResponse(BaseModel):
 
     # Optional field from contract
     trace: Optional[TraceInfo] = Field(None, description="Trace information")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; absent on the last page"
+    )
 
 
 class ProjectAccepted(BaseModel):
@@ -30,13 +30,18 @@ feedback for optimal context assembly.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
 
 from observability.logging import get_json_logger
 from observability.trace import start_span
+from storage.stores.memory.vector_index import similarity_matrix
 
 logger = get_json_logger(__name__)
 
+SIMILARITY_DIMENSIONS = ("semantic", "temporal", "contextual", "structural")
+
 
 @dataclass
 class DiversificationConfig:
@@ -117,6 +122,38 @@ class ContentFeatures:
     hierarchy_level: int = 0
 
 
+class _MMRSelection:
+    """
+    Greedy MMR state over a precomputed candidate similarity matrix.
+
+    Keeps every candidate's maximum similarity to the items selected so far,
+    so a round is one vectorized score and argmax over all candidates and a
+    selection folds in a single matrix row: O(k·n) for k picks out of n
+    candidates once the matrix is built.
+    """
+
+    def __init__(self, relevance: np.ndarray, similarity: np.ndarray) -> None:
+        self.relevance = relevance
+        self.similarity = similarity
+        self.max_similarity = np.zeros(len(relevance))
+        self.available = np.ones(len(relevance), dtype=bool)
+        self.selected: List[int] = []
+
+    @property
+    def remaining(self) -> int:
+        return len(self.relevance) - len(self.selected)
+
+    def scores(self, lambda_rel: float) -> np.ndarray:
+        """MMR score of every candidate; selected candidates score -inf."""
+        scores = lambda_rel * self.relevance - (1 - lambda_rel) * self.max_similarity
+        return np.where(self.available, scores, -np.inf)
+
+    def select(self, index: int) -> None:
+        self.selected.append(index)
+        self.available[index] = False
+        np.maximum(self.max_similarity, self.similarity[index], out=self.max_similarity)
+
+
 class MMRDiversifier:
     """
     Sophisticated MMR-based diversification for context bundle assembly.
@@ -320,36 +357,17 @@ class MMRDiversifier:
     ) -> DiversificationResult:
         """Classic MMR algorithm implementation."""
 
-        selected = []
-        remaining = items.copy()
         lambda_rel = self.config.lambda_relevance
+        similarity = self._candidate_similarity(items, features_map)
+        selection = _MMRSelection(
+            self._relevance_vector(items, relevance_scores), similarity
+        )
 
-        while len(selected) < target_count and remaining:
-            best_item = None
-            best_score = -float("inf")
-
-            for item in remaining:
-                item_id = item.get("id", str(hash(str(item))))
-                relevance = relevance_scores.get(item_id, 0.0)
-
-                # Calculate maximum similarity to already selected items
-                max_similarity = 0.0
-                if selected:
-                    similarities = await self._compute_similarities_to_selected(
-                        item, selected, features_map
-                    )
-                    max_similarity = max(similarities) if similarities else 0.0
-
-                # MMR score: λ * relevance - (1-λ) * max_similarity
-                mmr_score = lambda_rel * relevance - (1 - lambda_rel) * max_similarity
-
-                if mmr_score > best_score:
-                    best_score = mmr_score
-                    best_item = item
+        while len(selection.selected) < target_count and selection.remaining:
+            # MMR score: λ * relevance - (1-λ) * max_similarity
+            selection.select(int(np.argmax(selection.scores(lambda_rel))))
 
-            if best_item:
-                selected.append(best_item)
-                remaining.remove(best_item)
+        selected = [items[index] for index in selection.selected]
 
         # Calculate final scores
         diversity_score = await self._calculate_diversity_score(selected, features_map)
@@ -366,6 +384,7 @@ class MMRDiversifier:
             iterations_performed=len(selected),
             convergence_achieved=len(selected) == target_count,
             items_rejected=len(items) - len(selected),
+            similarity_matrix_size=similarity.size,
         )
 
     async def _mmr_enhanced_algorithm(
@@ -379,55 +398,21 @@ class MMRDiversifier:
     ) -> DiversificationResult:
         """Enhanced MMR algorithm with multi-dimensional similarity."""
 
-        selected = []
-        remaining = items.copy()
         lambda_rel = await self._adapt_lambda_for_query(query, context)
 
-        # Enhanced scoring with multiple factors
-        while len(selected) < target_count and remaining:
-            best_item = None
-            best_score = -float("inf")
-
-            for item in remaining:
-                item_id = item.get("id", str(hash(str(item))))
-                relevance = relevance_scores.get(item_id, 0.0)
-
-                # Multi-dimensional similarity calculation
-                similarity_scores = await self._compute_multi_dimensional_similarity(
-                    item, selected, features_map
-                )
-
-                # Enhanced MMR with weighted similarity dimensions
-                semantic_sim = similarity_scores.get("semantic", 0.0)
-                temporal_sim = similarity_scores.get("temporal", 0.0)
-                contextual_sim = similarity_scores.get("contextual", 0.0)
-
-                weighted_similarity = (
-                    semantic_sim * self.config.semantic_weight
-                    + temporal_sim * self.config.temporal_weight
-                    + contextual_sim * self.config.contextual_weight
-                )
-
-                # Enhanced MMR score with coverage bonus
-                coverage_bonus = await self._calculate_coverage_bonus(
-                    item, selected, query
-                )
-
-                mmr_score = (
-                    lambda_rel * relevance
-                    - (1 - lambda_rel) * weighted_similarity
-                    + 0.1 * coverage_bonus
-                )
+        # Enhanced MMR with weighted semantic, temporal and contextual
+        # similarity; structure does not count against an item here
+        similarity = self._candidate_similarity(
+            items, features_map, dimensions=("semantic", "temporal", "contextual")
+        )
+        selection = _MMRSelection(
+            self._relevance_vector(items, relevance_scores), similarity
+        )
 
-                if mmr_score > best_score:
-                    best_score = mmr_score
-                    best_item = item
+        while len(selection.selected) < target_count and selection.remaining:
+            selection.select(int(np.argmax(selection.scores(lambda_rel))))
 
-            if best_item:
-                selected.append(best_item)
-                remaining.remove(best_item)
-            else:
-                break  # No suitable item found
+        selected = [items[index] for index in selection.selected]
 
         # Calculate enhanced quality metrics
         diversity_score = await self._calculate_enhanced_diversity_score(
@@ -446,6 +431,7 @@ class MMRDiversifier:
             iterations_performed=len(selected),
             convergence_achieved=len(selected) == target_count,
             items_rejected=len(items) - len(selected),
+            similarity_matrix_size=similarity.size,
         )
 
     async def _adaptive_algorithm(
@@ -483,13 +469,15 @@ class MMRDiversifier:
             similarity_threshold = self.config.similarity_threshold
 
         # Apply adaptive MMR with dynamic parameters
-        selected = []
-        remaining = items.copy()
+        similarity = self._candidate_similarity(items, features_map)
+        selection = _MMRSelection(
+            self._relevance_vector(items, relevance_scores), similarity
+        )
         iteration = 0
 
         while (
-            len(selected) < target_count
-            and remaining
+            len(selection.selected) < target_count
+            and selection.remaining
             and iteration < self.config.max_iterations
         ):
             iteration += 1
@@ -498,43 +486,29 @@ class MMRDiversifier:
             if iteration > target_count * 0.5:
                 similarity_threshold *= 0.95  # Relax threshold as we progress
 
-            best_item = None
-            best_score = -float("inf")
-
-            for item in remaining:
-                item_id = item.get("id", str(hash(str(item))))
-                relevance = relevance_scores.get(item_id, 0.0)
-
-                # Adaptive similarity computation
-                similarity = await self._compute_adaptive_similarity(
-                    item, selected, features_map, data_analysis
-                )
-
-                # Dynamic MMR with adaptive weighting
-                adaptive_weight = await self._calculate_adaptive_weight(
-                    item, selected, query, iteration, target_count
-                )
-
-                mmr_score = (
-                    lambda_rel * relevance
-                    - (1 - lambda_rel) * similarity
-                    + adaptive_weight
+            # Dynamic MMR with adaptive weighting
+            adaptive_weight = await self._calculate_adaptive_weight(
+                selection.selected, query, iteration, target_count
+            )
+            scores = selection.scores(lambda_rel) + adaptive_weight
+
+            # Apply threshold filtering
+            if len(selection.selected) > 2:
+                # Penalize highly similar items
+                scores = np.where(
+                    selection.max_similarity > similarity_threshold,
+                    scores * 0.5,
+                    scores,
                 )
 
-                # Apply threshold filtering
-                if similarity > similarity_threshold and len(selected) > 2:
-                    mmr_score *= 0.5  # Penalize highly similar items
-
-                if mmr_score > best_score:
-                    best_score = mmr_score
-                    best_item = item
-
-            if best_item and best_score > -0.5:  # Minimum quality threshold
-                selected.append(best_item)
-                remaining.remove(best_item)
+            best = int(np.argmax(scores))
+            if scores[best] > -0.5:  # Minimum quality threshold
+                selection.select(best)
             else:
                 break  # No suitable items found
 
+        selected = [items[index] for index in selection.selected]
+
         # Calculate adaptive quality metrics
         diversity_score = await self._calculate_adaptive_diversity_score(
             selected, features_map, data_analysis
@@ -552,6 +526,7 @@ class MMRDiversifier:
             iterations_performed=iteration,
             convergence_achieved=len(selected) == target_count,
             items_rejected=len(items) - len(selected),
+            similarity_matrix_size=similarity.size,
         )
 
     async def _extract_features_for_items(
@@ -577,6 +552,9 @@ class MMRDiversifier:
             if isinstance(content, dict):
                 content = content.get("text", str(content))
 
+            embedding = item.get("embedding")
+            if embedding is not None and len(embedding) > 0:
+                features.semantic_embedding = list(embedding)
             features.keywords = set(self._extract_keywords(content))
             features.entities = set(self._extract_entities(content))
             features.concepts = set(self._extract_concepts(content))
@@ -638,46 +616,165 @@ class MMRDiversifier:
 
         return relevance_scores
 
-    async def _compute_similarities_to_selected(
+    def _relevance_vector(
+        self, items: List[Dict[str, Any]], relevance_scores: Dict[str, float]
+    ) -> np.ndarray:
+        """Relevance score of every item, in item order."""
+        return np.array(
+            [
+                relevance_scores.get(item.get("id", str(hash(str(item)))), 0.0)
+                for item in items
+            ],
+            dtype=np.float64,
+        )
+
+    def _candidate_similarity(
         self,
-        item: Dict[str, Any],
-        selected: List[Dict[str, Any]],
+        items: List[Dict[str, Any]],
         features_map: Dict[str, ContentFeatures],
-    ) -> List[float]:
-        """Compute similarities between item and all selected items."""
-
-        similarities = []
-        item_id = item.get("id", str(hash(str(item))))
-        item_features = features_map.get(item_id)
-
-        if not item_features:
-            return [0.0] * len(selected)
+        dimensions: Sequence[str] = SIMILARITY_DIMENSIONS,
+    ) -> np.ndarray:
+        """
+        Similarity of every item to every other item as an (n, n) matrix.
 
-        for selected_item in selected:
-            selected_id = selected_item.get("id", str(hash(str(selected_item))))
-            selected_features = features_map.get(selected_id)
+        Each pair scores what ``_compute_pairwise_similarity`` gives it,
+        weighted over ``dimensions`` only, but every dimension is computed for
+        all pairs at once with array operations. Rows and columns of items
+        without features are zero.
+        """
+        features = [
+            features_map.get(item.get("id", str(hash(str(item))))) for item in items
+        ]
+        known = [f if f is not None else ContentFeatures() for f in features]
+        weights = {
+            "semantic": self.config.semantic_weight,
+            "temporal": self.config.temporal_weight,
+            "contextual": self.config.contextual_weight,
+            "structural": self.config.structural_weight,
+        }
 
-            if selected_features:
-                similarity = await self._compute_pairwise_similarity(
-                    item_features, selected_features
+        similarity = np.zeros((len(items), len(items)))
+        for dimension in dimensions:
+            if dimension == "semantic":
+                score = (
+                    self._jaccard_matrix([f.keywords for f in known])
+                    + self._jaccard_matrix([f.concepts for f in known])
+                    + self._jaccard_matrix([f.entities for f in known])
+                ) / 3.0
+                # Embedding cosine replaces term overlap between items whose
+                # embeddings share a dimension
+                by_dim: Dict[int, List[int]] = {}
+                for i, f in enumerate(known):
+                    if f.semantic_embedding:
+                        by_dim.setdefault(len(f.semantic_embedding), []).append(i)
+                for rows in by_dim.values():
+                    vectors = [known[i].semantic_embedding for i in rows]
+                    score[np.ix_(rows, rows)] = np.maximum(
+                        similarity_matrix(vectors, vectors), 0.0
+                    )
+            elif dimension == "temporal":
+                # 1 day normalization; pairs missing a timestamp score 0.0
+                stamps = np.array(
+                    [f.timestamp.timestamp() if f.timestamp else np.nan for f in known]
+                )
+                time_diff = np.abs(stamps[:, None] - stamps[None, :])
+                score = np.nan_to_num(np.maximum(0.0, 1.0 - time_diff / 86400.0))
+            elif dimension == "contextual":
+                score = (
+                    self._jaccard_matrix([f.context_tags for f in known])
+                    + self._equality_matrix([f.space_id for f in known])
+                ) / 2.0
+            elif dimension == "structural":
+                lengths = np.array([f.content_length for f in known], dtype=np.float64)
+                longest = np.maximum(
+                    np.maximum(lengths[:, None], lengths[None, :]), 1.0
                 )
-                similarities.append(similarity)
+                length_sim = 1.0 - np.abs(lengths[:, None] - lengths[None, :]) / longest
+                score = (
+                    self._equality_matrix([f.content_type for f in known]) + length_sim
+                ) / 2.0
             else:
-                similarities.append(0.0)
+                raise ValueError(f"Unknown similarity dimension: {dimension}")
+            similarity += score * weights[dimension]
+
+        missing = np.array([f is None for f in features], dtype=bool)
+        similarity[missing, :] = 0.0
+        similarity[:, missing] = 0.0
+        return np.minimum(1.0, similarity)
 
-        return similarities
+    def _embedding_similarities(
+        self,
+        left: List[Optional[ContentFeatures]],
+        right: List[Optional[ContentFeatures]],
+    ) -> Dict[Tuple[int, int], float]:
+        """
+        Cosine similarity between the semantic embeddings of two feature lists.
+
+        Computed as a single matrix-matrix product over every pair whose
+        features carry embeddings of the same dimension. Returns a mapping of
+        (left position, right position) to similarity; pairs without
+        embeddings are absent.
+        """
+        left_rows = [
+            (i, f.semantic_embedding)
+            for i, f in enumerate(left)
+            if f and f.semantic_embedding
+        ]
+        right_rows = [
+            (j, f.semantic_embedding)
+            for j, f in enumerate(right)
+            if f and f.semantic_embedding
+        ]
+        if not left_rows or not right_rows:
+            return {}
+
+        dim = len(left_rows[0][1])
+        left_rows = [(i, v) for i, v in left_rows if len(v) == dim]
+        right_rows = [(j, v) for j, v in right_rows if len(v) == dim]
+        if not right_rows:
+            return {}
+
+        sims = similarity_matrix([v for _, v in left_rows], [v for _, v in right_rows])
+        return {
+            (i, j): float(sims[a, b])
+            for a, (i, _) in enumerate(left_rows)
+            for b, (j, _) in enumerate(right_rows)
+        }
 
     async def _compute_pairwise_similarity(
-        self, features1: ContentFeatures, features2: ContentFeatures
+        self,
+        features1: ContentFeatures,
+        features2: ContentFeatures,
+        embedding_similarity: Optional[float] = None,
     ) -> float:
-        """Compute similarity between two feature sets."""
+        """
+        Compute similarity between two feature sets.
+
+        When both items carry embeddings the semantic component is their cosine
+        similarity; callers scoring many pairs pass it in precomputed from
+        ``_embedding_similarities``.
+        """
+
+        if embedding_similarity is None:
+            embedding_similarity = self._embedding_similarities(
+                [features1], [features2]
+            ).get((0, 0))
 
-        # Semantic similarity (keyword/concept overlap)
-        semantic_sim = self._jaccard_similarity(features1.keywords, features2.keywords)
-        concept_sim = self._jaccard_similarity(features1.concepts, features2.concepts)
-        entity_sim = self._jaccard_similarity(features1.entities, features2.entities)
+        if embedding_similarity is not None:
+            semantic_score = max(0.0, embedding_similarity)
+        else:
+            # Semantic similarity (keyword/concept overlap)
+            semantic_sim = self._jaccard_similarity(
+                features1.keywords, features2.keywords
+            )
+            concept_sim = self._jaccard_similarity(
+                features1.concepts, features2.concepts
+            )
+            entity_sim = self._jaccard_similarity(
+                features1.entities, features2.entities
+            )
 
-        semantic_score = (semantic_sim + concept_sim + entity_sim) / 3.0
+            semantic_score = (semantic_sim + concept_sim + entity_sim) / 3.0
 
         # Temporal similarity
         temporal_score = 0.0
@@ -723,6 +820,35 @@ class MMRDiversifier:
         union = len(set1.union(set2))
         return intersection / union if union > 0 else 0.0
 
+    def _jaccard_matrix(self, sets: List[Set[str]]) -> np.ndarray:
+        """Jaccard similarity of every pair of sets, as ``_jaccard_similarity``."""
+        # Members of a single set never intersect, so only shared members
+        # need an incidence column
+        counts: Dict[str, int] = {}
+        for members in sets:
+            for member in members:
+                counts[member] = counts.get(member, 0) + 1
+        columns = {
+            member: column
+            for column, member in enumerate(m for m, n in counts.items() if n > 1)
+        }
+        incidence = np.zeros((len(sets), len(columns)), dtype=np.float32)
+        for row, members in enumerate(sets):
+            incidence[row, [columns[m] for m in members if m in columns]] = 1.0
+
+        sizes = np.array([len(members) for members in sets], dtype=np.float64)
+        intersection = (incidence @ incidence.T).astype(np.float64)
+        np.fill_diagonal(intersection, sizes)
+        union = sizes[:, None] + sizes[None, :] - intersection
+        # Two empty sets are identical
+        return np.divide(intersection, union, out=np.ones_like(union), where=union > 0)
+
+    def _equality_matrix(self, values: List[Any]) -> np.ndarray:
+        """1.0 for every pair of equal values, else 0.0."""
+        codes: Dict[Any, int] = {}
+        keys = np.array([codes.setdefault(value, len(codes)) for value in values])
+        return (keys[:, None] == keys[None, :]).astype(np.float64)
+
     def _extract_keywords(self, content: str) -> List[str]:
         """Simple keyword extraction (placeholder for sophisticated NLP)."""
         # Remove common words and extract meaningful terms
@@ -819,17 +945,23 @@ class MMRDiversifier:
         total_similarity = 0.0
         pair_count = 0
 
+        selected_features = [
+            features_map.get(item.get("id", str(hash(str(item))))) for item in selected
+        ]
+        embedding_sims = self._embedding_similarities(
+            selected_features, selected_features
+        )
+
         for i in range(len(selected)):
             for j in range(i + 1, len(selected)):
-                item1_id = selected[i].get("id", str(hash(str(selected[i]))))
-                item2_id = selected[j].get("id", str(hash(str(selected[j]))))
-
-                features1 = features_map.get(item1_id)
-                features2 = features_map.get(item2_id)
+                features1 = selected_features[i]
+                features2 = selected_features[j]
 
                 if features1 and features2:
                     similarity = await self._compute_pairwise_similarity(
-                        features1, features2
+                        features1,
+                        features2,
+                        embedding_similarity=embedding_sims.get((i, j)),
                     )
                     total_similarity += similarity
                     pair_count += 1
@@ -855,14 +987,6 @@ class MMRDiversifier:
         return total_relevance / len(selected)
 
     # Additional placeholder methods for enhanced algorithms
-    async def _compute_multi_dimensional_similarity(self, item, selected, features_map):
-        """Placeholder for multi-dimensional similarity computation."""
-        return {"semantic": 0.5, "temporal": 0.3, "contextual": 0.4}
-
-    async def _calculate_coverage_bonus(self, item, selected, query):
-        """Placeholder for coverage bonus calculation."""
-        return 0.1
-
     async def _calculate_enhanced_diversity_score(self, selected, features_map):
         """Placeholder for enhanced diversity score calculation."""
         return await self._calculate_diversity_score(selected, features_map)
@@ -879,21 +1003,10 @@ class MMRDiversifier:
             "temporal_clustering": False,
         }
 
-    async def _compute_adaptive_similarity(
-        self, item, selected, features_map, data_analysis
-    ):
-        """Placeholder for adaptive similarity computation."""
-        if selected:
-            similarities = await self._compute_similarities_to_selected(
-                item, selected, features_map
-            )
-            return max(similarities) if similarities else 0.0
-        return 0.0
-
     async def _calculate_adaptive_weight(
-        self, item, selected, query, iteration, target_count
+        self, selected, query, iteration, target_count
     ):
-        """Placeholder for adaptive weight calculation."""
+        """Placeholder for adaptive weight calculation, added to every candidate."""
         return 0.05 * (iteration / target_count)
 
     async def _calculate_adaptive_diversity_score(
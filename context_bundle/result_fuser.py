@@ -25,12 +25,12 @@ optimization, cross-store deduplication, temporal weighting, and confidence
 modeling for high-quality context assembly.
 """
 
-import hashlib
 import math
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from embeddings.encoders import EmbeddingProvider, get_default_provider
 from observability.logging import get_json_logger
 from observability.trace import start_span
 
@@ -106,6 +106,8 @@ class ResultFusionEngine:
         self,
         # Configuration
         config: Optional[Dict[str, Any]] = None,
+        # Local embedding provider for content similarity
+        embedding_provider: Optional[EmbeddingProvider] = None,
     ):
         # Configuration with defaults
         self.config = config or {}
@@ -117,8 +119,10 @@ class ResultFusionEngine:
         )  # 1 week
         self.max_fusion_results = self.config.get("max_fusion_results", 50)
 
-        # Embedding dimension for similarity calculation (placeholder)
-        self.embedding_dim = self.config.get("embedding_dim", 128)
+        # Content embeddings for deduplication come from the shared provider,
+        # cached by content hash so repeated results are embedded once
+        self.embedding_provider = embedding_provider or get_default_provider()
+        self.embedding_dim = self.embedding_provider.dim
 
         logger.info(
             "ResultFusionEngine initialized",
@@ -304,13 +308,15 @@ class ResultFusionEngine:
             )
             normalized["confidence"] = max(0.0, min(1.0, normalized["confidence"]))
 
-            # Generate content embedding placeholder for similarity calculation
-            normalized["content_embedding"] = self._generate_content_embedding(
-                normalized["content"]
-            )
-
             normalized_results.append(normalized)
 
+        # Embed all contents for similarity calculation, batched off the loop
+        embeddings = await self.embedding_provider.embed_texts(
+            [str(normalized["content"]) for normalized in normalized_results]
+        )
+        for normalized, embedding in zip(normalized_results, embeddings):
+            normalized["content_embedding"] = embedding
+
         logger.debug(
             "Cross-store result normalization completed",
             extra={"normalized_count": len(normalized_results)},
@@ -674,26 +680,6 @@ class ResultFusionEngine:
 
         return merged_result
 
-    def _generate_content_embedding(self, content: str) -> List[float]:
-        """Generate placeholder embedding for content similarity calculation."""
-
-        # Simple hash-based embedding for testing
-        # In production, this would use actual embedding models
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-
-        # Convert hash to fixed-size embedding
-        embedding = []
-        for i in range(0, min(len(content_hash), self.embedding_dim * 2), 2):
-            hex_pair = content_hash[i : i + 2]
-            value = int(hex_pair, 16) / 255.0  # Normalize to 0-1
-            embedding.append(value)
-
-        # Pad to embedding dimension
-        while len(embedding) < self.embedding_dim:
-            embedding.append(0.0)
-
-        return embedding[: self.embedding_dim]
-
     def _calculate_content_similarity(
         self, embedding1: List[float], embedding2: List[float]
     ) -> float:
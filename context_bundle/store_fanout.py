@@ -30,6 +30,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from embeddings.encoders import EmbeddingProvider, get_default_provider
 from observability.logging import get_json_logger
 from observability.trace import start_span
 
@@ -100,9 +101,12 @@ class StoreFanoutManager:
         store_adapters: Optional[Dict[str, StoreAdapter]] = None,
         # Configuration
         config: Optional[Dict[str, Any]] = None,
+        # Embeds queries for vector stores that support batched search
+        embedding_provider: Optional[EmbeddingProvider] = None,
     ):
         # Store adapters configuration
         self.store_adapters = store_adapters or {}
+        self._embedding_provider = embedding_provider
 
         # Configuration with defaults
         self.config = config or {}
@@ -478,11 +482,23 @@ class StoreFanoutManager:
         if store_name == "semantic_store" and query_type == "vector_similarity":
             adapted_query.update(
                 {
-                    "embedding_query": query,  # Would be converted to embedding
+                    "embedding_query": query,
                     "similarity_threshold": 0.7,
                     "include_metadata": True,
+                    # Query and expansion embeddings, searched together in one batch
+                    "query_embeddings": query_features.get("query_embeddings", []),
+                    "model_id": query_features.get("model_id"),
+                    "space_ids": query_features.get("space_ids"),
                 }
             )
+            adapter = self.store_adapters.get(store_name)
+            if not adapted_query["query_embeddings"] and hasattr(
+                getattr(adapter, "connection_pool", None), "batch_similarity_search"
+            ):
+                provider = self._get_embedding_provider()
+                texts = [query, *query_features.get("query_expansions", [])]
+                adapted_query["query_embeddings"] = await provider.embed_texts(texts)
+                adapted_query["model_id"] = provider.model_id
 
         elif store_name == "knowledge_graph" and query_type == "graph_traversal":
             # Extract entities for graph traversal
@@ -518,13 +534,29 @@ class StoreFanoutManager:
 
         return adapted_query
 
+    def _get_embedding_provider(self) -> EmbeddingProvider:
+        """Embedding provider for vector queries, the shared one by default."""
+        if self._embedding_provider is None:
+            self._embedding_provider = get_default_provider()
+        return self._embedding_provider
+
     async def _execute_vector_query(
         self, adapter: StoreAdapter, plan: QueryPlan
     ) -> List[Dict[str, Any]]:
         """Execute vector similarity query."""
-        # Placeholder implementation - would integrate with actual vector store
         logger.debug(f"Executing vector query for {adapter.store_name}")
 
+        store = adapter.connection_pool
+        embeddings = plan.adapted_query.get("query_embeddings")
+        if (
+            embeddings
+            and plan.adapted_query.get("model_id")
+            and hasattr(store, "batch_similarity_search")
+        ):
+            return await self._execute_batched_vector_query(adapter, plan)
+
+        # Placeholder implementation - would integrate with actual vector store
+
         # Simulate query execution
         await asyncio.sleep(0.1)  # Simulate network latency
 
@@ -540,6 +572,51 @@ class StoreFanoutManager:
             for i in range(min(3, plan.max_results))
         ]
 
+    async def _execute_batched_vector_query(
+        self, adapter: StoreAdapter, plan: QueryPlan
+    ) -> List[Dict[str, Any]]:
+        """
+        Search every query embedding of the plan in one batched call.
+
+        The vector store scores all embeddings against each partition with a
+        single matrix-matrix product; hits are merged per vector, keeping the
+        best similarity any embedding reached.
+        """
+        adapted = plan.adapted_query
+        result_lists = await asyncio.to_thread(
+            adapter.connection_pool.batch_similarity_search,
+            adapted["query_embeddings"],
+            adapted["model_id"],
+            limit=plan.max_results,
+            min_similarity=adapted.get("similarity_threshold", 0.0),
+            space_ids=adapted.get("space_ids"),
+        )
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for query_index, hits in enumerate(result_lists):
+            for row, score in hits:
+                current = best.get(row.vec_id)
+                if current is not None and current["similarity_score"] >= score:
+                    continue
+                best[row.vec_id] = {
+                    "content_id": row.doc_id,
+                    "content": "",
+                    "similarity_score": float(score),
+                    "source_store": adapter.store_name,
+                    "timestamp": row.timestamp,
+                    "metadata": {
+                        "type": "vector_match",
+                        "vec_id": row.vec_id,
+                        "space_id": row.space_id,
+                        "query_index": query_index,
+                    },
+                }
+
+        results = sorted(
+            best.values(), key=lambda item: item["similarity_score"], reverse=True
+        )
+        return results[: plan.max_results]
+
     async def _execute_graph_query(
         self, adapter: StoreAdapter, plan: QueryPlan
     ) -> List[Dict[str, Any]]:
@@ -0,0 +1,403 @@
+"""
+Edge Encoders and Embedding Provider for MemoryOS
+
+Local, on-device text embedding behind one small interface:
+
+* ``OnnxEncoder`` runs a sentence-embedding model (e.g. MiniLM exported to
+  ONNX) with ONNX Runtime on the CPU, mean-pooling token states with the
+  attention mask. It needs ``onnxruntime`` and ``tokenizers`` plus a
+  ``tokenizer.json`` next to the model file.
+* ``HashingEncoder`` is the dependency-free fallback: word, word-bigram and
+  character-trigram features hashed into a fixed number of signed buckets.
+  It captures lexical overlap only, but is deterministic across processes and
+  devices, so vectors from different runs stay comparable.
+
+``EmbeddingProvider`` wraps an encoder with a bounded LRU cache keyed by
+(model_id, sha256(text)) and an asyncio micro-batching queue: concurrent
+``embed_text`` calls issued within ``max_wait_ms`` of each other are encoded in
+one inference call. Every vector is L2-normalized float32.
+
+Only redacted content should reach these encoders (see embeddings/README.md).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_DIM = 384
+HASHING_MODEL_ID = "hashing-v1"
+
+CacheKey = Tuple[str, str]  # (model_id, sha256 of the text)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class Encoder(Protocol):
+    """A model that turns a batch of texts into a (len(texts), dim) matrix."""
+
+    model_id: str
+    dim: int
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed a batch of texts as L2-normalized float32 rows."""
+        ...
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.where(norms > 0, matrix / norms, 0.0)
+    return normalized.astype(np.float32, copy=False)
+
+
+class HashingEncoder:
+    """
+    Feature-hashing text encoder.
+
+    Each feature is hashed with 64-bit BLAKE2b; the low bits pick one of
+    ``dim`` buckets and the top bit picks the sign, so colliding features tend
+    to cancel rather than accumulate.
+    """
+
+    def __init__(
+        self, dim: int = DEFAULT_EMBEDDING_DIM, model_id: Optional[str] = None
+    ) -> None:
+        if dim <= 0:
+            raise ValueError(f"Embedding dimension must be positive, got {dim}")
+        self.dim = dim
+        self.model_id = model_id or f"{HASHING_MODEL_ID}-{dim}"
+
+    @staticmethod
+    def _features(text: str) -> List[Tuple[str, float]]:
+        words = _WORD_RE.findall(text.lower())
+        features = [(f"w:{word}", 1.0) for word in words]
+        features.extend(
+            (f"b:{first} {second}", 0.5) for first, second in zip(words, words[1:])
+        )
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(
+                (f"c:{padded[i:i + 3]}", 0.25) for i in range(len(padded) - 2)
+            )
+        return features
+
+    def _hash_vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = self._features(text)
+        if not features:
+            return vector
+        hashes = np.array(
+            [
+                int.from_bytes(
+                    hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(),
+                    "little",
+                )
+                for name, _ in features
+            ],
+            dtype=np.uint64,
+        )
+        weights = np.array([weight for _, weight in features], dtype=np.float32)
+        buckets = (hashes % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, buckets, signs * weights)
+        return vector
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize_rows(np.stack([self._hash_vector(text) for text in texts]))
+
+
+class OnnxEncoder:
+    """
+    Sentence-embedding model run with ONNX Runtime on the CPU.
+
+    Raises ImportError when onnxruntime or tokenizers is not installed and
+    OSError/RuntimeError when the model cannot be loaded; use ``create_encoder``
+    to fall back to the hashing encoder instead.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_path: Optional[str] = None,
+        model_id: Optional[str] = None,
+        max_length: int = 256,
+        providers: Optional[List[str]] = None,
+    ) -> None:
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        path = Path(model_path)
+        tokenizer_file = (
+            Path(tokenizer_path) if tokenizer_path else path.with_name("tokenizer.json")
+        )
+        self.model_path = str(path)
+        self.model_id = model_id or path.stem
+        self.session = ort.InferenceSession(
+            self.model_path, providers=providers or ["CPUExecutionProvider"]
+        )
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_file))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self._input_names = {
+            model_input.name for model_input in self.session.get_inputs()
+        }
+
+        output_dim = self.session.get_outputs()[0].shape[-1]
+        self.dim = (
+            output_dim
+            if isinstance(output_dim, int)
+            else self.encode(["probe"]).shape[1]
+        )
+        logger.info(f"ONNX encoder {self.model_id} loaded ({self.dim} dims)")
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, getattr(self, "dim", 0)), dtype=np.float32)
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        candidates = {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feed = {
+            name: value
+            for name, value in candidates.items()
+            if name in self._input_names
+        }
+        output = np.asarray(self.session.run(None, feed)[0], dtype=np.float32)
+
+        if output.ndim == 3:
+            # Mean-pool token states over the attention mask
+            mask = attention_mask[:, :, None].astype(np.float32)
+            output = (output * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+        return _normalize_rows(output)
+
+
+def create_encoder(
+    model_path: Optional[str] = None, dim: int = DEFAULT_EMBEDDING_DIM
+) -> Encoder:
+    """
+    ONNX encoder when ``model_path`` (or $EMBEDDING_MODEL_PATH) names a loadable
+    model, otherwise a HashingEncoder of ``dim`` dimensions.
+    """
+    model_path = model_path or os.getenv("EMBEDDING_MODEL_PATH")
+    if model_path and Path(model_path).is_file():
+        try:
+            return OnnxEncoder(model_path)
+        except ImportError:
+            logger.warning(
+                "onnxruntime/tokenizers not installed, using hashing encoder"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load ONNX encoder from {model_path}: {e}")
+    elif model_path:
+        logger.warning(f"Embedding model {model_path} not found, using hashing encoder")
+    return HashingEncoder(dim)
+
+
+class EmbeddingCache:
+    """Thread-safe bounded LRU of embeddings keyed by (model_id, content hash)."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_id: str, text: str) -> CacheKey:
+        return model_id, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: CacheKey, vector: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class EmbeddingProvider:
+    """
+    Cached, micro-batched access to an encoder.
+
+    ``embed``/``embed_many`` are synchronous; ``embed_text``/``embed_texts``
+    queue requests on the running event loop and encode everything that
+    arrives within ``max_wait_ms`` (or ``max_batch_size`` texts) in one call
+    on a worker thread.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        cache_size: int = 10000,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        self.encoder = encoder or HashingEncoder()
+        self.cache = EmbeddingCache(cache_size)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.batches_encoded = 0
+        self.texts_encoded = 0
+        self._pending: List[Tuple[str, "asyncio.Future[np.ndarray]"]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def model_id(self) -> str:
+        return self.encoder.model_id
+
+    @property
+    def dim(self) -> int:
+        return self.encoder.dim
+
+    # Synchronous API
+
+    def embed(self, text: str) -> List[float]:
+        """Embedding of a single text as a list of floats."""
+        return self.embed_many([text])[0].tolist()
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embeddings of ``texts`` as a (len(texts), dim) float32 matrix.
+
+        Cached texts are served from the LRU; the distinct misses are encoded
+        in batches of at most ``max_batch_size``.
+        """
+        return self._embed(texts, lookup=True)
+
+    def _embed(self, texts: Sequence[str], lookup: bool) -> np.ndarray:
+        result = np.zeros((len(texts), self.dim), dtype=np.float32)
+        positions: Dict[CacheKey, List[int]] = {}
+        pending: Dict[CacheKey, str] = {}
+        for position, text in enumerate(texts):
+            key = self.cache.key(self.model_id, text)
+            vector = self.cache.get(key) if lookup else None
+            if vector is not None:
+                result[position] = vector
+                continue
+            positions.setdefault(key, []).append(position)
+            pending.setdefault(key, text)
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start : start + self.max_batch_size]
+            vectors = self.encoder.encode([pending[key] for key in chunk])
+            self.batches_encoded += 1
+            self.texts_encoded += len(chunk)
+            for key, vector in zip(chunk, vectors):
+                self.cache.put(key, vector)
+                result[positions[key]] = vector
+        return result
+
+    # Micro-batched async API
+
+    async def embed_text(self, text: str) -> List[float]:
+        """Embedding of one text, batched with concurrent callers."""
+        cached = self.cache.get(self.cache.key(self.model_id, text))
+        if cached is not None:
+            return cached.tolist()
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[np.ndarray]" = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return (await future).tolist()
+
+    async def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embeddings of several texts, sharing batches with concurrent callers."""
+        return list(await asyncio.gather(*(self.embed_text(text) for text in texts)))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._encode_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _encode_batch(
+        self, batch: List[Tuple[str, "asyncio.Future[np.ndarray]"]]
+    ) -> None:
+        try:
+            # Callers already missed the cache in embed_text
+            vectors = await asyncio.to_thread(
+                self._embed, [text for text, _ in batch], False
+            )
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model_id": self.model_id,
+            "dim": self.dim,
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "batches_encoded": self.batches_encoded,
+            "texts_encoded": self.texts_encoded,
+        }
+
+
+_default_provider: Optional[EmbeddingProvider] = None
+_default_lock = threading.Lock()
+
+
+def get_default_provider() -> EmbeddingProvider:
+    """Process-wide provider shared by indexing, dedup and fusion."""
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            _default_provider = EmbeddingProvider(create_encoder())
+        return _default_provider
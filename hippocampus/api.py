@@ -32,6 +32,7 @@ from hippocampus.completer import CA3PatternCompleter, CompletionConfig
 from hippocampus.sdr import SDRProcessor
 from hippocampus.separator import DentateGyrusSeparator
 from hippocampus.types import (
+    MINHASH_SCHEME_LEGACY,
     CompletionCandidate,
     HippocampalEncoding,
     SemanticProjection,
@@ -87,6 +88,9 @@ class HippocampusAPI:
         self.sdr_processor = SDRProcessor()
 
         self.dg_separator = DentateGyrusSeparator()
+        if hippocampus_store is not None:
+            # Novelty candidates come from the store's MinHash LSH index
+            self.dg_separator.set_storage(hippocampus_store)
 
         self.ca3_completer = CA3PatternCompleter(
             self.sdr_processor,
@@ -288,6 +292,7 @@ class HippocampusAPI:
                 length=record.get("meta", {}).get("length", 0),
                 ts=datetime.fromisoformat(record["ts"]),
                 metadata=record.get("meta", {}),
+                minhash_scheme=record.get("minhash_scheme", MINHASH_SCHEME_LEGACY),
             )
 
             logger.debug("Retrieved encoding", extra={"event_id": event_id})
@@ -22,9 +22,11 @@ Storage Integration:
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
 
-from hippocampus.sdr import SDRProcessor
+import numpy as np
+
+from hippocampus.sdr import SDRProcessor, popcount_rows
 from hippocampus.types import CompletionCandidate, SDRCodes
 from observability.logging import get_json_logger
 
@@ -48,10 +50,20 @@ class VectorStoreProtocol(Protocol):
         """Get embedding vector for an event."""
         ...
 
+    def get_embeddings(self, event_ids: Sequence[str]) -> Dict[str, Any]:
+        """Embedding vectors of many events, fetched in one query."""
+        ...
+
     def cosine_similarity(self, vector_a: List[float], vector_b: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         ...
 
+    def similarity_matrix(
+        self, queries: Sequence[Sequence[float]], candidates: Sequence[Sequence[float]]
+    ) -> Any:
+        """Cosine similarity of every query against every candidate, shape (Q, N)."""
+        ...
+
 
 @dataclass
 class CompletionConfig:
@@ -227,9 +239,14 @@ class CA3PatternCompleter:
         cue_embedding: Optional[List[float]],
         candidates: List[Dict[str, Any]],
     ) -> List[CompletionCandidate]:
-        """Score candidates using hybrid vector + SDR approach."""
-        scored_candidates = []
+        """
+        Score candidates using hybrid vector + SDR approach.
 
+        All candidates are scored together: Hamming distances come from one
+        XOR/popcount over the packed codes, cosines from one batched
+        embedding fetch and one matrix product, and the fusion is a single
+        array expression.
+        """
         # Determine if we're using vector mode
         use_vectors = cue_embedding is not None and self.vector_store is not None
 
@@ -244,94 +261,139 @@ class CA3PatternCompleter:
             },
         )
 
-        for candidate in candidates:
-            try:
-                score, explanation = self._score_single_candidate(
-                    cue_codes, cue_embedding, candidate, lambda_weight, use_vectors
-                )
+        event_ids, codes = self._packed_codes(candidates)
+        if not event_ids:
+            return []
 
-                completion_candidate = CompletionCandidate(
-                    event_id=candidate["event_id"],
-                    score=score,
-                    explanation=[explanation],  # Convert string to list
+        cue_code = np.frombuffer(
+            int(cue_codes.simhash_bits).to_bytes(self.config.hamming_bits // 8, "big"),
+            dtype=np.uint64,
+        )
+        hamming = popcount_rows(codes ^ cue_code)
+        sdr_similarity = 1.0 - hamming / self.config.hamming_bits
+
+        vector_similarity = np.zeros(len(event_ids))
+        if use_vectors:
+            vector_similarity = self._vector_similarities(cue_embedding, event_ids)
+
+        # Fusion scoring: score = λ·cos(q,v) + (1-λ)·(1-d_H/B)
+        scores = lambda_weight * vector_similarity + (1.0 - lambda_weight) * (
+            sdr_similarity
+        )
+
+        # Sort by score descending (stable, so ties keep store order)
+        order = np.argsort(-scores, kind="stable")
+        scored_candidates = []
+        for i in order:
+            if use_vectors:
+                explanation = (
+                    f"vector:cos={vector_similarity[i]:.3f},"
+                    f"sdr:hamm={sdr_similarity[i]:.3f},fusion:λ={lambda_weight}"
+                )
+            else:
+                explanation = f"sdr:hamm={sdr_similarity[i]:.3f},pure_sdr_mode"
+            scored_candidates.append(
+                CompletionCandidate(
+                    event_id=event_ids[i],
+                    score=float(scores[i]),
+                    explanation=[explanation],
                 )
+            )
 
-                scored_candidates.append(completion_candidate)
+        return scored_candidates
 
-            except Exception as e:
+    def _packed_codes(
+        self, candidates: List[Dict[str, Any]]
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Event ids and SimHash codes of the scorable candidates, packed as a
+        uint64 matrix with one row per candidate.
+        """
+        code_bytes = self.config.hamming_bits // 8
+        event_ids: List[str] = []
+        blobs: List[bytes] = []
+        for candidate in candidates:
+            event_id = candidate.get("event_id", candidate.get("id"))
+            try:
+                simhash_hex = candidate.get("simhash_hex", candidate.get("simhash"))
+                if simhash_hex:
+                    blob = bytes.fromhex(simhash_hex)
+                else:
+                    blob = int(candidate["simhash_bits"]).to_bytes(code_bytes, "big")
+                if event_id is None or len(blob) != code_bytes:
+                    raise ValueError(f"expected a {code_bytes}-byte code")
+            except (KeyError, TypeError, ValueError, OverflowError) as e:
                 logger.warning(
                     "Failed to score candidate",
-                    extra={
-                        "event_id": candidate.get("event_id", "unknown"),
-                        "error": str(e),
-                    },
+                    extra={"event_id": event_id or "unknown", "error": str(e)},
                 )
                 continue
+            event_ids.append(event_id)
+            blobs.append(blob)
 
-        # Sort by score descending
-        scored_candidates.sort(key=lambda x: x.score, reverse=True)
-
-        return scored_candidates
-
-    def _score_single_candidate(
-        self,
-        cue_codes: SDRCodes,
-        cue_embedding: Optional[List[float]],
-        candidate: Dict[str, Any],
-        lambda_weight: float,
-        use_vectors: bool,
-    ) -> tuple[float, str]:
-        """Score a single candidate using hybrid approach."""
-
-        # Parse candidate codes (assume stored format matches expected fields)
-        candidate_codes = SDRCodes(
-            simhash_bits=candidate.get("simhash_bits", 0),
-            simhash_hex=candidate.get("simhash_hex", candidate.get("simhash", "")),
-            minhash32=candidate.get("minhash32", candidate.get("minhash", [])),
-            tokens=candidate.get("tokens", []),
-            text_length=candidate.get("text_length", 0),
-        )
+        codes = np.frombuffer(b"".join(blobs), dtype=np.uint64)
+        return event_ids, codes.reshape(len(blobs), code_bytes // 8)
 
-        # Calculate SDR component
-        hamming_distance = cue_codes.hamming_distance(candidate_codes)
-        sdr_similarity = 1.0 - (hamming_distance / self.config.hamming_bits)
+    def _vector_similarities(
+        self, cue_embedding: Optional[List[float]], event_ids: List[str]
+    ) -> np.ndarray:
+        """
+        Cosine of the cue against every candidate embedding, in event_ids
+        order; 0.0 where a candidate has no embedding of the cue's dimension.
 
-        vector_similarity = 0.0
-        if use_vectors and cue_embedding:
-            try:
-                if not self.vector_store:
-                    raise ValueError("VectorStore not available")
+        Embeddings come from one VectorStore.get_embeddings call when the
+        store offers it, otherwise one get_embedding call per candidate.
+        """
+        similarities = np.zeros(len(event_ids))
+        if not cue_embedding or not self.vector_store:
+            return similarities
 
-                candidate_embedding = self.vector_store.get_embedding(
-                    candidate["event_id"]
-                )
-                if candidate_embedding:
-                    vector_similarity = self.vector_store.cosine_similarity(
-                        cue_embedding, candidate_embedding
-                    )
-            except Exception as e:
-                logger.debug(
-                    "Vector similarity calculation failed",
-                    extra={"event_id": candidate["event_id"], "error": str(e)},
-                )
+        try:
+            if hasattr(self.vector_store, "get_embeddings"):
+                embeddings = self.vector_store.get_embeddings(event_ids)
+            else:
+                embeddings = {}
+                for event_id in event_ids:
+                    embedding = self.vector_store.get_embedding(event_id)
+                    if embedding is not None:
+                        embeddings[event_id] = embedding
+        except Exception as e:
+            logger.debug("Embedding lookup failed", extra={"error": str(e)})
+            return similarities
+
+        # Mismatched dimensions score 0.0, as with cosine_similarity
+        rows = [
+            i
+            for i, event_id in enumerate(event_ids)
+            if event_id in embeddings
+            and len(embeddings[event_id]) == len(cue_embedding)
+        ]
+        if not rows:
+            return similarities
 
-        # Fusion scoring: score = λ·cos(q,v) + (1-λ)·(1-d_H/B)
-        score = (
-            lambda_weight * vector_similarity + (1.0 - lambda_weight) * sdr_similarity
-        )
+        matrix = np.asarray([embeddings[event_ids[i]] for i in rows], dtype=np.float32)
+        try:
+            if hasattr(self.vector_store, "similarity_matrix"):
+                scores = self.vector_store.similarity_matrix([cue_embedding], matrix)[0]
+            else:
+                scores = _cosine_row(np.asarray(cue_embedding, np.float32), matrix)
+        except Exception as e:
+            logger.debug("Batched vector similarity failed", extra={"error": str(e)})
+            return similarities
+        similarities[rows] = scores
+        return similarities
 
-        # Build explanation
-        if use_vectors:
-            explanation = f"vector:cos={vector_similarity:.3f},sdr:hamm={sdr_similarity:.3f},fusion:λ={lambda_weight}"
-        else:
-            explanation = f"sdr:hamm={sdr_similarity:.3f},pure_sdr_mode"
 
-        return score, explanation
+def _cosine_row(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine of ``query`` against each row of ``matrix`` (0.0 for zero norms)."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    dots = matrix @ query
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
 
 
 # TODO: Production integration points
 # - Wire HippocampusStore.find_codes_in_space() method
-# - Wire VectorStore.get_embedding() and cosine_similarity() methods
+# - Wire VectorStore.get_embeddings() and similarity_matrix() methods
 # - Add embedding service integration for cue_embedding generation
 # - Add performance monitoring and SLO validation
 # - Add cache layer for frequently accessed candidates
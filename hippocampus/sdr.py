@@ -4,18 +4,67 @@ Sparse Distributed Representation (SDR) Algorithms - Production Implementation
 
 Implements biological-inspired memory coding algorithms:
 - Tokenization with k-gram shingles (k=3)
-- SimHash: 512-bit binary SDR with weighted token hashing
-- MinHash: 64-permutation Jaccard similarity estimation
-- Distance calculations for pattern matching
+- SimHash: 512-bit binary SDR with weighted token hashing, vectorized with
+  NumPy (one SHA-256 per distinct shingle, one reduction per text)
+- MinHash: 64-permutation Jaccard similarity estimation; each shingle is
+  hashed once to 64 bits and the permutations are universal hashes
+  (a*x + b) mod (2^61 - 1) evaluated over a NumPy array (the original
+  SHA-256-per-permutation scheme remains available as "sha256")
+- Distance calculations for pattern matching, including popcount_rows for
+  Hamming distances over packed code matrices
 
 Based on hippocampus README.md specification with full mathematical implementation.
 """
 
 import hashlib
 import re
-from typing import List, Tuple
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
 
-from .types import KGRAM_SIZE, MINHASH_PERMS, SIMHASH_BITS, SDRCodes
+import numpy as np
+
+from .types import (
+    KGRAM_SIZE,
+    MINHASH_PERMS,
+    MINHASH_SCHEME,
+    MINHASH_SCHEME_LEGACY,
+    SIMHASH_BITS,
+    SDRCodes,
+)
+
+# Mersenne prime modulus of the universal MinHash permutations
+_MERSENNE_61 = np.uint64((1 << 61) - 1)
+_LOW_31 = np.uint64((1 << 31) - 1)
+_LOW_30 = np.uint64((1 << 30) - 1)
+# Byte popcount table for NumPy releases without np.bitwise_count
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _mod_mersenne61(values: np.ndarray) -> np.ndarray:
+    """values mod 2^61 - 1 for uint64 values below 2^63."""
+    folded = (values & _MERSENNE_61) + (values >> np.uint64(61))
+    return np.where(folded >= _MERSENNE_61, folded - _MERSENNE_61, folded)
+
+
+def _mulmod_mersenne61(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    a * x mod 2^61 - 1 for uint64 a, x < 2^61, without 128-bit products.
+
+    Splits both operands at bit 31 so every partial product fits in 62 bits,
+    and folds the high parts back using 2^61 = 1 (mod 2^61 - 1).
+    """
+    a_hi, a_lo = a >> np.uint64(31), a & _LOW_31
+    x_hi, x_lo = x >> np.uint64(31), x & _LOW_31
+    high = a_hi * x_hi  # weight 2^62 = 2
+    middle = a_hi * x_lo + a_lo * x_hi  # weight 2^31
+    low = a_lo * x_lo
+    total = (
+        (high << np.uint64(1))
+        + (middle >> np.uint64(30))
+        + ((middle & _LOW_30) << np.uint64(31))
+        + low
+    )
+    return _mod_mersenne61(total)
 
 
 class SDRProcessor:
@@ -31,11 +80,28 @@ class SDRProcessor:
         simhash_bits: int = SIMHASH_BITS,
         minhash_perms: int = MINHASH_PERMS,
         kgram_size: int = KGRAM_SIZE,
+        minhash_scheme: str = MINHASH_SCHEME,
     ):
-        """Initialize SDR processor with configurable parameters."""
+        """
+        Initialize SDR processor with configurable parameters.
+
+        ``minhash_scheme="sha256"`` reproduces the original MinHash values,
+        for comparing against sketches stored before the universal scheme.
+        """
+        if minhash_scheme not in (MINHASH_SCHEME, MINHASH_SCHEME_LEGACY):
+            raise ValueError(f"Unknown MinHash scheme: {minhash_scheme}")
         self.simhash_bits = simhash_bits
         self.minhash_perms = minhash_perms
         self.kgram_size = kgram_size
+        self.minhash_scheme = minhash_scheme
+
+        # Digest bit feeding each SimHash position: bit (pos % 8) of byte
+        # (pos // 8) mod the digest length, so codes wider than SHA-256's
+        # 256 bits reuse the digest from its first byte
+        positions = np.arange(simhash_bits)
+        self._simhash_bit_index = (
+            (positions // 8) % hashlib.sha256().digest_size
+        ) * 8 + positions % 8
 
         # Pre-compute MinHash permutation seeds for consistency
         self.minhash_seeds = [
@@ -43,6 +109,25 @@ class SDRProcessor:
             for i in range(minhash_perms)
         ]
 
+        # Universal hash coefficients per permutation, a in [1, p) and
+        # b in [0, p), derived from SHA-256 so they never change
+        prime = int(_MERSENNE_61)
+        self._minhash_a = np.array(
+            [
+                self._seed(f"minhash_a_{i}") % (prime - 1) + 1
+                for i in range(minhash_perms)
+            ],
+            dtype=np.uint64,
+        )[:, None]
+        self._minhash_b = np.array(
+            [self._seed(f"minhash_b_{i}") % prime for i in range(minhash_perms)],
+            dtype=np.uint64,
+        )[:, None]
+
+    @staticmethod
+    def _seed(label: str) -> int:
+        return int(hashlib.sha256(label.encode()).hexdigest()[:16], 16)
+
     def tokenize_to_shingles(self, text: str) -> List[str]:
         """
         Convert text to k-gram shingles following specification.
@@ -82,6 +167,10 @@ class SDRProcessor:
         2. For each bit position b ∈ [0,B), accumulate s_b += ±w_t using hash(t)
         3. Set bit b=1 if s_b ≥ 0 else 0
 
+        Each distinct token is hashed once; its ±1 bit influences form one
+        row of a matrix, and the accumulator is a single weighted sum over
+        the rows (weight = token count).
+
         Args:
             tokens: List of token strings
 
@@ -91,35 +180,30 @@ class SDRProcessor:
         if not tokens:
             return 0, "0" * (self.simhash_bits // 4)
 
-        # Initialize accumulator for each bit position
-        accumulator: List[float] = [0.0] * self.simhash_bits
-
-        for token in tokens:
-            # Weight is token frequency (can be enhanced)
-            weight = 1.0
-
-            # Generate hash and extract bit influences
-            token_hash = hashlib.sha256(token.encode()).digest()
+        counts = Counter(tokens)
+        signs = self._simhash_signs(list(counts))
+        weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        return self._simhash_code(weights @ signs)
 
-            for bit_pos in range(self.simhash_bits):
-                # Use hash bytes to determine bit influence
-                byte_idx = (bit_pos // 8) % len(token_hash)
-                bit_in_byte = bit_pos % 8
-
-                # Extract bit from hash
-                bit_value = (token_hash[byte_idx] >> bit_in_byte) & 1
-
-                # Accumulate ±weight based on bit value
-                if bit_value:
-                    accumulator[bit_pos] += weight
-                else:
-                    accumulator[bit_pos] -= weight
+    def _simhash_signs(self, tokens: Sequence[str]) -> np.ndarray:
+        """
+        (tokens x simhash_bits) matrix of ±1: the influence of each token on
+        each bit position, read from its SHA-256 digest.
+        """
+        digests = b"".join(hashlib.sha256(token.encode()).digest() for token in tokens)
+        digest_bits = np.unpackbits(
+            np.frombuffer(digests, dtype=np.uint8).reshape(len(tokens), -1),
+            axis=1,
+            bitorder="little",
+        )
+        # Token weight is 1.0 (frequency via repeated tokens): bit 1 adds +w,
+        # bit 0 adds -w
+        return digest_bits[:, self._simhash_bit_index].astype(np.int64) * 2 - 1
 
-        # Convert accumulator to binary code
-        binary_code = 0
-        for bit_pos in range(self.simhash_bits):
-            if accumulator[bit_pos] >= 0:
-                binary_code |= 1 << bit_pos
+    def _simhash_code(self, accumulator: np.ndarray) -> Tuple[int, str]:
+        """Set bit b where accumulator[b] >= 0; returns (integer, hex string)."""
+        packed = np.packbits(accumulator >= 0, bitorder="little")
+        binary_code = int.from_bytes(packed.tobytes(), "little")
 
         # Convert to hex string
         hex_digits = self.simhash_bits // 4
@@ -136,6 +220,11 @@ class SDRProcessor:
         2. Record min h_i(S) for each permutation
         3. Store as 32-bit values for speed
 
+        With the universal scheme each shingle is hashed once (BLAKE2b, 64
+        bits) and h_i(x) = (a_i*x + b_i) mod (2^61 - 1) is evaluated for all
+        permutations and shingles as one array; the minimum is taken per
+        permutation before truncating to 32 bits.
+
         Args:
             tokens: List of token strings
 
@@ -148,6 +237,12 @@ class SDRProcessor:
         # Convert tokens to set for deduplication
         token_set = set(tokens)
 
+        if self.minhash_scheme == MINHASH_SCHEME_LEGACY:
+            return self._sha256_minhash(token_set)
+        return self._universal_minhash(self._base_hashes(token_set))
+
+    def _sha256_minhash(self, token_set: Set[str]) -> List[int]:
+        """Original scheme: one SHA-256 per (permutation, token) pair."""
         minhash_values: List[int] = []
 
         for perm_idx in range(self.minhash_perms):
@@ -165,6 +260,21 @@ class SDRProcessor:
 
         return minhash_values
 
+    @staticmethod
+    def _base_hashes(tokens: Iterable[str]) -> np.ndarray:
+        """64-bit hash of each token, reduced modulo 2^61 - 1."""
+        digests = b"".join(
+            hashlib.blake2b(token.encode(), digest_size=8).digest() for token in tokens
+        )
+        return _mod_mersenne61(np.frombuffer(digests, dtype="<u8").astype(np.uint64))
+
+    def _universal_minhash(self, base_hashes: np.ndarray) -> List[int]:
+        """Per-permutation minimum of (a*x + b) mod p over distinct tokens."""
+        permuted = _mod_mersenne61(
+            _mulmod_mersenne61(self._minhash_a, base_hashes[None, :]) + self._minhash_b
+        )
+        return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).tolist()
+
     def process_text(self, text: str) -> SDRCodes:
         """
         Complete SDR processing pipeline for input text.
@@ -190,8 +300,67 @@ class SDRProcessor:
             minhash32=minhash32,
             tokens=tokens,
             text_length=len(text),
+            minhash_scheme=self.minhash_scheme,
+        )
+
+    def process_texts_batch(self, texts: Sequence[str]) -> List[SDRCodes]:
+        """
+        SDR processing for many texts at once.
+
+        Every distinct shingle in the batch is hashed once, for SimHash and
+        (universal scheme) MinHash alike; each text's SimHash is one weighted
+        sum over the rows of its shingles and its MinHash one minimum over
+        their base hashes. Codes are identical to process_text() for each
+        text.
+
+        Args:
+            texts: Input text strings
+
+        Returns:
+            SDRCodes per text, in input order
+        """
+        token_lists = [self.tokenize_to_shingles(text) for text in texts]
+
+        vocabulary: Dict[str, int] = {}
+        token_ids = [
+            np.fromiter(
+                (vocabulary.setdefault(token, len(vocabulary)) for token in tokens),
+                dtype=np.int64,
+                count=len(tokens),
+            )
+            for tokens in token_lists
+        ]
+        signs = self._simhash_signs(list(vocabulary)) if vocabulary else None
+        universal = self.minhash_scheme != MINHASH_SCHEME_LEGACY
+        base_hashes = (
+            self._base_hashes(vocabulary) if vocabulary and universal else None
         )
 
+        codes: List[SDRCodes] = []
+        for text, tokens, ids in zip(texts, token_lists, token_ids):
+            if tokens:
+                distinct, counts = np.unique(ids, return_counts=True)
+                simhash_bits, simhash_hex = self._simhash_code(counts @ signs[distinct])
+                minhash32 = (
+                    self._universal_minhash(base_hashes[distinct])
+                    if universal
+                    else self.compute_minhash(tokens)
+                )
+            else:
+                simhash_bits, simhash_hex = self.compute_simhash(tokens)
+                minhash32 = self.compute_minhash(tokens)
+            codes.append(
+                SDRCodes(
+                    simhash_bits=simhash_bits,
+                    simhash_hex=simhash_hex,
+                    minhash32=minhash32,
+                    tokens=tokens,
+                    text_length=len(text),
+                    minhash_scheme=self.minhash_scheme,
+                )
+            )
+        return codes
+
     @staticmethod
     def hamming_distance(code1: SDRCodes, code2: SDRCodes) -> int:
         """Calculate Hamming distance between two SimHash codes."""
@@ -221,6 +390,11 @@ def process_text(text: str) -> SDRCodes:
     return sdr_processor.process_text(text)
 
 
+def process_texts_batch(texts: Sequence[str]) -> List[SDRCodes]:
+    """Process many texts into SDR codes using global processor."""
+    return sdr_processor.process_texts_batch(texts)
+
+
 def hamming_distance(code1: SDRCodes, code2: SDRCodes) -> int:
     """Calculate Hamming distance between codes."""
     return SDRProcessor.hamming_distance(code1, code2)
@@ -229,3 +403,15 @@ def hamming_distance(code1: SDRCodes, code2: SDRCodes) -> int:
 def jaccard_similarity(code1: SDRCodes, code2: SDRCodes) -> float:
     """Calculate Jaccard similarity between codes."""
     return SDRProcessor.jaccard_similarity(code1, code2)
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """
+    Set bits per row of a C-contiguous uint64[N, W] array, as uint16.
+
+    Hamming distances of packed SimHash codes are popcount_rows(codes ^ cue);
+    CA3 candidate scoring and the store's SimHash matrix both use it.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.uint16)
+    return _POPCOUNT8[words.view(np.uint8)].sum(axis=1, dtype=np.uint16)
@@ -6,6 +6,9 @@ Implements biological DG pattern separation for hippocampal memory encoding:
 - Event encoding with SDR generation
 - Novelty detection using Hamming distance analysis
 - Near-duplicate detection with configurable thresholds
+- Candidate retrieval through the store's MinHash LSH index, so novelty is
+  scored against likely near-duplicates instead of every code in the space
+- Duplicate rate from the store's running per-space novelty statistics
 - Integration with hippocampus storage and optional embeddings
 
 Based on hippocampus README.md specification with full mathematical implementation.
@@ -13,8 +16,11 @@ Based on hippocampus README.md specification with full mathematical implementati
 
 import logging
 import math
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .sdr import SDRProcessor, process_text
 from .types import (
@@ -135,6 +141,7 @@ class DentateGyrusSeparator:
                 length=len(text),
                 ts=ts,
                 metadata=metadata or {},
+                minhash_scheme=sdr_codes.minhash_scheme,
             )
 
             # Step 5: Persist to storage
@@ -175,57 +182,104 @@ class DentateGyrusSeparator:
             return 0.9, []
 
         try:
-            # Get existing codes in this space
-            existing_codes = await self._get_existing_codes(space_id)
-
-            if not existing_codes:
-                # First event in space - maximum novelty
-                return 1.0, []
-
-            # Calculate Hamming distances to all existing codes
-            distances: List[Tuple[str, int, float]] = []
-            for existing_event_id, existing_simhash_hex in existing_codes:
-                # Convert hex to integer for comparison
-                existing_bits = int(existing_simhash_hex, 16)
-                new_bits = new_codes.simhash_bits
-
-                hamming_dist = bin(existing_bits ^ new_bits).count("1")
-                normalized_dist = hamming_dist / SIMHASH_BITS
-
-                distances.append((existing_event_id, hamming_dist, normalized_dist))
-
-            # Find near-duplicates (smallest distances)
-            distances.sort(key=lambda x: x[1])  # Sort by raw Hamming distance
-            near_duplicates = [
-                (event_id, normalized_dist)
-                for event_id, _, normalized_dist in distances[
-                    : self.max_near_duplicates
+            # Lookups need a connection even before the caller's transaction
+            with self._store_lookups() as conn:
+                if conn is None:
+                    # No database or LSH index yet - the space is empty
+                    return 1.0, []
+
+                # Get LSH candidates for this event in the space
+                existing_codes = await self._get_existing_codes(
+                    space_id, new_codes, conn
+                )
+
+                if not existing_codes:
+                    # Nothing in the space resembles this event - maximum novelty
+                    return 1.0, []
+
+                # Calculate Hamming distances to the candidate codes
+                distances: List[Tuple[str, int, float]] = []
+                for existing_event_id, existing_simhash_hex in existing_codes:
+                    # Convert hex to integer for comparison
+                    existing_bits = int(existing_simhash_hex, 16)
+                    new_bits = new_codes.simhash_bits
+
+                    hamming_dist = bin(existing_bits ^ new_bits).count("1")
+                    normalized_dist = hamming_dist / SIMHASH_BITS
+
+                    distances.append((existing_event_id, hamming_dist, normalized_dist))
+
+                # Find near-duplicates (smallest distances)
+                distances.sort(key=lambda x: x[1])  # Sort by raw Hamming distance
+                near_duplicates = [
+                    (event_id, normalized_dist)
+                    for event_id, _, normalized_dist in distances[
+                        : self.max_near_duplicates
+                    ]
                 ]
-            ]
 
-            # Calculate novelty using specification formula
-            min_normalized_distance = distances[0][2] if distances else 1.0
-            duplicate_rate = sum(1 for _, _, dist in distances if dist < 0.1) / len(
-                distances
-            )
+                # Calculate novelty using specification formula
+                min_normalized_distance = distances[0][2] if distances else 1.0
+                duplicate_rate = self._duplicate_rate(
+                    space_id, min_normalized_distance, conn
+                )
 
-            # Apply novelty formula: σ(α·(d_H/B) - β·dup_rate)
-            novelty_input = (
-                self.novelty_alpha * min_normalized_distance
-                - self.novelty_beta * duplicate_rate
-            )
-            novelty = self._sigmoid(novelty_input)
+                # Apply novelty formula: σ(α·(d_H/B) - β·dup_rate)
+                novelty_input = (
+                    self.novelty_alpha * min_normalized_distance
+                    - self.novelty_beta * duplicate_rate
+                )
+                novelty = self._sigmoid(novelty_input)
 
-            return novelty, near_duplicates
+                return novelty, near_duplicates
 
         except Exception as e:
             logger.error(f"Novelty calculation failed: {e}")
             # Fallback to medium novelty
             return 0.5, []
 
-    async def _get_existing_codes(self, space_id: str) -> List[Tuple[str, str]]:
+    @contextmanager
+    def _store_lookups(self) -> Iterator[Optional[sqlite3.Connection]]:
+        """
+        Connection for the novelty lookups.
+
+        Inside the caller's transaction this is the transaction's connection,
+        so the lookups see its uncommitted traces; otherwise a short-lived
+        read-only connection of the separator's own. Yields None when the
+        database or its LSH index does not exist yet.
+        """
+        conn = self.hippocampus_store.get_current_connection()
+        if conn is not None:
+            yield conn
+            return
+
+        db_path = Path(self.hippocampus_store.config.db_path)
+        if not db_path.exists():
+            yield None
+            return
+        conn = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            has_index = conn.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'hippocampus_minhash_lsh'"
+            ).fetchone()
+            yield conn if has_index else None
+        finally:
+            conn.close()
+
+    async def _get_existing_codes(
+        self,
+        space_id: str,
+        new_codes: SDRCodes,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[Tuple[str, str]]:
         """
-        Retrieve existing SimHash codes for space.
+        Retrieve SimHash codes of the traces colliding with the new event in
+        the store's MinHash LSH index.
+
+        Only these candidates are scored for the nearest distance, which keeps
+        the lookup independent of the size of the space; the duplicate rate
+        comes from the store's running statistics (see _duplicate_rate).
 
         Returns:
             List of (event_id, simhash_hex) tuples
@@ -233,16 +287,36 @@ class DentateGyrusSeparator:
         if not self.hippocampus_store:
             return []
 
-        # This will be implemented when we integrate with real storage
-        # For now, return empty to enable testing
         try:
-            # Example query - will be replaced with real storage call
-            # results = await self.hippocampus_store.get_codes_by_space(space_id)
-            return []
+            candidates = self.hippocampus_store.find_minhash_candidates(
+                space_id, new_codes.minhash32, new_codes.minhash_scheme, conn=conn
+            )
+            return [(c["id"], c["simhash_hex"]) for c in candidates]
         except Exception as e:
             logger.warning(f"Failed to get existing codes for {space_id}: {e}")
             return []
 
+    def _duplicate_rate(
+        self,
+        space_id: str,
+        nearest_distance: float,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> float:
+        """
+        Space-wide decayed duplicate rate including this event, from the
+        store's running novelty statistics (O(1), no scan of the space).
+        The near-duplicate threshold is the store's near_duplicate_distance.
+        """
+        store = self.hippocampus_store
+        is_duplicate = float(nearest_distance < store.near_duplicate_distance)
+        if not hasattr(store, "duplicate_rate_with"):
+            return is_duplicate
+        try:
+            return store.duplicate_rate_with(space_id, nearest_distance, conn=conn)
+        except Exception as e:
+            logger.warning(f"Failed to read novelty stats for {space_id}: {e}")
+            return is_duplicate
+
     async def _persist_encoding(self, encoding: HippocampalEncoding):
         """Persist encoding to hippocampus store."""
         if not self.hippocampus_store:
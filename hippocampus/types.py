@@ -27,6 +27,7 @@ class HippocampalEncoding:
     length: int  # Original text length
     ts: datetime
     metadata: Optional[Dict[str, Any]] = None
+    minhash_scheme: str = "universal"  # See MINHASH_SCHEME
 
 
 @dataclass
@@ -96,6 +97,7 @@ class SDRCodes:
     minhash32: List[int]  # 64 x 32-bit MinHash values
     tokens: List[str]  # Original k-gram tokens
     text_length: int
+    minhash_scheme: str = "universal"  # See MINHASH_SCHEME
 
     def hamming_distance(self, other: "SDRCodes") -> int:
         """Calculate Hamming distance to another SDR code."""
@@ -105,6 +107,11 @@ class SDRCodes:
         """Estimate Jaccard similarity using MinHash."""
         if len(self.minhash32) != len(other.minhash32):
             raise ValueError("MinHash arrays must have same length")
+        if self.minhash_scheme != other.minhash_scheme:
+            raise ValueError(
+                f"MinHash schemes differ: {self.minhash_scheme} vs "
+                f"{other.minhash_scheme}"
+            )
 
         matches = sum(1 for a, b in zip(self.minhash32, other.minhash32) if a == b)
         return matches / len(self.minhash32)
@@ -113,6 +120,11 @@ class SDRCodes:
 # Algorithm configuration constants from specification
 SIMHASH_BITS = 512  # Binary SDR dimensionality
 MINHASH_PERMS = 64  # Number of MinHash permutations
+# MinHash schemes: "universal" hashes each shingle once and derives every
+# permutation as (a*x + b) mod (2^61 - 1); "sha256" is the original one
+# SHA-256 per (permutation, shingle). Sketches only compare within a scheme.
+MINHASH_SCHEME = "universal"
+MINHASH_SCHEME_LEGACY = "sha256"
 KGRAM_SIZE = 3  # k-gram shingle size
 NOVELTY_ALPHA = 6.0  # Novelty calculation scaling factor
 NOVELTY_BETA = 1.0  # Duplicate rate penalty
@@ -379,6 +379,7 @@ class MemoryCommitManager:
             "space_id": encoding.space_id,
             "simhash_hex": encoding.simhash_hex,
             "minhash32": encoding.minhash32,
+            "minhash_scheme": encoding.minhash_scheme,
             "novelty": encoding.novelty,
             "near_duplicates": encoding.near_duplicates,
             "ts": encoding.ts.isoformat(),
@@ -31,6 +31,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from embeddings.encoders import EmbeddingProvider, get_default_provider
 from hippocampus.api import HippocampusAPI
 from hippocampus.types import CompletionCandidate, HippocampalEncoding
 from observability.logging import get_json_logger
@@ -110,12 +111,14 @@ class MemoryDeduplicationEngine:
         # Dependencies
         hippocampus_api: Optional[HippocampusAPI] = None,
         memory_store=None,
+        embedding_provider: Optional[EmbeddingProvider] = None,
         # Configuration
         config: Optional[Dict[str, Any]] = None,
     ):
         # Dependencies (injected for testability)
         self.hippocampus_api = hippocampus_api or HippocampusAPI()
         self.memory_store = memory_store
+        self.embedding_provider = embedding_provider or get_default_provider()
 
         # Configuration with defaults
         self.config = config or {}
@@ -274,12 +277,18 @@ class MemoryDeduplicationEngine:
                 use_vectors=self.enable_semantic_similarity,
             )
 
+            semantic_similarities = await self._semantic_similarities(
+                content_text, candidates
+            )
+
             # Convert candidates to similarity matches
-            for candidate in candidates:
+            for candidate, semantic_similarity in zip(
+                candidates, semantic_similarities
+            ):
                 if candidate.score >= self.similarity_threshold:
                     # Calculate additional similarity metrics
                     similarity_breakdown = await self._calculate_similarity_breakdown(
-                        encoding, candidate
+                        encoding, candidate, semantic_similarity
                     )
 
                     # Calculate temporal distance
@@ -330,14 +339,39 @@ class MemoryDeduplicationEngine:
 
         return similarity_matches
 
+    async def _semantic_similarities(
+        self, content_text: str, candidates: List[CompletionCandidate]
+    ) -> List[float]:
+        """Embedding cosine similarity of the content to each candidate's content."""
+
+        if not candidates:
+            return []
+        contents = [
+            str(candidate.metadata.get("content", "")) if candidate.metadata else ""
+            for candidate in candidates
+        ]
+        # One micro-batched call; embeddings are L2-normalized
+        embeddings = await self.embedding_provider.embed_texts(
+            [content_text, *contents]
+        )
+        query = embeddings[0]
+        return [
+            max(0.0, sum(a * b for a, b in zip(query, embedding))) if content else 0.0
+            for content, embedding in zip(contents, embeddings[1:])
+        ]
+
     async def _calculate_similarity_breakdown(
-        self, encoding: HippocampalEncoding, candidate: CompletionCandidate
+        self,
+        encoding: HippocampalEncoding,
+        candidate: CompletionCandidate,
+        semantic_similarity: float = 0.0,
     ) -> Dict[str, float]:
         """Calculate detailed similarity breakdown."""
 
         breakdown = {
             "overall": candidate.score,
             "content_overlap": 0.0,
+            "semantic_similarity": semantic_similarity,
             "entity_overlap": 0.0,
             "temporal_proximity": 0.0,
             "structural_similarity": 0.0,
@@ -423,9 +457,13 @@ class MemoryDeduplicationEngine:
         ):  # Within 24 hours
             return "merge", 0.9
 
-        # High content overlap but distant in time -> link
+        # High content overlap (lexical or embedding) but distant in time -> link
         elif (
-            similarity_breakdown["content_overlap"] >= 0.8
+            max(
+                similarity_breakdown["content_overlap"],
+                similarity_breakdown.get("semantic_similarity", 0.0),
+            )
+            >= 0.8
             and temporal_distance <= self.temporal_window_hours
         ):
             return "link", 0.7
@@ -0,0 +1,8 @@
+"""
+Retrieval - Hybrid Memory Recall and Ranking
+
+Recall pipeline for MemoryOS: the broker reads lexical (FTS/BM25) and vector
+candidates for a space, fuses them with early-terminating rank fusion, then
+ranks, diversifies, re-ranks and calibrates the results, with QoS gating and
+an optional trace. See retrieval/README.md for the full pipeline.
+"""
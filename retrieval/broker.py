@@ -1,9 +1,261 @@
-""" Retrieval broker (stub) """
+"""
+Retrieval broker: hybrid lexical + vector recall over the memory stores.
+
+``fetch`` reads FTS/BM25 hits from FTSStore and nearest neighbours from the
+VectorStore ANN index (or an exact scan when the store has no ANN index), and
+fuses them with FusionEngine, which stops reading each source once the fused
+top-k is settled. The request's security bands and time bounds apply to both
+sources: vector rows carry neither, so vector hits are kept only if their
+document's FTS metadata passes (and are skipped without an FTS store).
+FTSStore searches run on the caller's UnitOfWork connection, so call
+``fetch`` inside one when an FTS store is configured.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+
+from retrieval.fusion import FusedHit, FusionEngine, FusionResult, FusionSource
+from retrieval.types import (
+    RetrievalCandidate,
+    RetrievalFilters,
+    RetrievalItem,
+    RetrievalRequest,
+    RetrievalResponse,
+    RetrievalTrace,
+    SecurityBand,
+)
+from storage.stores.memory.fts_store import SearchQuery
+
+if TYPE_CHECKING:
+    from embeddings.encoders import EmbeddingProvider
+    from storage.stores.memory.fts_store import FTSStore
+    from storage.stores.memory.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
 
-from typing import Any, Dict, List, Optional
 class RetrievalBroker:
-    """Stub for RetrievalBroker."""
-    def fetch(self, *args: Any, **kwargs: Any) -> Any:
-        """TODO: implement fetch."""
-        return None
+    """Orchestrates hybrid search and fusion for a RetrievalRequest."""
+
+    def __init__(
+        self,
+        fts_store: Optional["FTSStore"] = None,
+        vector_store: Optional["VectorStore"] = None,
+        embedder: Optional["EmbeddingProvider"] = None,
+        fusion: Optional[FusionEngine] = None,
+        vector_index: str = "semantic",
+        fts_weight: float = 1.0,
+        vector_weight: float = 1.0,
+    ) -> None:
+        if vector_store is not None and embedder is None:
+            raise ValueError("A vector store needs an embedder for query vectors")
+        self.fts_store = fts_store
+        self.vector_store = vector_store
+        self.embedder = embedder
+        self.fusion = fusion or FusionEngine()
+        self.vector_index = vector_index
+        self.fts_weight = fts_weight
+        self.vector_weight = vector_weight
+
+    def fetch(self, request: RetrievalRequest) -> RetrievalResponse:
+        """Fused top-k for a request, scoped to its space(s)."""
+        started = time.perf_counter()
+        spaces = self._spaces(request)
+        sources = self._sources(request, spaces)
+        if not sources:
+            return RetrievalResponse(
+                items=[], warnings=["No retrieval sources configured"]
+            )
+
+        result = self.fusion.fuse(sources, request.k)
+        response = RetrievalResponse(
+            items=[self._to_item(hit) for hit in result.hits],
+            used_time_ms=(time.perf_counter() - started) * 1000,
+            total_candidates=result.candidates_seen,
+            query_id=request.trace_id,
+        )
+        if request.return_trace:
+            response.trace = self._trace(sources, result)
+        return response
+
+    # Sources
+
+    @staticmethod
+    def _spaces(request: RetrievalRequest) -> Optional[Set[str]]:
+        spaces: Set[str] = (
+            set(request.filters.space_ids or []) if request.filters else set()
+        )
+        if request.space_id:
+            spaces.add(request.space_id)
+        return spaces or None
+
+    @staticmethod
+    def _bands(filters: Optional[RetrievalFilters]) -> Optional[List[str]]:
+        """Allowed security bands, from ``bands`` narrowed by min/max_band."""
+        if filters is None or not (
+            filters.bands or filters.min_band or filters.max_band
+        ):
+            return None
+        order = list(SecurityBand)
+        low = order.index(filters.min_band) if filters.min_band else 0
+        high = order.index(filters.max_band) if filters.max_band else len(order) - 1
+        allowed = filters.bands or order
+        return [band.value for band in allowed if low <= order.index(band) <= high]
+
+    @staticmethod
+    def _time_bounds(
+        filters: Optional[RetrievalFilters],
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        if filters is None:
+            return None, None
+        if filters.within_days is not None:
+            now = datetime.now(timezone.utc)
+            return now - timedelta(days=filters.within_days), None
+        return filters.after, filters.before
+
+    def _sources(
+        self, request: RetrievalRequest, spaces: Optional[Set[str]]
+    ) -> List[FusionSource]:
+        sources: List[FusionSource] = []
+        if self.fts_store is not None:
+            sources.append(
+                FusionSource("fts", self._fts_fetcher(request, spaces), self.fts_weight)
+            )
+        gated = self._bands(request.filters) is not None or any(
+            self._time_bounds(request.filters)
+        )
+        if self.vector_store is not None and gated and self.fts_store is None:
+            # Vector rows carry no band or ts to hold them to the filters
+            logger.warning("Band/time filters without an FTS store: no vector hits")
+        elif self.vector_store is not None:
+            sources.append(
+                FusionSource(
+                    "vector", self._vector_fetcher(request, spaces), self.vector_weight
+                )
+            )
+        return sources
+
+    def _fts_fetcher(self, request: RetrievalRequest, spaces: Optional[Set[str]]):
+        languages = request.filters.languages if request.filters else None
+        bands = self._bands(request.filters)
+        after, before = self._time_bounds(request.filters)
+
+        def fetch(offset: int, limit: int) -> List[RetrievalCandidate]:
+            query = SearchQuery(
+                text=request.query,
+                limit=limit,
+                offset=offset,
+                languages=languages,
+                bands=bands,
+                after=after,
+                before=before,
+                projection="snippet",
+            )
+            # bm25() is lower-is-better; fusion expects higher-is-better
+            return [
+                RetrievalCandidate(
+                    doc_id=result.doc_id,
+                    content=result.metadata.get("snippet", ""),
+                    source="fts",
+                    raw_score=-result.score,
+                )
+                for result in self.fts_store.search(query, spaces)
+            ]
+
+        return fetch
+
+    def _vector_fetcher(self, request: RetrievalRequest, spaces: Optional[Set[str]]):
+        query_vector = self.embedder.embed(request.query)
+        model_id = self.embedder.model_id
+        has_ann = self.vector_store.get_ann_index(self.vector_index, model_id)
+        if has_ann is None:
+            logger.debug(
+                f"No ANN index {self.vector_index}/{model_id}, scanning exactly"
+            )
+        bands = self._bands(request.filters)
+        after, before = self._time_bounds(request.filters)
+        gated = bands is not None or after is not None or before is not None
+
+        def search(depth: int):
+            # Rank every neighbour; weak ones only add little to the fusion
+            if has_ann is None:
+                return self.vector_store.similarity_search(
+                    query_vector,
+                    model_id,
+                    limit=depth,
+                    min_similarity=-1.0,
+                    space_ids=spaces,
+                )
+            return self.vector_store.ann_search(
+                query_vector,
+                self.vector_index,
+                model_id,
+                limit=depth,
+                ef_search=max(64, depth),
+                min_similarity=-1.0,
+                space_ids=spaces,
+            )
+
+        def fetch(offset: int, limit: int) -> List[RetrievalCandidate]:
+            # Neither search has a cursor: search one level deeper and skip
+            # what was read, deeper still while the filters drop hits
+            depth = offset + limit
+            while True:
+                hits = search(depth)
+                if gated:
+                    allowed = self.fts_store.documents_matching(
+                        (row.doc_id for row, _ in hits), bands, after, before
+                    )
+                    kept = [hit for hit in hits if hit[0].doc_id in allowed]
+                else:
+                    kept = hits
+                if len(kept) >= offset + limit or len(hits) < depth:
+                    break
+                depth *= 2
+            return [
+                RetrievalCandidate(
+                    doc_id=row.doc_id,
+                    content="",
+                    source="vector",
+                    raw_score=similarity,
+                    metadata={"space_id": row.space_id, "vec_id": row.vec_id},
+                )
+                for row, similarity in kept[offset : offset + limit]
+            ]
+
+        return fetch
+
+    # Response
+
+    @staticmethod
+    def _to_item(hit: FusedHit) -> RetrievalItem:
+        fts = hit.candidates.get("fts")
+        vector = hit.candidates.get("vector")
+        return RetrievalItem(
+            id=hit.doc_id,
+            score=hit.score,
+            snippet=fts.content if fts else None,
+            space_id=vector.metadata.get("space_id") if vector else None,
+            payload={"ranks": dict(hit.ranks)},
+            reasons=[f"{name}#{rank}" for name, rank in sorted(hit.ranks.items())],
+        )
 
+    def _trace(
+        self, sources: List[FusionSource], result: FusionResult
+    ) -> RetrievalTrace:
+        trace = RetrievalTrace(
+            stage="fusion",
+            top_candidates=[hit.doc_id for hit in result.hits[:3]],
+            fusion_weights={source.name: source.weight for source in sources},
+        )
+        for name, depth in result.depths.items():
+            trace.add_step(f"{name}: read {depth} rows")
+        trace.add_step(
+            f"{self.fusion.method}: {result.rounds} rounds, "
+            f"early_stopped={result.early_stopped}"
+        )
+        return trace
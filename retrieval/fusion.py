@@ -1,3 +1,299 @@
-""" Fusion (stub) """
+"""
+Hybrid result fusion for the retrieval broker.
 
-from typing import Any, Dict, List, Optional
+Combines ranked candidate streams (FTS/BM25, vector similarity, ...) into one
+top-k list with either:
+
+- Reciprocal Rank Fusion: score(d) = sum_s w_s / (rrf_k + rank_s(d))
+- Weighted score normalization: score(d) = sum_s w_s * norm_s(score_s(d)),
+  where norm_s maps a source's scores onto [0, 1] between its floor and its
+  top score
+
+Sources are read page by page in rank order, and reading stops as soon as
+the final top-k (membership and order) is settled. This is the threshold /
+no-random-access scheme of Fagin et al.: a document's fused score is bounded
+below by the contributions seen so far and above by adding, for every source
+it has not appeared in yet, the best contribution any unread row of that
+source could still make (the contribution at the current read depth).
+Once each of the k leaders beats the upper bound of everything ranked after
+it, deeper rows cannot change the answer. The leaders' own scores may still
+miss sources they rank below the read depth in, so those sources alone are
+read on until every leader is found or the source ends; returned scores and
+ranks therefore equal the full-depth ones. Normalization uses the top score
+of each source, not its minimum, so it is known after the first page.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Literal, Optional, Sequence
+
+from retrieval.types import RetrievalCandidate
+
+logger = logging.getLogger(__name__)
+
+FusionMethod = Literal["rrf", "weighted"]
+
+
+@dataclass
+class FusionSource:
+    """A ranked candidate stream read through ``fetch(offset, limit)``.
+
+    ``fetch`` returns candidates best first with higher ``raw_score`` meaning
+    more relevant; fewer than ``limit`` candidates means the source is
+    exhausted. Repeated doc_ids (e.g. several chunks of one document) keep
+    their first, best position.
+    """
+
+    name: str
+    fetch: Callable[[int, int], Sequence[RetrievalCandidate]]
+    weight: float = 1.0
+    # Scores at or below the floor normalize to 0 (weighted fusion only)
+    score_floor: float = 0.0
+
+
+@dataclass
+class FusedHit:
+    """One fused result with its per-source ranks (1-based) and raw scores."""
+
+    doc_id: str
+    score: float
+    ranks: Dict[str, int] = field(default_factory=dict)
+    source_scores: Dict[str, float] = field(default_factory=dict)
+    candidates: Dict[str, RetrievalCandidate] = field(default_factory=dict)
+
+
+@dataclass
+class FusionResult:
+    """Fused top-k plus how deep each source had to be read."""
+
+    hits: List[FusedHit]
+    depths: Dict[str, int]
+    rounds: int
+    early_stopped: bool
+    candidates_seen: int
+
+    @property
+    def rows_read(self) -> int:
+        return sum(self.depths.values())
+
+
+class _SourceState:
+    """Read position of one source during a fusion run."""
+
+    def __init__(self, source: FusionSource) -> None:
+        self.source = source
+        self.depth = 0  # rows fetched, duplicates included
+        self.ranked = 0  # distinct doc_ids seen
+        self.exhausted = False
+        self.top_score: Optional[float] = None
+        self.last_score: Optional[float] = None
+        self.seen: Dict[str, int] = {}
+
+    def read(self, limit: int) -> List[RetrievalCandidate]:
+        rows = list(self.source.fetch(self.depth, limit))
+        self.depth += len(rows)
+        if len(rows) < limit:
+            self.exhausted = True
+        fresh: List[RetrievalCandidate] = []
+        for candidate in rows:
+            if self.top_score is None:
+                self.top_score = candidate.raw_score
+            self.last_score = candidate.raw_score
+            if candidate.doc_id in self.seen:
+                continue
+            self.ranked += 1
+            self.seen[candidate.doc_id] = self.ranked
+            fresh.append(candidate)
+        return fresh
+
+
+class FusionEngine:
+    """
+    Fuses ranked sources with RRF or weighted score normalization.
+
+    With ``early_stop`` disabled every source is read to exhaustion (or
+    ``max_depth``), which is the reference the early stop must agree with.
+    """
+
+    def __init__(
+        self,
+        method: FusionMethod = "rrf",
+        rrf_k: int = 60,
+        early_stop: bool = True,
+        max_depth: int = 1000,
+        initial_depth: Optional[int] = None,
+    ) -> None:
+        if method not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {method}")
+        if rrf_k < 1:
+            raise ValueError(f"rrf_k must be positive, got {rrf_k}")
+        self.method = method
+        self.rrf_k = rrf_k
+        self.early_stop = early_stop
+        self.max_depth = max_depth
+        self.initial_depth = initial_depth
+
+    def fuse(self, sources: Sequence[FusionSource], k: int) -> FusionResult:
+        """Return the fused top-k of ``sources``."""
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        names = [source.name for source in sources]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Fusion source names must be unique: {names}")
+
+        states = [_SourceState(source) for source in sources]
+        hits: Dict[str, FusedHit] = {}
+        page = max(1, self.initial_depth or k)
+        rounds = 0
+        early_stopped = False
+
+        while True:
+            rounds += 1
+            for state in states:
+                if state.exhausted or state.depth >= self.max_depth:
+                    continue
+                self._read_page(state, page, hits)
+
+            active = [s for s in states if not s.exhausted and s.depth < self.max_depth]
+            if not active:
+                break
+            if self.early_stop and self._settled(states, hits, k):
+                early_stopped = True
+                break
+            # Double the read depth each round: few fetches, at most 2x overshoot
+            page = max(page, min(s.depth for s in active))
+
+        ranked = sorted(hits.values(), key=lambda h: (-h.score, h.doc_id))
+        if early_stopped:
+            # Completing the leaders only raises them further above every
+            # challenger's upper bound, so membership and order are unchanged
+            self._complete_leaders(states, hits, ranked[:k], page)
+            ranked = sorted(hits.values(), key=lambda h: (-h.score, h.doc_id))
+
+        result = FusionResult(
+            hits=ranked[:k],
+            depths={state.source.name: state.depth for state in states},
+            rounds=rounds,
+            early_stopped=early_stopped,
+            candidates_seen=len(hits),
+        )
+        logger.debug(
+            f"Fused {len(sources)} sources ({self.method}): depths={result.depths}, "
+            f"rounds={rounds}, early_stopped={early_stopped}"
+        )
+        return result
+
+    def _read_page(
+        self, state: _SourceState, page: int, hits: Dict[str, FusedHit]
+    ) -> List[RetrievalCandidate]:
+        """Read the next page of ``state`` into ``hits``; returns the new rows."""
+        fresh = state.read(min(page, self.max_depth - state.depth))
+        name = state.source.name
+        for candidate in fresh:
+            hit = hits.get(candidate.doc_id)
+            if hit is None:
+                hit = hits[candidate.doc_id] = FusedHit(candidate.doc_id, 0.0)
+            hit.ranks[name] = state.seen[candidate.doc_id]
+            hit.source_scores[name] = candidate.raw_score
+            hit.candidates[name] = candidate
+            # Ranks and normalized scores are final once read, so the running
+            # sum is the hit's lower bound and, once complete, its fused score
+            hit.score += self._contribution(state, hit)
+        return fresh
+
+    def _complete_leaders(
+        self,
+        states: List[_SourceState],
+        hits: Dict[str, FusedHit],
+        leaders: List[FusedHit],
+        page: int,
+    ) -> None:
+        """Read on in each source until it has scored every leader or can add nothing."""
+        for state in states:
+            name = state.source.name
+            missing = {hit.doc_id for hit in leaders if name not in hit.ranks}
+            while (
+                missing
+                and not state.exhausted
+                and state.depth < self.max_depth
+                and self._unread_bound(state) > 0
+            ):
+                for candidate in self._read_page(state, page, hits):
+                    missing.discard(candidate.doc_id)
+                page = max(page, state.depth)
+
+    # Scoring
+
+    def _normalize(self, state: _SourceState, score: float) -> float:
+        floor = state.source.score_floor
+        top = state.top_score if state.top_score is not None else floor
+        span = top - floor
+        if span <= 0:
+            return 0.0
+        return min(1.0, max(0.0, (score - floor) / span))
+
+    def _contribution(self, state: _SourceState, hit: FusedHit) -> float:
+        name = state.source.name
+        if self.method == "rrf":
+            return state.source.weight / (self.rrf_k + hit.ranks[name])
+        return state.source.weight * self._normalize(state, hit.source_scores[name])
+
+    def _unread_bound(self, state: _SourceState) -> float:
+        """Largest contribution a row below the current depth could make."""
+        if state.exhausted:
+            return 0.0
+        if self.method == "rrf":
+            return state.source.weight / (self.rrf_k + state.ranked + 1)
+        if state.last_score is None:
+            return state.source.weight
+        return state.source.weight * self._normalize(state, state.last_score)
+
+    # Early termination
+
+    def _settled(
+        self, states: List[_SourceState], hits: Dict[str, FusedHit], k: int
+    ) -> bool:
+        """True when reading deeper cannot change the top-k or its order."""
+        bounds = [(state.source.name, self._unread_bound(state)) for state in states]
+        unseen_upper = sum(bound for _, bound in bounds)
+
+        # Cheap rejection before scoring every candidate
+        leaders = heapq.nsmallest(k, hits.values(), key=lambda h: (-h.score, h.doc_id))
+        if len(leaders) < k or leaders[-1].score <= unseen_upper:
+            return False
+
+        scored = [
+            (
+                hit.score,
+                hit.score
+                + sum(bound for name, bound in bounds if name not in hit.ranks),
+                hit.doc_id,
+            )
+            for hit in hits.values()
+        ]
+        scored.sort(key=lambda s: (-s[0], s[2]))
+
+        # Final order is (score desc, doc_id asc): leader i is settled against
+        # j if it stays ahead even when j reaches its upper bound. Only the
+        # strongest challenger after i matters (highest upper bound, lowest
+        # doc_id on ties), so scan from the back keeping a running best.
+        challenger = (float("-inf"), "")
+        strongest: List[tuple] = [challenger] * k
+        for i in range(len(scored) - 1, 0, -1):
+            _, upper, doc_id = scored[i]
+            if upper > challenger[0] or (
+                upper == challenger[0] and doc_id < challenger[1]
+            ):
+                challenger = (upper, doc_id)
+            if i <= k:
+                strongest[i - 1] = challenger
+
+        for i in range(k):
+            lower, _, doc_id = scored[i]
+            upper, other_id = strongest[i]
+            if upper > lower or (upper == lower and other_id < doc_id):
+                return False
+        return True
@@ -9,7 +9,7 @@ Contract compliance:
 - Implements IndexingServiceInterface from api/contracts/service_interfaces.py
 - Supports incremental and full index rebuilds
 - Provides realistic processing times and status updates
-- Simulates embedding generation and search optimization
+- Generates embeddings with the shared local EmbeddingProvider
 
 Usage:
     indexing_service = IndexingService()
@@ -18,10 +18,11 @@ Usage:
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from api.contracts.service_interfaces import IndexingServiceInterface
+from embeddings.encoders import EmbeddingProvider, get_default_provider
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +35,9 @@ class IndexingService(IndexingServiceInterface):
     Simulates embedding generation, index updates, and processing workflows.
     """
 
-    def __init__(self):
+    def __init__(self, embedding_provider: Optional[EmbeddingProvider] = None):
         """Initialize indexing service with mock state."""
+        self.embedding_provider = embedding_provider or get_default_provider()
         self.indexed_content: Dict[str, Dict[str, Any]] = {}
         self.index_jobs: Dict[str, Dict[str, Any]] = {}
         self.space_indices: Dict[str, Dict[str, Any]] = {}
@@ -74,12 +76,12 @@ class IndexingService(IndexingServiceInterface):
             "language_detected": "en",
             "entities_extracted": ["sample_entity_1", "sample_entity_2"],
             "topics_identified": ["general", "personal"],
-            "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
-            "embedding_dimensions": 384,
+            "embedding_model": self.embedding_provider.model_id,
+            "embedding_dimensions": self.embedding_provider.dim,
         }
 
-        # Mock embedding generation (simulate processing time)
-        embedding_vector = [0.1 * i for i in range(384)]  # Mock 384-dim vector
+        # Batched with concurrent index calls and cached by content hash
+        embedding_vector = await self.embedding_provider.embed_text(content_text)
 
         # Store indexed content
         indexed_record = {
@@ -232,7 +234,7 @@ class IndexingService(IndexingServiceInterface):
                 "total_documents": space_index["total_documents"],
                 "total_size_bytes": space_index["total_size_bytes"],
                 "index_version": space_index["index_version"],
-                "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+                "embedding_model": self.embedding_provider.model_id,
                 "average_document_size": (
                     space_index["total_size_bytes"]
                     // max(1, space_index["total_documents"])
@@ -0,0 +1,97 @@
+"""
+Keyset Pagination Cursors
+
+Opaque continuation cursors for store list/search APIs. A cursor encodes the
+sort key of the last row of a page, e.g. (ts, id) or (score, id), together
+with a scope naming the query it was issued for. The next page continues
+with ``WHERE (sort key) < (cursor key)`` (or ``>``) instead of
+``LIMIT ? OFFSET ?``, so every page costs the same: SQLite seeks to the key
+through an index instead of walking and discarding all skipped rows.
+
+Cursors are URL-safe base64 of a small JSON document. They are not signed;
+a tampered cursor can only move the caller within a result set its filters
+already allow, and a cursor from another query is rejected by its scope.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+CursorKey = Tuple[Any, ...]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or was issued for another query."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the cursor for the next page (None at the end)."""
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def cursor_scope(*parts: Any) -> str:
+    """Short fingerprint of the query parameters a cursor is valid for."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def encode_cursor(scope: str, key: Sequence[Any]) -> str:
+    """Opaque token for continuing after the row with sort key ``key``."""
+    payload = json.dumps({"s": scope, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, scope: str, arity: int) -> CursorKey:
+    """Sort key encoded in ``cursor``; validates its scope and key length."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_scope_, key = payload["s"], payload["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}") from e
+    if cursor_scope_ != scope:
+        raise InvalidCursorError("Cursor was issued for a different query")
+    if not isinstance(key, list) or len(key) != arity:
+        raise InvalidCursorError(f"Cursor key must have {arity} components")
+    return tuple(key)
+
+
+def keyset_condition(
+    columns: Sequence[Tuple[str, bool]], key: Sequence[Any]
+) -> Tuple[str, List[Any]]:
+    """
+    SQL condition selecting rows strictly after ``key`` in the given order.
+
+    ``columns`` are (expression, descending) pairs of the ORDER BY clause.
+    Uniform directions become a row-value comparison, which SQLite can serve
+    from an index range; mixed directions expand to
+    ``a > ? OR (a = ? AND (b < ? OR ...))``.
+    """
+    if len(columns) != len(key):
+        raise ValueError("Keyset columns and key must have the same length")
+    directions = {descending for _, descending in columns}
+    if len(directions) == 1:
+        op = "<" if directions.pop() else ">"
+        exprs = ", ".join(expr for expr, _ in columns)
+        placeholders = ", ".join("?" * len(columns))
+        return f"({exprs}) {op} ({placeholders})", list(key)
+
+    (expr, descending), value = columns[0], key[0]
+    op = "<" if descending else ">"
+    if len(columns) == 1:
+        return f"{expr} {op} ?", [value]
+    rest_sql, rest_params = keyset_condition(columns[1:], key[1:])
+    return (
+        f"({expr} {op} ? OR ({expr} = ? AND {rest_sql}))",
+        [value, value] + rest_params,
+    )
@@ -6,19 +6,21 @@ This module provides lifecycle management for search indexes, supporting:
 - Automated create/update/rotate/delete operations
 - Background task scheduling and execution
 - Event-driven lifecycle triggers and hooks
+- Background segment merging for stores that register an optimizer
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 
-from storage.index_config_store import IndexConfig, IndexConfigStore
+from storage.monitoring.index_config_store import IndexConfig, IndexConfigStore
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ class LifecycleOperationType(str, Enum):
     REBUILD = "rebuild"
     ACTIVATE = "activate"
     DEACTIVATE = "deactivate"
+    OPTIMIZE = "optimize"
 
 
 @dataclass
@@ -235,8 +238,12 @@ class IndexLifecycleManager:
         self.config_store = config_store
         self._state_storage: Dict[str, LifecycleStateInfo] = {}
         self._operation_queue: List[LifecycleOperation] = []
+        # Guards _operation_queue; schedule_optimize runs on arbitrary threads
+        self._queue_lock = threading.Lock()
         self._triggers: List[LifecycleTrigger] = []
         self._hooks: Dict[str, List[Callable[..., Any]]] = {}
+        self._optimizers: Dict[str, Callable[[LifecycleOperation], Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._running = False
 
         # Valid state transitions
@@ -263,6 +270,7 @@ class IndexLifecycleManager:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
         logger.info("Index lifecycle manager started")
 
         # Start background monitoring and processing
@@ -272,6 +280,7 @@ class IndexLifecycleManager:
     async def stop(self) -> None:
         """Stop the lifecycle manager."""
         self._running = False
+        self._loop = None
         logger.info("Index lifecycle manager stopped")
 
     def add_trigger(self, trigger: LifecycleTrigger) -> None:
@@ -287,6 +296,18 @@ class IndexLifecycleManager:
             self._hooks[event] = []
         self._hooks[event].append(hook)
 
+    def register_optimizer(
+        self, index_name: str, optimizer: Callable[[LifecycleOperation], Any]
+    ) -> None:
+        """
+        Register the callable that performs OPTIMIZE operations for an index.
+
+        The optimizer runs in a worker thread so it may block (e.g. FTS5
+        segment merging); a returned dict is recorded in the operation metrics.
+        """
+        self._optimizers[index_name] = optimizer
+        logger.info(f"Registered optimizer for index {index_name}")
+
     async def get_state(self, index_name: str) -> Optional[LifecycleStateInfo]:
         """Get current lifecycle state for an index."""
         return self._state_storage.get(index_name)
@@ -337,8 +358,13 @@ class IndexLifecycleManager:
 
     async def queue_operation(self, operation: LifecycleOperation) -> str:
         """Queue a lifecycle operation for execution."""
-        self._operation_queue.append(operation)
+        with self._queue_lock:
+            self._operation_queue.append(operation)
+        await self._operation_queued(operation)
+        return operation.operation_id
 
+    async def _operation_queued(self, operation: LifecycleOperation) -> None:
+        """Run the operation_queued hooks for an operation already in the queue."""
         await self._run_hooks(
             "operation_queued",
             {
@@ -351,7 +377,6 @@ class IndexLifecycleManager:
         logger.info(
             f"Queued operation {operation.operation_id}: {operation.operation} for {operation.index_name}"
         )
-        return operation.operation_id
 
     async def create_index(self, config: IndexConfig) -> str:
         """Create a new index from configuration."""
@@ -395,6 +420,51 @@ class IndexLifecycleManager:
 
         return await self.queue_operation(operation)
 
+    async def optimize_index(self, index_name: str, reason: str = "manual") -> str:
+        """Merge/compact an index in the background; it stays queryable."""
+        operation = LifecycleOperation(
+            index_name=index_name,
+            operation=LifecycleOperationType.OPTIMIZE,
+            operation_metadata={"reason": reason},
+        )
+
+        return await self.queue_operation(operation)
+
+    def schedule_optimize(
+        self,
+        index_name: str,
+        reason: str = "manual",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Queue an OPTIMIZE operation from synchronous code, e.g. a store that has
+        just finished a bulk load. Safe to call from any thread.
+
+        Coalesces with an OPTIMIZE already pending for the same index, so a
+        backfill that loads many batches triggers a single merge.
+        """
+        with self._queue_lock:
+            for pending in self._operation_queue:
+                if (
+                    pending.index_name == index_name
+                    and pending.operation == LifecycleOperationType.OPTIMIZE
+                ):
+                    return pending.operation_id
+
+            operation = LifecycleOperation(
+                index_name=index_name,
+                operation=LifecycleOperationType.OPTIMIZE,
+                operation_metadata={"reason": reason, **(metadata or {})},
+            )
+            # Enqueued under the lock, so a concurrent call coalesces with it;
+            # without a running loop it is picked up once the manager starts
+            self._operation_queue.append(operation)
+
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._operation_queued(operation), loop)
+        return operation.operation_id
+
     async def _monitor_triggers(self) -> None:
         """Background task to monitor triggers."""
         while self._running:
@@ -420,12 +490,15 @@ class IndexLifecycleManager:
         """Background task to process queued operations."""
         while self._running:
             try:
-                if not self._operation_queue:
+                with self._queue_lock:
+                    operation = (
+                        self._operation_queue.pop(0) if self._operation_queue else None
+                    )
+                if operation is None:
                     # TODO: Use queue event notifications instead of polling
                     await asyncio.sleep(0.1)  # Reduced from 1s
                     continue
 
-                operation = self._operation_queue.pop(0)
                 await self._execute_operation(operation)
 
             except Exception as e:
@@ -523,6 +596,8 @@ class IndexLifecycleManager:
                 return await self._delete_index_impl(operation)
             elif operation.operation == LifecycleOperationType.REBUILD:
                 return await self._rebuild_index_impl(operation)
+            elif operation.operation == LifecycleOperationType.OPTIMIZE:
+                return await self._optimize_index_impl(operation)
             else:
                 operation.error_message = f"Unknown operation: {operation.operation}"
                 return False
@@ -606,6 +681,30 @@ class IndexLifecycleManager:
         # await asyncio.sleep(0.3)
         return True
 
+    async def _optimize_index_impl(self, operation: LifecycleOperation) -> bool:
+        """Implementation for optimizing an index through its registered optimizer."""
+        optimizer = self._optimizers.get(operation.index_name)
+        if optimizer is None:
+            operation.error_message = (
+                f"No optimizer registered for index {operation.index_name}"
+            )
+            return False
+
+        logger.info(f"Optimizing index {operation.index_name}")
+
+        # No transitional state: the index keeps serving queries while merging
+        result = await asyncio.to_thread(optimizer, operation)
+        if isinstance(result, dict):
+            operation.metrics.update(result)
+
+        current_state = await self.get_state(operation.index_name)
+        if current_state:
+            current_state.state_metadata["last_optimized"] = datetime.now(
+                timezone.utc
+            ).isoformat()
+
+        return True
+
     async def _run_hooks(self, event: str, data: Dict[str, Any]) -> None:
         """Run registered hooks for an event."""
         hooks = self._hooks.get(event, [])
@@ -9,6 +9,9 @@ Storage Schema:
 - ts: ISO timestamp of encoding
 - simhash_hex: 512-bit SimHash as hex string for pattern matching
 - minhash32: Array of 32-bit MinHash values for Jaccard similarity
+- minhash_scheme: How minhash32 was computed ("universal" or the original
+  "sha256"); sketches only compare within one scheme, and migrate_minhash()
+  recomputes legacy sketches
 - novelty: Computed novelty score (0.0-1.0)
 - meta: Optional metadata (author, mentions, etc.)
 
@@ -16,15 +19,56 @@ Integration:
 - Extends BaseStore for transaction management and validation
 - Space-scoped queries for privacy enforcement
 - Optimized indexing for pattern matching and temporal queries
+
+SimHash band index (multi-index hashing):
+- hippocampus_simhash_bands holds each 512-bit code split into 32 bands of
+  16 bits, one row per (space, band, band value, trace), written with the
+  trace
+- Two codes within Hamming distance r agree within floor(r / 32) bits on at
+  least one band (pigeonhole), so probing every band value within that
+  radius finds all of them; find_similar_by_simhash only verifies those
+  colliding candidates, across the whole space history
+
+MinHash LSH index:
+- hippocampus_minhash_lsh splits each 64-value MinHash sketch into bands of
+  rows; a trace is filed under one bucket per band, keyed by a hash of the
+  band's values (and of the scheme, so sketches of different schemes never
+  collide)
+- Two traces with Jaccard similarity s share a bucket with probability
+  1 - (1 - s^rows)^bands; bands and rows are chosen so that this S-curve
+  rises at minhash_lsh_threshold
+- find_minhash_candidates reads the buckets of one sketch, so DG novelty
+  scoring touches only traces likely to be near-duplicates
+
+Packed SimHash codes:
+- Each trace also stores its SimHash as a 64-byte simhash_bin BLOB
+- A space's codes are loaded lazily into a SimHashMatrix (uint64[N, 8]) on
+  the first exact scan and kept current by this store's inserts, updates
+  and deletes; nearest_by_simhash and wide find_similar_by_simhash lookups
+  are one vectorised XOR/popcount over the matrix
+
+Novelty statistics:
+- hippocampus_novelty_stats keeps one row per space with the number of
+  encodings, the near-duplicate count, a nearest-distance histogram and an
+  exponentially decayed duplicate rate
+- Encodings created with their near_duplicates update the row in O(1), in
+  the same transaction as the trace, so DG novelty scoring reads space-wide
+  aggregates instead of recomputing them from every code
 """
 
+import hashlib
 import json
 import logging
 import sqlite3
+import struct
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from storage.core.base_store import BaseStore, StoreConfig
+from storage.stores.cognitive.simhash_matrix import SimHashMatrix, simhash_to_blob
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +81,49 @@ class HippocampusStore(BaseStore):
     pattern separation encoding with SimHash/MinHash for similarity.
     """
 
+    # MinHash scheme of rows written before the column existed, and of
+    # records that do not name one
+    LEGACY_MINHASH_SCHEME = "sha256"
+    MINHASH_SCHEMES = ("universal", "sha256")
+
+    # SimHash band index: SIMHASH_BANDS bands of SIMHASH_BAND_BITS bits. A
+    # lookup probes band values up to max_probe_radius bits away, which finds
+    # every code within (max_probe_radius + 1) * SIMHASH_BANDS - 1 bits
+    SIMHASH_BITS = 512
+    SIMHASH_BANDS = 32
+    SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+    max_probe_radius = 2
+    # Band keys per IN (...) lookup
+    _PROBE_CHUNK = 500
+
+    # MinHash LSH: bands x rows over MINHASH_PERMS values, tuned so traces at
+    # or above minhash_lsh_threshold Jaccard similarity collide. Changing
+    # these requires rebuild_minhash_lsh()
+    MINHASH_PERMS = 64
+    minhash_lsh_threshold = 0.5
+    # Most candidates returned per lookup, ranked by colliding bands
+    max_lsh_candidates = 200
+
+    # Spaces whose SimHash matrix stays resident (least recently used evicted)
+    simhash_matrix_spaces = 8
+
+    # Novelty statistics: a nearest normalised Hamming distance below
+    # near_duplicate_distance (DentateGyrusSeparator reads it from here) is a
+    # near-duplicate; the duplicate rate decays by duplicate_rate_decay per
+    # encoding
+    near_duplicate_distance = 0.1
+    duplicate_rate_decay = 0.98
+    NOVELTY_HISTOGRAM_BINS = 20
+
     def __init__(self, config: Optional[StoreConfig] = None):
         super().__init__(config)
         self._store_name = "hippocampus"
+        self.minhash_lsh_bands, self.minhash_lsh_rows = self.lsh_params(
+            self.minhash_lsh_threshold, self.MINHASH_PERMS
+        )
+        self._simhash_matrices: "OrderedDict[str, SimHashMatrix]" = OrderedDict()
+        # Spaces whose resident matrix saw writes in the open transaction
+        self._pending_spaces: Set[str] = set()
 
     def _get_schema(self) -> Dict[str, Any]:
         """Get JSON schema for hippocampus trace validation."""
@@ -74,6 +158,17 @@ class HippocampusStore(BaseStore):
                     "maxItems": 64,
                     "description": "Array of 32-bit MinHash values",
                 },
+                "minhash_scheme": {
+                    "type": "string",
+                    "enum": list(self.MINHASH_SCHEMES),
+                    "description": "MinHash scheme minhash32 was computed with",
+                },
+                "near_duplicates": {
+                    "type": "array",
+                    "items": {"type": "array", "minItems": 2, "maxItems": 2},
+                    "description": "(event_id, normalised distance) pairs from DG "
+                    "encoding; feeds the space's novelty statistics",
+                },
                 "novelty": {
                     "type": "number",
                     "minimum": 0.0,
@@ -100,7 +195,9 @@ class HippocampusStore(BaseStore):
                 space_id TEXT NOT NULL,
                 ts TEXT NOT NULL,
                 simhash_hex TEXT NOT NULL,
+                simhash_bin BLOB,  -- simhash_hex packed to 64 bytes
                 minhash32 TEXT NOT NULL,  -- JSON array
+                minhash_scheme TEXT NOT NULL DEFAULT 'sha256',
                 novelty REAL NOT NULL,
                 meta TEXT,  -- JSON object
                 created_at TEXT NOT NULL DEFAULT (datetime('now')),
@@ -112,6 +209,27 @@ class HippocampusStore(BaseStore):
         """
         )
 
+        # Tables created before minhash_scheme hold original SHA-256 sketches
+        columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(hippocampus_traces)")
+        }
+        if "minhash_scheme" not in columns:
+            conn.execute(
+                "ALTER TABLE hippocampus_traces "
+                "ADD COLUMN minhash_scheme TEXT NOT NULL DEFAULT 'sha256'"
+            )
+        if "simhash_bin" not in columns:
+            conn.execute("ALTER TABLE hippocampus_traces ADD COLUMN simhash_bin BLOB")
+        rows = conn.execute(
+            "SELECT id, simhash_hex FROM hippocampus_traces WHERE simhash_bin IS NULL"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE hippocampus_traces SET simhash_bin = ? WHERE id = ?",
+                [(simhash_to_blob(simhash_hex), id_) for id_, simhash_hex in rows],
+            )
+            logger.info(f"Packed SimHash codes of {len(rows)} existing traces")
+
         # Indexes for pattern matching and temporal queries
         conn.execute(
             """
@@ -134,6 +252,71 @@ class HippocampusStore(BaseStore):
         """
         )
 
+        # SimHash band index; band_key = band << 16 | band value
+        backfill = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'hippocampus_simhash_bands'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS hippocampus_simhash_bands (
+                space_id TEXT NOT NULL,
+                band_key INTEGER NOT NULL,
+                trace_id TEXT NOT NULL,
+                PRIMARY KEY (space_id, band_key, trace_id)
+            ) WITHOUT ROWID
+        """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_hippocampus_simhash_bands_trace
+            ON hippocampus_simhash_bands(trace_id)
+        """
+        )
+        if backfill:
+            rows = conn.execute(
+                "SELECT id, space_id, simhash_hex FROM hippocampus_traces"
+            ).fetchall()
+            for trace_id, space_id, simhash_hex in rows:
+                self._index_bands(conn, trace_id, space_id, simhash_hex)
+            if rows:
+                logger.info(f"Indexed SimHash bands of {len(rows)} existing traces")
+
+        # MinHash LSH buckets; bucket = hash of (scheme, band, band values)
+        backfill = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'hippocampus_minhash_lsh'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS hippocampus_minhash_lsh (
+                space_id TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                trace_id TEXT NOT NULL,
+                PRIMARY KEY (space_id, bucket, trace_id)
+            ) WITHOUT ROWID
+        """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_hippocampus_minhash_lsh_trace
+            ON hippocampus_minhash_lsh(trace_id)
+        """
+        )
+        if backfill:
+            self._index_all_minhash(conn)
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS hippocampus_novelty_stats (
+                space_id TEXT PRIMARY KEY,
+                encodings INTEGER NOT NULL DEFAULT 0,
+                near_duplicates INTEGER NOT NULL DEFAULT 0,
+                duplicate_ema REAL NOT NULL DEFAULT 0.0,  -- not bias-corrected
+                distance_histogram TEXT NOT NULL,  -- JSON counts per bin
+                updated_at TEXT NOT NULL
+            )
+        """
+        )
+
         logger.info("Hippocampus store schema initialized")
 
     def _create_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -144,25 +327,45 @@ class HippocampusStore(BaseStore):
         # Serialize complex fields
         minhash32_json = json.dumps(data["minhash32"])
         meta_json = json.dumps(data.get("meta", {}))
+        simhash_blob = simhash_to_blob(data["simhash_hex"])
         created_at = datetime.now(timezone.utc).isoformat()
 
         self._connection.execute(
             """
             INSERT INTO hippocampus_traces
-            (id, space_id, ts, simhash_hex, minhash32, novelty, meta, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (id, space_id, ts, simhash_hex, simhash_bin, minhash32, minhash_scheme,
+             novelty, meta, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
                 data["id"],
                 data["space_id"],
                 data["ts"],
                 data["simhash_hex"],
+                simhash_blob,
                 minhash32_json,
+                data.get("minhash_scheme", self.LEGACY_MINHASH_SCHEME),
                 data["novelty"],
                 meta_json,
                 created_at,
             ),
         )
+        self._index_bands(
+            self._connection, data["id"], data["space_id"], data["simhash_hex"]
+        )
+        self._matrix_add(data["space_id"], data["id"], simhash_blob)
+        if "near_duplicates" in data:
+            self.record_novelty(
+                data["space_id"],
+                min((float(d) for _, d in data["near_duplicates"]), default=1.0),
+            )
+        self._index_minhash(
+            self._connection,
+            data["id"],
+            data["space_id"],
+            data["minhash32"],
+            data.get("minhash_scheme", self.LEGACY_MINHASH_SCHEME),
+        )
 
         # Return the created record
         result = self._read_record(data["id"])
@@ -177,7 +380,8 @@ class HippocampusStore(BaseStore):
 
         cursor = self._connection.execute(
             """
-            SELECT id, space_id, ts, simhash_hex, minhash32, novelty, meta, created_at
+            SELECT id, space_id, ts, simhash_hex, minhash32, novelty, meta, created_at,
+                   minhash_scheme
             FROM hippocampus_traces
             WHERE id = ?
         """,
@@ -199,11 +403,15 @@ class HippocampusStore(BaseStore):
         update_fields: List[str] = []
         values: List[Any] = []
 
-        for field in ["space_id", "ts", "simhash_hex", "novelty"]:
+        for field in ["space_id", "ts", "simhash_hex", "minhash_scheme", "novelty"]:
             if field in data:
                 update_fields.append(f"{field} = ?")
                 values.append(data[field])
 
+        if "simhash_hex" in data:
+            update_fields.append("simhash_bin = ?")
+            values.append(simhash_to_blob(data["simhash_hex"]))
+
         if "minhash32" in data:
             update_fields.append("minhash32 = ?")
             values.append(json.dumps(data["minhash32"]))
@@ -229,6 +437,33 @@ class HippocampusStore(BaseStore):
         if cursor.rowcount == 0:
             raise ValueError(f"Record {record_id} not found")
 
+        if "simhash_hex" in data or "space_id" in data:
+            self._connection.execute(
+                "DELETE FROM hippocampus_simhash_bands WHERE trace_id = ?",
+                (record_id,),
+            )
+            space_id, simhash_hex = self._connection.execute(
+                "SELECT space_id, simhash_hex FROM hippocampus_traces WHERE id = ?",
+                (record_id,),
+            ).fetchone()
+            self._index_bands(self._connection, record_id, space_id, simhash_hex)
+            self._matrix_remove(record_id)
+            self._matrix_add(space_id, record_id, simhash_to_blob(simhash_hex))
+
+        if {"minhash32", "minhash_scheme", "space_id"} & data.keys():
+            self._connection.execute(
+                "DELETE FROM hippocampus_minhash_lsh WHERE trace_id = ?",
+                (record_id,),
+            )
+            space_id, minhash32, scheme = self._connection.execute(
+                "SELECT space_id, minhash32, minhash_scheme "
+                "FROM hippocampus_traces WHERE id = ?",
+                (record_id,),
+            ).fetchone()
+            self._index_minhash(
+                self._connection, record_id, space_id, json.loads(minhash32), scheme
+            )
+
         result = self._read_record(record_id)
         if result is None:
             raise RuntimeError(f"Failed to read updated record {record_id}")
@@ -245,9 +480,25 @@ class HippocampusStore(BaseStore):
         """,
             (record_id,),
         )
+        self._connection.execute(
+            "DELETE FROM hippocampus_simhash_bands WHERE trace_id = ?", (record_id,)
+        )
+        self._connection.execute(
+            "DELETE FROM hippocampus_minhash_lsh WHERE trace_id = ?", (record_id,)
+        )
+        self._matrix_remove(record_id)
 
         return cursor.rowcount > 0
 
+    def _on_transaction_commit(self, conn: sqlite3.Connection) -> None:
+        self._pending_spaces.clear()
+
+    def _on_transaction_rollback(self, conn: sqlite3.Connection) -> None:
+        # Resident matrices may hold codes of rolled back writes
+        for space_id in self._pending_spaces:
+            self._simhash_matrices.pop(space_id, None)
+        self._pending_spaces.clear()
+
     def get_encoding(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
         Get hippocampal encoding by event ID.
@@ -292,7 +543,8 @@ class HippocampusStore(BaseStore):
                 values.append(filters["until_ts"])
 
         query = """
-            SELECT id, space_id, ts, simhash_hex, minhash32, novelty, meta, created_at
+            SELECT id, space_id, ts, simhash_hex, minhash32, novelty, meta, created_at,
+                   minhash_scheme
             FROM hippocampus_traces
         """
 
@@ -320,6 +572,7 @@ class HippocampusStore(BaseStore):
             "novelty": float(row[5]),
             "meta": json.loads(str(row[6])) if row[6] else {},
             "created_at": str(row[7]),
+            "minhash_scheme": str(row[8]),
         }
 
     # Specialized query methods for pattern matching
@@ -344,6 +597,7 @@ class HippocampusStore(BaseStore):
         - id: trace identifier
         - simhash_hex: 512-bit SimHash for Hamming distance calculation
         - minhash32: MinHash values for Jaccard similarity
+        - minhash_scheme: scheme minhash32 was computed with
         - novelty: novelty score for ranking
         """
         if not self._connection:
@@ -351,7 +605,7 @@ class HippocampusStore(BaseStore):
 
         cursor = self._connection.execute(
             """
-            SELECT id, simhash_hex, minhash32, novelty
+            SELECT id, simhash_hex, minhash32, novelty, minhash_scheme
             FROM hippocampus_traces
             WHERE space_id = ?
             ORDER BY novelty DESC, ts DESC
@@ -370,6 +624,7 @@ class HippocampusStore(BaseStore):
                     "id": row[0],
                     "simhash_hex": row[1],
                     "minhash32": minhash32,
+                    "minhash_scheme": row[4],
                     "novelty": row[3],
                 }
             )
@@ -395,31 +650,465 @@ class HippocampusStore(BaseStore):
         """
         Find traces with similar SimHash within Hamming distance threshold.
 
-        Note: This is a simplified implementation. For production, consider
-        using specialized similarity search with LSH or approximate methods.
+        When the space's SimHash matrix is resident, or the threshold is
+        wider than the band index answers exactly
+        ((max_probe_radius + 1) * SIMHASH_BANDS - 1 bits), distances are
+        computed over the matrix. Otherwise the band index is probed for
+        band values within max_hamming_distance // SIMHASH_BANDS bits of the
+        target's bands and only the colliding traces are verified. Either
+        way every trace of the space is reachable, not just the most recent
+        ones. Ordered by Hamming distance, most recent first on ties.
         """
         if not self._connection:
             raise RuntimeError("No active connection")
 
-        # For now, fetch all traces in space and compute Hamming distance
-        # TODO: Implement LSH indexing for efficient similarity search
-
-        all_traces = self.find_by_space(space_id, limit=1000)
-        similar_traces = []
+        exact_bands = (self.max_probe_radius + 1) * self.SIMHASH_BANDS - 1
+        if space_id in self._simhash_matrices or max_hamming_distance > exact_bands:
+            hits = self._simhash_matrix(space_id).nearest(
+                simhash_to_blob(target_simhash), limit, max_hamming_distance
+            )
+            return self._ranked_traces(dict(hits), limit)
 
+        candidates = self._simhash_candidates(
+            space_id, target_simhash, max_hamming_distance
+        )
         target_bits = int(target_simhash, 16)
+        distances = {}
+        for trace_id, simhash_hex in self._simhash_codes(candidates):
+            hamming_dist = bin(target_bits ^ int(simhash_hex, 16)).count("1")
+            if hamming_dist <= max_hamming_distance:
+                distances[trace_id] = hamming_dist
+        return self._ranked_traces(distances, limit)
 
-        for trace in all_traces:
-            trace_bits = int(trace["simhash_hex"], 16)
-            hamming_dist = bin(target_bits ^ trace_bits).count("1")
+    def nearest_by_simhash(
+        self, space_id: str, target_simhash: str, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact Hamming top-k over every trace of the space.
 
-            if hamming_dist <= max_hamming_distance:
-                trace["hamming_distance"] = hamming_dist
-                similar_traces.append(trace)
+        Scans the space's SimHash matrix (loaded on first use). Ordered by
+        Hamming distance, most recent first on ties; each trace carries
+        "hamming_distance".
+        """
+        if not self._connection:
+            raise RuntimeError("No active connection")
+
+        hits = self._simhash_matrix(space_id).nearest(
+            simhash_to_blob(target_simhash), k
+        )
+        return self._ranked_traces(dict(hits), k)
+
+    def _ranked_traces(
+        self, distances: Dict[str, int], limit: int
+    ) -> List[Dict[str, Any]]:
+        traces = self._traces_by_id(distances)
+        for trace in traces:
+            trace["hamming_distance"] = distances[trace["id"]]
 
         # Sort by similarity (lower Hamming distance = more similar)
-        similar_traces.sort(key=lambda x: x["hamming_distance"])
-        return similar_traces[:limit]
+        traces.sort(key=lambda x: x["ts"], reverse=True)
+        traces.sort(key=lambda x: x["hamming_distance"])
+        return traces[:limit]
+
+    def _simhash_codes(self, trace_ids: Iterable[str]) -> List[Tuple[str, str]]:
+        ids = list(trace_ids)
+        codes: List[Tuple[str, str]] = []
+        for start in range(0, len(ids), self._PROBE_CHUNK):
+            chunk = ids[start : start + self._PROBE_CHUNK]
+            codes.extend(
+                self._connection.execute(
+                    f"""
+                    SELECT id, simhash_hex FROM hippocampus_traces
+                    WHERE id IN ({",".join("?" * len(chunk))})
+                """,
+                    chunk,
+                )
+            )
+        return codes
+
+    # In-memory SimHash matrices
+
+    def _simhash_matrix(self, space_id: str) -> SimHashMatrix:
+        """The space's resident matrix, loading it from simhash_bin if needed."""
+        matrix = self._simhash_matrices.get(space_id)
+        if matrix is not None:
+            self._simhash_matrices.move_to_end(space_id)
+            return matrix
+
+        cursor = self._connection.execute(
+            "SELECT id, simhash_bin FROM hippocampus_traces WHERE space_id = ?",
+            (space_id,),
+        )
+        matrix = SimHashMatrix.from_rows(cursor)
+        self._simhash_matrices[space_id] = matrix
+        # It may include this transaction's uncommitted writes
+        self._pending_spaces.add(space_id)
+        while len(self._simhash_matrices) > self.simhash_matrix_spaces:
+            self._simhash_matrices.popitem(last=False)
+        logger.debug(f"Loaded SimHash matrix of {len(matrix)} traces for {space_id}")
+        return matrix
+
+    def _matrix_add(self, space_id: str, trace_id: str, blob: bytes) -> None:
+        matrix = self._simhash_matrices.get(space_id)
+        if matrix is not None:
+            matrix.add(trace_id, blob)
+            self._pending_spaces.add(space_id)
+
+    def _matrix_remove(self, trace_id: str) -> None:
+        for space_id, matrix in self._simhash_matrices.items():
+            if matrix.remove(trace_id):
+                self._pending_spaces.add(space_id)
+                return
+
+    def invalidate_simhash_matrix(self, space_id: Optional[str] = None) -> None:
+        """
+        Drop resident SimHash matrices (one space, or all), e.g. after
+        traces were written by another process or store instance.
+        """
+        if space_id is None:
+            self._simhash_matrices.clear()
+        else:
+            self._simhash_matrices.pop(space_id, None)
+
+    # SimHash band index
+
+    @classmethod
+    def _band_values(cls, simhash_hex: str) -> List[int]:
+        bits = int(simhash_hex, 16)
+        mask = (1 << cls.SIMHASH_BAND_BITS) - 1
+        return [
+            (bits >> (band * cls.SIMHASH_BAND_BITS)) & mask
+            for band in range(cls.SIMHASH_BANDS)
+        ]
+
+    @classmethod
+    def _band_key(cls, band: int, value: int) -> int:
+        return (band << cls.SIMHASH_BAND_BITS) | value
+
+    def _index_bands(
+        self,
+        conn: sqlite3.Connection,
+        trace_id: str,
+        space_id: str,
+        simhash_hex: str,
+    ) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO hippocampus_simhash_bands "
+            "(space_id, band_key, trace_id) VALUES (?, ?, ?)",
+            [
+                (space_id, self._band_key(band, value), trace_id)
+                for band, value in enumerate(self._band_values(simhash_hex))
+            ],
+        )
+
+    @classmethod
+    def _flip_masks(cls, radius: int) -> List[int]:
+        """All band-width masks with at most ``radius`` bits set."""
+        return [
+            sum(1 << bit for bit in bits)
+            for flipped in range(radius + 1)
+            for bits in combinations(range(cls.SIMHASH_BAND_BITS), flipped)
+        ]
+
+    def _simhash_candidates(
+        self, space_id: str, simhash_hex: str, max_hamming_distance: int
+    ) -> Set[str]:
+        """Ids of traces sharing a band value within the probe radius."""
+        radius = min(max_hamming_distance // self.SIMHASH_BANDS, self.max_probe_radius)
+        masks = self._flip_masks(radius)
+        keys = [
+            self._band_key(band, value ^ mask)
+            for band, value in enumerate(self._band_values(simhash_hex))
+            for mask in masks
+        ]
+        candidates: Set[str] = set()
+        for start in range(0, len(keys), self._PROBE_CHUNK):
+            chunk = keys[start : start + self._PROBE_CHUNK]
+            cursor = self._connection.execute(
+                f"""
+                SELECT trace_id FROM hippocampus_simhash_bands
+                WHERE space_id = ? AND band_key IN ({",".join("?" * len(chunk))})
+            """,
+                [space_id, *chunk],
+            )
+            candidates.update(row[0] for row in cursor)
+        return candidates
+
+    def _traces_by_id(
+        self, trace_ids: Iterable[str], conn: Optional[sqlite3.Connection] = None
+    ) -> List[Dict[str, Any]]:
+        conn = conn or self._connection
+        ids = list(trace_ids)
+        traces: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), self._PROBE_CHUNK):
+            chunk = ids[start : start + self._PROBE_CHUNK]
+            cursor = conn.execute(
+                f"""
+                SELECT id, space_id, ts, simhash_hex, minhash32, novelty, meta,
+                       created_at, minhash_scheme
+                FROM hippocampus_traces
+                WHERE id IN ({",".join("?" * len(chunk))})
+            """,
+                chunk,
+            )
+            traces.extend(self._row_to_dict(row) for row in cursor)
+        return traces
+
+    # MinHash LSH index
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def lsh_params(threshold: float, perms: int) -> Tuple[int, int]:
+        """
+        (bands, rows) with bands * rows <= perms for a Jaccard threshold.
+
+        Minimises the false positive area below the threshold plus the false
+        negative area above it under the collision curve
+        1 - (1 - s^rows)^bands.
+        """
+        if not 0.0 < threshold < 1.0:
+            raise ValueError("LSH threshold must be between 0 and 1")
+        steps = 200
+
+        def area(lo: float, hi: float, rows: int, bands: int, above: bool) -> float:
+            width = (hi - lo) / steps
+            total = 0.0
+            for i in range(steps):
+                s = lo + (i + 0.5) * width
+                p = 1.0 - (1.0 - s**rows) ** bands
+                total += (1.0 - p if above else p) * width
+            return total
+
+        best: Tuple[float, int, int] = (float("inf"), 1, perms)
+        for bands in range(1, perms + 1):
+            for rows in range(1, perms // bands + 1):
+                error = area(0.0, threshold, rows, bands, False) + area(
+                    threshold, 1.0, rows, bands, True
+                )
+                if error < best[0]:
+                    best = (error, bands, rows)
+        return best[1], best[2]
+
+    def _lsh_buckets(self, minhash32: List[int], scheme: str) -> List[int]:
+        """One signed 64-bit bucket per band of ``minhash32``."""
+        rows = self.minhash_lsh_rows
+        if len(minhash32) < self.minhash_lsh_bands * rows:
+            return []
+        buckets = []
+        for band in range(self.minhash_lsh_bands):
+            values = minhash32[band * rows : (band + 1) * rows]
+            digest = hashlib.blake2b(
+                f"{scheme}:{band}:{rows}:".encode()
+                + struct.pack(f"<{rows}I", *values),
+                digest_size=8,
+            ).digest()
+            buckets.append(int.from_bytes(digest, "little", signed=True))
+        return buckets
+
+    def _index_minhash(
+        self,
+        conn: sqlite3.Connection,
+        trace_id: str,
+        space_id: str,
+        minhash32: List[int],
+        scheme: str,
+    ) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO hippocampus_minhash_lsh "
+            "(space_id, bucket, trace_id) VALUES (?, ?, ?)",
+            [
+                (space_id, bucket, trace_id)
+                for bucket in self._lsh_buckets(minhash32, scheme)
+            ],
+        )
+
+    def _index_all_minhash(
+        self, conn: sqlite3.Connection, space_id: Optional[str] = None
+    ) -> int:
+        query = "SELECT id, space_id, minhash32, minhash_scheme FROM hippocampus_traces"
+        params: List[Any] = []
+        if space_id:
+            query += " WHERE space_id = ?"
+            params.append(space_id)
+        count = 0
+        for trace_id, trace_space, minhash32, scheme in conn.execute(
+            query, params
+        ).fetchall():
+            self._index_minhash(
+                conn, trace_id, trace_space, json.loads(minhash32 or "[]"), scheme
+            )
+            count += 1
+        if count:
+            logger.info(f"Indexed MinHash LSH buckets of {count} traces")
+        return count
+
+    def rebuild_minhash_lsh(self, space_id: Optional[str] = None) -> int:
+        """
+        Re-file traces in the LSH index, e.g. after changing
+        minhash_lsh_threshold. Runs on the caller's transaction.
+
+        Returns:
+            Number of traces indexed
+        """
+        if not self._connection:
+            raise RuntimeError("No active connection")
+
+        if space_id:
+            self._connection.execute(
+                "DELETE FROM hippocampus_minhash_lsh WHERE space_id = ?", (space_id,)
+            )
+        else:
+            self._connection.execute("DELETE FROM hippocampus_minhash_lsh")
+        return self._index_all_minhash(self._connection, space_id)
+
+    def find_minhash_candidates(
+        self,
+        space_id: str,
+        minhash32: List[int],
+        minhash_scheme: str = "universal",
+        limit: Optional[int] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Traces sharing at least one LSH bucket with ``minhash32``.
+
+        Candidates are likely (not certain) to be within
+        minhash_lsh_threshold Jaccard similarity; callers score them with
+        the exact codes. Returned in the find_codes_in_space format plus
+        "band_collisions", most collisions first, at most ``limit``
+        (default max_lsh_candidates). Reads on ``conn`` when given (e.g. a
+        read-only connection outside any transaction), else on the store's
+        transaction.
+        """
+        conn = conn or self._connection
+        if not conn:
+            raise RuntimeError("No active connection")
+
+        buckets = self._lsh_buckets(minhash32, minhash_scheme)
+        if not buckets:
+            return []
+        cursor = conn.execute(
+            f"""
+            SELECT trace_id, COUNT(*) AS collisions
+            FROM hippocampus_minhash_lsh
+            WHERE space_id = ? AND bucket IN ({",".join("?" * len(buckets))})
+            GROUP BY trace_id
+            ORDER BY collisions DESC, trace_id ASC
+            LIMIT ?
+        """,
+            [space_id, *buckets, limit or self.max_lsh_candidates],
+        )
+        collisions = dict(cursor.fetchall())
+
+        candidates = []
+        for trace in self._traces_by_id(collisions, conn):
+            candidates.append(
+                {
+                    "id": trace["id"],
+                    "simhash_hex": trace["simhash_hex"],
+                    "minhash32": trace["minhash32"],
+                    "minhash_scheme": trace["minhash_scheme"],
+                    "novelty": trace["novelty"],
+                    "band_collisions": collisions[trace["id"]],
+                }
+            )
+        candidates.sort(key=lambda c: (-c["band_collisions"], c["id"]))
+        return candidates
+
+    def count_minhash_schemes(self, space_id: Optional[str] = None) -> Dict[str, int]:
+        """Number of traces per MinHash scheme, to follow a migration."""
+        if not self._connection:
+            raise RuntimeError("No active connection")
+
+        query = "SELECT minhash_scheme, COUNT(*) FROM hippocampus_traces"
+        params: List[Any] = []
+        if space_id:
+            query += " WHERE space_id = ?"
+            params.append(space_id)
+        cursor = self._connection.execute(query + " GROUP BY minhash_scheme", params)
+        return dict(cursor.fetchall())
+
+    def migrate_minhash(
+        self,
+        load_texts: Callable[[List[str]], Dict[str, str]],
+        compute_minhash: Callable[[List[str]], List[List[int]]],
+        scheme: str = "universal",
+        space_id: Optional[str] = None,
+        batch_size: int = 256,
+    ) -> Dict[str, int]:
+        """
+        Recompute stored MinHash sketches that use another scheme.
+
+        Traces keep only their sketches, so the source texts come from
+        ``load_texts`` (trace ids -> texts, e.g. from the episodic store) and
+        the new sketches from ``compute_minhash`` (texts -> sketches, e.g.
+        SDRProcessor.process_texts_batch). Traces are walked in id order in
+        batches of ``batch_size``; a trace whose text cannot be loaded keeps
+        its old sketch and scheme. Runs on the caller's transaction.
+
+        Returns:
+            Counts of "migrated" and "missing" (no text) traces
+        """
+        if not self._connection:
+            raise RuntimeError("No active connection")
+        if scheme not in self.MINHASH_SCHEMES:
+            raise ValueError(f"Unknown MinHash scheme: {scheme}")
+
+        space_clause = " AND space_id = ?" if space_id else ""
+        migrated = missing = 0
+        last_id = ""
+        while True:
+            params: List[Any] = [scheme, last_id]
+            if space_id:
+                params.append(space_id)
+            spaces = dict(
+                self._connection.execute(
+                    f"""
+                    SELECT id, space_id FROM hippocampus_traces
+                    WHERE minhash_scheme != ? AND id > ?{space_clause}
+                    ORDER BY id
+                    LIMIT ?
+                """,
+                    params + [batch_size],
+                ).fetchall()
+            )
+            ids = list(spaces)
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            texts = load_texts(ids)
+            found = [trace_id for trace_id in ids if trace_id in texts]
+            missing += len(ids) - len(found)
+            if not found:
+                continue
+            sketches = compute_minhash([texts[trace_id] for trace_id in found])
+            self._connection.executemany(
+                """
+                UPDATE hippocampus_traces
+                SET minhash32 = ?, minhash_scheme = ?
+                WHERE id = ?
+            """,
+                [
+                    (json.dumps(sketch), scheme, trace_id)
+                    for trace_id, sketch in zip(found, sketches)
+                ],
+            )
+            migrated += len(found)
+            self._connection.executemany(
+                "DELETE FROM hippocampus_minhash_lsh WHERE trace_id = ?",
+                [(trace_id,) for trace_id in found],
+            )
+            for trace_id, sketch in zip(found, sketches):
+                self._index_minhash(
+                    self._connection, trace_id, spaces[trace_id], sketch, scheme
+                )
+
+        logger.info(
+            f"Migrated {migrated} MinHash sketches to {scheme} "
+            f"({missing} without text)"
+        )
+        return {"migrated": migrated, "missing": missing}
 
     def get_recent_traces(
         self, space_id: str, hours: int = 24, limit: int = 50
@@ -463,6 +1152,108 @@ class HippocampusStore(BaseStore):
             "low_novelty_count": row[5],  # <= 0.2
         }
 
+    def _novelty_row(
+        self, space_id: str, conn: Optional[sqlite3.Connection] = None
+    ) -> Tuple[int, int, float, List[int]]:
+        row = (conn or self._connection).execute(
+            """
+            SELECT encodings, near_duplicates, duplicate_ema, distance_histogram
+            FROM hippocampus_novelty_stats WHERE space_id = ?
+        """,
+            (space_id,),
+        ).fetchone()
+        if row is None:
+            return 0, 0, 0.0, [0] * self.NOVELTY_HISTOGRAM_BINS
+        return row[0], row[1], row[2], json.loads(row[3])
+
+    def _decayed_rate(self, ema: float, encodings: int) -> float:
+        # Bias-corrected, so the first encodings are not pulled towards 0
+        if encodings == 0:
+            return 0.0
+        return ema / (1.0 - self.duplicate_rate_decay**encodings)
+
+    def record_novelty(self, space_id: str, nearest_distance: float) -> None:
+        """
+        Fold one committed encoding into the space's novelty statistics.
+
+        ``nearest_distance`` is the normalised Hamming distance to the
+        closest existing trace (1.0 when there was none). One keyed read and
+        one upsert, on the caller's transaction.
+        """
+        if not self._connection:
+            raise RuntimeError("No active connection")
+
+        encodings, near_duplicates, ema, histogram = self._novelty_row(space_id)
+        is_duplicate = nearest_distance < self.near_duplicate_distance
+        decay = self.duplicate_rate_decay
+        bins = len(histogram)
+        histogram[min(int(max(nearest_distance, 0.0) * bins), bins - 1)] += 1
+
+        self._connection.execute(
+            """
+            INSERT INTO hippocampus_novelty_stats
+            (space_id, encodings, near_duplicates, duplicate_ema,
+             distance_histogram, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(space_id) DO UPDATE SET
+                encodings = excluded.encodings,
+                near_duplicates = excluded.near_duplicates,
+                duplicate_ema = excluded.duplicate_ema,
+                distance_histogram = excluded.distance_histogram,
+                updated_at = excluded.updated_at
+        """,
+            (
+                space_id,
+                encodings + 1,
+                near_duplicates + is_duplicate,
+                decay * ema + (1.0 - decay) * is_duplicate,
+                json.dumps(histogram),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+
+    def get_novelty_stats(self, space_id: str) -> Dict[str, Any]:
+        """
+        Running novelty statistics of a space.
+
+        Returns encodings, near_duplicates, the decayed duplicate_rate and
+        distance_histogram (nearest-distance counts over
+        NOVELTY_HISTOGRAM_BINS equal bins of [0, 1]).
+        """
+        if not self._connection:
+            raise RuntimeError("No active connection")
+
+        encodings, near_duplicates, ema, histogram = self._novelty_row(space_id)
+        return {
+            "encodings": encodings,
+            "near_duplicates": near_duplicates,
+            "duplicate_rate": self._decayed_rate(ema, encodings),
+            "distance_histogram": histogram,
+        }
+
+    def duplicate_rate_with(
+        self,
+        space_id: str,
+        nearest_distance: float,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> float:
+        """
+        The space's decayed duplicate rate once an event at
+        ``nearest_distance`` from its closest trace is counted, without
+        recording it. Reads on ``conn`` when given, else on the store's
+        transaction.
+        """
+        conn = conn or self._connection
+        if not conn:
+            raise RuntimeError("No active connection")
+
+        encodings, _, ema, _ = self._novelty_row(space_id, conn)
+        is_duplicate = nearest_distance < self.near_duplicate_distance
+        decay = self.duplicate_rate_decay
+        return self._decayed_rate(
+            decay * ema + (1.0 - decay) * is_duplicate, encodings + 1
+        )
+
     # ============================================================================
     # SEQUENCE INTEGRATION (Sub-issue 4.1.1.2)
     # ============================================================================
@@ -998,7 +1789,7 @@ class HippocampusStore(BaseStore):
         """
         # Get raw similar traces
         raw_traces = self.find_similar_by_simhash(
-            simhash_hex, space_id, max_hamming_distance, limit
+            space_id, simhash_hex, max_hamming_distance, limit
         )
 
         # Apply policy to each trace
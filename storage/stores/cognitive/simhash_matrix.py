@@ -0,0 +1,119 @@
+"""
+In-memory SimHash Matrix for HippocampusStore
+
+Holds the 512-bit SimHash codes of one space as a ``uint64[N, 8]`` matrix,
+so exact Hamming distances to every trace are one XOR, one popcount and one
+row sum over the whole matrix instead of a Python loop over hex strings.
+
+Rows are appended into spare capacity (doubling when full), and removal
+moves the last row into the freed slot, so inserts and deletes are O(1)
+amortised and the matrix never needs rebuilding while it is resident.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from hippocampus.sdr import popcount_rows
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BYTES = 64
+_WORDS = SIMHASH_BYTES // 8
+
+
+def simhash_to_blob(simhash_hex: str) -> bytes:
+    """Packed 64-byte form of a 128-character SimHash hex string."""
+    blob = bytes.fromhex(simhash_hex)
+    if len(blob) != SIMHASH_BYTES:
+        raise ValueError(f"SimHash must be {SIMHASH_BYTES} bytes, got {len(blob)}")
+    return blob
+
+
+class SimHashMatrix:
+    """Packed SimHash codes of one space with exact Hamming search."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._codes = np.zeros((max(capacity, 1), _WORDS), dtype=np.uint64)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, bytes]]) -> "SimHashMatrix":
+        """Matrix of (trace_id, 64-byte code) rows, loaded in one copy."""
+        ids: List[str] = []
+        blobs: List[bytes] = []
+        for trace_id, blob in rows:
+            ids.append(trace_id)
+            blobs.append(blob)
+        matrix = cls(capacity=len(ids) + len(ids) // 4)
+        if ids:
+            packed = np.frombuffer(b"".join(blobs), dtype=np.uint64)
+            matrix._codes[: len(ids)] = packed.reshape(len(ids), _WORDS)
+        matrix._ids = ids
+        matrix._rows = {trace_id: row for row, trace_id in enumerate(ids)}
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, trace_id: object) -> bool:
+        return trace_id in self._rows
+
+    def add(self, trace_id: str, blob: bytes) -> None:
+        """Insert or replace the code of ``trace_id``."""
+        code = np.frombuffer(blob, dtype=np.uint64)
+        row = self._rows.get(trace_id)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._codes):
+                grown = np.zeros((2 * len(self._codes), _WORDS), dtype=np.uint64)
+                grown[:row] = self._codes
+                self._codes = grown
+            self._ids.append(trace_id)
+            self._rows[trace_id] = row
+        self._codes[row] = code
+
+    def remove(self, trace_id: str) -> bool:
+        """Drop ``trace_id``; the last row moves into its slot."""
+        row = self._rows.pop(trace_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._codes[row] = self._codes[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+        return True
+
+    def distances(self, blob: bytes) -> np.ndarray:
+        """Hamming distance from ``blob`` to every row, in row order."""
+        target = np.frombuffer(blob, dtype=np.uint64)
+        return popcount_rows(self._codes[: len(self._ids)] ^ target)
+
+    def nearest(
+        self, blob: bytes, k: int, max_distance: int = SIMHASH_BYTES * 8
+    ) -> List[Tuple[str, int]]:
+        """
+        (trace_id, distance) of the k closest codes within ``max_distance``.
+
+        Codes tied with the k-th distance are all included, so callers can
+        break ties on their own keys; ordered by distance.
+        """
+        if not self._ids or k <= 0:
+            return []
+        distances = self.distances(blob)
+        if k < len(distances):
+            # Distances are at most 512, so the k-th smallest comes from a
+            # histogram in one pass instead of a partition
+            histogram = np.bincount(distances, minlength=SIMHASH_BYTES * 8 + 1)
+            kth = int(np.searchsorted(np.cumsum(histogram), k))
+            max_distance = min(max_distance, kth)
+        rows = np.flatnonzero(distances <= max_distance)
+        rows = rows[np.argsort(distances[rows], kind="stable")]
+        return [(self._ids[row], int(distances[row])) for row in rows]
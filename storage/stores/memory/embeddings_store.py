@@ -88,6 +88,9 @@ class SimilarityResult:
 class EmbeddingsStore(BaseStore):
     """Embeddings store with vector similarity search."""
 
+    # Rows decoded and scored per step of an exact similarity search
+    similarity_chunk_rows = 4096
+
     def __init__(self, config: Optional[StoreConfig] = None):
         super().__init__(config)
         self._connection: Optional[sqlite3.Connection] = None
@@ -522,21 +525,37 @@ class EmbeddingsStore(BaseStore):
     def similarity_search(
         self, query: SimilarityQuery, space_filter: Optional[Set[str]] = None
     ) -> List[SimilarityResult]:
-        """Perform vector similarity search."""
+        """
+        Perform exact vector similarity search over every vector of the model.
+
+        Candidate rows are streamed in chunks of ``similarity_chunk_rows``; each
+        chunk is decoded with a single ``np.frombuffer`` and scored in one
+        vectorized pass, and only the running best ``offset + limit`` rows are
+        kept, so memory stays bounded regardless of model size. Offset and limit
+        apply to the global ranking.
+        """
         try:
             if not self._connection:
                 self._connection = self._get_connection()
 
+            dim = len(query.vector)
+            keep = query.offset + query.limit
+            if dim == 0 or keep <= 0:
+                return []
+
             # Normalize query vector for cosine similarity
-            query_vector = np.array(query.vector)
+            query_vector = np.asarray(query.vector, dtype=np.float32)
             if query.distance_metric == "cosine":
                 query_norm = np.linalg.norm(query_vector)
                 if query_norm > 0:
                     query_vector = query_vector / query_norm
+            elif query.distance_metric not in ("dot_product", "euclidean"):
+                logger.warning(f"Unknown distance metric: {query.distance_metric}")
+                return []
 
             # Build conditions
-            conditions: List[str] = ["v.model_id = ?"]
-            params: List[Any] = [query.model_id]
+            conditions: List[str] = ["v.model_id = ?", "v.dim = ?"]
+            params: List[Any] = [query.model_id, dim]
 
             # Add space filter
             if space_filter:
@@ -552,67 +571,82 @@ class EmbeddingsStore(BaseStore):
 
             where_clause = " AND ".join(conditions)
 
-            # Get candidate vectors
             cursor = self._connection.execute(
                 f"""
                 SELECT e.embedding_id, e.doc_id, v.vector, v.norm, v.space_id, v.privacy_band
                 FROM embedding_records e
                 JOIN vector_rows v ON e.vector_ref = v.id
                 WHERE {where_clause}
-                ORDER BY e.created_at DESC
-                LIMIT ?
             """,
-                params + [query.limit * 2],
-            )  # Get more candidates for better ranking
-
-            results: List[SimilarityResult] = []
+                params,
+            )
 
-            for row in cursor.fetchall():
-                try:
-                    # Unpack vector
-                    vector_bytes = row[2]
-                    dim = len(query.vector)
-                    candidate_vector = np.array(struct.unpack(f"{dim}f", vector_bytes))
-
-                    # Calculate similarity
-                    score = self._calculate_similarity(
-                        query_vector, candidate_vector, query.distance_metric, row[3]
+            ascending = query.distance_metric == "euclidean"
+            expected_bytes = dim * 4
+            best_scores = np.zeros(0, dtype=np.float32)
+            best_vectors = np.zeros((0, dim), dtype=np.float32)
+            best_rows: List[Any] = []
+
+            while True:
+                chunk = cursor.fetchmany(self.similarity_chunk_rows)
+                if not chunk:
+                    break
+
+                rows = [row for row in chunk if len(row[2]) == expected_bytes]
+                if len(rows) != len(chunk):
+                    logger.warning(
+                        f"Skipped {len(chunk) - len(rows)} malformed vectors for model {query.model_id}"
                     )
-
-                    # Apply threshold
-                    if score >= query.threshold:
-                        results.append(
-                            SimilarityResult(
-                                embedding_id=row[0],
-                                doc_id=row[1],
-                                score=score,
-                                vector=(
-                                    candidate_vector.tolist()
-                                    if query.distance_metric != "cosine"
-                                    else None
-                                ),
-                                metadata={
-                                    "space_id": row[4],
-                                    "privacy_band": row[5],
-                                    "distance_metric": query.distance_metric,
-                                },
-                            )
-                        )
-
-                except Exception as e:
-                    logger.warning(f"Failed to process candidate vector: {e}")
+                if not rows:
                     continue
 
-            # Sort by score (descending for similarity)
-            if query.distance_metric in ["cosine", "dot_product"]:
-                results.sort(key=lambda x: x.score, reverse=True)
-            else:  # euclidean (distance)
-                results.sort(key=lambda x: x.score)
+                vectors = np.frombuffer(
+                    b"".join(row[2] for row in rows), dtype=np.float32
+                ).reshape(len(rows), dim)
+                scores = self._score_block(
+                    query_vector,
+                    vectors,
+                    query.distance_metric,
+                    np.asarray([row[3] or 0.0 for row in rows], dtype=np.float32),
+                )
 
-            # Apply pagination
-            start_idx = query.offset
-            end_idx = query.offset + query.limit
-            return results[start_idx:end_idx]
+                # Apply threshold
+                mask = scores >= query.threshold
+                if not mask.any():
+                    continue
+                selected = np.flatnonzero(mask)
+
+                # Merge with the running best and keep only the top `keep`
+                merged_scores = np.concatenate([best_scores, scores[selected]])
+                merged_vectors = np.concatenate([best_vectors, vectors[selected]])
+                merged_rows = best_rows + [rows[i] for i in selected]
+                order = self._top_indices(merged_scores, keep, ascending)
+                best_scores = merged_scores[order]
+                best_vectors = merged_vectors[order]
+                best_rows = [merged_rows[i] for i in order]
+
+            order = np.argsort(
+                best_scores if ascending else -best_scores, kind="stable"
+            )[query.offset : keep]
+
+            return [
+                SimilarityResult(
+                    embedding_id=best_rows[i][0],
+                    doc_id=best_rows[i][1],
+                    score=float(best_scores[i]),
+                    vector=(
+                        best_vectors[i].tolist()
+                        if query.distance_metric != "cosine"
+                        else None
+                    ),
+                    metadata={
+                        "space_id": best_rows[i][4],
+                        "privacy_band": best_rows[i][5],
+                        "distance_metric": query.distance_metric,
+                    },
+                )
+                for i in order
+            ]
 
         except Exception as e:
             logger.error(f"Similarity search failed for model {query.model_id}: {e}")
@@ -776,39 +810,33 @@ class EmbeddingsStore(BaseStore):
             "ts": row[7],
         }
 
-    def _calculate_similarity(
+    def _score_block(
         self,
         query_vector: np.ndarray,
-        candidate_vector: np.ndarray,
+        vectors: np.ndarray,
         metric: str,
-        candidate_norm: Optional[float] = None,
-    ) -> float:
-        """Calculate similarity score between vectors."""
-        try:
-            if metric == "cosine":
-                # Use pre-computed norm if available
-                if candidate_norm:
-                    candidate_vector = candidate_vector / candidate_norm
-                else:
-                    norm = np.linalg.norm(candidate_vector)
-                    if norm > 0:
-                        candidate_vector = candidate_vector / norm
-
-                return float(np.dot(query_vector, candidate_vector))
-
-            elif metric == "dot_product":
-                return float(np.dot(query_vector, candidate_vector))
-
-            elif metric == "euclidean":
-                return float(np.linalg.norm(query_vector - candidate_vector))
-
-            else:
-                logger.warning(f"Unknown distance metric: {metric}")
-                return 0.0
-
-        except Exception as e:
-            logger.error(f"Failed to calculate similarity: {e}")
-            return 0.0
+        stored_norms: np.ndarray,
+    ) -> np.ndarray:
+        """Score a block of candidate vectors against the query in one pass."""
+        if metric == "cosine":
+            # Use pre-computed norms where available
+            norms = np.where(
+                stored_norms > 0, stored_norms, np.linalg.norm(vectors, axis=1)
+            )
+            dots = vectors @ query_vector
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(norms > 0, dots / norms, dots).astype(np.float32)
+        if metric == "dot_product":
+            return (vectors @ query_vector).astype(np.float32)
+        return np.linalg.norm(vectors - query_vector, axis=1).astype(np.float32)
+
+    @staticmethod
+    def _top_indices(scores: np.ndarray, k: int, ascending: bool) -> np.ndarray:
+        """Indices of the k best scores (unordered)."""
+        if scores.size <= k:
+            return np.arange(scores.size)
+        keyed = scores if ascending else -scores
+        return np.argpartition(keyed, k - 1)[:k]
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get or create database connection."""
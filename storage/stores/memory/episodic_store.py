@@ -8,6 +8,8 @@ This implementation follows the contracts exactly:
 Features:
 - Contract-compliant storage for episodic records and sequences
 - High-performance temporal indexing
+- Keyword search through an external-content FTS5 index (episodic_fts) over
+  the text fields of content_json/features_json, kept in sync by triggers
 - BaseStore abstract interface implementation
 - Hippocampus consolidation integration
 - ULID-based identifiers as per contracts
@@ -20,9 +22,16 @@ import logging
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from storage.core.base_store import BaseStore, StoreConfig
+from storage.core.pagination import (
+    Page,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -159,6 +168,11 @@ class TemporalQuery:
     limit: int = 100
     offset: int = 0
     order_desc: bool = True  # Most recent first by default
+    # With keywords: "time" keeps time order, "relevance" ranks by bm25
+    rank_by: Literal["time", "relevance"] = "time"
+    # Continuation cursor from a previous page (see query_temporal_page);
+    # replaces offset
+    cursor: Optional[str] = None
 
 
 class EpisodicStore(BaseStore):
@@ -236,6 +250,7 @@ class EpisodicStore(BaseStore):
             )
         """
         )
+        self._initialize_search_index(conn)
 
         # Episodic sequences table - follows contract exactly
         conn.execute(
@@ -255,10 +270,12 @@ class EpisodicStore(BaseStore):
         )
 
         # Performance indexes for temporal queries
+        # (space_id, ts, id) serves both time orders and keyset cursors
+        conn.execute("DROP INDEX IF EXISTS idx_episodic_records_space_time")
         conn.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_episodic_records_space_time
-            ON episodic_records(space_id, ts DESC)
+            CREATE INDEX IF NOT EXISTS idx_episodic_records_space_ts_id
+            ON episodic_records(space_id, ts, id)
         """
         )
         conn.execute(
@@ -282,6 +299,87 @@ class EpisodicStore(BaseStore):
 
         logger.info("Episodic store schema initialized")
 
+    # Text fields of a record that keyword queries match, as generated columns
+    # so the external-content FTS5 table can read them back by name
+    _SEARCH_COLUMNS = {
+        "search_text": "json_extract(content_json, '$.text')",
+        "search_keywords": "json_extract(features_json, '$.keywords')",
+    }
+
+    def _initialize_search_index(self, conn: sqlite3.Connection) -> None:
+        """
+        Create episodic_fts, an external-content FTS5 index over episodic_records.
+
+        Only the extracted text fields are indexed; triggers keep the index in
+        step with inserts, updates and deletes. Databases created before the
+        index existed get the generated columns added and the index rebuilt.
+        """
+        columns = {
+            row[1] for row in conn.execute("PRAGMA table_xinfo(episodic_records)")
+        }
+        for name, expression in self._SEARCH_COLUMNS.items():
+            if name not in columns:
+                conn.execute(
+                    f"ALTER TABLE episodic_records ADD COLUMN {name} TEXT "
+                    f"GENERATED ALWAYS AS ({expression}) VIRTUAL"
+                )
+
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'episodic_fts'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS episodic_fts USING fts5(
+                search_text,
+                search_keywords,
+                content='episodic_records',
+                content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+        """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS episodic_fts_insert
+            AFTER INSERT ON episodic_records BEGIN
+                INSERT INTO episodic_fts(rowid, search_text, search_keywords)
+                VALUES (new.rowid, new.search_text, new.search_keywords);
+            END
+        """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS episodic_fts_delete
+            AFTER DELETE ON episodic_records BEGIN
+                INSERT INTO episodic_fts(episodic_fts, rowid, search_text, search_keywords)
+                VALUES ('delete', old.rowid, old.search_text, old.search_keywords);
+            END
+        """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS episodic_fts_update
+            AFTER UPDATE OF content_json, features_json ON episodic_records BEGIN
+                INSERT INTO episodic_fts(episodic_fts, rowid, search_text, search_keywords)
+                VALUES ('delete', old.rowid, old.search_text, old.search_keywords);
+                INSERT INTO episodic_fts(rowid, search_text, search_keywords)
+                VALUES (new.rowid, new.search_text, new.search_keywords);
+            END
+        """
+        )
+        if not exists:
+            self.rebuild_search_index(conn)
+
+    def rebuild_search_index(self, conn: Optional[sqlite3.Connection] = None) -> None:
+        """
+        Re-index every record. Needed after a VACUUM, which may renumber the
+        rowids the external-content index refers to.
+        """
+        conn = conn or self._connection
+        if conn is None:
+            raise RuntimeError("Store not in transaction")
+        conn.execute("INSERT INTO episodic_fts(episodic_fts) VALUES ('rebuild')")
+
     def _create_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new episodic record (BaseStore interface)."""
         record = EpisodicRecord.from_dict(data)
@@ -487,13 +585,23 @@ class EpisodicStore(BaseStore):
         try:
             ts_unix = int(record.ts.timestamp())
 
+            # Upsert rather than INSERT OR REPLACE: REPLACE deletes the old row
+            # without firing delete triggers, which would leave it in episodic_fts
             self._connection.execute(
                 """
-                INSERT OR REPLACE INTO episodic_records (
+                INSERT INTO episodic_records (
                     id, envelope_id, space_id, ts, ts_iso, band, author,
                     device, content_json, features_json, mls_group,
                     links_json, meta_json
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    envelope_id=excluded.envelope_id, space_id=excluded.space_id,
+                    ts=excluded.ts, ts_iso=excluded.ts_iso, band=excluded.band,
+                    author=excluded.author, device=excluded.device,
+                    content_json=excluded.content_json,
+                    features_json=excluded.features_json,
+                    mls_group=excluded.mls_group, links_json=excluded.links_json,
+                    meta_json=excluded.meta_json, updated_at=unixepoch()
             """,
                 (
                     record.id,
@@ -582,61 +690,102 @@ class EpisodicStore(BaseStore):
 
     def query_temporal(self, query: TemporalQuery) -> List[EpisodicRecord]:
         """Execute temporal query against episodic records."""
+        return self.query_temporal_page(query).items
+
+    def query_temporal_page(self, query: TemporalQuery) -> Page[EpisodicRecord]:
+        """
+        One page of a temporal query plus the cursor for the next page.
+
+        Results are ordered by (ts, id), or by (bm25, ts, id) when ranking by
+        relevance; the cursor encodes that key of the last record, so the
+        next page seeks past it instead of skipping ``offset`` rows. Raises
+        InvalidCursorError for a cursor issued for a different query.
+        """
         if not self._connection:
-            return []
+            return Page()
+
+        match = self._build_match_query(query.keywords) if query.keywords else ""
+        by_relevance = bool(match) and query.rank_by == "relevance"
+        desc = query.order_desc
+        order: List[Tuple[str, bool]] = [("r.ts", desc), ("r.id", desc)]
+        if by_relevance:
+            order.insert(0, ("bm25(episodic_fts)", False))
+        scope = cursor_scope(
+            "episodic",
+            query.space_id,
+            query.start_time,
+            query.end_time,
+            query.author,
+            query.band_filter,
+            match,
+            query.sequence_id,
+            desc,
+            by_relevance,
+        )
+        after = decode_cursor(query.cursor, scope, len(order)) if query.cursor else None
 
         try:
-            where_clauses: List[str] = ["space_id = ?"]
+            where_clauses: List[str] = ["r.space_id = ?"]
             params: List[Any] = [query.space_id]
+            source = "episodic_records r"
+
+            # Keyword search through the FTS5 index, combined with the filters below
+            if match:
+                source = (
+                    "episodic_fts JOIN episodic_records r"
+                    " ON r.rowid = episodic_fts.rowid"
+                )
+                where_clauses.insert(0, "episodic_fts MATCH ?")
+                params.insert(0, match)
 
             if query.start_time:
-                where_clauses.append("ts >= ?")
+                where_clauses.append("r.ts >= ?")
                 params.append(int(query.start_time.timestamp()))
 
             if query.end_time:
-                where_clauses.append("ts <= ?")
+                where_clauses.append("r.ts <= ?")
                 params.append(int(query.end_time.timestamp()))
 
             if query.author:
-                where_clauses.append("author = ?")
+                where_clauses.append("r.author = ?")
                 params.append(query.author)
 
             if query.band_filter:
                 placeholders = ",".join("?" * len(query.band_filter))
-                where_clauses.append(f"band IN ({placeholders})")
+                where_clauses.append(f"r.band IN ({placeholders})")
                 params.extend(query.band_filter)
 
             if query.sequence_id:
-                where_clauses.append("json_extract(links_json, '$.sequence_id') = ?")
+                where_clauses.append("json_extract(r.links_json, '$.sequence_id') = ?")
                 params.append(query.sequence_id)
 
-            # Basic keyword search in content
-            if query.keywords:
-                keyword_conditions: List[str] = []
-                for keyword in query.keywords:
-                    keyword_conditions.append(
-                        "(content_json LIKE ? OR features_json LIKE ?)"
-                    )
-                    params.extend([f"%{keyword}%", f"%{keyword}%"])
-                where_clauses.append(f"({' OR '.join(keyword_conditions)})")
+            if after is not None:
+                condition, key_params = keyset_condition(order, after)
+                where_clauses.append(condition)
+                params.extend(key_params)
 
             where_clause = " AND ".join(where_clauses)
-            order_clause = "ORDER BY ts DESC" if query.order_desc else "ORDER BY ts ASC"
+            order_clause = ", ".join(
+                f"{expr} {'DESC' if descending else 'ASC'}"
+                for expr, descending in order
+            )
+            rank_column = "bm25(episodic_fts)" if by_relevance else "NULL"
 
             sql = f"""
-                SELECT id, envelope_id, space_id, ts_iso, band, author,
-                       device, content_json, features_json, mls_group,
-                       links_json, meta_json
-                FROM episodic_records
+                SELECT r.id, r.envelope_id, r.space_id, r.ts_iso, r.band, r.author,
+                       r.device, r.content_json, r.features_json, r.mls_group,
+                       r.links_json, r.meta_json, r.ts, {rank_column}
+                FROM {source}
                 WHERE {where_clause}
-                {order_clause}
+                ORDER BY {order_clause}
                 LIMIT ? OFFSET ?
             """
-            params.extend([query.limit, query.offset])
+            params.extend([query.limit, 0 if after is not None else query.offset])
 
             cursor = self._connection.execute(sql, params)
 
             records: List[EpisodicRecord] = []
+            last_key: Optional[List[Any]] = None
             for row in cursor:
                 record_data = {
                     "id": row[0],
@@ -658,15 +807,32 @@ class EpisodicStore(BaseStore):
                     record_data["meta"] = json.loads(row[11])
 
                 records.append(EpisodicRecord.from_dict(record_data))
+                last_key = [row[12], row[0]]
+                if by_relevance:
+                    last_key.insert(0, row[13])
 
-            return records
+            next_cursor = None
+            if last_key is not None and len(records) == query.limit:
+                next_cursor = encode_cursor(scope, last_key)
+            return Page(records, next_cursor)
 
         except Exception as e:
             logger.error(
                 "Temporal query failed",
                 extra={"space_id": query.space_id, "error": str(e)},
             )
-            return []
+            return Page()
+
+    @staticmethod
+    def _build_match_query(keywords: List[str]) -> str:
+        """FTS5 query matching any keyword, each quoted as a phrase."""
+        phrases = []
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if keyword:
+                escaped = keyword.replace('"', '""')
+                phrases.append(f'"{escaped}"')
+        return " OR ".join(phrases)
 
     # === Sequence Management Methods (Issue 2.1.2) ===
 
@@ -4,24 +4,55 @@ Provides SQLite FTS5-based full-text search capabilities with:
 - Multi-language support with stemming
 - Advanced search features (phrase queries, faceted search)
 - TF-IDF scoring and ranking
-- Performance optimization and caching
+- Performance optimization and caching: ranked result lists are cached per
+  query and invalidated by per-space write generations (see query_cache)
+- Snippets and highlight offsets computed by FTS5 (snippet()/highlight());
+  the "snippet" projection returns ids, scores and snippets only and loads
+  text and highlights on demand
+- Bulk ingest in one transaction with FTS5 automerge/crisismerge raised for
+  the load; segments are merged afterwards in the background by the
+  IndexLifecycleManager (see store_documents_bulk / merge_segments)
+- Typeahead over titles and entity names: a second FTS5 table with prefix
+  indexes (prefix='2 3 4') answers per-keystroke prefix queries per space,
+  newest first, through a small write-aware result cache (see typeahead)
 - Integration with UnitOfWork and MLS security
 
 Contract: contracts/storage/schemas/fts_document.schema.json
 """
 
+import bisect
 import hashlib
 import json
 import logging
 import re
 import sqlite3
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from storage.core.base_store import BaseStore, StoreConfig
+from storage.core.pagination import Page, cursor_scope, decode_cursor, encode_cursor
 from storage.core.sqlite_util import create_optimized_connection
 
+from .query_cache import QueryResultCache, WriteGenerations
+
+if TYPE_CHECKING:
+    from storage.monitoring.index_lifecycle_manager import (
+        IndexLifecycleManager,
+        LifecycleOperation,
+    )
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,8 +81,17 @@ class SearchQuery:
     languages: Optional[List[str]] = None
     bands: Optional[List[str]] = None
     space_ids: Optional[List[str]] = None
+    # Document ts bounds: after is inclusive, before exclusive
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
     highlight: bool = False
     min_score: float = 0.0
+    # "full": text and metadata per hit; "snippet": doc_id, score and snippet
+    # only, with text and highlights loaded later through load_details()
+    projection: Literal["full", "snippet"] = "full"
+    # Continuation cursor from a previous page (see search_page); replaces
+    # offset
+    cursor: Optional[str] = None
 
 
 @dataclass
@@ -59,21 +99,69 @@ class SearchResult:
     """Search result with metadata and scoring."""
 
     doc_id: str
-    text: str
+    text: Optional[str]  # None until loaded for "snippet" projection results
     score: float
     highlights: List[Tuple[int, int]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class Suggestion:
+    """A typeahead entry: a document title or an entity name in a space."""
+
+    label: str
+    space_id: str
+    doc_id: str
+    kind: Literal["title", "entity"] = "title"
+    # Higher weights rank first among suggestions matching equally well
+    weight: float = 0.0
+
+
 class FTSStore(BaseStore):
     """Full-text search store using SQLite FTS5."""
 
+    # A query's ranked (doc_id, score) list is cached to this depth regardless
+    # of limit/offset, so every page within it is served from one entry
+    cache_depth = 1000
+    cache_max_entries = 512
+    cache_max_bytes = 8 * 1024 * 1024
+    # Approximate footprint of one cached (doc_id, score) pair
+    _RANKED_HIT_BYTES = 160
+    # doc_ids per IN (...) query; below SQLite's default variable limit
+    _DOC_ID_CHUNK = 500
+    # Markers passed to FTS5 highlight() as char(2)/char(3); control characters
+    # do not occur in stored text, so they can be stripped back out as offsets
+    _HIGHLIGHT_OPEN = "\x02"
+    _HIGHLIGHT_CLOSE = "\x03"
+    # FTS5 merge settings while store_documents_bulk() loads documents: fewer,
+    # larger merges during the load, restored to the previous values after it
+    ingest_automerge = 16
+    ingest_crisismerge = 64
+    _FTS5_MERGE_DEFAULTS = {"automerge": 4, "crisismerge": 16}
+    # Leaf pages merged per committed step of merge_segments()
+    merge_pages = 256
+    max_merge_steps = 10_000
+    # Typeahead: shortest prefix served (the prefix indexes start at 2 chars),
+    # candidates read per requested suggestion before re-ranking, cache size
+    typeahead_min_chars = 2
+    typeahead_candidates = 4
+    typeahead_cache_entries = 256
+
     def __init__(self, config: Optional[StoreConfig] = None):
         super().__init__(config)
         self._connection: Optional[sqlite3.Connection] = None
         self._initialized = False
-        self._query_cache: Dict[str, Tuple[List[SearchResult], float]] = {}
+        self._query_cache = QueryResultCache(
+            max_entries=self.cache_max_entries, max_bytes=self.cache_max_bytes
+        )
+        self._generations = WriteGenerations()
+        self._typeahead_cache = QueryResultCache(
+            max_entries=self.typeahead_cache_entries, max_bytes=self.cache_max_bytes
+        )
+        self._pending_spaces: Set[Optional[str]] = set()
         self._stats_cache: Optional[Dict[str, Any]] = None
+        self._lifecycle: Optional["IndexLifecycleManager"] = None
+        self._lifecycle_index = "fts_documents"
 
     def _get_schema(self) -> Dict[str, Any]:
         """Get the JSON schema for FTS documents."""
@@ -108,8 +196,6 @@ class FTSStore(BaseStore):
                 source UNINDEXED,
                 tokens_count UNINDEXED,
                 segments UNINDEXED,
-                content='',
-                contentless_delete=1,
                 tokenize='porter unicode61'
             )
         """
@@ -127,8 +213,7 @@ class FTSStore(BaseStore):
                 source TEXT,
                 tokens_count INTEGER,
                 segments TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (doc_id) REFERENCES fts_documents(doc_id)
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """
         )
@@ -148,6 +233,24 @@ class FTSStore(BaseStore):
         """
         )
 
+        # Typeahead suggestions. space_key holds one opaque token per space so
+        # the space filter is part of the MATCH; prefix indexes make "ab*",
+        # "abc*" and "abcd*" single index lookups instead of term-range scans
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS fts_typeahead USING fts5(
+                label,
+                space_key,
+                space_id UNINDEXED,
+                doc_id UNINDEXED,
+                kind UNINDEXED,
+                weight UNINDEXED,
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3 4'
+            )
+        """
+        )
+
     def _create_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new FTS record."""
         if not self._connection:
@@ -192,6 +295,7 @@ class FTSStore(BaseStore):
             ),
         )
 
+        self._record_write(data["space_id"])
         return data
 
     def _read_record(self, record_id: str) -> Optional[Dict[str, Any]]:
@@ -231,6 +335,10 @@ class FTSStore(BaseStore):
         if not self._connection:
             raise RuntimeError("No active connection")
 
+        self._record_write(self._space_of(record_id))
+        if "space_id" in data:
+            self._record_write(data["space_id"])
+
         # Build update query for metadata table
         set_clauses: List[str] = []
         params: List[Any] = []
@@ -284,6 +392,8 @@ class FTSStore(BaseStore):
         if not self._connection:
             raise RuntimeError("No active connection")
 
+        space_id = self._space_of(record_id)
+
         # Delete from FTS table
         cursor = self._connection.execute(
             """
@@ -302,7 +412,11 @@ class FTSStore(BaseStore):
         """,
             (record_id,),
         )
+        self._connection.execute(
+            "DELETE FROM fts_typeahead WHERE doc_id = ?", (record_id,)
+        )
 
+        self._record_write(space_id)
         return True
 
     def _list_records(
@@ -365,17 +479,7 @@ class FTSStore(BaseStore):
         """Store a document in the FTS index."""
         try:
             # Validate document against schema
-            doc_data = {
-                "doc_id": document.doc_id,
-                "space_id": document.space_id,
-                "text": document.text,
-                "lang": document.lang,
-                "ts": document.ts.isoformat(),
-                "band": document.band,
-                "source": document.source,
-                "tokens_count": document.tokens_count,
-                "segments": document.segments,
-            }
+            doc_data = self._document_data(document)
 
             if self.config.schema_validation:
                 validation = self.validate_data(doc_data)
@@ -392,104 +496,610 @@ class FTSStore(BaseStore):
             logger.error(f"Failed to store document {document.doc_id}: {e}")
             return False
 
+    def store_documents_bulk(
+        self, documents: Iterable[FTSDocument], ingest_mode: bool = True
+    ) -> int:
+        """
+        Store many documents in a single transaction.
+
+        Rows for fts_documents and fts_metadata are inserted with executemany
+        on a dedicated connection. With ingest_mode, FTS5 automerge and
+        crisismerge are raised for the duration of the load and restored in the
+        same transaction, so a failed load never leaves them raised; once it
+        commits, a background merge is scheduled through the attached
+        IndexLifecycleManager (see attach_lifecycle_manager). Rolls back and
+        re-raises on any failure.
+
+        Returns the number of documents stored.
+        """
+        fts_rows: List[Tuple[Any, ...]] = []
+        metadata_rows: List[Tuple[Any, ...]] = []
+        spaces: Set[str] = set()
+        for document in documents:
+            doc_data = self._document_data(document)
+            if self.config.schema_validation:
+                validation = self.validate_data(doc_data)
+                if not validation.is_valid:
+                    raise ValueError(
+                        f"Document {document.doc_id} validation failed: "
+                        f"{validation.errors}"
+                    )
+            segments = json.dumps(document.segments) if document.segments else None
+            fts_rows.append(
+                (
+                    document.doc_id,
+                    document.space_id,
+                    document.text,
+                    document.lang,
+                    doc_data["ts"],
+                    document.band,
+                    document.source,
+                    document.tokens_count,
+                    segments,
+                )
+            )
+            metadata_rows.append(fts_rows[-1][:2] + fts_rows[-1][3:])
+            spaces.add(document.space_id)
+
+        if not fts_rows:
+            return 0
+
+        conn = create_optimized_connection(self.config.db_path)
+        try:
+            self._initialize_schema(conn)
+            with conn:
+                previous = self._merge_settings(conn) if ingest_mode else None
+                if previous is not None:
+                    self._apply_merge_settings(
+                        conn,
+                        {
+                            "automerge": self.ingest_automerge,
+                            "crisismerge": self.ingest_crisismerge,
+                        },
+                    )
+                conn.executemany(
+                    """
+                    INSERT INTO fts_documents (doc_id, space_id, text, lang, ts, band, source, tokens_count, segments)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    fts_rows,
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO fts_metadata (doc_id, space_id, lang, ts, band, source, tokens_count, segments)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    metadata_rows,
+                )
+                if previous is not None:
+                    self._apply_merge_settings(conn, previous)
+        finally:
+            conn.close()
+
+        # Other connections only see the rows now, so invalidate after commit
+        for space_id in spaces:
+            self._generations.bump(space_id)
+        self._stats_cache = None
+        logger.info(f"Bulk stored {len(fts_rows)} FTS documents")
+
+        if ingest_mode and self._lifecycle is not None:
+            self._lifecycle.schedule_optimize(
+                self._lifecycle_index, "bulk_ingest", {"documents": len(fts_rows)}
+            )
+        return len(fts_rows)
+
+    def attach_lifecycle_manager(
+        self, manager: "IndexLifecycleManager", index_name: str = "fts_documents"
+    ) -> None:
+        """Let the lifecycle manager merge this index after bulk loads."""
+        self._lifecycle = manager
+        self._lifecycle_index = index_name
+        manager.register_optimizer(index_name, self.merge_segments)
+
+    def merge_segments(
+        self, operation: Optional["LifecycleOperation"] = None
+    ) -> Dict[str, Any]:
+        """
+        Incrementally merge all FTS5 segments into one.
+
+        Runs FTS5 'merge' on a dedicated connection in steps of merge_pages
+        leaf pages, committing after each step so queries and writes are only
+        blocked for one step at a time. The first step uses a negative page
+        count, which merges segments across levels as 'optimize' does; the
+        loop stops once a step reports no work (total_changes grows by < 2).
+        """
+        started = time.perf_counter()
+        conn = create_optimized_connection(self.config.db_path)
+        steps = 0
+        try:
+            self._initialize_schema(conn)
+            pages = -self.merge_pages
+            while steps < self.max_merge_steps:
+                before = conn.total_changes
+                with conn:
+                    conn.execute(
+                        "INSERT INTO fts_documents(fts_documents, rank) "
+                        "VALUES('merge', ?)",
+                        (pages,),
+                    )
+                steps += 1
+                pages = self.merge_pages
+                if conn.total_changes - before < 2:
+                    break
+        finally:
+            conn.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Merged FTS segments in {steps} steps ({elapsed_ms:.1f}ms)")
+        return {"merge_steps": steps, "merge_ms": elapsed_ms}
+
     def search(
         self, query: SearchQuery, space_filter: Optional[Set[str]] = None
     ) -> List[SearchResult]:
-        """Search documents using FTS5."""
+        """
+        Search documents using FTS5.
+
+        The ranked hit list is cached per query (not per page) and stamped
+        with the write generations of the searched spaces, so a write to any
+        of them invalidates it and every page of an unchanged result set is
+        served from one entry.
+        """
+        return self.search_page(query, space_filter).items
+
+    def search_page(
+        self, query: SearchQuery, space_filter: Optional[Set[str]] = None
+    ) -> Page[SearchResult]:
+        """
+        One page of search results plus the cursor for the next page.
+
+        Hits are ranked by (score, doc_id); the cursor encodes that key of the
+        last hit and the next page starts right after it in the ranked list
+        (a binary search), so it stays correct if documents are added or
+        removed between pages. Raises InvalidCursorError for a cursor issued
+        for a different query.
+        """
+        fts_query = self._build_fts_query(query.text)
+        spaces = set(space_filter) if space_filter else None
+        cache_key = self._build_cache_key(query, spaces)
+        scope = cursor_scope("fts", cache_key)
+        after = decode_cursor(query.cursor, scope, 2) if query.cursor else None
+
         try:
-            # Check cache first
-            cache_key = self._build_cache_key(query, space_filter)
-            if cache_key in self._query_cache:
-                cached_results, timestamp = self._query_cache[cache_key]
-                # Cache TTL check (5 minutes)
-                if datetime.now(timezone.utc).timestamp() - timestamp < 300:
-                    return cached_results[query.offset : query.offset + query.limit]
-
-            # Build FTS query
-            fts_query = self._build_fts_query(query.text)
-
-            # Build conditions
-            conditions: List[str] = []
-            params: List[Any] = [fts_query]
-
-            # Add space filter
-            if space_filter:
-                space_placeholders = ",".join("?" * len(space_filter))
-                conditions.append(f"m.space_id IN ({space_placeholders})")
-                params.extend(space_filter)
-
-            # Add language filter
-            if query.languages:
-                lang_placeholders = ",".join("?" * len(query.languages))
-                conditions.append(f"m.lang IN ({lang_placeholders})")
-                params.extend(query.languages)
-
-            # Add band filter
-            if query.bands:
-                band_placeholders = ",".join("?" * len(query.bands))
-                conditions.append(f"m.band IN ({band_placeholders})")
-                params.extend(query.bands)
-
-            where_clause = " AND " + " AND ".join(conditions) if conditions else ""
-
-            # Execute search
+            start = query.offset
+            ranked, depth = self._ranked(fts_query, query, spaces, cache_key, start)
+            if after is not None:
+                start = bisect.bisect_right(ranked, after, key=self._rank_key)
+                if start + query.limit > depth and len(ranked) >= depth:
+                    # The cursor is past the cached depth: rank deeper
+                    ranked, depth = self._ranked(
+                        fts_query, query, spaces, cache_key, start
+                    )
+                    start = bisect.bisect_right(ranked, after, key=self._rank_key)
+
+            page = ranked[start : start + query.limit]
+            results = self._hydrate(fts_query, query, page)
+            more = start + query.limit < len(ranked) or len(ranked) >= depth
+            next_cursor = None
+            if page and len(page) == query.limit and more:
+                next_cursor = encode_cursor(scope, self._rank_key(page[-1]))
+            return Page(results, next_cursor)
+
+        except Exception as e:
+            logger.error(f"Search failed for query '{query.text}': {e}")
+            return Page()
+
+    def _ranked(
+        self,
+        fts_query: str,
+        query: SearchQuery,
+        spaces: Optional[Set[str]],
+        cache_key: str,
+        start: int,
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """Cached ranked list deep enough for a page starting at ``start``."""
+        stamp = self._generations.stamp(spaces)
+        end = start + query.limit
+
+        cached = self._query_cache.get(cache_key, stamp)
+        if cached is not None and (cached[1] >= end or len(cached[0]) < cached[1]):
+            return cached
+
+        depth = max(self.cache_depth, end)
+        ranked = self._rank(fts_query, query, spaces, depth)
+        self._query_cache.put(
+            cache_key,
+            (ranked, depth),
+            stamp,
+            len(ranked) * self._RANKED_HIT_BYTES + len(cache_key),
+        )
+        return ranked, depth
+
+    def _rank(
+        self,
+        fts_query: str,
+        query: SearchQuery,
+        space_filter: Optional[Set[str]],
+        depth: int,
+    ) -> List[Tuple[str, float]]:
+        """Ranked (doc_id, score) pairs for a query, best first (lowest score)."""
+        conditions: List[str] = []
+        params: List[Any] = [fts_query]
+
+        # Add space filter
+        if space_filter:
+            space_placeholders = ",".join("?" * len(space_filter))
+            conditions.append(f"m.space_id IN ({space_placeholders})")
+            params.extend(space_filter)
+
+        # Add language filter
+        if query.languages:
+            lang_placeholders = ",".join("?" * len(query.languages))
+            conditions.append(f"m.lang IN ({lang_placeholders})")
+            params.extend(query.languages)
+
+        # Add band and time filters
+        self._add_band_time_conditions(
+            conditions, params, query.bands, query.after, query.before
+        )
+
+        where_clause = " AND " + " AND ".join(conditions) if conditions else ""
+
+        cursor = self._connection.execute(
+            f"""
+            SELECT f.doc_id, m.lang, m.band, bm25(fts_documents) as score
+            FROM fts_documents f
+            JOIN fts_metadata m ON f.doc_id = m.doc_id
+            WHERE fts_documents MATCH ?{where_clause}
+            ORDER BY score
+            LIMIT ?
+        """,
+            params + [depth],
+        )
+        ranked = [
+            (
+                row[0],
+                self._calculate_custom_score(
+                    row[3], row[1], query.languages, row[2], query.bands
+                ),
+            )
+            for row in cursor.fetchall()
+        ]
+        # Total order on the boosted score, so pages can be keyed by it
+        ranked.sort(key=self._rank_key)
+        return ranked
+
+    def documents_matching(
+        self,
+        doc_ids: Iterable[str],
+        bands: Optional[List[str]] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+    ) -> Set[str]:
+        """
+        The subset of ``doc_ids`` whose band and ts pass the given filters.
+
+        Uses the same conditions as a SearchQuery, so hits found outside FTS
+        (e.g. vector neighbours) can be held to a query's band and time
+        bounds. Unknown doc_ids never match.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        matching: Set[str] = set()
+        for i in range(0, len(doc_ids), self._DOC_ID_CHUNK):
+            chunk = doc_ids[i : i + self._DOC_ID_CHUNK]
+            conditions = [f"m.doc_id IN ({','.join('?' * len(chunk))})"]
+            params: List[Any] = list(chunk)
+            self._add_band_time_conditions(conditions, params, bands, after, before)
+            cursor = self._connection.execute(
+                f"SELECT m.doc_id FROM fts_metadata m WHERE {' AND '.join(conditions)}",
+                params,
+            )
+            matching.update(row[0] for row in cursor.fetchall())
+        return matching
+
+    @staticmethod
+    def _add_band_time_conditions(
+        conditions: List[str],
+        params: List[Any],
+        bands: Optional[List[str]],
+        after: Optional[datetime],
+        before: Optional[datetime],
+    ) -> None:
+        """Append fts_metadata (alias m) band and ts filters."""
+        if bands:
+            conditions.append(f"m.band IN ({','.join('?' * len(bands))})")
+            params.extend(bands)
+        # julianday() compares timestamps across UTC offsets
+        if after is not None:
+            conditions.append("julianday(m.ts) >= julianday(?)")
+            params.append(after.isoformat())
+        if before is not None:
+            conditions.append("julianday(m.ts) < julianday(?)")
+            params.append(before.isoformat())
+
+    @staticmethod
+    def _rank_key(hit: Tuple[str, float]) -> Tuple[float, str]:
+        return (hit[1], hit[0])
+
+    def _hydrate(
+        self, fts_query: str, query: SearchQuery, page: List[Tuple[str, float]]
+    ) -> List[SearchResult]:
+        """Load one page of ranked hits in the query's projection."""
+        if not page:
+            return []
+        placeholders = ",".join("?" * len(page))
+        params = [fts_query] + [doc_id for doc_id, _ in page]
+        snippet = "snippet(fts_documents, 2, '<mark>', '</mark>', '...', 32)"
+
+        if query.projection == "snippet":
             cursor = self._connection.execute(
                 f"""
-                SELECT f.doc_id, f.text, m.space_id, m.lang, m.ts, m.band, m.source,
-                       snippet(fts_documents, 2, '<mark>', '</mark>', '...', 32) as snippet,
-                       bm25(fts_documents) as score
+                SELECT f.doc_id, {snippet}
                 FROM fts_documents f
-                JOIN fts_metadata m ON f.doc_id = m.doc_id
-                WHERE fts_documents MATCH ?{where_clause}
-                ORDER BY score
-                LIMIT ? OFFSET ?
+                WHERE fts_documents MATCH ? AND f.doc_id IN ({placeholders})
             """,
-                params + [query.limit, query.offset],
+                params,
             )
-
-            results: List[SearchResult] = []
-            for row in cursor.fetchall():
-                # Calculate custom score
-                score = self._calculate_custom_score(
-                    row[8], row[3], query.languages, row[5], query.bands
-                )
-
-                # Extract highlights if requested
-                highlights = (
-                    self._extract_highlights(row[1], query.text.split())
-                    if query.highlight
-                    else []
+            snippets = dict(cursor.fetchall())
+            return [
+                SearchResult(
+                    doc_id=doc_id,
+                    text=None,
+                    score=score,
+                    metadata={"snippet": snippets[doc_id]},
                 )
-
-                result = SearchResult(
-                    doc_id=row[0],
-                    text=row[1],
+                for doc_id, score in page
+                if doc_id in snippets
+            ]
+
+        rows = self._fetch_details(fts_query, page, query.highlight, snippet)
+        results: List[SearchResult] = []
+        for doc_id, score in page:
+            row = rows.get(doc_id)
+            if row is None:
+                continue
+            text, highlights, metadata = row
+            results.append(
+                SearchResult(
+                    doc_id=doc_id,
+                    text=text,
                     score=score,
                     highlights=highlights,
-                    metadata={
-                        "space_id": row[2],
-                        "lang": row[3],
-                        "ts": row[4],
-                        "band": row[5],
-                        "source": row[6],
-                        "snippet": row[7],
-                    },
+                    metadata=metadata,
                 )
-                results.append(result)
-
-            # Cache results
-            self._query_cache[cache_key] = (
-                results,
-                datetime.now(timezone.utc).timestamp(),
             )
-            self._cleanup_cache()
+        return results
 
+    def load_details(
+        self, query: SearchQuery, results: List[SearchResult]
+    ) -> List[SearchResult]:
+        """
+        Fill in text, metadata and (if ``query.highlight``) highlight offsets of
+        "snippet" projection results, with one query for the whole batch.
+        """
+        pending = [(r.doc_id, r.score) for r in results if r.text is None]
+        if not pending:
+            return results
+        try:
+            rows = self._fetch_details(
+                self._build_fts_query(query.text), pending, query.highlight
+            )
+        except Exception as e:
+            logger.error(f"Failed to load details for query '{query.text}': {e}")
             return results
+        for result in results:
+            row = rows.get(result.doc_id)
+            if result.text is None and row is not None:
+                result.text, result.highlights, metadata = row
+                result.metadata = {**metadata, **result.metadata}
+        return results
 
+    def _fetch_details(
+        self,
+        fts_query: str,
+        hits: List[Tuple[str, float]],
+        highlight: bool,
+        snippet: Optional[str] = None,
+    ) -> Dict[str, Tuple[str, List[Tuple[int, int]], Dict[str, Any]]]:
+        """
+        Text, highlight offsets and metadata per doc_id. With ``highlight`` the
+        text is read through FTS5 highlight() and the offsets recovered from
+        its markers, so matching follows the tokenizer (stemming included).
+        """
+        placeholders = ",".join("?" * len(hits))
+        text_column = (
+            "highlight(fts_documents, 2, char(2), char(3))" if highlight else "f.text"
+        )
+        cursor = self._connection.execute(
+            f"""
+            SELECT f.doc_id, {text_column}, m.space_id, m.lang, m.ts, m.band, m.source,
+                   {snippet or 'NULL'}
+            FROM fts_documents f
+            JOIN fts_metadata m ON f.doc_id = m.doc_id
+            WHERE fts_documents MATCH ? AND f.doc_id IN ({placeholders})
+        """,
+            [fts_query] + [doc_id for doc_id, _ in hits],
+        )
+
+        details: Dict[str, Tuple[str, List[Tuple[int, int]], Dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            text, highlights = row[1], []
+            if highlight and text is not None:
+                text, highlights = self._split_highlights(text)
+            metadata = {
+                "space_id": row[2],
+                "lang": row[3],
+                "ts": row[4],
+                "band": row[5],
+                "source": row[6],
+            }
+            if snippet:
+                metadata["snippet"] = row[7]
+            details[row[0]] = (text, highlights, metadata)
+        return details
+
+    def _split_highlights(self, marked: str) -> Tuple[str, List[Tuple[int, int]]]:
+        """Strip highlight() markers, returning plain text and (start, end) offsets."""
+        pattern = f"([{self._HIGHLIGHT_OPEN}{self._HIGHLIGHT_CLOSE}])"
+        plain: List[str] = []
+        highlights: List[Tuple[int, int]] = []
+        position = 0
+        start = 0
+        for part in re.split(pattern, marked):
+            if part == self._HIGHLIGHT_OPEN:
+                start = position
+            elif part == self._HIGHLIGHT_CLOSE:
+                highlights.append((start, position))
+            else:
+                plain.append(part)
+                position += len(part)
+        return "".join(plain), highlights
+
+    # Typeahead
+
+    def store_suggestions(self, suggestions: Iterable[Suggestion]) -> int:
+        """
+        Add titles/entity names to the typeahead index in one transaction.
+
+        Suggestions are independent of fts_documents, so entities from the
+        knowledge graph can be indexed next to document titles; deleting a
+        document through the store removes the suggestions with its doc_id.
+        Returns the number of suggestions stored.
+        """
+        rows = [
+            (
+                suggestion.label,
+                self._space_token(suggestion.space_id),
+                suggestion.space_id,
+                suggestion.doc_id,
+                suggestion.kind,
+                suggestion.weight,
+            )
+            for suggestion in suggestions
+            if suggestion.label.strip()
+        ]
+        if not rows:
+            return 0
+
+        conn = create_optimized_connection(self.config.db_path)
+        try:
+            self._initialize_schema(conn)
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO fts_typeahead (label, space_key, space_id, doc_id, kind, weight)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+        finally:
+            conn.close()
+
+        for space_id in {row[2] for row in rows}:
+            self._generations.bump(space_id)
+        logger.info(f"Stored {len(rows)} typeahead suggestions")
+        return len(rows)
+
+    def delete_suggestions(self, doc_id: str) -> int:
+        """Remove every typeahead suggestion of a document or entity."""
+        if not self._connection:
+            raise RuntimeError("No active connection")
+        spaces = [
+            row[0]
+            for row in self._connection.execute(
+                "SELECT DISTINCT space_id FROM fts_typeahead WHERE doc_id = ?",
+                (doc_id,),
+            )
+        ]
+        cursor = self._connection.execute(
+            "DELETE FROM fts_typeahead WHERE doc_id = ?", (doc_id,)
+        )
+        for space_id in spaces:
+            self._record_write(space_id)
+        return cursor.rowcount
+
+    def typeahead(
+        self,
+        prefix: str,
+        space_ids: Optional[Set[str]] = None,
+        limit: int = 8,
+        kinds: Optional[List[str]] = None,
+    ) -> List[Suggestion]:
+        """
+        Suggestions whose words start with the typed words, for a search box.
+
+        Every word of ``prefix`` is matched as a word prefix ("den app" finds
+        "Dentist appointment"). Candidates are read newest first, which FTS5
+        serves by walking the matching doclists backwards and stopping after
+        ``limit * typeahead_candidates`` rows, so the cost does not grow with
+        the number of matches; they are then re-ranked with labels starting
+        with the whole prefix first, then by weight. One suggestion is kept
+        per distinct label. Results are cached per (prefix, spaces, kinds)
+        until one of the spaces is written.
+        """
+        words = re.findall(r"\w+", prefix.lower())
+        if not words or sum(len(word) for word in words) < self.typeahead_min_chars:
+            return []
+        spaces = set(space_ids) if space_ids else None
+        key = (" ".join(words), tuple(sorted(spaces or ())), tuple(kinds or ()), limit)
+        stamp = self._generations.stamp(spaces)
+        cached = self._typeahead_cache.get(key, stamp)
+        if cached is not None:
+            return list(cached)
+
+        match = " AND ".join(f'label : "{word}"*' for word in words)
+        if spaces:
+            tokens = " OR ".join(self._space_token(space) for space in sorted(spaces))
+            match = f"space_key : ({tokens}) AND {match}"
+        conditions = ""
+        params: List[Any] = [match]
+        if kinds:
+            conditions = f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+
+        try:
+            cursor = self._connection.execute(
+                f"""
+                SELECT label, space_id, doc_id, kind, weight
+                FROM fts_typeahead
+                WHERE fts_typeahead MATCH ?{conditions}
+                ORDER BY rowid DESC
+                LIMIT ?
+            """,
+                params + [limit * self.typeahead_candidates],
+            )
+            candidates = [Suggestion(*row) for row in cursor.fetchall()]
         except Exception as e:
-            logger.error(f"Search failed for query '{query.text}': {e}")
+            logger.error(f"Typeahead failed for prefix '{prefix}': {e}")
             return []
 
+        # Stable sort: newest first among equally ranked candidates
+        typed = " ".join(words)
+        candidates.sort(
+            key=lambda s: (not s.label.lower().startswith(typed), -s.weight)
+        )
+        results: List[Suggestion] = []
+        seen: Set[str] = set()
+        for suggestion in candidates:
+            folded = suggestion.label.casefold()
+            if folded not in seen:
+                seen.add(folded)
+                results.append(suggestion)
+            if len(results) == limit:
+                break
+
+        self._typeahead_cache.put(
+            key,
+            tuple(results),
+            stamp,
+            sum(len(s.label) + len(s.doc_id) for s in results) + 64,
+        )
+        return results
+
+    @staticmethod
+    def _space_token(space_id: str) -> str:
+        """A single unicode61 token standing for one space in space_key."""
+        return "s" + hashlib.sha1(space_id.encode()).hexdigest()[:16]
+
     def get_document(
         self, doc_id: str, space_filter: Optional[Set[str]] = None
     ) -> Optional[FTSDocument]:
@@ -600,6 +1210,7 @@ class FTSStore(BaseStore):
                 "language_distribution": lang_dist,
                 "band_distribution": band_dist,
                 "cache_size": len(self._query_cache),
+                "query_cache": self._query_cache.stats(),
             }
 
             self._stats_cache = stats
@@ -615,6 +1226,7 @@ class FTSStore(BaseStore):
             self._connection.execute(
                 "INSERT INTO fts_documents(fts_documents) VALUES('rebuild')"
             )
+            self._generations.bump_all()
             logger.info("FTS index rebuilt successfully")
         except Exception as e:
             logger.error(f"Failed to rebuild FTS index: {e}")
@@ -635,6 +1247,7 @@ class FTSStore(BaseStore):
             self._connection.close()
             self._connection = None
         self._query_cache.clear()
+        self._typeahead_cache.clear()
 
     # Private helper methods
 
@@ -666,29 +1279,6 @@ class FTSStore(BaseStore):
         terms = escaped_text.split()
         return " AND ".join(f'"{term}"' for term in terms if term)
 
-    def _extract_highlights(
-        self, text: str, query_terms: List[str]
-    ) -> List[Tuple[int, int]]:
-        """Extract highlight positions from search text."""
-        highlights: List[Tuple[int, int]] = []
-        text_lower = text.lower()
-
-        for term in query_terms:
-            term_lower = term.lower().strip('"')
-            start = 0
-            while True:
-                pos = text_lower.find(term_lower, start)
-                if pos == -1:
-                    break
-
-                # Adjust for word boundaries
-                actual_start = pos
-                actual_end = pos + len(term_lower)
-                highlights.append((actual_start, actual_end))
-                start = actual_end
-
-        return sorted(highlights)
-
     def _calculate_custom_score(
         self,
         base_score: float,
@@ -717,29 +1307,75 @@ class FTSStore(BaseStore):
     def _build_cache_key(
         self, query: SearchQuery, space_filter: Optional[Set[str]]
     ) -> str:
-        """Build cache key for query."""
+        """Build cache key for query; pages of the same query share one key."""
         key_parts = [
             query.text,
             str(sorted(space_filter) if space_filter else ""),
             str(sorted(query.languages) if query.languages else ""),
             str(sorted(query.bands) if query.bands else ""),
-            str(query.limit),
-            str(query.offset),
+            query.after.isoformat() if query.after else "",
+            query.before.isoformat() if query.before else "",
         ]
         return hashlib.md5("|".join(key_parts).encode()).hexdigest()
 
-    def _cleanup_cache(self) -> None:
-        """Remove old entries from cache based on TTL."""
-        current_time = datetime.now(timezone.utc).timestamp()
-        ttl_seconds = 300  # 5 minutes
+    @staticmethod
+    def _document_data(document: FTSDocument) -> Dict[str, Any]:
+        return {
+            "doc_id": document.doc_id,
+            "space_id": document.space_id,
+            "text": document.text,
+            "lang": document.lang,
+            "ts": document.ts.isoformat(),
+            "band": document.band,
+            "source": document.source,
+            "tokens_count": document.tokens_count,
+            "segments": document.segments,
+        }
+
+    # FTS5 merge configuration
 
-        keys_to_remove: List[str] = []
-        for key, (_, timestamp) in self._query_cache.items():
-            if current_time - timestamp > ttl_seconds:
-                keys_to_remove.append(key)
+    def _merge_settings(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Current automerge/crisismerge values (FTS5 defaults when unset)."""
+        settings = dict(self._FTS5_MERGE_DEFAULTS)
+        rows = conn.execute(
+            "SELECT k, v FROM fts_documents_config "
+            "WHERE k IN ('automerge', 'crisismerge')"
+        )
+        settings.update({key: int(value) for key, value in rows})
+        return settings
+
+    def _apply_merge_settings(
+        self, conn: sqlite3.Connection, settings: Dict[str, int]
+    ) -> None:
+        for key, value in settings.items():
+            conn.execute(
+                "INSERT INTO fts_documents(fts_documents, rank) VALUES(?, ?)",
+                (key, value),
+            )
 
-        for key in keys_to_remove:
-            del self._query_cache[key]
+    # Cache invalidation
+
+    def _space_of(self, doc_id: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT space_id FROM fts_metadata WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _record_write(self, space_id: Optional[str]) -> None:
+        """Invalidate cached results for a space (all spaces if unknown)."""
+        self._generations.bump(space_id)
+        self._pending_spaces.add(space_id)
+        self._stats_cache = None
+
+    def _on_transaction_commit(self, conn: sqlite3.Connection) -> None:
+        self._pending_spaces.clear()
+
+    def _on_transaction_rollback(self, conn: sqlite3.Connection) -> None:
+        # Results cached after a write in this transaction may contain rows
+        # that are now rolled back
+        for space_id in self._pending_spaces:
+            self._generations.bump(space_id)
+        self._pending_spaces.clear()
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get or create database connection."""
@@ -0,0 +1,514 @@
+"""
+HNSW Approximate Nearest Neighbour Index for MemoryOS
+
+Pure NumPy implementation of a Hierarchical Navigable Small World graph
+(Malkov & Yashunin) over cosine similarity, used by VectorStore for the
+vectors of one ``index_name``/``model_id`` pair.
+
+Features:
+- Incremental insert; delete via tombstones that are traversed but never returned
+- Tunable recall/latency through ``ef_search`` (per index or per query)
+- Filtered search: per-attribute allow-list masks (e.g. ``space_id``) are applied
+  while traversing layer 0, so a filtered query returns exactly k allowed hits
+- Persisted as a single ``.npz`` file, written to a temp file and renamed into place
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import threading
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .vector_filters import AttributeBitmaps, AttributeFilters
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+class HNSWIndex:
+    """
+    HNSW graph over L2-normalized float32 vectors.
+
+    Node labels are dense integers assigned in insertion order. Re-adding an
+    existing vec_id tombstones the old node and inserts a fresh one, so the
+    tombstone ratio (``deleted_ratio``) is the signal for a compacting rebuild.
+
+    Nodes can carry filter attributes (declared up front via ``attributes``);
+    ``search(filters=...)`` only returns nodes whose attributes match.
+    """
+
+    # A filtered query whose allow-list covers at most this fraction of the
+    # nodes is answered by an exact scan of the allowed rows instead of a
+    # graph traversal that would mostly visit rejected nodes
+    filter_scan_ratio = 0.05
+
+    def __init__(
+        self,
+        dim: int,
+        M: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        seed: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        attributes: Sequence[str] = (),
+    ):
+        if dim < 1:
+            raise ValueError(f"Invalid dimension: {dim}")
+        if M < 2:
+            raise ValueError(f"M must be at least 2, got {M}")
+        self.dim = dim
+        self.M = M
+        self.M0 = 2 * M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+        self._level_mult = 1.0 / math.log(M)
+        self._rng = random.Random(seed)
+        self._vectors = np.zeros((64, dim), dtype=np.float32)
+        self._deleted = np.zeros(64, dtype=bool)
+        self._ids: List[str] = []
+        self._label_of: Dict[str, int] = {}
+        self._levels: List[int] = []
+        self._links: List[List[List[int]]] = []
+        self._deleted_count = 0
+        self._entry = -1
+        self._max_level = -1
+        self._bitmaps = AttributeBitmaps(attributes)
+        self._lock = threading.RLock()
+
+    # Introspection
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._deleted_count
+
+    def __contains__(self, vec_id: str) -> bool:
+        return vec_id in self._label_of
+
+    @property
+    def node_count(self) -> int:
+        """Nodes in the graph, including tombstones."""
+        return len(self._ids)
+
+    @property
+    def deleted_count(self) -> int:
+        return self._deleted_count
+
+    @property
+    def deleted_ratio(self) -> float:
+        return self._deleted_count / len(self._ids) if self._ids else 0.0
+
+    def live_ids(self) -> List[str]:
+        """vec_ids of live nodes in label order."""
+        # _ids keeps the labels of replaced nodes too; only the current one counts
+        return [
+            vec_id
+            for label, vec_id in enumerate(self._ids)
+            if self._label_of.get(vec_id) == label
+        ]
+
+    @property
+    def attributes(self) -> List[str]:
+        """Filter attributes tracked per node."""
+        return self._bitmaps.attributes
+
+    def get_attribute(self, vec_id: str, attribute: str) -> Optional[str]:
+        label = self._label_of.get(vec_id)
+        return None if label is None else self._bitmaps.get(label, attribute)
+
+    def has_vector(self, vec_id: str, vector: Iterable[float]) -> bool:
+        """True if ``vec_id`` is live and stores ``vector`` (up to scale)."""
+        label = self._label_of.get(vec_id)
+        if label is None:
+            return False
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.dim,):
+            return False
+        return bool(
+            np.allclose(self._vectors[label], self._normalize(array), atol=1e-6)
+        )
+
+    # Mutation
+
+    def add(
+        self,
+        vec_id: str,
+        vector: Iterable[float],
+        attributes: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> None:
+        """Insert a vector, replacing any live node with the same vec_id."""
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.dim,):
+            raise ValueError(
+                f"Vector dimension {array.shape} does not match index dim {self.dim}"
+            )
+        with self._lock:
+            if vec_id in self._label_of:
+                self._remove_locked(vec_id)
+            self._insert(vec_id, self._normalize(array), attributes)
+
+    def add_batch(
+        self,
+        vec_ids: Sequence[str],
+        vectors: np.ndarray,
+        attributes: Optional[Sequence[Mapping[str, Optional[str]]]] = None,
+    ) -> None:
+        """Insert a block of vectors, normalizing the block in one pass."""
+        block = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block = np.where(norms > 0, block / np.where(norms > 0, norms, 1.0), 0.0)
+        with self._lock:
+            self._reserve(len(self._ids) + len(vec_ids))
+            for position, (vec_id, vector) in enumerate(zip(vec_ids, block)):
+                if vec_id in self._label_of:
+                    self._remove_locked(vec_id)
+                self._insert(
+                    vec_id,
+                    vector.astype(np.float32, copy=False),
+                    attributes[position] if attributes is not None else None,
+                )
+
+    def set_attributes(
+        self, vec_id: str, attributes: Mapping[str, Optional[str]]
+    ) -> bool:
+        """Update the filter attributes of a live node."""
+        with self._lock:
+            label = self._label_of.get(vec_id)
+            if label is None:
+                return False
+            self._bitmaps.set(label, attributes)
+            return True
+
+    def add_attribute(self, attribute: str) -> None:
+        """Start tracking a filter attribute; existing nodes have it unset."""
+        with self._lock:
+            self._bitmaps.add_attribute(attribute)
+
+    def remove(self, vec_id: str) -> bool:
+        """Tombstone a vector. Returns False if it is not in the index."""
+        with self._lock:
+            return self._remove_locked(vec_id)
+
+    def _remove_locked(self, vec_id: str) -> bool:
+        label = self._label_of.pop(vec_id, None)
+        if label is None:
+            return False
+        self._deleted[label] = True
+        self._deleted_count += 1
+        self._bitmaps.clear(label)
+        return True
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self._vectors.shape[0]:
+            return
+        new_capacity = max(capacity, self._vectors.shape[0] * 2)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[: len(self._ids)] = self._vectors[: len(self._ids)]
+        deleted = np.zeros(new_capacity, dtype=bool)
+        deleted[: len(self._ids)] = self._deleted[: len(self._ids)]
+        self._vectors = vectors
+        self._deleted = deleted
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _insert(
+        self,
+        vec_id: str,
+        vector: np.ndarray,
+        attributes: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> None:
+        label = len(self._ids)
+        self._reserve(label + 1)
+        self._vectors[label] = vector
+        self._ids.append(vec_id)
+        self._label_of[vec_id] = label
+        if attributes:
+            self._bitmaps.set(label, attributes)
+        level = self._random_level()
+        self._levels.append(level)
+        self._links.append([[] for _ in range(level + 1)])
+
+        if self._entry < 0:
+            self._entry = label
+            self._max_level = level
+            return
+
+        entry = self._entry
+        for layer in range(self._max_level, level, -1):
+            entry = self._search_layer(vector, [entry], 1, layer)[0][1]
+
+        entry_points = [entry]
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(
+                vector, entry_points, self.ef_construction, layer
+            )
+            max_links = self.M0 if layer == 0 else self.M
+            neighbours = self._select_neighbours(found, self.M)
+            self._links[label][layer] = neighbours
+            for neighbour in neighbours:
+                links = self._links[neighbour][layer]
+                links.append(label)
+                if len(links) > max_links:
+                    self._links[neighbour][layer] = self._shrink(
+                        neighbour, links, max_links
+                    )
+            entry_points = [node for _, node in found]
+
+        if level > self._max_level:
+            self._entry = label
+            self._max_level = level
+
+    def _shrink(self, node: int, links: List[int], max_links: int) -> List[int]:
+        """Re-select a node's neighbour list after it overflowed."""
+        dists = 1.0 - self._vectors[links] @ self._vectors[node]
+        ranked = sorted(zip(dists.tolist(), links))
+        return self._select_neighbours(ranked, max_links)
+
+    def _select_neighbours(
+        self, candidates: List[Tuple[float, int]], m: int
+    ) -> List[int]:
+        """
+        HNSW neighbour-selection heuristic.
+
+        Keeps a candidate only if it is closer to the base node than to every
+        neighbour already selected, which preserves links across clusters.
+        ``candidates`` must be sorted by distance ascending.
+        """
+        selected: List[int] = []
+        for dist, node in candidates:
+            if len(selected) >= m:
+                break
+            if selected:
+                to_selected = 1.0 - self._vectors[selected] @ self._vectors[node]
+                if (to_selected < dist).any():
+                    continue
+            selected.append(node)
+        return selected
+
+    # Search
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+        accept: Optional[Callable[[int], bool]] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        Best-first search on one layer; returns up to ``ef`` (distance, label)
+        pairs sorted ascending. Nodes rejected by ``accept`` are still traversed
+        but never enter the result set.
+        """
+        visited = set(entry_points)
+        entry_dists = (1.0 - self._vectors[entry_points] @ query).tolist()
+        candidates = list(zip(entry_dists, entry_points))
+        heapq.heapify(candidates)
+        results: List[Tuple[float, int]] = []
+        for dist, node in candidates:
+            if accept is None or accept(node):
+                results.append((-dist, node))
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            dist, node = heapq.heappop(candidates)
+            if len(results) >= ef and dist > -results[0][0]:
+                break
+            fresh = [n for n in self._links[node][layer] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            dists = (1.0 - self._vectors[fresh] @ query).tolist()
+            for neighbour, neighbour_dist in zip(fresh, dists):
+                if len(results) < ef or neighbour_dist < -results[0][0]:
+                    heapq.heappush(candidates, (neighbour_dist, neighbour))
+                    if accept is None or accept(neighbour):
+                        heapq.heappush(results, (-neighbour_dist, neighbour))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+
+        return sorted((-negative, node) for negative, node in results)
+
+    def search(
+        self,
+        query_vector: Iterable[float],
+        k: int = 10,
+        ef_search: Optional[int] = None,
+        filters: Optional[AttributeFilters] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k by cosine similarity.
+
+        Returns (vec_id, similarity) pairs, highest first. ``ef_search`` trades
+        latency for recall; it is raised to ``k`` if smaller.
+
+        ``filters`` maps attributes to allowed values (e.g. ``{"space_id":
+        {"personal:alice", "shared:household"}}``). The resulting allow-list is
+        applied during the layer-0 traversal - rejected nodes are walked through
+        but never returned - and ef is widened until ``min(k, allowed)`` hits
+        are found. Very selective filters are answered by an exact scan.
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (self.dim,):
+            raise ValueError(
+                f"Query dimension {query.shape} does not match index dim {self.dim}"
+            )
+        query = self._normalize(query)
+        with self._lock:
+            if self._entry < 0 or len(self) == 0 or k <= 0:
+                return []
+            count = len(self._ids)
+            allowed = ~self._deleted[:count]
+            if filters:
+                allowed &= self._bitmaps.allowed(count, filters)
+            allowed_count = int(np.count_nonzero(allowed))
+            want = min(k, allowed_count)
+            if want == 0:
+                return []
+
+            ef = max(ef_search or self.ef_search, k)
+            if filters and allowed_count <= max(ef, count * self.filter_scan_ratio):
+                found = self._scan(query, np.flatnonzero(allowed), k)
+            else:
+                entry = self._entry
+                for layer in range(self._max_level, 0, -1):
+                    entry = self._search_layer(query, [entry], 1, layer)[0][1]
+                accept = allowed.__getitem__
+                found = self._search_layer(query, [entry], ef, 0, accept=accept)
+                while len(found) < want and ef < count:
+                    ef = min(ef * 2, count)
+                    found = self._search_layer(query, [entry], ef, 0, accept=accept)
+                if len(found) < want:
+                    found = self._scan(query, np.flatnonzero(allowed), k)
+            return [(self._ids[node], 1.0 - dist) for dist, node in found[:k]]
+
+    def _scan(
+        self, query: np.ndarray, labels: np.ndarray, k: int
+    ) -> List[Tuple[float, int]]:
+        """Exact top-k over a set of node labels as (distance, label) pairs."""
+        dists = 1.0 - self._vectors[labels] @ query
+        if labels.size > k:
+            part = np.argpartition(dists, k - 1)[:k]
+            labels, dists = labels[part], dists[part]
+        order = np.argsort(dists, kind="stable")
+        return [(float(dists[i]), int(labels[i])) for i in order]
+
+    # Persistence
+
+    def save(self, path: Path) -> None:
+        """Write the index to ``path`` atomically (temp file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            count = len(self._ids)
+            link_counts: List[int] = []
+            flat_links: List[int] = []
+            for node_links in self._links:
+                for layer_links in node_links:
+                    link_counts.append(len(layer_links))
+                    flat_links.extend(layer_links)
+            header = {
+                "format_version": FORMAT_VERSION,
+                "dim": self.dim,
+                "M": self.M,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "entry": self._entry,
+                "max_level": self._max_level,
+                "metadata": self.metadata,
+                "attributes": self._bitmaps.attributes,
+            }
+            arrays = {
+                "header": np.array(json.dumps(header)),
+                "ids": np.array(self._ids, dtype=str),
+                "vectors": self._vectors[:count],
+                "deleted": self._deleted[:count],
+                "levels": np.asarray(self._levels, dtype=np.int32),
+                "link_counts": np.asarray(link_counts, dtype=np.int32),
+                "links": np.asarray(flat_links, dtype=np.int32),
+                **self._bitmaps.to_arrays(count),
+            }
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **arrays)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "HNSWIndex":
+        """Load an index written by :meth:`save`."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            if header.get("format_version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported HNSW format version {header.get('format_version')} in {path}"
+                )
+            index = cls(
+                dim=header["dim"],
+                M=header["M"],
+                ef_construction=header["ef_construction"],
+                ef_search=header["ef_search"],
+                metadata=header.get("metadata"),
+            )
+            ids = [str(vec_id) for vec_id in data["ids"]]
+            count = len(ids)
+            index._reserve(count)
+            index._vectors[:count] = data["vectors"]
+            index._deleted[:count] = data["deleted"]
+            index._ids = ids
+            index._levels = data["levels"].tolist()
+            link_counts = data["link_counts"].tolist()
+            flat_links = data["links"].tolist()
+            attributes = header.get("attributes", [])
+            if attributes:
+                index._bitmaps = AttributeBitmaps.from_arrays(attributes, data)
+
+        position = 0
+        cursor = 0
+        for level in index._levels:
+            node_links: List[List[int]] = []
+            for _ in range(level + 1):
+                size = link_counts[position]
+                node_links.append(flat_links[cursor : cursor + size])
+                cursor += size
+                position += 1
+            index._links.append(node_links)
+
+        index._label_of = {
+            vec_id: label
+            for label, vec_id in enumerate(ids)
+            if not index._deleted[label]
+        }
+        index._deleted_count = count - len(index._label_of)
+        index._entry = header["entry"]
+        index._max_level = header["max_level"]
+        return index
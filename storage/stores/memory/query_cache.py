@@ -0,0 +1,159 @@
+"""
+Write-aware Query Result Cache for MemoryOS
+
+Bounded LRU cache for search results whose entries are stamped with the
+write generations of the spaces they cover. Stores bump a space's generation
+on every write, so a stale entry is detected on lookup in O(1) instead of
+waiting for a TTL or walking the cache to invalidate it.
+
+Entries are kept in insertion/access order in an ``OrderedDict``; hits move an
+entry to the end and eviction pops from the front, so lookups, inserts and
+evictions are all O(1). The cache is bounded both by entry count and by an
+approximate byte budget supplied per entry by the caller.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GenerationStamp = Tuple[Any, ...]
+
+
+class WriteGenerations:
+    """
+    Per-space write counters.
+
+    ``bump(space_id)`` invalidates every entry that covers that space, including
+    entries for unfiltered queries; ``bump_all()`` invalidates everything (for
+    writes whose space is unknown, or maintenance such as an index rebuild).
+    """
+
+    def __init__(self) -> None:
+        self._spaces: Dict[str, int] = {}
+        self._total = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def bump(self, space_id: Optional[str]) -> None:
+        with self._lock:
+            if space_id is None:
+                self._epoch += 1
+            else:
+                self._spaces[space_id] = self._spaces.get(space_id, 0) + 1
+            self._total += 1
+
+    def bump_all(self) -> None:
+        self.bump(None)
+
+    def stamp(self, space_ids: Optional[Iterable[str]] = None) -> GenerationStamp:
+        """Generations an entry for these spaces (None: all spaces) depends on."""
+        with self._lock:
+            if space_ids is None:
+                return (self._epoch, self._total)
+            return (self._epoch,) + tuple(
+                (space_id, self._spaces.get(space_id, 0))
+                for space_id in sorted(set(space_ids))
+            )
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    stamp: GenerationStamp
+    size: int
+    created: float
+
+
+class QueryResultCache:
+    """O(1) LRU with an entry limit, a byte budget, a TTL and generation stamps."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 300.0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable, stamp: GenerationStamp) -> Optional[Any]:
+        """Return the cached value if it was stored under the same stamp."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expired = (
+                self.ttl_seconds is not None
+                and time.monotonic() - entry.created > self.ttl_seconds
+            )
+            if expired or entry.stamp != stamp:
+                self._drop(key)
+                self._stale += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, stamp: GenerationStamp, size: int) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _CacheEntry(value, stamp, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,153 @@
+"""
+Vector Codecs for MemoryOS
+
+Binary encodings for the ``dtype`` values of vector_row.schema.json:
+
+- f32:      little-endian float32, 4 bytes per component
+- f16:      little-endian IEEE half precision, 2 bytes per component
+- bfloat16: upper 16 bits of float32 (round-to-nearest-even), 2 bytes per component
+- q8:       per-vector scaled int8 - a float32 scale followed by ``dim`` int8 values,
+            where ``value = int8 * scale`` and ``scale = max(|x|) / 127``
+
+Rows written before these encodings existed stored every dtype as packed float32;
+decoding detects that layout by blob length so old rows keep working.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+VECTOR_DTYPES = ("f32", "f16", "q8", "bfloat16")
+
+_Q8_SCALE_BYTES = 4
+_Q8_MAX = 127.0
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def encoded_size(dim: int, dtype: str) -> int:
+    """Number of bytes used to store one vector of ``dim`` components."""
+    if dtype == "f32":
+        return 4 * dim
+    if dtype in ("f16", "bfloat16"):
+        return 2 * dim
+    if dtype == "q8":
+        return _Q8_SCALE_BYTES + dim
+    raise ValueError(f"Unsupported dtype: {dtype}")
+
+
+def float32_to_bfloat16(block: np.ndarray) -> np.ndarray:
+    """Round float32 values to bfloat16, returned as raw uint16 bit patterns."""
+    bits = np.ascontiguousarray(block, dtype=np.float32).view(np.uint32)
+    # Round to nearest even on the 16 discarded mantissa bits
+    rounding = ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    return ((bits + rounding) >> 16).astype(np.uint16)
+
+
+def bfloat16_to_float32(bits: np.ndarray) -> np.ndarray:
+    """Expand raw bfloat16 bit patterns back to float32."""
+    return (bits.astype(np.uint32) << 16).view(np.float32)
+
+
+def quantize_q8(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Returns (int8 matrix, float32 scales) such that ``row ~= int8 * scale``.
+    """
+    block = np.atleast_2d(np.asarray(block, dtype=np.float32))
+    scales = (np.abs(block).max(axis=1) / _Q8_MAX).astype(np.float32)
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.rint(block / safe[:, None]).clip(-_Q8_MAX, _Q8_MAX).astype(np.int8)
+    return codes, scales
+
+
+def dequantize_q8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`quantize_q8`."""
+    return codes.astype(np.float32) * scales.astype(np.float32)[:, None]
+
+
+def encode_vector(vector: ArrayLike, dtype: str) -> bytes:
+    """Serialize one vector to its on-disk representation."""
+    array = np.asarray(vector, dtype=np.float32)
+    if dtype == "f32":
+        return array.astype("<f4").tobytes()
+    if dtype == "f16":
+        return array.astype("<f2").tobytes()
+    if dtype == "bfloat16":
+        return float32_to_bfloat16(array).astype("<u2").tobytes()
+    if dtype == "q8":
+        codes, scales = quantize_q8(array[None, :])
+        return scales.astype("<f4").tobytes() + codes.tobytes()
+    raise ValueError(f"Unsupported dtype: {dtype}")
+
+
+def encode_block(block: np.ndarray, dtype: str) -> List[bytes]:
+    """Serialize an (n, dim) block of vectors, encoding the whole block at once."""
+    block = np.atleast_2d(np.asarray(block, dtype=np.float32))
+    if dtype == "f32":
+        raw = block.astype("<f4")
+    elif dtype == "f16":
+        raw = block.astype("<f2")
+    elif dtype == "bfloat16":
+        raw = float32_to_bfloat16(block).astype("<u2")
+    elif dtype == "q8":
+        codes, scales = quantize_q8(block)
+        raw = np.concatenate(
+            [scales.astype("<f4")[:, None].view(np.int8), codes], axis=1
+        )
+    else:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    raw = np.ascontiguousarray(raw)
+    return [row.tobytes() for row in raw]
+
+
+def decode_vector(data: bytes, dim: int, dtype: str) -> np.ndarray:
+    """Deserialize one vector to a float32 array."""
+    return decode_block([data], dim, dtype)[0]
+
+
+def decode_block(blobs: Sequence[bytes], dim: int, dtype: str) -> np.ndarray:
+    """
+    Deserialize many same-dtype vectors into an (n, dim) float32 matrix.
+
+    Uses a single ``np.frombuffer`` over the joined blobs when every blob has the
+    expected size, falling back to per-row decoding when legacy f32-packed rows
+    are mixed in.
+    """
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    if not blobs:
+        return np.zeros((0, dim), dtype=np.float32)
+
+    size = encoded_size(dim, dtype)
+    if all(len(blob) == size for blob in blobs):
+        return _decode_joined(b"".join(blobs), len(blobs), dim, dtype)
+
+    out = np.empty((len(blobs), dim), dtype=np.float32)
+    for i, blob in enumerate(blobs):
+        if len(blob) == size:
+            out[i] = _decode_joined(blob, 1, dim, dtype)[0]
+        elif len(blob) == 4 * dim:
+            # Legacy layout: every dtype was packed as float32
+            out[i] = np.frombuffer(blob, dtype="<f4")
+        else:
+            raise ValueError(
+                f"Vector blob of {len(blob)} bytes does not match dim {dim} dtype {dtype}"
+            )
+    return out
+
+
+def _decode_joined(buffer: bytes, count: int, dim: int, dtype: str) -> np.ndarray:
+    if dtype == "f32":
+        return np.frombuffer(buffer, dtype="<f4").reshape(count, dim).astype(np.float32)
+    if dtype == "f16":
+        return np.frombuffer(buffer, dtype="<f2").reshape(count, dim).astype(np.float32)
+    if dtype == "bfloat16":
+        bits = np.frombuffer(buffer, dtype="<u2").reshape(count, dim)
+        return bfloat16_to_float32(bits)
+    raw = np.frombuffer(buffer, dtype=np.int8).reshape(count, _Q8_SCALE_BYTES + dim)
+    scales = np.ascontiguousarray(raw[:, :_Q8_SCALE_BYTES]).view("<f4").reshape(count)
+    return dequantize_q8(raw[:, _Q8_SCALE_BYTES:], scales)
@@ -0,0 +1,163 @@
+"""
+Attribute Allow-lists for Vector Search in MemoryOS
+
+Boolean NumPy masks over the integer row slots of a vector index, one per value
+of each filter attribute (e.g. ``space_id`` or ``privacy_band``). Masks are
+updated in O(1) on every write, so a search can build its allow-list for a set
+of spaces and bands with a few vectorized ORs/ANDs and apply it while
+traversing the index instead of filtering in SQL beforehand or dropping hits
+afterwards.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AttributeFilters = Mapping[str, Iterable[str]]
+
+
+class AttributeBitmaps:
+    """
+    Per-value allow-list masks over row slots.
+
+    Each attribute keeps an int32 code per slot (-1 when unset) plus one
+    boolean mask per distinct value. ``allowed`` ORs the masks of the requested
+    values within an attribute and ANDs the result across attributes.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, attributes: Sequence[str] = ()) -> None:
+        self._capacity = self._INITIAL_CAPACITY
+        self._codes: Dict[str, np.ndarray] = {}
+        self._values: Dict[str, List[str]] = {}
+        self._code_of: Dict[str, Dict[str, int]] = {}
+        self._masks: Dict[str, List[np.ndarray]] = {}
+        for attribute in attributes:
+            self.add_attribute(attribute)
+
+    @property
+    def attributes(self) -> List[str]:
+        return list(self._codes)
+
+    def __contains__(self, attribute: str) -> bool:
+        return attribute in self._codes
+
+    def add_attribute(self, attribute: str) -> None:
+        """Start tracking a new attribute; every existing slot is unset."""
+        if attribute in self._codes:
+            return
+        self._codes[attribute] = np.full(self._capacity, -1, dtype=np.int32)
+        self._values[attribute] = []
+        self._code_of[attribute] = {}
+        self._masks[attribute] = []
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self._capacity:
+            return
+        new_capacity = max(capacity, self._capacity * 2)
+        for attribute, codes in self._codes.items():
+            grown = np.full(new_capacity, -1, dtype=np.int32)
+            grown[: self._capacity] = codes
+            self._codes[attribute] = grown
+            masks = self._masks[attribute]
+            for position, mask in enumerate(masks):
+                grown_mask = np.zeros(new_capacity, dtype=bool)
+                grown_mask[: self._capacity] = mask
+                masks[position] = grown_mask
+        self._capacity = new_capacity
+
+    def _code(self, attribute: str, value: str) -> int:
+        code = self._code_of[attribute].get(value)
+        if code is None:
+            code = len(self._values[attribute])
+            self._values[attribute].append(value)
+            self._code_of[attribute][value] = code
+            self._masks[attribute].append(np.zeros(self._capacity, dtype=bool))
+        return code
+
+    def set(self, slot: int, attributes: Mapping[str, Optional[str]]) -> None:
+        """Assign attribute values to a slot, replacing any previous values."""
+        self._reserve(slot + 1)
+        for attribute, value in attributes.items():
+            if attribute not in self._codes:
+                continue
+            codes = self._codes[attribute]
+            previous = codes[slot]
+            if previous >= 0:
+                self._masks[attribute][previous][slot] = False
+            if value is None:
+                codes[slot] = -1
+                continue
+            code = self._code(attribute, value)
+            codes[slot] = code
+            self._masks[attribute][code][slot] = True
+
+    def clear(self, slot: int) -> None:
+        """Unset every attribute of a slot."""
+        if slot >= self._capacity:
+            return
+        self.set(slot, {attribute: None for attribute in self._codes})
+
+    def get(self, slot: int, attribute: str) -> Optional[str]:
+        if attribute not in self._codes or slot >= self._capacity:
+            return None
+        code = self._codes[attribute][slot]
+        return self._values[attribute][code] if code >= 0 else None
+
+    def allowed(self, size: int, filters: AttributeFilters) -> np.ndarray:
+        """
+        Mask of the first ``size`` slots matching every attribute filter.
+
+        Filtering on an attribute that is not tracked raises ValueError rather
+        than silently allowing everything.
+        """
+        self._reserve(size)
+        allowed = np.ones(size, dtype=bool)
+        for attribute, values in filters.items():
+            if attribute not in self._codes:
+                raise ValueError(f"Attribute {attribute!r} is not indexed")
+            matched = np.zeros(size, dtype=bool)
+            for value in set(values):
+                code = self._code_of[attribute].get(value)
+                if code is not None:
+                    matched |= self._masks[attribute][code][:size]
+            allowed &= matched
+        return allowed
+
+    # Persistence
+
+    def to_arrays(self, size: int, prefix: str = "attr") -> Dict[str, np.ndarray]:
+        """Codes and value tables for the first ``size`` slots, for ``np.savez``."""
+        arrays: Dict[str, np.ndarray] = {}
+        for position, attribute in enumerate(self._codes):
+            arrays[f"{prefix}{position}_codes"] = self._codes[attribute][:size].copy()
+            arrays[f"{prefix}{position}_values"] = np.array(
+                self._values[attribute], dtype=str
+            )
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls,
+        attributes: Sequence[str],
+        data: Mapping[str, np.ndarray],
+        prefix: str = "attr",
+    ) -> "AttributeBitmaps":
+        """Rebuild bitmaps written by :meth:`to_arrays`."""
+        bitmaps = cls(attributes)
+        for position, attribute in enumerate(attributes):
+            codes = np.asarray(data[f"{prefix}{position}_codes"], dtype=np.int32)
+            values = [str(value) for value in data[f"{prefix}{position}_values"]]
+            bitmaps._reserve(len(codes))
+            bitmaps._codes[attribute][: len(codes)] = codes
+            for value in values:
+                bitmaps._code(attribute, value)
+            for code in range(len(values)):
+                bitmaps._masks[attribute][code][: len(codes)] = codes == code
+        return bitmaps
@@ -0,0 +1,1031 @@
+"""
+Vector Matrix Index for MemoryOS
+
+In-memory search engine backing VectorStore.similarity_search. Vectors are kept
+in one contiguous matrix per (model_id, space_id) partition together with
+precomputed L2 norms, so a top-k query is a single matrix-vector product followed
+by ``np.argpartition`` instead of a per-row Python loop. Partitions holding q8
+rows are ranked on their int8 codes and only the leading candidates are
+re-scored exactly. ``search_batch`` and ``similarity_matrix`` score a block of
+queries against many rows with one matrix-matrix product.
+
+Partitions are loaded lazily from ``vector_rows`` on first use and then kept in
+sync by VectorStore on every store/update/delete. A partition may instead be a
+LayeredVectorSegment: a read-only base mapped from a sidecar segment file (see
+vector_segments) plus a small in-memory delta that is merged back into the file
+in the background.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from .vector_codec import (
+    bfloat16_to_float32,
+    decode_block,
+    dequantize_q8,
+    encode_block,
+    float32_to_bfloat16,
+    quantize_q8,
+)
+
+logger = logging.getLogger(__name__)
+
+PartitionKey = Tuple[str, str]  # (model_id, space_id)
+
+# (vec_ids, matrix, norms, scales) in the partition's storage dtype
+SegmentArrays = Tuple[List[str], np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+
+def similarity_matrix(
+    queries: Any,
+    candidates: Any,
+    candidate_norms: Optional[np.ndarray] = None,
+    query_norms: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Cosine similarity of every query row against every candidate row.
+
+    Returns a float32 matrix of shape (len(queries), len(candidates)) computed
+    with a single matrix-matrix product. Rows with a zero norm score 0.0.
+    Precomputed norms may be passed to skip recomputing them.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    candidates = np.asarray(candidates, dtype=np.float32)
+    if queries.ndim == 1:
+        queries = queries[None, :]
+    if candidates.size == 0:
+        return np.zeros((queries.shape[0], 0), dtype=np.float32)
+    if candidates.ndim == 1:
+        candidates = candidates[None, :]
+    if queries.shape[1] != candidates.shape[1]:
+        raise ValueError(
+            f"Dimension mismatch: queries have {queries.shape[1]}, "
+            f"candidates have {candidates.shape[1]}"
+        )
+    if query_norms is None:
+        query_norms = np.linalg.norm(queries, axis=1)
+    if candidate_norms is None:
+        candidate_norms = np.linalg.norm(candidates, axis=1)
+    dots = queries @ candidates.T
+    denom = np.outer(query_norms, candidate_norms).astype(np.float32, copy=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sims = np.where(denom > 0, dots / denom, 0.0)
+    return sims.astype(np.float32, copy=False)
+
+
+class VectorMatrixSegment:
+    """
+    Contiguous matrix for a single (model_id, space_id) partition.
+
+    Rows are held in the partition's storage dtype - float32, float16, raw
+    bfloat16 bits or per-row scaled int8 - so reduced-precision partitions keep
+    their 2-4x memory saving in the search matrix. Rows are addressed by vec_id
+    through ``_row_of``. Appends grow the backing matrix geometrically; deletes
+    move the last row into the freed slot so the live rows always occupy
+    ``[0, size)`` without gaps.
+    """
+
+    _INITIAL_CAPACITY = 64
+    _SCAN_CHUNK_ROWS = 8192
+    _STORAGE_DTYPES = {
+        "f32": np.float32,
+        "f16": np.float16,
+        "bfloat16": np.uint16,
+        "q8": np.int8,
+    }
+
+    def __init__(self, dim: int, capacity: int = _INITIAL_CAPACITY, dtype: str = "f32"):
+        if dtype not in self._STORAGE_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        self.dim = dim
+        self.dtype = dtype
+        self.size = 0
+        capacity = max(capacity, 1)
+        self._matrix = np.zeros((capacity, dim), dtype=self._STORAGE_DTYPES[dtype])
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        self._scales = np.zeros(capacity if dtype == "q8" else 0, dtype=np.float32)
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dim: int,
+        dtype: str,
+        vec_ids: List[str],
+        matrix: np.ndarray,
+        norms: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+    ) -> "VectorMatrixSegment":
+        """
+        Wrap existing storage-dtype arrays (e.g. read-only memmaps) without copying.
+
+        The result is only suitable for reads; LayeredVectorSegment keeps all
+        writes in a separate delta.
+        """
+        segment = cls.__new__(cls)
+        segment.dim = dim
+        segment.dtype = dtype
+        segment.size = len(vec_ids)
+        segment._matrix = matrix
+        segment._norms = norms
+        segment._scales = (
+            scales if scales is not None else np.zeros(0, dtype=np.float32)
+        )
+        segment._ids = list(vec_ids)
+        segment._row_of = {vec_id: row for row, vec_id in enumerate(segment._ids)}
+        return segment
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live rows decoded to float32."""
+        return self.decode_rows(0, self.size)
+
+    @property
+    def norms(self) -> np.ndarray:
+        """View of the live row norms."""
+        return self._norms[: self.size]
+
+    @property
+    def ids(self) -> List[str]:
+        """vec_ids in row order."""
+        return self._ids
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the backing arrays."""
+        return self._matrix.nbytes + self._norms.nbytes + self._scales.nbytes
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, vec_id: str) -> bool:
+        return vec_id in self._row_of
+
+    def row_ids(self, rows: Iterable[int]) -> List[str]:
+        """vec_ids for a sequence of row indices."""
+        return [self._ids[row] for row in rows]
+
+    def storage_arrays(self) -> SegmentArrays:
+        """Live rows as raw storage-dtype arrays (views, not copies)."""
+        return (
+            self._ids[: self.size],
+            self._matrix[: self.size],
+            self._norms[: self.size],
+            self._scales[: self.size] if self.dtype == "q8" else None,
+        )
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the backing arrays to hold at least ``capacity`` rows."""
+        if capacity <= self._matrix.shape[0]:
+            return
+        new_capacity = max(capacity, self._matrix.shape[0] * 2)
+        matrix = np.zeros((new_capacity, self.dim), dtype=self._matrix.dtype)
+        matrix[: self.size] = self._matrix[: self.size]
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        norms[: self.size] = self._norms[: self.size]
+        self._matrix = matrix
+        self._norms = norms
+        if self.dtype == "q8":
+            scales = np.zeros(new_capacity, dtype=np.float32)
+            scales[: self.size] = self._scales[: self.size]
+            self._scales = scales
+
+    def _write_rows(self, start: int, block: np.ndarray) -> None:
+        """Encode a float32 block into rows ``[start, start + len(block))``."""
+        end = start + block.shape[0]
+        if self.dtype == "f32":
+            self._matrix[start:end] = block
+        elif self.dtype == "f16":
+            self._matrix[start:end] = block.astype(np.float16)
+        elif self.dtype == "bfloat16":
+            self._matrix[start:end] = float32_to_bfloat16(block)
+        else:
+            codes, scales = quantize_q8(block)
+            self._matrix[start:end] = codes
+            self._scales[start:end] = scales
+        # Norms are taken from the stored representation so scores stay consistent
+        self._norms[start:end] = np.linalg.norm(self.decode_rows(start, end), axis=1)
+
+    def decode_rows(self, start: int, end: int) -> np.ndarray:
+        """Decode rows ``[start, end)`` to float32."""
+        rows = self._matrix[start:end]
+        if self.dtype == "f32":
+            return rows
+        if self.dtype == "f16":
+            return rows.astype(np.float32)
+        if self.dtype == "bfloat16":
+            return bfloat16_to_float32(rows)
+        return dequantize_q8(rows, self._scales[start:end])
+
+    def decode_selected(self, rows: np.ndarray) -> np.ndarray:
+        """Decode an arbitrary set of row indices to float32."""
+        selected = self._matrix[rows]
+        if self.dtype == "f32":
+            return selected
+        if self.dtype == "f16":
+            return selected.astype(np.float32)
+        if self.dtype == "bfloat16":
+            return bfloat16_to_float32(selected)
+        return dequantize_q8(selected, self._scales[rows])
+
+    def upsert(self, vec_id: str, vector: np.ndarray) -> None:
+        """Insert a vector or overwrite it in place if vec_id is already present."""
+        row = self._row_of.get(vec_id)
+        if row is None:
+            self._reserve(self.size + 1)
+            row = self.size
+            self._ids.append(vec_id)
+            self._row_of[vec_id] = row
+            self.size += 1
+        self._write_rows(row, np.asarray(vector, dtype=np.float32)[None, :])
+
+    def extend(self, vec_ids: List[str], vectors: np.ndarray) -> None:
+        """Append a block of new vectors (ids must not already be present)."""
+        count = len(vec_ids)
+        if count == 0:
+            return
+        self._reserve(self.size + count)
+        start = self.size
+        self._write_rows(start, np.asarray(vectors, dtype=np.float32))
+        for offset, vec_id in enumerate(vec_ids):
+            self._row_of[vec_id] = start + offset
+        self._ids.extend(vec_ids)
+        self.size = start + count
+
+    def remove(self, vec_id: str) -> bool:
+        """Remove a vector by swapping the last row into its slot."""
+        row = self._row_of.pop(vec_id, None)
+        if row is None:
+            return False
+        last = self.size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._norms[row] = self._norms[last]
+            if self.dtype == "q8":
+                self._scales[row] = self._scales[last]
+            self._ids[row] = moved_id
+            self._row_of[moved_id] = row
+        self._ids.pop()
+        self.size = last
+        return True
+
+    def _cosine(
+        self, dots: np.ndarray, norms: np.ndarray, query_norm: float
+    ) -> np.ndarray:
+        denom = norms * np.float32(query_norm)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sims = np.where(denom > 0, dots / denom, 0.0)
+        return sims.astype(np.float32, copy=False)
+
+    def scores(self, query: np.ndarray, query_norm: float) -> np.ndarray:
+        """Exact cosine similarity of ``query`` against every live row."""
+        if self.size == 0 or query_norm == 0:
+            return np.zeros(self.size, dtype=np.float32)
+        if self.dtype == "f32":
+            dots = self._matrix[: self.size] @ query
+        else:
+            # Decode in bounded chunks so the float32 copy never spans the whole matrix
+            dots = np.empty(self.size, dtype=np.float32)
+            for start in range(0, self.size, self._SCAN_CHUNK_ROWS):
+                end = min(start + self._SCAN_CHUNK_ROWS, self.size)
+                dots[start:end] = self.decode_rows(start, end) @ query
+        return self._cosine(dots, self.norms, query_norm)
+
+    def scores_batch(self, queries: np.ndarray, query_norms: np.ndarray) -> np.ndarray:
+        """Exact cosine similarity of a (Q, dim) query block, shape (Q, size)."""
+        sims = np.zeros((queries.shape[0], self.size), dtype=np.float32)
+        for start in range(0, self.size, self._SCAN_CHUNK_ROWS):
+            end = min(start + self._SCAN_CHUNK_ROWS, self.size)
+            sims[:, start:end] = similarity_matrix(
+                queries,
+                self.decode_rows(start, end),
+                self._norms[start:end],
+                query_norms,
+            )
+        return sims
+
+    def live_mask(self) -> Optional[np.ndarray]:
+        """Boolean mask of searchable rows, or None when every row is live."""
+        return None
+
+    def approximate_scores(self, query: np.ndarray, query_norm: float) -> np.ndarray:
+        """
+        Cosine estimate computed directly on the int8 codes (q8 partitions only).
+
+        The query is quantized with the same symmetric scheme and the dot product
+        is accumulated in int32, so no float copy of the matrix is made.
+        """
+        if self.size == 0 or query_norm == 0:
+            return np.zeros(self.size, dtype=np.float32)
+        query_codes, query_scale = quantize_q8(query[None, :])
+        query_codes = query_codes[0].astype(np.int32)
+        dots = np.empty(self.size, dtype=np.float32)
+        for start in range(0, self.size, self._SCAN_CHUNK_ROWS):
+            end = min(start + self._SCAN_CHUNK_ROWS, self.size)
+            int_dots = self._matrix[start:end].astype(np.int32) @ query_codes
+            dots[start:end] = int_dots * self._scales[start:end] * query_scale[0]
+        return self._cosine(dots, self.norms, query_norm)
+
+    def top_k(
+        self,
+        query: np.ndarray,
+        query_norm: float,
+        k: int,
+        min_similarity: float,
+        rescore_factor: int = 4,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best ``k`` rows as (row indices, exact scores), best first.
+
+        q8 partitions are ranked on their int8 codes first and only the leading
+        ``k * rescore_factor`` candidates are re-scored exactly in float32.
+        Rows where the optional boolean ``mask`` is False are never returned.
+        """
+        if self.dtype != "q8":
+            sims = self.scores(query, query_norm)
+            rows = _top_k(sims, k, min_similarity, mask)
+            return rows, sims[rows]
+
+        approx = self.approximate_scores(query, query_norm)
+        candidates = _top_k(approx, k * max(rescore_factor, 1), -np.inf, mask)
+        if candidates.size == 0:
+            return candidates, np.zeros(0, dtype=np.float32)
+        exact = self.decode_selected(candidates) @ query
+        sims = self._cosine(exact, self._norms[candidates], query_norm)
+        order = _top_k(sims, k, min_similarity)
+        return candidates[order], sims[order]
+
+
+def _top_k(
+    scores: np.ndarray,
+    k: int,
+    min_similarity: float,
+    mask: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Indices of the k best scores at or above min_similarity, best first."""
+    keep = scores >= min_similarity
+    if mask is not None:
+        keep &= mask
+    eligible = np.flatnonzero(keep)
+    if eligible.size > k:
+        part = np.argpartition(-scores[eligible], k - 1)[:k]
+        eligible = eligible[part]
+    return eligible[np.argsort(-scores[eligible], kind="stable")]
+
+
+def _rescore(
+    query64: np.ndarray,
+    candidate_ids: List[str],
+    candidate_scores: List[np.ndarray],
+    candidate_vectors: List[np.ndarray],
+    limit: int,
+    min_similarity: float,
+) -> List[Tuple[str, float]]:
+    """Merge per-partition candidates and recompute the final k scores in float64."""
+    if not candidate_ids:
+        return []
+    scores = np.concatenate(candidate_scores)
+    order = _top_k(scores, limit, min_similarity)
+
+    winners = np.concatenate(candidate_vectors)[order].astype(np.float64)
+    denom = np.linalg.norm(winners, axis=1) * np.linalg.norm(query64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact = np.where(denom > 0, (winners @ query64) / denom, 0.0)
+    return [(candidate_ids[i], float(score)) for i, score in zip(order, exact)]
+
+
+class LayeredVectorSegment:
+    """
+    Read-only mapped base segment plus an in-memory delta segment.
+
+    Rows ``[0, base.size)`` address the base and rows past it address the
+    delta. Overwriting or deleting a base row tombstones it; tombstoned rows are
+    masked out of every search. Exposes the VectorMatrixSegment interface used
+    by VectorMatrixIndex.
+
+    While a merge is running, every touched vec_id is journaled so the writes
+    can be replayed on top of the newly written base (see ``rebase``).
+    """
+
+    def __init__(
+        self,
+        base: VectorMatrixSegment,
+        manifest: Dict[str, Any],
+        synced_ts: Optional[int] = None,
+    ) -> None:
+        self.base = base
+        self.manifest = manifest
+        self.dim = base.dim
+        self.dtype = base.dtype
+        self.delta = VectorMatrixSegment(base.dim, dtype=base.dtype)
+        # Unix time at which the rows were last known to match SQLite
+        self.synced_ts = (
+            synced_ts if synced_ts is not None else manifest.get("snapshot_ts")
+        )
+        self._live = np.ones(base.size, dtype=bool)
+        self._tombstones = 0
+        self._journal: Optional[Set[str]] = None
+
+    @property
+    def size(self) -> int:
+        return self.base.size - self._tombstones + self.delta.size
+
+    @property
+    def pending(self) -> int:
+        """Delta rows plus tombstones not yet merged into the base file."""
+        return self.delta.size + self._tombstones
+
+    @property
+    def merging(self) -> bool:
+        return self._journal is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Heap bytes held by the delta; mapped pages belong to the page cache."""
+        return self.delta.nbytes
+
+    @property
+    def mapped_bytes(self) -> int:
+        return self.base.nbytes
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, vec_id: str) -> bool:
+        if vec_id in self.delta:
+            return True
+        row = self.base._row_of.get(vec_id)
+        return row is not None and bool(self._live[row])
+
+    def live_ids(self) -> List[str]:
+        """vec_ids of every live row."""
+        base_ids = self.base.ids
+        return [base_ids[row] for row in np.flatnonzero(self._live)] + list(
+            self.delta.ids
+        )
+
+    def base_matches(self, vec_id: str, vector: np.ndarray) -> bool:
+        """True if a live base row already holds exactly ``vector``."""
+        row = self.base._row_of.get(vec_id)
+        if row is None or not self._live[row] or vec_id in self.delta:
+            return False
+        return bool(np.array_equal(self.base.decode_rows(row, row + 1)[0], vector))
+
+    def _tombstone(self, vec_id: str) -> bool:
+        row = self.base._row_of.get(vec_id)
+        if row is None or not self._live[row]:
+            return False
+        self._live[row] = False
+        self._tombstones += 1
+        return True
+
+    def upsert(self, vec_id: str, vector: np.ndarray) -> None:
+        self._tombstone(vec_id)
+        self.delta.upsert(vec_id, vector)
+        if self._journal is not None:
+            self._journal.add(vec_id)
+
+    def extend(self, vec_ids: List[str], vectors: np.ndarray) -> None:
+        for vec_id in vec_ids:
+            self._tombstone(vec_id)
+        self.delta.extend(vec_ids, vectors)
+        if self._journal is not None:
+            self._journal.update(vec_ids)
+
+    def remove(self, vec_id: str) -> bool:
+        removed = self.delta.remove(vec_id)
+        removed = self._tombstone(vec_id) or removed
+        if removed and self._journal is not None:
+            self._journal.add(vec_id)
+        return removed
+
+    def row_ids(self, rows: Iterable[int]) -> List[str]:
+        split = self.base.size
+        base_ids, delta_ids = self.base.ids, self.delta.ids
+        return [
+            base_ids[row] if row < split else delta_ids[row - split] for row in rows
+        ]
+
+    def decode_selected(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64)
+        decoded = np.empty((rows.size, self.dim), dtype=np.float32)
+        in_base = rows < self.base.size
+        if in_base.any():
+            decoded[in_base] = self.base.decode_selected(rows[in_base])
+        if not in_base.all():
+            decoded[~in_base] = self.delta.decode_selected(
+                rows[~in_base] - self.base.size
+            )
+        return decoded
+
+    def scores_batch(self, queries: np.ndarray, query_norms: np.ndarray) -> np.ndarray:
+        """Scores for base and delta rows in the combined row space; see live_mask."""
+        return np.concatenate(
+            [
+                self.base.scores_batch(queries, query_norms),
+                self.delta.scores_batch(queries, query_norms),
+            ],
+            axis=1,
+        )
+
+    def live_mask(self) -> Optional[np.ndarray]:
+        return np.concatenate([self._live, np.ones(self.delta.size, dtype=bool)])
+
+    def top_k(
+        self,
+        query: np.ndarray,
+        query_norm: float,
+        k: int,
+        min_similarity: float,
+        rescore_factor: int = 4,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``k`` live rows of base and delta, in the combined row space."""
+        split = self.base.size
+        base_mask = self._live if mask is None else self._live & mask[:split]
+        delta_mask = None if mask is None else mask[split:]
+        base_rows, base_sims = self.base.top_k(
+            query, query_norm, k, min_similarity, rescore_factor, base_mask
+        )
+        delta_rows, delta_sims = self.delta.top_k(
+            query, query_norm, k, min_similarity, rescore_factor, delta_mask
+        )
+        rows = np.concatenate([base_rows, delta_rows + split])
+        sims = np.concatenate([base_sims, delta_sims])
+        order = _top_k(sims, k, min_similarity)
+        return rows[order], sims[order]
+
+    def storage_arrays(self) -> SegmentArrays:
+        """Live rows of base and delta as compacted storage-dtype copies."""
+        live = np.flatnonzero(self._live)
+        delta_ids, delta_matrix, delta_norms, delta_scales = self.delta.storage_arrays()
+        ids = [self.base.ids[row] for row in live] + list(delta_ids)
+        matrix = np.concatenate([self.base._matrix[live], delta_matrix])
+        norms = np.concatenate([self.base._norms[live], delta_norms])
+        scales = None
+        if self.dtype == "q8":
+            scales = np.concatenate([self.base._scales[live], delta_scales])
+        return ids, matrix, norms, scales
+
+    def begin_merge(self) -> SegmentArrays:
+        """Snapshot the live rows and start journaling later writes."""
+        arrays = self.storage_arrays()
+        self._journal = set()
+        return arrays
+
+    def abort_merge(self) -> None:
+        self._journal = None
+
+    def rebase(
+        self, base: VectorMatrixSegment, manifest: Dict[str, Any]
+    ) -> "LayeredVectorSegment":
+        """New layered segment over a freshly merged base, replaying journaled writes."""
+        merged = LayeredVectorSegment(base, manifest, self.synced_ts)
+        for vec_id in self._journal or ():
+            merged._tombstone(vec_id)
+            row = self.delta._row_of.get(vec_id)
+            if row is not None:
+                merged.delta.upsert(vec_id, self.delta.decode_rows(row, row + 1)[0])
+        self._journal = None
+        return merged
+
+
+Segment = Union[VectorMatrixSegment, LayeredVectorSegment]
+
+
+class VectorMatrixIndex:
+    """
+    Partitioned in-memory matrix index for cosine top-k search.
+
+    Tracks which partitions have been loaded from storage, and which models
+    have had every space loaded, so VectorStore only needs to hit SQLite for
+    partitions it has never seen. A partition stores its rows in the dtype of
+    the first vector written to it; once a write of another dtype arrives it
+    is promoted to float32, which holds every encoding's decoded values
+    exactly.
+    """
+
+    def __init__(self, rescore_factor: int = 4) -> None:
+        self.rescore_factor = rescore_factor
+        self._segments: Dict[PartitionKey, Segment] = {}
+        self._loaded: Set[PartitionKey] = set()
+        self._complete_models: Set[str] = set()
+        self._location: Dict[str, PartitionKey] = {}
+        self._lock = threading.RLock()
+
+    # Load tracking
+
+    def is_loaded(self, model_id: str, space_id: Optional[str]) -> bool:
+        """True if the partition (or the whole model when space_id is None) is resident."""
+        with self._lock:
+            if model_id in self._complete_models:
+                return True
+            if space_id is None:
+                return False
+            return (model_id, space_id) in self._loaded
+
+    def mark_loaded(self, model_id: str, space_id: Optional[str]) -> None:
+        """Record that a partition, or every partition of a model, is resident."""
+        with self._lock:
+            if space_id is None:
+                self._complete_models.add(model_id)
+                for key in self._segments:
+                    if key[0] == model_id:
+                        self._loaded.add(key)
+            else:
+                self._loaded.add((model_id, space_id))
+
+    def loaded_spaces(self, model_id: str) -> Set[str]:
+        """Spaces already resident for a model."""
+        with self._lock:
+            return {space for (model, space) in self._loaded if model == model_id}
+
+    def _tracks(self, key: PartitionKey) -> bool:
+        return key in self._loaded or key[0] in self._complete_models
+
+    # Mutation
+
+    def load_partition(
+        self,
+        model_id: str,
+        space_id: str,
+        vec_ids: List[str],
+        vectors: np.ndarray,
+        dtype: str = "f32",
+    ) -> None:
+        """Bulk-load decoded float32 rows fetched from storage into a partition."""
+        key = (model_id, space_id)
+        with self._lock:
+            if len(vec_ids):
+                segment, vectors = self._segment_for(key, vectors, dtype)
+                if segment is None:
+                    return
+                fresh = [i for i, vec_id in enumerate(vec_ids) if vec_id not in segment]
+                if len(fresh) == len(vec_ids):
+                    segment.extend(vec_ids, vectors)
+                else:
+                    segment.extend([vec_ids[i] for i in fresh], vectors[fresh])
+                for vec_id in vec_ids:
+                    self._location[vec_id] = key
+            self._loaded.add(key)
+
+    def upsert(
+        self,
+        vec_id: str,
+        model_id: str,
+        space_id: str,
+        vector: Iterable[float],
+        dtype: str = "f32",
+    ) -> None:
+        """Apply a write to the index if its partition is resident."""
+        key = (model_id, space_id)
+        with self._lock:
+            previous = self._location.get(vec_id)
+            if previous is not None and previous != key:
+                self._remove_locked(vec_id)
+            if not self._tracks(key):
+                return
+            array = np.asarray(vector, dtype=np.float32)
+            segment, block = self._segment_for(key, array[None, :], dtype)
+            if segment is None:
+                return
+            segment.upsert(vec_id, block[0])
+            self._location[vec_id] = key
+
+    def upsert_block(
+        self,
+        model_id: str,
+        space_id: str,
+        vec_ids: List[str],
+        vectors: np.ndarray,
+        dtype: str = "f32",
+    ) -> None:
+        """Apply a block of writes to one partition if it is resident."""
+        key = (model_id, space_id)
+        with self._lock:
+            for vec_id in vec_ids:
+                previous = self._location.get(vec_id)
+                if previous is not None and previous != key:
+                    self._remove_locked(vec_id)
+            if not self._tracks(key) or not vec_ids:
+                return
+            segment, vectors = self._segment_for(key, vectors, dtype)
+            if segment is None:
+                return
+            fresh = [i for i, vec_id in enumerate(vec_ids) if vec_id not in segment]
+            for i in range(len(vec_ids)):
+                if vec_ids[i] in segment:
+                    segment.upsert(vec_ids[i], vectors[i])
+            segment.extend([vec_ids[i] for i in fresh], vectors[fresh])
+            for vec_id in vec_ids:
+                self._location[vec_id] = key
+
+    def remove(self, vec_id: str) -> bool:
+        """Remove a vector from whichever partition holds it."""
+        with self._lock:
+            return self._remove_locked(vec_id)
+
+    def clear(self) -> None:
+        """Drop all resident partitions."""
+        with self._lock:
+            self._segments.clear()
+            self._loaded.clear()
+            self._complete_models.clear()
+            self._location.clear()
+
+    def _remove_locked(self, vec_id: str) -> bool:
+        key = self._location.pop(vec_id, None)
+        if key is None:
+            return False
+        segment = self._segments.get(key)
+        return bool(segment and segment.remove(vec_id))
+
+    # Mapped segments
+
+    def partition(self, model_id: str, space_id: str) -> Optional[Segment]:
+        """The resident segment for a partition, if any."""
+        with self._lock:
+            return self._segments.get((model_id, space_id))
+
+    def location(self, vec_id: str) -> Optional[PartitionKey]:
+        """Partition currently holding a vector, if it is resident."""
+        with self._lock:
+            return self._location.get(vec_id)
+
+    def mapped_partitions(self) -> List[PartitionKey]:
+        """Keys of every partition backed by a mapped segment."""
+        with self._lock:
+            return [
+                key
+                for key, segment in self._segments.items()
+                if isinstance(segment, LayeredVectorSegment)
+            ]
+
+    def attach_segment(
+        self, model_id: str, space_id: str, segment: LayeredVectorSegment
+    ) -> None:
+        """Install a mapped segment as a resident partition."""
+        key = (model_id, space_id)
+        with self._lock:
+            if key in self._segments:
+                self._location = {
+                    vec_id: where
+                    for vec_id, where in self._location.items()
+                    if where != key
+                }
+            self._segments[key] = segment
+            for vec_id in segment.live_ids():
+                self._location[vec_id] = key
+            self._loaded.add(key)
+
+    def convert_partition(
+        self,
+        model_id: str,
+        space_id: str,
+        write: Callable[[VectorMatrixSegment], Optional[LayeredVectorSegment]],
+    ) -> Optional[LayeredVectorSegment]:
+        """
+        Replace an in-memory partition with a mapped one.
+
+        ``write`` persists the segment's rows and returns the mapped segment; it
+        runs under the index lock so no write can slip in between.
+        """
+        key = (model_id, space_id)
+        with self._lock:
+            segment = self._segments.get(key)
+            if not isinstance(segment, VectorMatrixSegment):
+                return None
+            mapped = write(segment)
+            if mapped is not None:
+                self._segments[key] = mapped
+            return mapped
+
+    def begin_merge(
+        self, model_id: str, space_id: str
+    ) -> Optional[Tuple[LayeredVectorSegment, SegmentArrays]]:
+        """Snapshot a mapped partition for merging, unless one is already running."""
+        with self._lock:
+            segment = self._segments.get((model_id, space_id))
+            if not isinstance(segment, LayeredVectorSegment) or segment.merging:
+                return None
+            return segment, segment.begin_merge()
+
+    def finish_merge(
+        self,
+        model_id: str,
+        space_id: str,
+        segment: LayeredVectorSegment,
+        base: Optional[VectorMatrixSegment],
+        manifest: Optional[Dict[str, Any]],
+    ) -> bool:
+        """Swap in the merged base, or abandon the merge when ``base`` is None."""
+        key = (model_id, space_id)
+        with self._lock:
+            if (
+                base is None
+                or manifest is None
+                or self._segments.get(key) is not segment
+            ):
+                segment.abort_merge()
+                return False
+            self._segments[key] = segment.rebase(base, manifest)
+            return True
+
+    def _segment_for(
+        self, key: PartitionKey, vectors: np.ndarray, dtype: str
+    ) -> Tuple[Optional[Segment], np.ndarray]:
+        """
+        The partition to write ``dtype`` rows into, and the rows to write.
+
+        A partition of another dtype is promoted to float32 and the rows are
+        passed through their own encoding first, so the partition holds
+        exactly what storage holds.
+        """
+        count, dim = vectors.shape
+        segment = self._segments.get(key)
+        if segment is None:
+            segment = VectorMatrixSegment(
+                dim, max(count, VectorMatrixSegment._INITIAL_CAPACITY), dtype
+            )
+            self._segments[key] = segment
+        elif segment.dim != dim:
+            logger.warning(
+                f"Skipping {dim}-dim vector for partition {key} holding {segment.dim}-dim vectors"
+            )
+            return None, vectors
+        elif segment.dtype != dtype:
+            if segment.dtype != "f32":
+                segment = self._promote(key, segment)
+            if dtype != "f32":
+                vectors = decode_block(encode_block(vectors, dtype), dim, dtype)
+        return segment, vectors
+
+    def _promote(self, key: PartitionKey, segment: Segment) -> VectorMatrixSegment:
+        """Replace a partition with a float32 copy of its live rows."""
+        if isinstance(segment, LayeredVectorSegment):
+            # The mapped file keeps the old dtype; the partition leaves the
+            # mapping (and any running merge is abandoned)
+            rows = np.concatenate(
+                [
+                    np.flatnonzero(segment._live),
+                    segment.base.size + np.arange(segment.delta.size),
+                ]
+            )
+        else:
+            rows = np.arange(segment.size)
+        promoted = VectorMatrixSegment(
+            segment.dim, max(rows.size, VectorMatrixSegment._INITIAL_CAPACITY), "f32"
+        )
+        promoted.extend(segment.row_ids(rows), segment.decode_selected(rows))
+        self._segments[key] = promoted
+        logger.info(f"Promoted vector partition {key} from {segment.dtype} to f32")
+        return promoted
+
+    # Search
+
+    def search(
+        self,
+        query_vector: Iterable[float],
+        model_id: str,
+        space_id: Optional[str] = None,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+        space_ids: Optional[Iterable[str]] = None,
+        masks: Optional[Dict[PartitionKey, np.ndarray]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k cosine search over resident partitions.
+
+        Returns (vec_id, similarity) pairs ordered by similarity, highest first.
+        ``space_ids`` restricts the scan to an allow-list of spaces; ``masks``
+        optionally supplies a per-partition boolean row allow-list that is
+        applied before ranking. Partitions whose dimension differs from the
+        query are skipped. Ranking is done in float32; the final k scores are
+        recomputed in float64.
+        """
+        query64 = np.asarray(query_vector, dtype=np.float64)
+        query = query64.astype(np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            keys = self._partition_keys(model_id, space_id, space_ids)
+            candidate_ids: List[str] = []
+            candidate_scores: List[np.ndarray] = []
+            candidate_vectors: List[np.ndarray] = []
+            for key in keys:
+                segment = self._segments[key]
+                if segment.size == 0 or segment.dim != query.shape[0]:
+                    continue
+                rows, sims = segment.top_k(
+                    query,
+                    query_norm,
+                    limit,
+                    min_similarity,
+                    self.rescore_factor,
+                    masks.get(key) if masks else None,
+                )
+                candidate_ids.extend(segment.row_ids(rows))
+                candidate_scores.append(sims)
+                candidate_vectors.append(segment.decode_selected(rows))
+
+        return _rescore(
+            query64,
+            candidate_ids,
+            candidate_scores,
+            candidate_vectors,
+            limit,
+            min_similarity,
+        )
+
+    def search_batch(
+        self,
+        query_vectors: Any,
+        model_id: str,
+        space_id: Optional[str] = None,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+        space_ids: Optional[Iterable[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k cosine search for many queries at once.
+
+        Each partition is scored against the whole (Q, dim) query block with one
+        matrix-matrix product per decoded chunk, instead of one scan per query.
+        Returns one result list per query, in query order, each shaped like
+        :meth:`search` output.
+        """
+        queries64 = np.asarray(query_vectors, dtype=np.float64)
+        if queries64.ndim == 1:
+            queries64 = queries64[None, :]
+        count = queries64.shape[0]
+        if limit <= 0 or count == 0:
+            return [[] for _ in range(count)]
+        queries = queries64.astype(np.float32)
+        query_norms = np.linalg.norm(queries, axis=1)
+
+        candidate_ids: List[List[str]] = [[] for _ in range(count)]
+        candidate_scores: List[List[np.ndarray]] = [[] for _ in range(count)]
+        candidate_vectors: List[List[np.ndarray]] = [[] for _ in range(count)]
+        with self._lock:
+            for key in self._partition_keys(model_id, space_id, space_ids):
+                segment = self._segments[key]
+                if segment.size == 0 or segment.dim != queries.shape[1]:
+                    continue
+                sims = segment.scores_batch(queries, query_norms)
+                mask = segment.live_mask()
+                for i in range(count):
+                    rows = _top_k(sims[i], limit, min_similarity, mask)
+                    candidate_ids[i].extend(segment.row_ids(rows))
+                    candidate_scores[i].append(sims[i, rows])
+                    candidate_vectors[i].append(segment.decode_selected(rows))
+
+        return [
+            _rescore(
+                queries64[i],
+                candidate_ids[i],
+                candidate_scores[i],
+                candidate_vectors[i],
+                limit,
+                min_similarity,
+            )
+            for i in range(count)
+        ]
+
+    def _partition_keys(
+        self,
+        model_id: str,
+        space_id: Optional[str],
+        space_ids: Optional[Iterable[str]],
+    ) -> List[PartitionKey]:
+        """Resident partitions of a model restricted to the allowed spaces."""
+        allowed = set(space_ids) if space_ids is not None else None
+        if space_id is not None:
+            allowed = (allowed or set()) | {space_id}
+        return [
+            key
+            for key in self._segments
+            if key[0] == model_id and (allowed is None or key[1] in allowed)
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """Resident partition and row counts."""
+        with self._lock:
+            return {
+                "partitions": len(self._segments),
+                "vectors": sum(len(s) for s in self._segments.values()),
+                "bytes": sum(s.nbytes for s in self._segments.values()),
+                "mapped_bytes": sum(
+                    getattr(s, "mapped_bytes", 0) for s in self._segments.values()
+                ),
+                "complete_models": len(self._complete_models),
+            }
@@ -0,0 +1,199 @@
+"""
+Memory-mapped Vector Segment Files for MemoryOS
+
+Sidecar files that let VectorStore warm-start its matrix index without decoding
+every BLOB from SQLite. Each (model_id, space_id) partition is written as raw
+``.npy`` arrays in its storage dtype - float32, float16, bfloat16 bits or int8
+codes plus per-row scales - together with the row norms, an id map and a JSON
+manifest. Opening a segment maps the arrays with ``np.load(mmap_mode="r")``
+(an ``np.memmap``), so search runs on page-cache backed memory with no per-row
+copies.
+
+Every write produces a new generation of array files; the manifest is replaced
+atomically last and names the generation to open, so a crash mid-write leaves
+the previous generation intact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .vector_index import LayeredVectorSegment, SegmentArrays, VectorMatrixSegment
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def segment_stem(model_id: str, space_id: str) -> str:
+    """File stem for a partition; the hash keeps sanitized names distinct."""
+    safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", f"{model_id}__{space_id}")
+    digest = hashlib.sha1(f"{model_id}\0{space_id}".encode("utf-8")).hexdigest()[:8]
+    return f"{safe_name}.{digest}"
+
+
+def _array_path(directory: Path, stem: str, generation: int, name: str) -> Path:
+    return directory / f"{stem}.g{generation}.{name}.npy"
+
+
+def _manifest_path(directory: Path, stem: str) -> Path:
+    return directory / f"{stem}.segment.json"
+
+
+def _fsync_replace(tmp_path: Path, path: Path) -> None:
+    with open(tmp_path, "rb+") as handle:
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        np.save(handle, np.ascontiguousarray(array), allow_pickle=False)
+    _fsync_replace(tmp_path, path)
+
+
+def read_manifest(directory: Path, stem: str) -> Optional[Dict[str, Any]]:
+    """Load a partition manifest, or None if it is missing or unreadable."""
+    path = _manifest_path(directory, stem)
+    if not path.exists():
+        return None
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable segment manifest {path}: {e}")
+        return None
+    if manifest.get("format_version") != FORMAT_VERSION:
+        logger.warning(f"Ignoring segment manifest {path} with unknown format")
+        return None
+    return manifest
+
+
+def iter_manifests(directory: Path, model_id: str) -> Iterator[Dict[str, Any]]:
+    """Manifests of every mapped partition of a model."""
+    if not directory.exists():
+        return
+    for path in sorted(directory.glob("*.segment.json")):
+        manifest = read_manifest(directory, path.name[: -len(".segment.json")])
+        if manifest is not None and manifest.get("model_id") == model_id:
+            yield manifest
+
+
+def write_segment(
+    directory: Path,
+    model_id: str,
+    space_id: str,
+    dim: int,
+    dtype: str,
+    arrays: SegmentArrays,
+    snapshot_ts: Optional[int],
+) -> Dict[str, Any]:
+    """
+    Write a new generation of a partition's segment files.
+
+    ``snapshot_ts`` is the Unix time at which the rows were known to match
+    SQLite; rows updated at or after it are re-read when the segment is opened.
+    Returns the new manifest.
+    """
+    vec_ids, matrix, norms, scales = arrays
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = segment_stem(model_id, space_id)
+    previous = read_manifest(directory, stem)
+    generation = previous["generation"] + 1 if previous else 1
+
+    files: Dict[str, np.ndarray] = {
+        "vectors": np.asarray(matrix),
+        "norms": np.asarray(norms, dtype=np.float32),
+        "ids": np.asarray(vec_ids, dtype=str),
+    }
+    if dtype == "q8":
+        files["scales"] = np.asarray(scales, dtype=np.float32)
+    for name, array in files.items():
+        _save_array(_array_path(directory, stem, generation, name), array)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_id": model_id,
+        "space_id": space_id,
+        "dim": dim,
+        "dtype": dtype,
+        "count": len(vec_ids),
+        "generation": generation,
+        "snapshot_ts": snapshot_ts,
+        "arrays": sorted(files),
+    }
+    path = _manifest_path(directory, stem)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+    _fsync_replace(tmp_path, path)
+
+    # The old generation is only dropped once the manifest no longer names it;
+    # existing mappings of it stay valid until they are released
+    if previous:
+        for name in previous.get("arrays", []):
+            try:
+                _array_path(directory, stem, previous["generation"], name).unlink()
+            except OSError as e:
+                logger.debug(f"Could not remove old segment file: {e}")
+    return manifest
+
+
+def open_base(directory: Path, manifest: Dict[str, Any]) -> VectorMatrixSegment:
+    """Map a partition's arrays as a read-only VectorMatrixSegment."""
+    stem = segment_stem(manifest["model_id"], manifest["space_id"])
+    generation = manifest["generation"]
+    dim, dtype, count = manifest["dim"], manifest["dtype"], manifest["count"]
+
+    def _map(name: str) -> np.ndarray:
+        return np.load(
+            _array_path(directory, stem, generation, name),
+            mmap_mode="r",
+            allow_pickle=False,
+        )
+
+    matrix = _map("vectors")
+    norms = _map("norms")
+    scales = _map("scales") if dtype == "q8" else None
+    vec_ids: List[str] = np.load(
+        _array_path(directory, stem, generation, "ids"), allow_pickle=False
+    ).tolist()
+    if matrix.shape != (count, dim) or norms.shape != (count,) or len(vec_ids) != count:
+        raise ValueError(f"Segment {stem} generation {generation} is inconsistent")
+    return VectorMatrixSegment.from_arrays(dim, dtype, vec_ids, matrix, norms, scales)
+
+
+def open_segment(
+    directory: Path, manifest: Dict[str, Any]
+) -> Optional[LayeredVectorSegment]:
+    """Open a partition's segment files with an empty delta, or None if unusable."""
+    try:
+        return LayeredVectorSegment(open_base(directory, manifest), manifest)
+    except (OSError, ValueError) as e:
+        logger.warning(
+            f"Ignoring segment for {manifest['model_id']}/{manifest['space_id']}: {e}"
+        )
+        return None
+
+
+def remove_segment(directory: Path, model_id: str, space_id: str) -> bool:
+    """Delete a partition's manifest and array files."""
+    stem = segment_stem(model_id, space_id)
+    manifest = read_manifest(directory, stem)
+    path = _manifest_path(directory, stem)
+    if not path.exists():
+        return False
+    path.unlink()
+    if manifest:
+        for name in manifest.get("arrays", []):
+            _array_path(directory, stem, manifest["generation"], name).unlink(
+                missing_ok=True
+            )
+    return True
@@ -3,29 +3,97 @@ Vector Store Implementation for MemoryOS
 
 This module provides high-performance vector storage for embeddings and similarity search.
 Supports various data types (f32, f16, q8, bfloat16) with model-specific organization
-and efficient nearest neighbor search capabilities.
+and efficient nearest neighbor search capabilities. Reduced-precision dtypes are stored
+in their real 2-byte / 1-byte encodings (see vector_codec). Partitions can
+optionally be kept in memory-mapped sidecar segment files (see vector_segments)
+for zero-copy warm starts.
 
 Contract: vector_row.schema.json
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import re
 import sqlite3
-import struct
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
 
 from storage.core.base_store import BaseStore, StoreConfig
+from storage.core.pagination import (
+    Page,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+)
+
+from .hnsw_index import HNSWIndex
+from .vector_codec import decode_block, decode_vector, encode_block, encode_vector
+from .vector_index import (
+    LayeredVectorSegment,
+    VectorMatrixIndex,
+    VectorMatrixSegment,
+    similarity_matrix,
+)
+from .vector_segments import (
+    iter_manifests,
+    open_base,
+    open_segment,
+    read_manifest,
+    segment_stem,
+    write_segment,
+)
+
+if TYPE_CHECKING:
+    from storage.monitoring.index_checkpoint_store import IndexCheckpointStore
+    from storage.monitoring.index_config_store import IndexConfigStore
 
 logger = logging.getLogger(__name__)
 
+AnnKey = Tuple[str, str]  # (index_name, model_id)
+
+# Per-node attributes HNSW indexes keep allow-lists for
+ANN_FILTER_ATTRIBUTES = ("space_id",)
+
 
 # Type definitions from vector_row.schema.json contract
 VectorDType = Literal["f32", "f16", "q8", "bfloat16"]
 
 
+def _batched(rows: Iterable[VectorRow], size: int) -> Iterator[List[VectorRow]]:
+    """Yield lists of at most ``size`` rows."""
+    batch: List[VectorRow] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 @dataclass
 class VectorRow:
     """
@@ -106,13 +174,37 @@ class VectorStore(BaseStore):
     Provides CRUD operations for vector embeddings with:
     - Model-specific organization
     - Multiple data type support (f32, f16, q8, bfloat16)
-    - Efficient similarity search
+    - Efficient similarity search backed by an in-memory matrix index
     - Space-scoped access control
-    - Index management capabilities
+    - Index management capabilities, including persistent HNSW indexes per
+      index_name/model_id stored next to the SQLite file. Every index file is a
+      crash-safe snapshot checkpointed at a vector_rows rowid; on open only the
+      rows past that checkpoint are replayed
     """
 
+    # Unsaved ANN mutations tolerated before an index is written back to disk
+    ann_autosave_every = 500
+
+    # Keep matrix partitions in memory-mapped segment files next to the SQLite
+    # file; a partition's delta is merged back in the background once this many
+    # rows or tombstones are pending
+    mmap_segments = False
+    segment_merge_rows = 1024
+
+    # Ids per IN (...) lookup, below SQLite's default variable limit of 32766
+    _MAX_IN_PARAMS = 30000
+
     def __init__(self, config: Optional[StoreConfig] = None):
         super().__init__(config or StoreConfig(db_path="data/vector.db"))
+        self._matrix_index = VectorMatrixIndex()
+        self._ann_indexes: Dict[AnnKey, HNSWIndex] = {}
+        self._ann_discovered = False
+        self._ann_pending: Dict[AnnKey, int] = {}
+        self._ann_rebuilding: Set[AnnKey] = set()
+        self._checkpoints: Optional[IndexCheckpointStore] = None
+        self._checkpoint_lock = threading.Lock()
+        self._segment_merges: Set[Tuple[str, str]] = set()
+        self._segment_lock = threading.Lock()
 
     # BaseStore abstract method implementations
 
@@ -178,6 +270,9 @@ class VectorStore(BaseStore):
         CREATE INDEX IF NOT EXISTS idx_vector_space_model ON vector_rows(space_id, model_id);
         CREATE INDEX IF NOT EXISTS idx_vector_index_name ON vector_rows(index_name);
         CREATE INDEX IF NOT EXISTS idx_vector_timestamp ON vector_rows(timestamp);
+        -- Listing order (created_at, vec_id), for keyset pagination
+        CREATE INDEX IF NOT EXISTS idx_vector_created ON vector_rows(created_at, vec_id);
+        CREATE INDEX IF NOT EXISTS idx_vector_space_created ON vector_rows(space_id, created_at, vec_id);
 
         -- Update trigger for updated_at
         CREATE TRIGGER IF NOT EXISTS vector_rows_updated_at
@@ -197,23 +292,7 @@ class VectorStore(BaseStore):
         vector_data = self._serialize_vector(vector_row.vector, dtype_to_use)
 
         # Handle timestamp conversion
-        ts_unix = None
-        ts_iso = None
-        if vector_row.timestamp:
-            if isinstance(vector_row.timestamp, str):
-                # Parse ISO format
-                from datetime import datetime
-
-                dt = datetime.fromisoformat(vector_row.timestamp.replace("Z", "+00:00"))
-                ts_unix = int(dt.timestamp())
-                ts_iso = vector_row.timestamp
-            else:
-                # Assume Unix timestamp
-                ts_unix = int(vector_row.timestamp)
-                from datetime import datetime, timezone
-
-                dt = datetime.fromtimestamp(ts_unix, tz=timezone.utc)
-                ts_iso = dt.isoformat()
+        ts_unix, ts_iso = self._timestamp_columns(vector_row.timestamp)
 
         with sqlite3.connect(self.config.db_path) as conn:
             conn.execute(
@@ -237,9 +316,38 @@ class VectorStore(BaseStore):
                 ),
             )
 
+        self._matrix_index.upsert(
+            vector_row.vec_id,
+            vector_row.model_id,
+            vector_row.space_id,
+            vector_row.vector,
+            dtype_to_use,
+        )
+        self._schedule_segment_merge(vector_row.model_id, vector_row.space_id)
+        self._ann_upsert(
+            vector_row.vec_id,
+            vector_row.index_name,
+            vector_row.model_id,
+            vector_row.space_id,
+            vector_row.vector,
+        )
+
         # Return the created data
         return vector_row.to_dict()
 
+    @staticmethod
+    def _timestamp_columns(timestamp: Any) -> Tuple[Optional[int], Optional[str]]:
+        """Convert an ISO string or Unix timestamp to (timestamp, timestamp_iso) columns."""
+        if not timestamp:
+            return None, None
+        if isinstance(timestamp, str):
+            # Parse ISO format
+            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+            return int(dt.timestamp()), timestamp
+        # Assume Unix timestamp
+        ts_unix = int(timestamp)
+        return ts_unix, datetime.fromtimestamp(ts_unix, tz=timezone.utc).isoformat()
+
     def _read_record(self, record_id: str) -> Optional[Dict[str, Any]]:
         """Read a vector row by ID and return as dictionary."""
         with sqlite3.connect(self.config.db_path) as conn:
@@ -307,6 +415,21 @@ class VectorStore(BaseStore):
 
         if updated:
             logger.info(f"Updated vector row {record_id}")
+            self._matrix_index.upsert(
+                record_id,
+                vector_row.model_id,
+                vector_row.space_id,
+                vector_row.vector,
+                dtype_to_use,
+            )
+            self._schedule_segment_merge(vector_row.model_id, vector_row.space_id)
+            self._ann_upsert(
+                record_id,
+                vector_row.index_name,
+                vector_row.model_id,
+                vector_row.space_id,
+                vector_row.vector,
+            )
             return vector_row.to_dict()
         else:
             logger.warning(f"Vector row {record_id} not found for update")
@@ -323,6 +446,11 @@ class VectorStore(BaseStore):
 
         if deleted:
             logger.info(f"Deleted vector row {record_id}")
+            partition = self._matrix_index.location(record_id)
+            self._matrix_index.remove(record_id)
+            if partition is not None:
+                self._schedule_segment_merge(*partition)
+            self._ann_remove(record_id)
         else:
             logger.warning(f"Vector row {record_id} not found for deletion")
 
@@ -335,62 +463,68 @@ class VectorStore(BaseStore):
         offset: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """List vector rows with optional filtering, returning dictionaries."""
-        query = "SELECT vec_id, doc_id, space_id, model_id, dim, vector_data, dtype, norm, index_name, timestamp_iso FROM vector_rows"
-        params: List[str] = []
+        rows = self._list_rows(filters, limit, offset)
+        return [row.to_dict() for row, _ in rows]
+
+    # Newest first; vec_id breaks ties between rows created in the same second
+    _LIST_ORDER = [("created_at", True), ("vec_id", True)]
+
+    def _list_rows(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after: Optional[Tuple[Any, ...]] = None,
+    ) -> List[Tuple[VectorRow, Tuple[int, str]]]:
+        """Vector rows in listing order with their (created_at, vec_id) keys."""
+        query = "SELECT vec_id, doc_id, space_id, model_id, dim, vector_data, dtype, norm, index_name, timestamp_iso, created_at FROM vector_rows"
+        params: List[Any] = []
+        where_clauses: List[str] = []
 
         # Handle filters
         if filters:
-            where_clauses: List[str] = []
             if "space_id" in filters:
                 where_clauses.append("space_id = ?")
                 params.append(filters["space_id"])
             if "model_id" in filters:
                 where_clauses.append("model_id = ?")
                 params.append(filters["model_id"])
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
+        if after is not None:
+            condition, key_params = keyset_condition(self._LIST_ORDER, after)
+            where_clauses.append(condition)
+            params.extend(key_params)
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
 
-        query += " ORDER BY created_at DESC"
+        query += " ORDER BY created_at DESC, vec_id DESC"
 
         if limit:
             query += " LIMIT ?"
-            params.append(str(limit))
+            params.append(limit)
 
         if offset:
+            if not limit:
+                query += " LIMIT -1"
             query += " OFFSET ?"
-            params.append(str(offset))
+            params.append(offset)
 
         with sqlite3.connect(self.config.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(query, params)
-            return [self._row_to_vector_row(row).to_dict() for row in cursor.fetchall()]
+            return [
+                (self._row_to_vector_row(row), (row["created_at"], row["vec_id"]))
+                for row in cursor.fetchall()
+            ]
 
     def _serialize_vector(self, vector: List[float], dtype: VectorDType) -> bytes:
         """Serialize vector to binary format based on dtype."""
-        if dtype == "f32":
-            return struct.pack(f"{len(vector)}f", *vector)
-        elif dtype == "f16":
-            # For f16, we'll store as f32 but could be optimized for space
-            return struct.pack(f"{len(vector)}f", *vector)
-        elif dtype == "q8":
-            # For q8 (quantized 8-bit), we'll store as f32 for now
-            # In production, implement proper quantization
-            return struct.pack(f"{len(vector)}f", *vector)
-        elif dtype == "bfloat16":
-            # For bfloat16, we'll store as f32 for now
-            return struct.pack(f"{len(vector)}f", *vector)
-        else:
-            raise ValueError(f"Unsupported dtype: {dtype}")
+        return encode_vector(vector, dtype)
 
     def _deserialize_vector(
         self, data: bytes, dim: int, dtype: VectorDType
     ) -> List[float]:
         """Deserialize vector from binary format."""
-        if dtype in ["f32", "f16", "q8", "bfloat16"]:
-            # All stored as f32 for now
-            return list(struct.unpack(f"{dim}f", data))
-        else:
-            raise ValueError(f"Unsupported dtype: {dtype}")
+        return decode_vector(data, dim, dtype).tolist()
 
     def _row_to_vector_row(self, row: sqlite3.Row) -> VectorRow:
         """Convert database row to VectorRow."""
@@ -417,6 +551,125 @@ class VectorStore(BaseStore):
         result_dict = self._create_record(vector_row.to_dict())
         return result_dict["vec_id"]
 
+    def store_vectors_bulk(
+        self, rows: Iterable[VectorRow], batch_size: int = 5000
+    ) -> List[str]:
+        """
+        Store many vector rows in a single transaction.
+
+        Each batch is grouped by (dim, dtype), serialized as one NumPy block with
+        norms computed in one vectorized pass, and inserted with executemany.
+        The matrix and ANN indexes are updated once per batch after the
+        transaction commits. Rolls back and re-raises on any failure.
+
+        Returns the vec_ids in input order.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        stored: List[str] = []
+        staged: List[Tuple[List[VectorRow], np.ndarray, str]] = []
+        conn = sqlite3.connect(self.config.db_path)
+        try:
+            with conn:
+                for batch in _batched(rows, batch_size):
+                    stored.extend(r.vec_id for r in batch)
+                    for group, block, dtype in self._encode_groups(batch):
+                        conn.executemany(
+                            """
+                            INSERT INTO vector_rows
+                            (vec_id, doc_id, space_id, model_id, dim, vector_data, dtype, norm, index_name, timestamp, timestamp_iso)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            """,
+                            self._bulk_params(group, block, dtype),
+                        )
+                        staged.append((group, block, dtype))
+        finally:
+            conn.close()
+
+        for group, block, dtype in staged:
+            self._index_block(group, block, dtype)
+
+        logger.info(f"Bulk stored {len(stored)} vector rows")
+        return stored
+
+    def _encode_groups(
+        self, batch: List[VectorRow]
+    ) -> List[Tuple[List[VectorRow], np.ndarray, str]]:
+        """Split a batch into same-(dim, dtype) groups with a float32 block each."""
+        groups: Dict[Tuple[int, str], List[VectorRow]] = {}
+        for row in batch:
+            if len(row.vector) != row.dim:
+                raise ValueError(
+                    f"Vector length {len(row.vector)} does not match dim {row.dim} for {row.vec_id}"
+                )
+            groups.setdefault((row.dim, row.dtype or "f32"), []).append(row)
+        return [
+            (group, np.asarray([r.vector for r in group], dtype=np.float32), dtype)
+            for (_, dtype), group in groups.items()
+        ]
+
+    def _bulk_params(
+        self, group: List[VectorRow], block: np.ndarray, dtype: str
+    ) -> List[Tuple[Any, ...]]:
+        """INSERT parameters for a same-(dim, dtype) group, encoded as one block."""
+        blobs = encode_block(block, dtype)
+        norms = np.linalg.norm(block, axis=1).tolist()
+        params: List[Tuple[Any, ...]] = []
+        for row, blob, norm in zip(group, blobs, norms):
+            ts_unix, ts_iso = self._timestamp_columns(row.timestamp)
+            params.append(
+                (
+                    row.vec_id,
+                    row.doc_id,
+                    row.space_id,
+                    row.model_id,
+                    row.dim,
+                    blob,
+                    dtype,
+                    row.norm if row.norm is not None else norm,
+                    row.index_name,
+                    ts_unix,
+                    ts_iso,
+                )
+            )
+        return params
+
+    def _index_block(self, group: List[VectorRow], block: np.ndarray, dtype: str) -> None:
+        """Apply a committed block of new rows to the matrix and ANN indexes."""
+        partitions: Dict[Tuple[str, str], List[int]] = {}
+        ann_targets: Dict[AnnKey, List[int]] = {}
+        for position, row in enumerate(group):
+            partitions.setdefault((row.model_id, row.space_id), []).append(position)
+            if row.index_name:
+                ann_targets.setdefault((row.index_name, row.model_id), []).append(
+                    position
+                )
+
+        for (model_id, space_id), positions in partitions.items():
+            self._matrix_index.upsert_block(
+                model_id,
+                space_id,
+                [group[i].vec_id for i in positions],
+                block[positions],
+                dtype,
+            )
+            self._schedule_segment_merge(model_id, space_id)
+
+        ann_indexes = self._load_ann_indexes() if ann_targets else {}
+        for key, positions in ann_targets.items():
+            index = ann_indexes.get(key)
+            if index is None or index.dim != block.shape[1]:
+                continue
+            index.add_batch(
+                [group[i].vec_id for i in positions],
+                block[positions],
+                [{"space_id": group[i].space_id} for i in positions],
+            )
+            self._ann_pending[key] = self._ann_pending.get(key, 0) + len(positions)
+            if self._ann_pending[key] >= self.ann_autosave_every:
+                self._save_ann_index(key)
+
     def get_vector(self, vec_id: str) -> Optional[VectorRow]:
         """Get a vector row by ID."""
         result_dict = self._read_record(vec_id)
@@ -443,6 +696,32 @@ class VectorStore(BaseStore):
             return vectors[0].vector
         return None
 
+    def get_embeddings(self, event_ids: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Latest embedding of each event, fetched with one IN query.
+
+        Batched counterpart of get_embedding for scoring many candidates;
+        events without a vector are absent from the result.
+        """
+        ids = list(dict.fromkeys(event_ids))
+        embeddings: Dict[str, np.ndarray] = {}
+        with sqlite3.connect(self.config.db_path) as conn:
+            for start in range(0, len(ids), self._MAX_IN_PARAMS):
+                chunk = ids[start : start + self._MAX_IN_PARAMS]
+                cursor = conn.execute(
+                    f"""
+                    SELECT doc_id, vector_data, dim, dtype
+                    FROM vector_rows
+                    WHERE doc_id IN ({",".join("?" * len(chunk))})
+                    ORDER BY created_at DESC
+                    """,
+                    chunk,
+                )
+                for doc_id, data, dim, dtype in cursor:
+                    if doc_id not in embeddings:
+                        embeddings[doc_id] = decode_vector(data, dim, dtype)
+        return embeddings
+
     def update_vector(self, vec_id: str, vector_row: VectorRow) -> bool:
         """Update a vector row."""
         try:
@@ -466,6 +745,35 @@ class VectorStore(BaseStore):
         result_dicts = self._list_records(filters, limit, offset)
         return [VectorRow.from_dict(d) for d in result_dicts]
 
+    def list_vectors_page(
+        self,
+        space_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ) -> Page[VectorRow]:
+        """
+        One page of vector rows, newest first, plus the cursor for the next.
+
+        The cursor encodes (created_at, vec_id) of the last row, so the next
+        page seeks past it through idx_vector_space_created instead of
+        skipping rows with OFFSET. Raises InvalidCursorError for a cursor
+        issued for different filters.
+        """
+        filters: Dict[str, Any] = {}
+        if space_id:
+            filters["space_id"] = space_id
+        if model_id:
+            filters["model_id"] = model_id
+        scope = cursor_scope("vector_rows", space_id, model_id)
+        after = decode_cursor(cursor, scope, 2) if cursor else None
+
+        rows = self._list_rows(filters, limit, after=after)
+        next_cursor = None
+        if rows and len(rows) == limit:
+            next_cursor = encode_cursor(scope, rows[-1][1])
+        return Page([row for row, _ in rows], next_cursor)
+
     def get_vectors_by_doc_id(self, doc_id: str) -> List[VectorRow]:
         """Get all vectors for a document."""
         with sqlite3.connect(self.config.db_path) as conn:
@@ -524,6 +832,21 @@ class VectorStore(BaseStore):
 
         return dot_product / (norm1 * norm2)
 
+    def similarity_matrix(
+        self,
+        queries: Sequence[Sequence[float]],
+        candidates: Sequence[Sequence[float]],
+    ) -> np.ndarray:
+        """
+        Cosine similarity of many query vectors against many candidate vectors.
+
+        Returns a (len(queries), len(candidates)) float32 score matrix computed
+        with one matrix-matrix product. Used by callers that already hold the
+        vectors (pattern completion, MMR) instead of calling cosine_similarity
+        once per pair.
+        """
+        return similarity_matrix(queries, candidates)
+
     def similarity_search(
         self,
         query_vector: List[float],
@@ -531,26 +854,324 @@ class VectorStore(BaseStore):
         space_id: Optional[str] = None,
         limit: int = 10,
         min_similarity: float = 0.0,
+        space_ids: Optional[Iterable[str]] = None,
     ) -> List[Tuple[VectorRow, float]]:
         """
         Find similar vectors using cosine similarity.
 
+        Scores every vector of the model (optionally within one space, or the
+        set of spaces in ``space_ids``) with a single matrix-vector product per
+        partition over the in-memory matrix index, loading partitions from
+        SQLite on first use. Only allowed partitions are scanned, so exactly
+        ``limit`` allowed hits come back when that many exist.
+
         Returns list of (VectorRow, similarity_score) tuples ordered by similarity.
         """
-        vectors = self.get_vectors_by_model(model_id, space_id)
+        spaces = self._load_search_spaces(model_id, space_id, space_ids)
+        hits = self._matrix_index.search(
+            query_vector,
+            model_id,
+            limit=limit,
+            min_similarity=min_similarity,
+            space_ids=spaces,
+        )
+        if not hits:
+            return []
 
-        results: List[Tuple[VectorRow, float]] = []
-        for vector_row in vectors:
-            if len(vector_row.vector) != len(query_vector):
-                continue
+        rows = self._get_vectors_by_ids([vec_id for vec_id, _ in hits])
+        return [(rows[vec_id], score) for vec_id, score in hits if vec_id in rows]
+
+    def batch_similarity_search(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        model_id: str,
+        space_id: Optional[str] = None,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+        space_ids: Optional[Iterable[str]] = None,
+    ) -> List[List[Tuple[VectorRow, float]]]:
+        """
+        Run similarity_search for several query vectors in one pass.
 
-            similarity = self.cosine_similarity(query_vector, vector_row.vector)
-            if similarity >= min_similarity:
-                results.append((vector_row, similarity))
+        Every allowed partition is scored against all queries with a single
+        matrix-matrix product and the matching rows are fetched from SQLite in
+        one query. Returns one result list per query vector, in input order.
+        """
+        spaces = self._load_search_spaces(model_id, space_id, space_ids)
+        hits = self._matrix_index.search_batch(
+            query_vectors,
+            model_id,
+            limit=limit,
+            min_similarity=min_similarity,
+            space_ids=spaces,
+        )
+        wanted = {vec_id for query_hits in hits for vec_id, _ in query_hits}
+        if not wanted:
+            return [[] for _ in hits]
+
+        rows = self._get_vectors_by_ids(sorted(wanted))
+        return [
+            [(rows[vec_id], score) for vec_id, score in query_hits if vec_id in rows]
+            for query_hits in hits
+        ]
 
-        # Sort by similarity (highest first) and apply limit
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+    def _load_search_spaces(
+        self,
+        model_id: str,
+        space_id: Optional[str],
+        space_ids: Optional[Iterable[str]],
+    ) -> Optional[Set[str]]:
+        """Load the partitions a search may touch and return its space allow-list."""
+        spaces = self._space_filter(space_id, space_ids)
+        if spaces is None:
+            self._ensure_index_loaded(model_id, None)
+        else:
+            for allowed_space in sorted(spaces):
+                self._ensure_index_loaded(model_id, allowed_space)
+        return spaces
+
+    def _ensure_index_loaded(self, model_id: str, space_id: Optional[str]) -> None:
+        """Load the (model_id, space_id) partition(s) into the matrix index."""
+        if self._matrix_index.is_loaded(model_id, space_id):
+            return
+
+        started = int(time.time())
+        mapped = self._open_segments(model_id, space_id)
+
+        query = "SELECT vec_id, space_id, dim, vector_data, dtype FROM vector_rows WHERE model_id = ?"
+        params: List[str] = [model_id]
+        if space_id:
+            query += " AND space_id = ?"
+            params.append(space_id)
+        if mapped:
+            query += f" AND space_id NOT IN ({','.join('?' * len(mapped))})"
+            params.extend(sorted(mapped))
+
+        # Group rows by (space, dim, dtype) so each group decodes in one pass
+        groups: Dict[Tuple[str, int, str], Tuple[List[str], List[bytes]]] = {}
+        with sqlite3.connect(self.config.db_path) as conn:
+            for vec_id, row_space, dim, data, dtype in conn.execute(query, params):
+                ids, blobs = groups.setdefault((row_space, dim, dtype), ([], []))
+                ids.append(vec_id)
+                blobs.append(data)
+
+        for (row_space, dim, dtype), (ids, blobs) in groups.items():
+            matrix = decode_block(blobs, dim, dtype)
+            self._matrix_index.load_partition(model_id, row_space, ids, matrix, dtype)
+        if self.mmap_segments:
+            for row_space in {key[0] for key in groups}:
+                self._map_partition(model_id, row_space, started)
+
+        self._matrix_index.mark_loaded(model_id, space_id)
+        logger.debug(
+            f"Loaded vector index for model {model_id} space {space_id or '*'}: "
+            f"{sum(len(ids) for ids, _ in groups.values())} vectors"
+        )
+
+    # Memory-mapped segment files
+
+    @property
+    def segment_dir(self) -> Optional[Path]:
+        """Directory holding memory-mapped segment files, next to the SQLite file."""
+        if self.config.db_path == ":memory:":
+            return None
+        db_path = Path(self.config.db_path)
+        return db_path.parent / f"{db_path.stem}.segments"
+
+    def _open_segments(self, model_id: str, space_id: Optional[str]) -> Set[str]:
+        """
+        Map segment files for a model (or one space) and reconcile them with SQLite.
+
+        Returns the spaces that are resident afterwards and need no BLOB scan.
+        """
+        directory = self.segment_dir
+        if not self.mmap_segments or directory is None:
+            return set()
+        if space_id:
+            manifest = read_manifest(directory, segment_stem(model_id, space_id))
+            manifests = [manifest] if manifest else []
+        else:
+            manifests = list(iter_manifests(directory, model_id))
+
+        resident: Set[str] = set()
+        with sqlite3.connect(self.config.db_path) as conn:
+            for manifest in manifests:
+                row_space = manifest["space_id"]
+                if self._matrix_index.is_loaded(model_id, row_space):
+                    resident.add(row_space)
+                    continue
+                started = int(time.time())
+                segment = open_segment(directory, manifest)
+                if segment is None:
+                    continue
+                self._reconcile_segment(conn, model_id, row_space, segment)
+                segment.synced_ts = started
+                self._matrix_index.attach_segment(model_id, row_space, segment)
+                self._schedule_segment_merge(model_id, row_space)
+                resident.add(row_space)
+                logger.debug(
+                    f"Mapped vector segment {model_id}/{row_space}: "
+                    f"{segment.base.size} rows, {segment.pending} pending"
+                )
+        return resident
+
+    def _reconcile_segment(
+        self,
+        conn: sqlite3.Connection,
+        model_id: str,
+        space_id: str,
+        segment: LayeredVectorSegment,
+    ) -> None:
+        """Apply rows written or deleted since the segment was snapshotted."""
+        since = segment.synced_ts or 0
+        present: Set[str] = set()
+        stale: List[str] = []
+        for vec_id, updated_at in conn.execute(
+            "SELECT vec_id, updated_at FROM vector_rows WHERE model_id = ? AND space_id = ?",
+            (model_id, space_id),
+        ):
+            present.add(vec_id)
+            if updated_at >= since or vec_id not in segment:
+                stale.append(vec_id)
+
+        for vec_id in segment.live_ids():
+            if vec_id not in present:
+                segment.remove(vec_id)
+
+        for start in range(0, len(stale), 500):
+            chunk = stale[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for vec_id, dim, data, dtype in conn.execute(
+                f"SELECT vec_id, dim, vector_data, dtype FROM vector_rows WHERE vec_id IN ({placeholders})",
+                chunk,
+            ):
+                if dim != segment.dim:
+                    segment.remove(vec_id)
+                    continue
+                vector = decode_vector(data, dim, dtype)
+                # updated_at has one-second resolution, so unchanged rows from
+                # the snapshot's own second are re-read; keep them in the base
+                if not segment.base_matches(vec_id, vector):
+                    segment.upsert(vec_id, vector)
+
+    def _map_partition(self, model_id: str, space_id: str, synced_ts: int) -> None:
+        """Write a freshly loaded partition to segment files and map it back."""
+        directory = self.segment_dir
+        if directory is None:
+            return
+
+        def _write(segment: VectorMatrixSegment) -> LayeredVectorSegment:
+            manifest = write_segment(
+                directory,
+                model_id,
+                space_id,
+                segment.dim,
+                segment.dtype,
+                segment.storage_arrays(),
+                synced_ts,
+            )
+            return LayeredVectorSegment(open_base(directory, manifest), manifest)
+
+        try:
+            self._matrix_index.convert_partition(model_id, space_id, _write)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not map vector segment {model_id}/{space_id}: {e}")
+
+    def _schedule_segment_merge(self, model_id: str, space_id: str) -> None:
+        """Start a background merge once a mapped partition has enough pending rows."""
+        if not self.mmap_segments:
+            return
+        segment = self._matrix_index.partition(model_id, space_id)
+        if (
+            not isinstance(segment, LayeredVectorSegment)
+            or segment.pending < self.segment_merge_rows
+        ):
+            return
+        key = (model_id, space_id)
+        with self._segment_lock:
+            if key in self._segment_merges:
+                return
+            self._segment_merges.add(key)
+        threading.Thread(
+            target=self._merge_in_background,
+            args=key,
+            name="vector-segment-merge",
+            daemon=True,
+        ).start()
+
+    def _merge_in_background(self, model_id: str, space_id: str) -> None:
+        try:
+            self.merge_segment(model_id, space_id)
+        except Exception as e:
+            logger.error(f"Vector segment merge failed for {model_id}/{space_id}: {e}")
+        finally:
+            with self._segment_lock:
+                self._segment_merges.discard((model_id, space_id))
+
+    def merge_segment(self, model_id: str, space_id: str) -> bool:
+        """
+        Fold a mapped partition's delta and tombstones into a new segment file.
+
+        Writes made while the file is being written are replayed on top of the
+        new base. Returns True if a new generation was swapped in.
+        """
+        directory = self.segment_dir
+        started = self._matrix_index.begin_merge(model_id, space_id)
+        if started is None:
+            return False
+        segment, arrays = started
+        base = manifest = None
+        try:
+            if directory is not None:
+                manifest = write_segment(
+                    directory,
+                    model_id,
+                    space_id,
+                    segment.dim,
+                    segment.dtype,
+                    arrays,
+                    segment.synced_ts,
+                )
+                base = open_base(directory, manifest)
+        finally:
+            merged = self._matrix_index.finish_merge(
+                model_id, space_id, segment, base, manifest
+            )
+        if merged:
+            logger.debug(
+                f"Merged vector segment {model_id}/{space_id}: {len(arrays[0])} rows"
+            )
+        return merged
+
+    def flush_vector_segments(self) -> int:
+        """Merge every mapped partition with pending writes; returns the merge count."""
+        merged = 0
+        for model_id, space_id in self._matrix_index.mapped_partitions():
+            segment = self._matrix_index.partition(model_id, space_id)
+            if isinstance(segment, LayeredVectorSegment) and segment.pending:
+                merged += self.merge_segment(model_id, space_id)
+        return merged
+
+    def _get_vectors_by_ids(self, vec_ids: List[str]) -> Dict[str, VectorRow]:
+        """Fetch VectorRows for a set of ids, _MAX_IN_PARAMS ids per IN query."""
+        rows: Dict[str, VectorRow] = {}
+        if not vec_ids:
+            return rows
+        with sqlite3.connect(self.config.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            for start in range(0, len(vec_ids), self._MAX_IN_PARAMS):
+                chunk = vec_ids[start : start + self._MAX_IN_PARAMS]
+                cursor = conn.execute(
+                    f"""
+                    SELECT vec_id, doc_id, space_id, model_id, dim, vector_data, dtype, norm, index_name, timestamp_iso
+                    FROM vector_rows
+                    WHERE vec_id IN ({",".join("?" * len(chunk))})
+                    """,
+                    chunk,
+                )
+                for row in cursor:
+                    rows[row["vec_id"]] = self._row_to_vector_row(row)
+        return rows
 
     def get_index_vectors(
         self, index_name: str, space_id: Optional[str] = None
@@ -572,4 +1193,577 @@ class VectorStore(BaseStore):
         with sqlite3.connect(self.config.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(query, params)
-            return [self._row_to_vector_row(row) for row in cursor.fetchall()]
\ No newline at end of file
+            return [self._row_to_vector_row(row) for row in cursor.fetchall()]
+
+    # Approximate nearest neighbour (HNSW) indexes
+
+    @property
+    def ann_index_dir(self) -> Optional[Path]:
+        """Directory holding HNSW index files, next to the SQLite file."""
+        if self.config.db_path == ":memory:":
+            return None
+        db_path = Path(self.config.db_path)
+        return db_path.parent / f"{db_path.stem}.ann"
+
+    def _ann_path(self, index_name: str, model_id: str) -> Optional[Path]:
+        directory = self.ann_index_dir
+        if directory is None:
+            return None
+        safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", f"{index_name}__{model_id}")
+        return directory / f"{safe_name}.hnsw.npz"
+
+    def _load_ann_indexes(self) -> Dict[AnnKey, HNSWIndex]:
+        """Open every HNSW index file on first use and replay rows it missed."""
+        if self._ann_discovered:
+            return self._ann_indexes
+        self._ann_discovered = True
+        directory = self.ann_index_dir
+        if directory is None or not directory.exists():
+            return self._ann_indexes
+        for stale in directory.glob("*.hnsw.npz.tmp"):
+            # Left behind by a save interrupted before its rename
+            stale.unlink(missing_ok=True)
+        for path in sorted(directory.glob("*.hnsw.npz")):
+            try:
+                index = HNSWIndex.load(path)
+                key = (index.metadata["index_name"], index.metadata["model_id"])
+            except Exception as e:
+                logger.error(f"Failed to load ANN index {path}: {e}")
+                continue
+            if key in self._ann_indexes:
+                continue
+            self._ann_indexes[key] = index
+            try:
+                self._recover_ann_index(key, index, path)
+            except Exception as e:
+                logger.error(f"Failed to replay ANN index {path}: {e}")
+        return self._ann_indexes
+
+    def get_ann_index(self, index_name: str, model_id: str) -> Optional[HNSWIndex]:
+        """Get the HNSW index for an index_name/model_id pair, if one exists."""
+        return self._load_ann_indexes().get((index_name, model_id))
+
+    def create_ann_index(
+        self,
+        index_name: str,
+        model_id: str,
+        M: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+    ) -> HNSWIndex:
+        """
+        Build a persistent HNSW index over the vectors tagged with ``index_name``
+        for ``model_id``. Later writes to that index_name are applied incrementally.
+        """
+        key = (index_name, model_id)
+        existing = self.get_ann_index(index_name, model_id)
+        if existing is not None:
+            raise ValueError(f"ANN index {index_name}/{model_id} already exists")
+
+        synced_ts, position = self._ann_sync_point()
+        rows = [r for r in self.get_index_vectors(index_name) if r.model_id == model_id]
+        if not rows:
+            raise ValueError(
+                f"No vectors found for index {index_name} and model {model_id}"
+            )
+        now = datetime.now(timezone.utc).isoformat()
+        index = HNSWIndex(
+            dim=rows[0].dim,
+            M=M,
+            ef_construction=ef_construction,
+            ef_search=ef_search,
+            metadata={
+                "index_name": index_name,
+                "model_id": model_id,
+                "created_ts": now,
+                "last_rebuild_ts": now,
+                "rebuild_count": 0,
+                "snapshot_position": position,
+                "synced_ts": synced_ts,
+            },
+            attributes=ANN_FILTER_ATTRIBUTES,
+        )
+        self._fill_ann_index(index, rows)
+        self._ann_indexes[key] = index
+        self._save_ann_index(key)
+        logger.info(
+            f"Created ANN index {index_name}/{model_id} with {len(index)} vectors"
+        )
+        return index
+
+    def rebuild_ann_index(
+        self,
+        index_name: str,
+        model_id: str,
+        config_store: Optional["IndexConfigStore"] = None,
+    ) -> HNSWIndex:
+        """
+        Rebuild an HNSW index from vector_rows, dropping tombstones.
+
+        The rebuild is tracked in the IndexCheckpointStore rebuild status while
+        it runs. If ``config_store`` (in an active transaction) holds the
+        index's registration, its health metadata is refreshed afterwards.
+        """
+        key = (index_name, model_id)
+        current = self.get_ann_index(index_name, model_id)
+        if current is None:
+            raise ValueError(f"ANN index {index_name}/{model_id} does not exist")
+
+        self._ann_rebuilding.add(key)
+        try:
+            synced_ts, position = self._ann_sync_point()
+            with self._checkpoint_transaction() as checkpoints:
+                checkpoints.start_rebuild(index_name, position, total_shards=1)
+            rows = [
+                r for r in self.get_index_vectors(index_name) if r.model_id == model_id
+            ]
+            metadata = dict(current.metadata)
+            metadata["last_rebuild_ts"] = datetime.now(timezone.utc).isoformat()
+            metadata["rebuild_count"] = int(metadata.get("rebuild_count", 0)) + 1
+            metadata["snapshot_position"] = position
+            metadata["synced_ts"] = synced_ts
+            index = HNSWIndex(
+                dim=current.dim,
+                M=current.M,
+                ef_construction=current.ef_construction,
+                ef_search=current.ef_search,
+                metadata=metadata,
+                attributes=ANN_FILTER_ATTRIBUTES,
+            )
+            self._fill_ann_index(index, rows)
+            self._ann_indexes[key] = index
+            self._save_ann_index(key)
+            with self._checkpoint_transaction() as checkpoints:
+                checkpoints.update_rebuild_progress(index_name, position, 1)
+                checkpoints.complete_rebuild(index_name)
+        finally:
+            self._ann_rebuilding.discard(key)
+
+        if config_store is not None and config_store.config_exists(index_name):
+            config = config_store.get_config(index_name)
+            if config is not None:
+                config.metadata["health"] = self.ann_index_metrics(
+                    index_name, model_id
+                )
+                config_store.update_config(config)
+
+        logger.info(f"Rebuilt ANN index {index_name}/{model_id}: {len(index)} vectors")
+        return index
+
+    def drop_ann_index(self, index_name: str, model_id: str) -> bool:
+        """Remove an HNSW index and its file."""
+        key = (index_name, model_id)
+        self._load_ann_indexes()
+        removed = self._ann_indexes.pop(key, None) is not None
+        self._ann_pending.pop(key, None)
+        path = self._ann_path(index_name, model_id)
+        if path is not None and path.exists():
+            path.unlink()
+            removed = True
+        if path is not None:
+            try:
+                from storage.monitoring.index_checkpoint_store import (
+                    CheckpointQuery,
+                )
+
+                query = CheckpointQuery(
+                    index_name=index_name, shard_id=self._ann_shard(model_id)
+                )
+                with self._checkpoint_transaction() as checkpoints:
+                    # Every snapshot of the index, a page at a time
+                    stale = checkpoints.query_checkpoints(query)
+                    while stale and all(checkpoints.delete(c.id) for c in stale):
+                        stale = checkpoints.query_checkpoints(query)
+            except Exception as e:
+                logger.error(
+                    f"Failed to drop checkpoint of {index_name}/{model_id}: {e}"
+                )
+        return removed
+
+    def _fill_ann_index(self, index: HNSWIndex, rows: List[VectorRow]) -> None:
+        rows = [r for r in rows if r.dim == index.dim]
+        if rows:
+            index.add_batch(
+                [r.vec_id for r in rows],
+                np.asarray([r.vector for r in rows], dtype=np.float32),
+                [{"space_id": r.space_id} for r in rows],
+            )
+
+    def _ensure_ann_attributes(self, index: HNSWIndex) -> None:
+        """Backfill the space allow-lists of an index saved before they existed."""
+        missing = [a for a in ANN_FILTER_ATTRIBUTES if a not in index.attributes]
+        if not missing:
+            return
+        for attribute in missing:
+            index.add_attribute(attribute)
+        live = index.live_ids()
+        with sqlite3.connect(self.config.db_path) as conn:
+            for start in range(0, len(live), 500):
+                chunk = live[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for vec_id, space_id in conn.execute(
+                    f"SELECT vec_id, space_id FROM vector_rows WHERE vec_id IN ({placeholders})",
+                    chunk,
+                ):
+                    index.set_attributes(vec_id, {"space_id": space_id})
+
+    def ann_search(
+        self,
+        query_vector: List[float],
+        index_name: str,
+        model_id: str,
+        space_id: Optional[str] = None,
+        limit: int = 10,
+        ef_search: Optional[int] = None,
+        min_similarity: float = 0.0,
+        space_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[VectorRow, float]]:
+        """
+        Approximate similarity search through the HNSW index for index_name/model_id.
+
+        ``ef_search`` overrides the index default to trade latency for recall.
+        ``space_id`` / ``space_ids`` restrict results to those spaces through the
+        index's allow-list during traversal, so up to ``limit`` hits from the
+        allowed spaces come back in one pass.
+        Returns (VectorRow, similarity) tuples ordered by similarity.
+        """
+        index = self.get_ann_index(index_name, model_id)
+        if index is None:
+            raise ValueError(f"ANN index {index_name}/{model_id} does not exist")
+
+        spaces = self._space_filter(space_id, space_ids)
+        filters = None
+        if spaces is not None:
+            self._ensure_ann_attributes(index)
+            filters = {"space_id": spaces}
+        hits = index.search(query_vector, limit, ef_search, filters)
+        hits = [(vec_id, score) for vec_id, score in hits if score >= min_similarity]
+        rows = self._get_vectors_by_ids([vec_id for vec_id, _ in hits])
+        return [(rows[vec_id], score) for vec_id, score in hits if vec_id in rows]
+
+    @staticmethod
+    def _space_filter(
+        space_id: Optional[str], space_ids: Optional[Iterable[str]]
+    ) -> Optional[Set[str]]:
+        """Combine the single-space and multi-space arguments into one allow-list."""
+        if space_ids is None:
+            return {space_id} if space_id else None
+        spaces = set(space_ids)
+        if space_id:
+            spaces.add(space_id)
+        return spaces
+
+    def flush_ann_indexes(self) -> None:
+        """Write every HNSW index with unsaved mutations to disk."""
+        for key in list(self._ann_pending):
+            self._save_ann_index(key)
+
+    def _save_ann_index(self, key: AnnKey) -> None:
+        """
+        Snapshot an index atomically and checkpoint it.
+
+        Rows added by other writers since the last checkpoint are caught up
+        first, so the recorded position is the highest vector_rows rowid the
+        snapshot reflects.
+        """
+        index = self._ann_indexes.get(key)
+        self._ann_pending.pop(key, None)
+        path = self._ann_path(*key)
+        if index is None or path is None:
+            return
+        index.metadata["snapshot_position"] = self._ann_catch_up(key, index)
+        index.metadata["last_saved_ts"] = datetime.now(timezone.utc).isoformat()
+        index.save(path)
+        try:
+            self._record_ann_checkpoint(key, index, path)
+        except Exception as e:
+            # The snapshot carries its own position, so recovery still works
+            logger.error(f"Failed to checkpoint ANN index {key[0]}/{key[1]}: {e}")
+
+    # Snapshot checkpoints and delta replay
+
+    @staticmethod
+    def _ann_shard(model_id: str) -> str:
+        """Checkpoint shard of an HNSW index; the index_name is the checkpoint's own."""
+        return f"hnsw:{model_id}"
+
+    @contextmanager
+    def _checkpoint_transaction(self) -> Iterator["IndexCheckpointStore"]:
+        """IndexCheckpointStore in a transaction on this store's database."""
+        from storage.monitoring.index_checkpoint_store import IndexCheckpointStore
+
+        with self._checkpoint_lock:
+            if self._checkpoints is None:
+                self._checkpoints = IndexCheckpointStore(self.config)
+            with sqlite3.connect(self.config.db_path) as conn:
+                self._checkpoints.begin_transaction(conn)
+                try:
+                    yield self._checkpoints
+                except Exception:
+                    self._checkpoints.rollback_transaction(conn)
+                    raise
+                self._checkpoints.commit_transaction(conn)
+
+    def _ann_sync_point(self) -> Tuple[int, int]:
+        """
+        (unix time, highest vector_rows rowid) taken before reading rows, so an
+        index built from what follows reflects at least every row up to both.
+        """
+        synced_ts = int(time.time())
+        with sqlite3.connect(self.config.db_path) as conn:
+            (position,) = conn.execute(
+                "SELECT COALESCE(MAX(rowid), 0) FROM vector_rows"
+            ).fetchone()
+        return synced_ts, int(position)
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _ann_catch_up(self, key: AnnKey, index: HNSWIndex) -> int:
+        """
+        Add rows past the index's snapshot position that it does not hold yet
+        (written by other processes) and return the new position.
+        """
+        index_name, model_id = key
+        previous = int(index.metadata.get("snapshot_position", 0))
+        with sqlite3.connect(self.config.db_path) as conn:
+            (position,) = conn.execute(
+                "SELECT COALESCE(MAX(rowid), 0) FROM vector_rows"
+            ).fetchone()
+            missing = [
+                vec_id
+                for (vec_id,) in conn.execute(
+                    """
+                    SELECT vec_id FROM vector_rows
+                    WHERE rowid > ? AND rowid <= ? AND index_name = ? AND model_id = ?
+                    """,
+                    (previous, position, index_name, model_id),
+                )
+                if vec_id not in index
+            ]
+        if missing:
+            rows = self._get_vectors_by_ids(missing)
+            self._fill_ann_index(index, list(rows.values()))
+        return max(previous, int(position))
+
+    def _ann_snapshot_state(
+        self, key: AnnKey, index: HNSWIndex, path: Path
+    ) -> Tuple[int, int, bool]:
+        """
+        Position and sync time to replay a loaded snapshot from, and whether
+        its checkpoint matched the file.
+
+        The latest IndexCheckpoint drives recovery. If it is missing or was
+        recorded for different file contents (a crash between the rename and
+        the checkpoint write), the older of the two positions is used; replay
+        is idempotent, so being conservative only costs redundant checks.
+        """
+        file_position = int(index.metadata.get("snapshot_position", 0))
+        file_synced = int(index.metadata.get("synced_ts", 0))
+        with self._checkpoint_transaction() as checkpoints:
+            checkpoint = checkpoints.get_latest_checkpoint(
+                key[0], self._ann_shard(key[1])
+            )
+        if checkpoint is None:
+            return file_position, file_synced, False
+        checkpoint_synced = int(checkpoint.metadata.get("synced_ts", 0))
+        if checkpoint.content_hash == self._file_digest(path):
+            return checkpoint.position, checkpoint_synced, True
+        return (
+            min(file_position, checkpoint.position),
+            min(file_synced, checkpoint_synced),
+            False,
+        )
+
+    def _recover_ann_index(self, key: AnnKey, index: HNSWIndex, path: Path) -> None:
+        """
+        Bring a loaded snapshot up to date with vector_rows.
+
+        Rows past the checkpointed rowid are replayed, rows updated since the
+        snapshot's last full sync are re-checked (which also covers rowids
+        renumbered by VACUUM), and ids no longer tagged with this
+        index_name/model_id are removed. Unchanged rows are skipped so the
+        graph does not collect tombstones.
+        """
+        index_name, model_id = key
+        position, synced_ts, trusted = self._ann_snapshot_state(key, index, path)
+        started, head = self._ann_sync_point()
+        with sqlite3.connect(self.config.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """
+                SELECT vec_id, doc_id, space_id, model_id, dim, vector_data, dtype, norm, index_name, timestamp_iso
+                FROM vector_rows
+                WHERE index_name = ? AND model_id = ? AND (rowid > ? OR updated_at >= ?)
+                """,
+                (index_name, model_id, position, synced_ts),
+            )
+            changed = [self._row_to_vector_row(row) for row in cursor]
+            current = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT vec_id FROM vector_rows WHERE index_name = ? AND model_id = ?",
+                    (index_name, model_id),
+                )
+            }
+
+        replayed: List[VectorRow] = []
+        relabelled = 0
+        tracks_spaces = "space_id" in index.attributes
+        for row in changed:
+            if row.dim != index.dim:
+                continue
+            if not index.has_vector(row.vec_id, row.vector):
+                replayed.append(row)
+            elif tracks_spaces and index.get_attribute(row.vec_id, "space_id") != (
+                row.space_id
+            ):
+                index.set_attributes(row.vec_id, {"space_id": row.space_id})
+                relabelled += 1
+        self._fill_ann_index(index, replayed)
+        removed = [vec_id for vec_id in index.live_ids() if vec_id not in current]
+        for vec_id in removed:
+            index.remove(vec_id)
+
+        index.metadata["snapshot_position"] = max(position, head)
+        index.metadata["synced_ts"] = started
+        if replayed or relabelled or removed or not trusted:
+            logger.info(
+                f"Recovered ANN index {index_name}/{model_id} from rowid {position}: "
+                f"{len(replayed)} rows replayed, {relabelled} relabelled, "
+                f"{len(removed)} removed"
+            )
+            self._save_ann_index(key)
+
+    def _record_ann_checkpoint(
+        self, key: AnnKey, index: HNSWIndex, path: Path
+    ) -> None:
+        from storage.monitoring.index_checkpoint_store import IndexCheckpoint
+
+        checkpoint = IndexCheckpoint(
+            id=uuid.uuid4().hex.upper()[:26],
+            index_name=key[0],
+            shard_id=self._ann_shard(key[1]),
+            position=int(index.metadata["snapshot_position"]),
+            content_hash=self._file_digest(path),
+            metadata={
+                "path": str(path),
+                "synced_ts": int(index.metadata.get("synced_ts", 0)),
+                "vectors": len(index),
+                "node_count": index.node_count,
+            },
+        )
+        with self._checkpoint_transaction() as checkpoints:
+            checkpoints.create_checkpoint(checkpoint)
+            # Only the latest snapshot is ever restored
+            checkpoints.cleanup_old_checkpoints(key[0], keep_latest=1)
+
+    def _ann_touch(self, key: AnnKey) -> None:
+        pending = self._ann_pending.get(key, 0) + 1
+        self._ann_pending[key] = pending
+        if pending >= self.ann_autosave_every:
+            self._save_ann_index(key)
+
+    def _ann_upsert(
+        self,
+        vec_id: str,
+        index_name: Optional[str],
+        model_id: str,
+        space_id: str,
+        vector: List[float],
+    ) -> None:
+        """Apply a write to the HNSW indexes, moving the vector between indexes if needed."""
+        indexes = self._load_ann_indexes()
+        if not indexes:
+            return
+        target = (index_name, model_id) if index_name else None
+        for key, index in indexes.items():
+            if key != target and index.remove(vec_id):
+                self._ann_touch(key)
+        if target is not None and target in indexes:
+            index = indexes[target]
+            if len(vector) == index.dim:
+                index.add(vec_id, vector, {"space_id": space_id})
+                self._ann_touch(target)
+
+    def _ann_remove(self, vec_id: str) -> None:
+        for key, index in self._load_ann_indexes().items():
+            if index.remove(vec_id):
+                self._ann_touch(key)
+
+    def ann_index_metrics(self, index_name: str, model_id: str) -> Dict[str, Any]:
+        """Health metrics for an HNSW index, in IndexHealthMonitor.evaluate format."""
+        index = self.get_ann_index(index_name, model_id)
+        if index is None:
+            raise ValueError(f"ANN index {index_name}/{model_id} does not exist")
+        path = self._ann_path(index_name, model_id)
+        size_bytes = (
+            path.stat().st_size
+            if path is not None and path.exists()
+            else index.node_count * index.dim * 4
+        )
+        return {
+            "size_mb": size_bytes / (1024 * 1024),
+            "document_count": len(index),
+            "last_updated": index.metadata.get("last_saved_ts"),
+            "rebuild_in_progress": (index_name, model_id) in self._ann_rebuilding,
+            "engine": "hnsw",
+            "deleted_ratio": index.deleted_ratio,
+            "node_count": index.node_count,
+            "ef_search": index.ef_search,
+            "last_rebuild_ts": index.metadata.get("last_rebuild_ts"),
+            "rebuild_count": index.metadata.get("rebuild_count", 0),
+        }
+
+    def register_ann_index(
+        self,
+        config_store: "IndexConfigStore",
+        index_name: str,
+        model_id: str,
+        space_id: str,
+        band_min: str = "GREEN",
+    ) -> str:
+        """
+        Register an HNSW index with the IndexConfigStore as an embeddings index,
+        so it is tracked by health monitoring and lifecycle management alongside
+        the FTS indexes. The config store must be in an active transaction.
+        """
+        from storage.monitoring.index_config_store import EmbeddingsConfig, IndexConfig
+
+        index = self.get_ann_index(index_name, model_id)
+        if index is None:
+            raise ValueError(f"ANN index {index_name}/{model_id} does not exist")
+
+        path = self._ann_path(index_name, model_id)
+        config = IndexConfig(
+            index_name=index_name,
+            type="embeddings",
+            space_id=space_id,
+            band_min=band_min,  # type: ignore[arg-type]
+            embeddings_config=EmbeddingsConfig(
+                model_id=model_id,
+                dimensions=index.dim,
+                similarity_metric="cosine",
+            ),
+            metadata={
+                "engine": "hnsw",
+                "path": str(path) if path else None,
+                "M": index.M,
+                "ef_construction": index.ef_construction,
+                "ef_search": index.ef_search,
+                "health": self.ann_index_metrics(index_name, model_id),
+            },
+        )
+        if config_store.config_exists(index_name):
+            existing = config_store.get_config(index_name)
+            if existing is not None:
+                config.created_ts = existing.created_ts
+            config_store.update_config(config)
+        else:
+            config_store.create_config(config)
+        return index_name
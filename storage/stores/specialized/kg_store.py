@@ -13,6 +13,13 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from storage.core.base_store import BaseStore
+from storage.core.pagination import (
+    Page,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +97,8 @@ class KGStore(BaseStore):
         CREATE INDEX IF NOT EXISTS idx_kg_entities_space_id ON kg_entities(space_id);
         CREATE INDEX IF NOT EXISTS idx_kg_entities_types ON kg_entities(types);
         CREATE INDEX IF NOT EXISTS idx_kg_entities_created_ts ON kg_entities(created_ts);
+        CREATE INDEX IF NOT EXISTS idx_kg_entities_space_created
+            ON kg_entities(space_id, created_ts, id);
 
         CREATE TABLE IF NOT EXISTS kg_edges (
             id TEXT PRIMARY KEY,
@@ -287,7 +296,10 @@ class KGStore(BaseStore):
         logger.info(f"Deleted KG entity {entity_id} and associated edges")
 
     def list_entities(
-        self, space_id: Optional[str] = None, limit: Optional[int] = None
+        self,
+        space_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[KGEntity]:
         """
         List KG entities, optionally filtered by space.
@@ -295,30 +307,77 @@ class KGStore(BaseStore):
         Args:
             space_id: Optional space filter
             limit: Optional result limit
+            cursor: Optional continuation cursor from list_entities_page
 
         Returns:
             List of KGEntity instances
         """
+        if cursor:
+            return self.list_entities_page(space_id, limit or 100, cursor).items
+        return [entity for entity, _ in self._entity_rows(space_id, limit)]
+
+    def list_entities_page(
+        self,
+        space_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page[KGEntity]:
+        """
+        One page of KG entities, newest first, plus the cursor for the next.
+
+        Args:
+            space_id: Optional space filter
+            limit: Page size
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Page of KGEntity instances; next_cursor is None on the last page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for
+                another space
+        """
+        scope = cursor_scope("kg_entities", space_id)
+        after = decode_cursor(cursor, scope, 2) if cursor else None
+        rows = self._entity_rows(space_id, limit, after)
+
+        next_cursor = None
+        if rows and len(rows) == limit:
+            next_cursor = encode_cursor(scope, rows[-1][1])
+        return Page([entity for entity, _ in rows], next_cursor)
+
+    def _entity_rows(
+        self,
+        space_id: Optional[str],
+        limit: Optional[int],
+        after: Optional[Tuple[Any, ...]] = None,
+    ) -> List[Tuple[KGEntity, Tuple[str, str]]]:
+        """Entities in (created_ts, id) descending order with their sort keys."""
         if not self._connection:
             raise RuntimeError("KGStore not in transaction")
 
+        query = """
+            SELECT id, space_id, types, labels, created_ts, props
+            FROM kg_entities
+        """
+        where: List[str] = []
+        params: List[Any] = []
         if space_id:
-            query = """
-                SELECT id, space_id, types, labels, created_ts, props
-                FROM kg_entities WHERE space_id = ?
-                ORDER BY created_ts DESC
-            """
-            params = (space_id,)
-        else:
-            query = """
-                SELECT id, space_id, types, labels, created_ts, props
-                FROM kg_entities
-                ORDER BY created_ts DESC
-            """
-            params = ()
+            where.append("space_id = ?")
+            params.append(space_id)
+        if after is not None:
+            condition, key_params = keyset_condition(
+                [("created_ts", True), ("id", True)], after
+            )
+            where.append(condition)
+            params.extend(key_params)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_ts DESC, id DESC"
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
 
         cursor = self._connection.execute(query, params)
         rows = cursor.fetchall()
@@ -333,7 +392,7 @@ class KGStore(BaseStore):
                 created_ts=row[4],
                 props=json.loads(row[5]) if row[5] else None,
             )
-            entities.append(entity)
+            entities.append((entity, (row[4], row[0])))
 
         return entities
 
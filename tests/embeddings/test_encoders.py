@@ -0,0 +1,111 @@
+"""
+Test suite for the local embedding provider.
+
+Validates:
+1. HashingEncoder is deterministic, normalized and reflects lexical overlap
+2. EmbeddingProvider caches by (model_id, content hash) with LRU eviction
+3. Concurrent embed_text calls are micro-batched into one encoder call
+4. create_encoder falls back to hashing when no ONNX model is available
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import test
+
+from embeddings.encoders import (
+    EmbeddingProvider,
+    HashingEncoder,
+    create_encoder,
+)
+
+
+class CountingEncoder(HashingEncoder):
+    """HashingEncoder that records every batch it is asked to encode."""
+
+    def __init__(self, dim=32):
+        super().__init__(dim, model_id="counting")
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return super().encode(texts)
+
+
+@test("hashing encoder is deterministic, normalized and lexical")
+def test_hashing_encoder():
+    encoder = HashingEncoder(128)
+    texts = [
+        "Sunday dinner with the grandparents",
+        "dinner with grandparents on Sunday",
+        "quarterly tax filing deadline",
+        "",
+    ]
+    vectors = encoder.encode(texts)
+
+    assert vectors.shape == (4, 128) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, atol=1e-5)
+    assert not vectors[3].any()
+    assert np.array_equal(vectors, HashingEncoder(128).encode(texts))
+    assert vectors[0] @ vectors[1] > 0.5
+    assert abs(vectors[0] @ vectors[2]) < 0.3
+    assert encoder.model_id == "hashing-v1-128"
+
+
+@test("provider caches by content hash and evicts least recently used")
+def test_provider_cache():
+    encoder = CountingEncoder()
+    provider = EmbeddingProvider(encoder, cache_size=2, max_batch_size=8)
+
+    first = provider.embed_many(["a b", "c d", "a b"])
+    assert encoder.calls == [["a b", "c d"]]
+    assert np.array_equal(first[0], first[2])
+
+    assert provider.embed("a b") == first[0].tolist()
+    assert len(encoder.calls) == 1
+    provider.embed("e f")  # evicts "c d", the least recently used
+    provider.embed("c d")
+    assert encoder.calls[-1] == ["c d"]
+    assert provider.stats()["cache_entries"] == 2
+
+    # Same text under another model id is a different cache entry
+    assert provider.cache.key("counting", "a b") != provider.cache.key("m2", "a b")
+    assert provider.cache.get(provider.cache.key("m2", "a b")) is None
+
+
+@test("concurrent embed_text calls share one encoder call")
+def test_micro_batching():
+    encoder = CountingEncoder()
+    provider = EmbeddingProvider(encoder, max_batch_size=64, max_wait_ms=20)
+
+    async def run():
+        texts = [f"note {i % 10}" for i in range(40)]
+        return texts, await asyncio.gather(*(provider.embed_text(t) for t in texts))
+
+    texts, vectors = asyncio.run(run())
+    assert len(encoder.calls) == 1
+    assert sorted(encoder.calls[0]) == sorted({t for t in texts})
+    expected = HashingEncoder(32, model_id="counting").encode(texts)
+    assert np.allclose(np.array(vectors), expected)
+
+    # A full queue flushes without waiting for the timer
+    small = EmbeddingProvider(CountingEncoder(), max_batch_size=4, max_wait_ms=10000)
+
+    async def burst():
+        return await small.embed_texts([f"x{i}" for i in range(8)])
+
+    assert len(asyncio.run(asyncio.wait_for(burst(), timeout=5))) == 8
+    assert [len(call) for call in small.encoder.calls] == [4, 4]
+
+
+@test("create_encoder falls back to hashing without a usable model")
+def test_create_encoder_fallback():
+    assert isinstance(create_encoder(None, dim=64), HashingEncoder)
+    assert create_encoder(None, dim=64).dim == 64
+    with tempfile.TemporaryDirectory() as directory:
+        missing = Path(directory) / "minilm.onnx"
+        assert isinstance(create_encoder(str(missing)), HashingEncoder)
+        missing.write_bytes(b"not a model")
+        assert isinstance(create_encoder(str(missing)), HashingEncoder)
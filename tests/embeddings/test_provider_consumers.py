@@ -0,0 +1,124 @@
+"""
+Test suite for components that embed through EmbeddingProvider.
+
+Validates:
+1. ResultFusionEngine embeds normalized results through the async,
+   micro-batched provider API, never the blocking one
+2. MemoryDeduplicationEngine scores candidates by embedding similarity and
+   links semantically equal memories that share few tokens
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+from ward import test
+
+from context_bundle.result_fuser import ResultFusionEngine
+from embeddings.encoders import EmbeddingProvider, HashingEncoder
+from hippocampus.types import CompletionCandidate, HippocampalEncoding
+from memory_steward.deduplication_engine import MemoryDeduplicationEngine
+
+SPACE = "shared:household"
+
+
+class _SynonymEncoder(HashingEncoder):
+    """Hashing encoder that maps a few synonyms onto one token."""
+
+    SYNONYMS = {"doctor": "dentist", "visit": "appointment", "nana": "grandma"}
+
+    def encode(self, texts):
+        return super().encode(
+            [
+                " ".join(self.SYNONYMS.get(word, word) for word in text.split())
+                for text in texts
+            ]
+        )
+
+
+class _Hippocampus:
+    def __init__(self, candidates):
+        self.candidates = candidates
+
+    async def recall_by_cue(self, space_id, cue_text, k, use_vectors):
+        return self.candidates
+
+
+def _encoding(content: str) -> HippocampalEncoding:
+    return HippocampalEncoding(
+        event_id="evt-new",
+        space_id=SPACE,
+        simhash_hex="0" * 128,
+        minhash32=[0] * 64,
+        novelty=0.5,
+        near_duplicates=[],
+        length=len(content),
+        ts=datetime.now(timezone.utc),
+        metadata={"content": content},
+    )
+
+
+@test("result fusion embeds normalized results without blocking the loop")
+def test_fuser_embeds_async():
+    provider = EmbeddingProvider(HashingEncoder(dim=64))
+    provider.embed_many = None  # The blocking API must not be used
+    fuser = ResultFusionEngine(embedding_provider=provider)
+    results = [
+        {"content_id": "a", "content": "dentist appointment for grandma"},
+        {"content_id": "b", "content": "soccer practice after school"},
+    ]
+
+    normalized = asyncio.run(fuser._normalize_cross_store_results(results))
+
+    assert provider.batches_encoded == 1
+    reference = EmbeddingProvider(HashingEncoder(dim=64))
+    for item, result in zip(normalized, results):
+        assert np.allclose(
+            item["content_embedding"], reference.embed(result["content"])
+        )
+
+
+@test("deduplication links memories that are equal in embedding space")
+def test_dedup_semantic_similarity():
+    provider = EmbeddingProvider(_SynonymEncoder(dim=256))
+    candidates = [
+        CompletionCandidate(
+            event_id="evt-synonym",
+            score=0.85,
+            explanation=[],
+            metadata={"content": "doctor visit for nana"},
+        ),
+        CompletionCandidate(
+            event_id="evt-other",
+            score=0.85,
+            explanation=[],
+            metadata={"content": "soccer practice after school"},
+        ),
+        CompletionCandidate(event_id="evt-empty", score=0.85, explanation=[]),
+    ]
+    engine = MemoryDeduplicationEngine(
+        hippocampus_api=_Hippocampus(candidates), embedding_provider=provider
+    )
+    engine._calculate_temporal_distance = _async(48.0)
+
+    matches = asyncio.run(
+        engine._find_similar_memories(
+            _encoding("dentist appointment for grandma"), SPACE
+        )
+    )
+
+    by_id = {match.event_id: match for match in matches}
+    synonym = by_id["evt-synonym"].similarity_breakdown
+    assert abs(synonym["semantic_similarity"] - 1.0) < 1e-5
+    assert synonym["content_overlap"] < 0.5
+    assert by_id["evt-synonym"].merge_recommendation == "link"
+    assert by_id["evt-other"].similarity_breakdown["semantic_similarity"] < 0.5
+    assert by_id["evt-other"].merge_recommendation == "append_context"
+    assert by_id["evt-empty"].similarity_breakdown["semantic_similarity"] == 0.0
+
+
+def _async(value):
+    async def result(*args, **kwargs):
+        return value
+
+    return result
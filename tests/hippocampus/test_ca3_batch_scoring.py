@@ -0,0 +1,181 @@
+"""
+Tests for batched candidate scoring in CA3PatternCompleter.
+
+Validates:
+1. Batched scores equal the fusion formula λ·cos + (1-λ)·(1 - d_H/B)
+   computed per candidate, in pure SDR and in vector mode
+2. Candidate embeddings are fetched with one get_embeddings call; missing
+   or mismatched embeddings score a cosine of 0.0
+3. VectorStore.get_embeddings returns each event's latest vector
+"""
+
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from hippocampus.completer import CA3PatternCompleter, CompletionConfig
+from hippocampus.sdr import SDRProcessor
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+SPACE = "shared:household"
+DIM = 16
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+class FakeHippocampusStore:
+    def __init__(self, codes):
+        self.codes = codes
+
+    def find_codes_in_space(self, space_id, limit=1000):
+        return self.codes[:limit]
+
+
+class CountingVectorStore:
+    """Vector store double that records how embeddings are fetched."""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    def get_embedding(self, event_id):
+        self.single_calls += 1
+        return self.embeddings.get(event_id)
+
+    def get_embeddings(self, event_ids):
+        self.batch_calls += 1
+        return {i: self.embeddings[i] for i in event_ids if i in self.embeddings}
+
+
+def _codes(processor: SDRProcessor, count: int, rng: random.Random):
+    words = ["dentist", "milk", "piano", "lesson", "school", "soccer", "bread"]
+    codes = []
+    for i in range(count):
+        text = " ".join(rng.choices(words, k=8)) + f" note {i}"
+        sdr = processor.process_text(text)
+        codes.append(
+            {
+                "id": f"evt-{i:04d}",
+                "simhash_hex": sdr.simhash_hex,
+                "minhash32": sdr.minhash32,
+                "novelty": 0.5,
+            }
+        )
+    return codes
+
+
+def _reference(cue_bits, cue_vec, code, embedding, lambda_weight):
+    hamming = bin(cue_bits ^ int(code["simhash_hex"], 16)).count("1")
+    sdr = 1.0 - hamming / 512
+    cos = 0.0
+    if embedding is not None and len(embedding) == len(cue_vec):
+        cos = float(
+            np.dot(cue_vec, embedding)
+            / (np.linalg.norm(cue_vec) * np.linalg.norm(embedding))
+        )
+    return lambda_weight * cos + (1.0 - lambda_weight) * sdr
+
+
+@test("batched scores match the per-candidate fusion formula")
+def test_batched_scores():
+    rng = random.Random(23)
+    processor = SDRProcessor()
+    codes = _codes(processor, 300, rng)
+    vectors = np.random.default_rng(23).normal(size=(300, DIM)).astype(np.float32)
+    embeddings = {c["id"]: vectors[i] for i, c in enumerate(codes) if i % 7}
+    # A stale embedding of another model's dimension
+    embeddings["evt-0001"] = np.ones(DIM // 2, dtype=np.float32)
+    vector_store = CountingVectorStore(embeddings)
+    completer = CA3PatternCompleter(
+        processor,
+        config=CompletionConfig(max_candidates=1000, min_score=-1.0),
+        hippocampus_store=FakeHippocampusStore(codes),
+        vector_store=vector_store,
+    )
+
+    cue = processor.process_text("dentist lesson school note 12")
+    cue_vec = vectors[12] + 0.1
+
+    sdr_only = completer.complete_pattern(SPACE, "dentist lesson school note 12", 300)
+    expected = {
+        c["id"]: _reference(cue.simhash_bits, cue_vec, c, None, 0.0) for c in codes
+    }
+    assert len(sdr_only) == 300
+    for candidate in sdr_only:
+        assert abs(candidate.score - expected[candidate.event_id]) < 1e-9
+        assert candidate.explanation[0].endswith("pure_sdr_mode")
+    assert vector_store.batch_calls == 0
+
+    fused = completer.complete_pattern(
+        SPACE, "dentist lesson school note 12", 300, cue_embedding=list(cue_vec)
+    )
+    expected = {
+        c["id"]: _reference(cue.simhash_bits, cue_vec, c, embeddings.get(c["id"]), 0.7)
+        for c in codes
+    }
+    scores = [candidate.score for candidate in fused]
+    assert scores == sorted(scores, reverse=True)
+    for candidate in fused:
+        assert abs(candidate.score - expected[candidate.event_id]) < 1e-5
+    assert fused[0].event_id == "evt-0012"
+    assert vector_store.batch_calls == 1 and vector_store.single_calls == 0
+
+
+@test("malformed candidate codes are skipped, not fatal")
+def test_malformed_candidates():
+    processor = SDRProcessor()
+    codes = _codes(processor, 5, random.Random(3))
+    codes[1]["simhash_hex"] = "abc"
+    del codes[2]["id"]
+    completer = CA3PatternCompleter(
+        processor,
+        config=CompletionConfig(min_score=-1.0),
+        hippocampus_store=FakeHippocampusStore(codes),
+    )
+    found = completer.complete_pattern(SPACE, "milk bread", 10)
+    assert sorted(c.event_id for c in found) == ["evt-0000", "evt-0003", "evt-0004"]
+
+
+@test("VectorStore.get_embeddings returns each event's latest vector")
+def test_vector_store_get_embeddings(directory=temp_dir):
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    rng = np.random.default_rng(24)
+    rows = [
+        VectorRow(
+            vec_id=f"vec_{i:03d}",
+            doc_id=f"evt-{i % 40:04d}",
+            space_id=SPACE,
+            model_id="test-model",
+            dim=DIM,
+            vector=rng.normal(size=DIM).astype(np.float32),
+        )
+        for i in range(50)
+    ]
+    store.store_vectors_bulk(rows)
+    # Later rows of a document are newer
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "UPDATE vector_rows SET created_at = ? WHERE vec_id = ?",
+            [(1_700_000_000 + i, row.vec_id) for i, row in enumerate(rows)],
+        )
+
+    wanted = [f"evt-{i:04d}" for i in range(0, 45, 3)]
+    embeddings = store.get_embeddings(wanted)
+    assert sorted(embeddings) == [i for i in wanted if int(i[-4:]) < 40]
+    for event_id, embedding in embeddings.items():
+        assert np.allclose(embedding, store.get_embedding(event_id))
+    assert np.allclose(embeddings["evt-0003"], rows[43].vector)
+    assert store.get_embeddings([]) == {}
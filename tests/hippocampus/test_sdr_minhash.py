@@ -0,0 +1,200 @@
+"""
+Tests for universal-hash MinHash and the minhash32 scheme migration.
+
+Validates:
+1. The universal scheme estimates Jaccard similarity as well as the original
+   SHA-256 scheme, which the "sha256" flag still reproduces exactly
+2. process_texts_batch matches process_text under both schemes, and the
+   universal scheme is much faster
+3. HippocampusStore marks pre-existing traces as "sha256" and
+   migrate_minhash recomputes them in batches
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from ward import fixture, raises, test
+
+from hippocampus.sdr import SDRProcessor
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.cognitive.hippocampus_store import HippocampusStore
+
+SPACE = "shared:household"
+WORDS = ["dentist", "appointment", "monday", "milk", "bread", "piano", "lesson"]
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _reference_minhash(tokens, perms=64):
+    """The original SHA-256 MinHash."""
+    if not tokens:
+        return [0] * perms
+    seeds = [
+        int(hashlib.sha256(f"minhash_perm_{i}".encode()).hexdigest()[:8], 16)
+        for i in range(perms)
+    ]
+    return [
+        min(
+            int(hashlib.sha256(f"{seed}{token}".encode()).hexdigest()[:8], 16)
+            for token in set(tokens)
+        )
+        & 0xFFFFFFFF
+        for seed in seeds
+    ]
+
+
+def _text(rng: random.Random, words: int = 80) -> str:
+    return " ".join(rng.choice(WORDS) + str(rng.randint(0, 30)) for _ in range(words))
+
+
+def _pairs(count: int, seed: int = 19):
+    """Text pairs sharing a varying fraction of their words."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        base = _text(rng).split()
+        keep = rng.randint(0, len(base))
+        other = base[:keep] + _text(rng, len(base) - keep).split()
+        pairs.append((" ".join(base), " ".join(other)))
+    return pairs
+
+
+@test("universal MinHash estimates Jaccard like the SHA-256 scheme it replaces")
+def test_jaccard_estimates():
+    universal = SDRProcessor()
+    legacy = SDRProcessor(minhash_scheme="sha256")
+    errors = {"universal": [], "sha256": []}
+    for left, right in _pairs(60):
+        tokens_left = universal.tokenize_to_shingles(left)
+        tokens_right = universal.tokenize_to_shingles(right)
+        truth = len(set(tokens_left) & set(tokens_right)) / len(
+            set(tokens_left) | set(tokens_right)
+        )
+        for name, processor in (("universal", universal), ("sha256", legacy)):
+            estimate = processor.process_text(left).jaccard_similarity(
+                processor.process_text(right)
+            )
+            errors[name].append(abs(estimate - truth))
+
+    mean_error = {name: sum(e) / len(e) for name, e in errors.items()}
+    assert mean_error["universal"] < 0.06
+    assert mean_error["universal"] < mean_error["sha256"] * 1.5
+
+    # The compatibility flag reproduces stored sketches bit for bit
+    for left, _ in _pairs(5, seed=7):
+        tokens = legacy.tokenize_to_shingles(left)
+        assert legacy.compute_minhash(tokens) == _reference_minhash(tokens)
+    assert all(0 <= v <= 0xFFFFFFFF for v in universal.compute_minhash(["abc"]))
+
+    with raises(ValueError):
+        universal.process_text("milk").jaccard_similarity(legacy.process_text("milk"))
+    with raises(ValueError):
+        SDRProcessor(minhash_scheme="md5")
+
+
+@test("batched codes match single-text codes and universal MinHash is faster")
+def test_batch_and_speed():
+    texts = ["", "ab", "Ünïcödé"] + [left for left, _ in _pairs(30)]
+    for scheme in ("universal", "sha256"):
+        processor = SDRProcessor(minhash_scheme=scheme)
+        batch = processor.process_texts_batch(texts)
+        for text, codes in zip(texts, batch):
+            single = processor.process_text(text)
+            assert codes.minhash32 == single.minhash32
+            assert codes.minhash_scheme == single.minhash_scheme == scheme
+
+    text = " ".join(left for left, _ in _pairs(10))[:2048]
+    tokens = SDRProcessor().tokenize_to_shingles(text)
+    started = time.perf_counter()
+    SDRProcessor(minhash_scheme="sha256").compute_minhash(tokens)
+    legacy_s = time.perf_counter() - started
+    processor = SDRProcessor()
+    started = time.perf_counter()
+    for _ in range(10):
+        processor.compute_minhash(tokens)
+    universal_s = (time.perf_counter() - started) / 10
+    assert universal_s * 10 < legacy_s
+
+
+@test("stored legacy sketches are marked and migrated in batches")
+def test_minhash_migration(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    legacy = SDRProcessor(minhash_scheme="sha256")
+    rng = random.Random(3)
+    texts = {f"01HX3V6MMINHASHDEERY7{i:05d}": _text(rng, 20) for i in range(12)}
+
+    # A table written before minhash_scheme existed
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE hippocampus_traces (
+                id TEXT PRIMARY KEY, space_id TEXT NOT NULL, ts TEXT NOT NULL,
+                simhash_hex TEXT NOT NULL, minhash32 TEXT NOT NULL,
+                novelty REAL NOT NULL, meta TEXT,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO hippocampus_traces "
+            "(id, space_id, ts, simhash_hex, minhash32, novelty) "
+            "VALUES (?, ?, '2025-03-01T09:00:00+00:00', ?, ?, 0.5)",
+            [
+                (
+                    trace_id,
+                    SPACE,
+                    codes.simhash_hex,
+                    json.dumps(codes.minhash32),
+                )
+                for trace_id, codes in zip(
+                    texts, legacy.process_texts_batch(list(texts.values()))
+                )
+            ],
+        )
+
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    universal = SDRProcessor()
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    with uow:
+        assert store.count_minhash_schemes(SPACE) == {"sha256": 12}
+        lost = sorted(texts)[5]
+        requested = []
+
+        def load_texts(ids):
+            requested.append(len(ids))
+            return {trace_id: texts[trace_id] for trace_id in ids if trace_id != lost}
+
+        result = store.migrate_minhash(
+            load_texts,
+            lambda batch: [c.minhash32 for c in universal.process_texts_batch(batch)],
+            batch_size=5,
+        )
+        assert result == {"migrated": 11, "missing": 1}
+        assert requested == [5, 5, 2]
+        assert store.count_minhash_schemes() == {"universal": 11, "sha256": 1}
+
+        trace_id = sorted(texts)[0]
+        record = store.read(trace_id)
+        assert record["minhash_scheme"] == "universal"
+        assert record["minhash32"] == universal.process_text(texts[trace_id]).minhash32
+        assert store.read(lost)["minhash_scheme"] == "sha256"
+        codes = {c["id"]: c for c in store.find_codes_in_space(SPACE)}
+        assert codes[lost]["minhash_scheme"] == "sha256"
+
+        # Running again only revisits the trace without text
+        requested.clear()
+        assert store.migrate_minhash(load_texts, lambda batch: []) == {
+            "migrated": 0,
+            "missing": 1,
+        }
+        with raises(ValueError):
+            store.migrate_minhash(load_texts, lambda batch: [], scheme="md5")
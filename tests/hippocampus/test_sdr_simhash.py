@@ -0,0 +1,122 @@
+"""
+Tests for the vectorized SimHash in SDRProcessor.
+
+Validates:
+1. compute_simhash is bit-identical to the per-bit reference loop for
+   empty, short, repetitive and unicode texts and for other code widths
+2. process_texts_batch returns the same SDRCodes as process_text per text
+3. The vectorized SimHash is faster than the reference loop
+4. popcount_rows counts the bits of packed codes of any width, with and
+   without np.bitwise_count
+"""
+
+import hashlib
+import random
+import time
+
+import numpy as np
+from ward import test
+
+from hippocampus.sdr import (
+    SDRProcessor,
+    popcount_rows,
+    process_texts_batch,
+    sdr_processor,
+)
+
+
+def _reference_simhash(tokens, simhash_bits=512):
+    """The original per-token, per-bit SimHash loop."""
+    if not tokens:
+        return 0, "0" * (simhash_bits // 4)
+    accumulator = [0.0] * simhash_bits
+    for token in tokens:
+        token_hash = hashlib.sha256(token.encode()).digest()
+        for bit_pos in range(simhash_bits):
+            byte_idx = (bit_pos // 8) % len(token_hash)
+            if (token_hash[byte_idx] >> (bit_pos % 8)) & 1:
+                accumulator[bit_pos] += 1.0
+            else:
+                accumulator[bit_pos] -= 1.0
+    binary_code = 0
+    for bit_pos in range(simhash_bits):
+        if accumulator[bit_pos] >= 0:
+            binary_code |= 1 << bit_pos
+    return binary_code, f"{binary_code:0{simhash_bits // 4}x}"
+
+
+def _texts(count: int, seed: int = 18):
+    rng = random.Random(seed)
+    words = ["dentist", "appointment", "milk", "école", "日本語", "piano", "2025"]
+    texts = ["", "a", "ab", "!!!", "aaaa aaaa aaaa", "Ünïcödé — text."]
+    texts += [" ".join(rng.choices(words, k=rng.randint(1, 60))) for _ in range(count)]
+    return texts
+
+
+@test("compute_simhash is bit-identical to the reference loop")
+def test_simhash_matches_reference():
+    for text in _texts(40):
+        tokens = sdr_processor.tokenize_to_shingles(text)
+        assert sdr_processor.compute_simhash(tokens) == _reference_simhash(tokens)
+
+    for bits in (64, 256, 1024):
+        processor = SDRProcessor(simhash_bits=bits)
+        for text in _texts(10, seed=bits):
+            tokens = processor.tokenize_to_shingles(text)
+            assert processor.compute_simhash(tokens) == _reference_simhash(tokens, bits)
+
+
+@test("process_texts_batch returns the same codes as process_text")
+def test_batch_matches_single():
+    texts = _texts(50)
+    batch = process_texts_batch(texts)
+    assert len(batch) == len(texts)
+    for text, codes in zip(texts, batch):
+        single = sdr_processor.process_text(text)
+        assert codes.simhash_bits == single.simhash_bits
+        assert codes.simhash_hex == single.simhash_hex
+        assert codes.minhash32 == single.minhash32
+        assert codes.tokens == single.tokens
+        assert codes.text_length == single.text_length
+    assert process_texts_batch([]) == []
+
+
+@test("vectorized SimHash beats the per-bit loop on a 2 KB memory")
+def test_simhash_speed():
+    text = " ".join(_texts(400, seed=3))[:2048]
+    tokens = sdr_processor.tokenize_to_shingles(text)
+
+    started = time.perf_counter()
+    reference = _reference_simhash(tokens)
+    reference_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(10):
+        fast = sdr_processor.compute_simhash(tokens)
+    fast_s = (time.perf_counter() - started) / 10
+
+    assert fast == reference
+    assert fast_s * 20 < reference_s
+
+
+@test("popcount_rows counts set bits with and without np.bitwise_count")
+def test_popcount_rows():
+    rng = np.random.default_rng(23)
+    for words in (8, 4, 1):
+        codes = rng.integers(0, 2**64, size=(50, words), dtype=np.uint64)
+        codes[0] = 0
+        codes[1] = np.iinfo(np.uint64).max
+        expected = [sum(bin(int(word)).count("1") for word in row) for row in codes]
+
+        counts = popcount_rows(codes)
+        assert counts.dtype == np.uint16
+        assert counts.tolist() == expected
+
+        bitwise_count = getattr(np, "bitwise_count", None)
+        if bitwise_count is not None:
+            del np.bitwise_count
+        try:
+            assert popcount_rows(codes).tolist() == expected
+        finally:
+            if bitwise_count is not None:
+                np.bitwise_count = bitwise_count
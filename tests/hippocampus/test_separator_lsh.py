@@ -0,0 +1,236 @@
+"""
+Tests for DG novelty scoring through the MinHash LSH index.
+
+Validates:
+1. lsh_params puts the collision S-curve at the Jaccard threshold
+2. DentateGyrusSeparator scores a repeated event as a near-duplicate of the
+   stored trace and an unrelated event as novel, looking only at LSH
+   candidates rather than the whole space
+3. HippocampusAPI.encode_event scores novelty against the store before any
+   transaction is open, without touching the store's connection, and scores
+   an event as fully novel before the database or its schema exists
+4. The LSH buckets follow updates, deletes, MinHash migration and rebuilds,
+   and are backfilled for traces written before the index existed
+"""
+
+import asyncio
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from ward import fixture, raises, test
+
+from hippocampus.api import HippocampusAPI, HippocampusConfig
+from hippocampus.sdr import SDRProcessor
+from hippocampus.separator import DentateGyrusSeparator
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.cognitive.hippocampus_store import HippocampusStore
+
+SPACE = "shared:household"
+_rng = random.Random(20)
+# Random words, so unrelated texts share few character shingles
+WORDS = [
+    "".join(
+        _rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(3, 9))
+    )
+    for _ in range(3000)
+]
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _transaction(store: HippocampusStore, db_path: str) -> UnitOfWork:
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _text(rng: random.Random, words: int = 30) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _trace(i: int, text: str, processor: SDRProcessor) -> dict:
+    codes = processor.process_text(text)
+    return {
+        "id": f"01HX3V6MMINHASHLSHDEE{i:05d}",
+        "space_id": SPACE,
+        "ts": f"2025-03-01T09:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+        "simhash_hex": codes.simhash_hex,
+        "minhash32": codes.minhash32,
+        "minhash_scheme": codes.minhash_scheme,
+        "novelty": 0.5,
+        "meta": {},
+    }
+
+
+def _collision_probability(s: float, bands: int, rows: int) -> float:
+    return 1.0 - (1.0 - s**rows) ** bands
+
+
+@test("lsh_params places the collision curve at the threshold")
+def test_lsh_params():
+    for threshold in (0.3, 0.5, 0.8):
+        bands, rows = HippocampusStore.lsh_params(threshold, 64)
+        assert bands * rows <= 64
+        assert _collision_probability(threshold - 0.2, bands, rows) < 0.5
+        assert _collision_probability(threshold + 0.15, bands, rows) > 0.7
+    with raises(ValueError):
+        HippocampusStore.lsh_params(1.0, 64)
+
+
+@test("novelty is scored against the colliding candidates only")
+def test_separator_novelty(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(21)
+    processor = SDRProcessor()
+    texts = [_text(rng) for _ in range(300)]
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        for i, text in enumerate(texts):
+            store.create(_trace(i, text, processor))
+
+    separator = DentateGyrusSeparator()
+    separator.set_storage(store)
+    with _transaction(store, db_path):
+        repeated = asyncio.run(separator.encode_event(SPACE, "evt-1", texts[42]))
+        trace_id = _trace(42, texts[42], processor)["id"]
+        assert repeated.near_duplicates[0] == (trace_id, 0.0)
+        assert len(repeated.near_duplicates) < 5
+        assert repeated.novelty < 0.5
+
+        # An edited copy still collides with its original
+        words = texts[7].split()
+        words[3] = "edited"
+        edited = asyncio.run(separator.encode_event(SPACE, "evt-2", " ".join(words)))
+        assert edited.near_duplicates[0][0] == _trace(7, texts[7], processor)["id"]
+        assert edited.novelty < 0.9
+
+        unrelated = asyncio.run(
+            separator.encode_event(SPACE, "evt-3", "completely different words here")
+        )
+        assert unrelated.novelty == 1.0 and unrelated.near_duplicates == []
+
+        candidates = store.find_minhash_candidates(
+            SPACE, processor.process_text(texts[42]).minhash32
+        )
+        assert candidates[0]["id"] == trace_id
+        assert candidates[0]["band_collisions"] == store.minhash_lsh_bands
+        assert len(candidates) < 10
+        # Sketches of another scheme never collide
+        legacy = SDRProcessor(minhash_scheme="sha256").process_text(texts[42])
+        assert store.find_minhash_candidates(SPACE, legacy.minhash32, "sha256") == []
+
+
+@test("HippocampusAPI.encode_event finds near-duplicates outside a transaction")
+def test_api_novelty(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(23)
+    processor = SDRProcessor()
+    texts = [_text(rng) for _ in range(50)]
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        for i, text in enumerate(texts):
+            store.create(_trace(i, text, processor))
+        # Exact copies tie on band collisions; ids break the tie
+        for i in range(50, 54):
+            store.create(_trace(i, texts[9], processor))
+
+    api = HippocampusAPI(
+        HippocampusConfig(auto_extract_semantics=False), hippocampus_store=store
+    )
+    repeated = asyncio.run(api.encode_event(SPACE, "evt-1", texts[9]))
+    assert repeated.near_duplicates[0] == (_trace(9, texts[9], processor)["id"], 0.0)
+    assert repeated.novelty < 0.5
+    novel = asyncio.run(api.encode_event(SPACE, "evt-2", "completely new words"))
+    assert novel.novelty == 1.0
+    # The lookups ran on the separator's own read connection
+    assert store._connection is None
+
+    with _transaction(store, db_path):
+        minhash = processor.process_text(texts[9]).minhash32
+        tied = [_trace(i, texts[9], processor)["id"] for i in (9, 50, 51, 52, 53)]
+        top = store.find_minhash_candidates(SPACE, minhash, limit=3)
+        assert [c["id"] for c in top] == sorted(tied)[:3]
+
+    # No database file yet, then a database without the store's schema
+    empty_path = directory / "empty.db"
+    empty = HippocampusStore(StoreConfig(db_path=str(empty_path)))
+    separator = DentateGyrusSeparator()
+    separator.set_storage(empty)
+    first = asyncio.run(separator.encode_event(SPACE, "evt-3", texts[9]))
+    assert first.novelty == 1.0 and first.near_duplicates == []
+    assert not empty_path.exists()
+    sqlite3.connect(empty_path).close()
+    bare = asyncio.run(separator.encode_event(SPACE, "evt-4", texts[9]))
+    assert bare.novelty == 1.0 and bare.near_duplicates == []
+
+
+@test("LSH buckets follow writes, migration, rebuilds and backfill")
+def test_lsh_maintenance(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(22)
+    processor = SDRProcessor()
+    legacy = SDRProcessor(minhash_scheme="sha256")
+    texts = [_text(rng) for _ in range(20)]
+    traces = [_trace(i, text, legacy) for i, text in enumerate(texts)]
+
+    # Traces written before the LSH index existed
+    with sqlite3.connect(db_path) as conn:
+        HippocampusStore(StoreConfig(db_path=db_path))._initialize_schema(conn)
+        conn.execute("DROP TABLE hippocampus_minhash_lsh")
+        conn.executemany(
+            "INSERT INTO hippocampus_traces "
+            "(id, space_id, ts, simhash_hex, minhash32, novelty) "
+            "VALUES (?, ?, ?, ?, ?, 0.5)",
+            [
+                (t["id"], t["space_id"], t["ts"], t["simhash_hex"], str(t["minhash32"]))
+                for t in traces
+            ],
+        )
+
+    def ids(text, codes=processor):
+        sketch = codes.process_text(text)
+        return [
+            c["id"]
+            for c in store.find_minhash_candidates(
+                SPACE, sketch.minhash32, sketch.minhash_scheme
+            )
+        ]
+
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        assert ids(texts[3], legacy) == [traces[3]["id"]]
+        assert ids(texts[3]) == []
+
+        store.migrate_minhash(
+            # Only the first ten texts are still available
+            lambda batch: {t["id"]: texts[i] for i, t in enumerate(traces[:10])},
+            lambda batch: [c.minhash32 for c in processor.process_texts_batch(batch)],
+        )
+        assert ids(texts[3]) == [traces[3]["id"]]
+        assert ids(texts[3], legacy) == []
+        assert ids(texts[15], legacy) == [traces[15]["id"]]
+
+        store.update(traces[15]["id"], {"space_id": "personal:alice"})
+        assert ids(texts[15], legacy) == []
+        store.update(
+            traces[4]["id"],
+            {
+                "minhash32": processor.process_text(texts[5]).minhash32,
+                "minhash_scheme": "universal",
+            },
+        )
+        assert sorted(ids(texts[5])) == [traces[4]["id"], traces[5]["id"]]
+        store.delete(traces[5]["id"])
+        assert ids(texts[5]) == [traces[4]["id"]]
+
+        store._connection.execute("DELETE FROM hippocampus_minhash_lsh")
+        assert ids(texts[3]) == []
+        assert store.rebuild_minhash_lsh() == 19
+        assert ids(texts[3]) == [traces[3]["id"]]
@@ -0,0 +1,308 @@
+"""
+Test suite for hybrid fusion and the retrieval broker.
+
+Validates:
+1. Early-stopped RRF and weighted fusion return exactly the full-depth top-k
+   while reading a fraction of each source
+2. Score ties, duplicate doc_ids and short sources are handled like the
+   full-depth reference
+3. Early-stopped hits carry their full-depth scores and ranks, also when a
+   leader sits below the read depth of some source
+4. RetrievalBroker.fetch fuses FTSStore and VectorStore hits for a space
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from embeddings.encoders import EmbeddingProvider, HashingEncoder
+from retrieval.broker import RetrievalBroker
+from retrieval.fusion import FusionEngine, FusionSource
+from retrieval.types import (
+    RetrievalCandidate,
+    RetrievalFilters,
+    RetrievalRequest,
+    SecurityBand,
+)
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.memory.fts_store import FTSDocument, FTSStore
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+HOUSEHOLD = "shared:household"
+ALICE = "personal:alice"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _source(name, scores, keep=None, weight=1.0):
+    """A source over docs d00000.. ranked by score, optionally a subset."""
+    order = [i for i in np.argsort(-scores, kind="stable") if keep is None or keep[i]]
+    rows = [RetrievalCandidate(f"d{i:05d}", "", name, float(scores[i])) for i in order]
+    return FusionSource(
+        name, lambda offset, limit: rows[offset : offset + limit], weight
+    )
+
+
+def _correlated_sources(seed: int, n: int = 20000):
+    rng = np.random.default_rng(seed)
+    relevance = rng.exponential(1.0, n)
+    lexical = relevance + rng.normal(0, 0.3, n)
+    semantic = relevance + rng.normal(0, 0.5, n)
+    # Lexical matches only cover part of the corpus
+    return [
+        _source("fts", lexical, keep=rng.random(n) > 0.3),
+        _source("vector", semantic, weight=0.8),
+    ]
+
+
+def _fuse_both(method: str, sources, k: int):
+    early = FusionEngine(method, max_depth=100_000).fuse(sources, k)
+    full = FusionEngine(method, early_stop=False, max_depth=100_000).fuse(sources, k)
+    return early, full
+
+
+def _ranking(result):
+    return [(hit.doc_id, hit.score) for hit in result.hits]
+
+
+@test("early-stopped fusion returns the full-depth top-k from a fraction of the rows")
+def test_early_stop_matches_full_depth():
+    for method in ("rrf", "weighted"):
+        sources = _correlated_sources(seed=15)
+        early, full = _fuse_both(method, sources, k=10)
+        assert _ranking(early) == _ranking(full)
+        assert early.early_stopped and not full.early_stopped
+        assert early.rows_read * 20 < full.rows_read
+
+
+@test("ties, duplicates and short sources match the full-depth reference")
+def test_edge_cases():
+    # Disjoint sources with equal weights: every RRF score is tied pairwise
+    left = np.linspace(1.0, 0.0, 200)
+    keep_even = np.arange(200) % 2 == 0
+    sources = [
+        _source("fts", left, keep=keep_even),
+        _source("vector", left, keep=~keep_even),
+    ]
+    early, full = _fuse_both("rrf", sources, k=7)
+    assert _ranking(early) == _ranking(full)
+    assert [hit.doc_id for hit in early.hits[:2]] == ["d00000", "d00001"]
+
+    # A document repeated in one source keeps its first rank
+    rows = [
+        RetrievalCandidate(doc_id, "", "vector", score)
+        for doc_id, score in [("a", 0.9), ("b", 0.8), ("a", 0.7), ("c", 0.6)]
+    ]
+    chunked = FusionSource(
+        "vector", lambda offset, limit: rows[offset : offset + limit]
+    )
+    result = FusionEngine("rrf", initial_depth=2).fuse([chunked], k=3)
+    assert [(hit.doc_id, hit.ranks["vector"]) for hit in result.hits] == [
+        ("a", 1),
+        ("b", 2),
+        ("c", 3),
+    ]
+    assert result.depths == {"vector": 4}
+
+    # Fewer candidates than k: everything is returned
+    short = _source("fts", np.array([0.5, 0.2]))
+    assert len(FusionEngine("weighted").fuse([short], k=5).hits) == 2
+
+    with raises(ValueError):
+        FusionEngine("borda")
+    with raises(ValueError):
+        FusionEngine().fuse([short, short], k=5)
+
+
+@test("early-stopped hits carry their full-depth scores and ranks")
+def test_early_stop_scores_complete():
+    rng = np.random.default_rng(150)
+    for case in range(400):
+        n = int(rng.integers(5, 200))
+        sources = [
+            _source(
+                f"s{j}",
+                rng.normal(size=n).round(int(rng.integers(0, 3))),
+                keep=rng.random(n) < rng.uniform(0.3, 1.0),
+                weight=float(rng.uniform(0.2, 2.0)),
+            )
+            for j in range(int(rng.integers(1, 4)))
+        ]
+        method = ("rrf", "weighted")[case % 2]
+        k = int(rng.integers(1, 15))
+        early = FusionEngine(method, initial_depth=int(rng.integers(1, 8))).fuse(
+            sources, k
+        )
+        full = FusionEngine(method, early_stop=False).fuse(sources, k)
+        assert [hit.doc_id for hit in early.hits] == [hit.doc_id for hit in full.hits]
+        for hit, reference in zip(early.hits, full.hits):
+            assert abs(hit.score - reference.score) < 1e-12
+            # Weighted fusion stops once a source's rows score nothing
+            if method == "rrf":
+                assert hit.ranks == reference.ranks
+            else:
+                assert hit.ranks.items() <= reference.ranks.items()
+
+
+def _seed_broker_stores(directory, docs, ann_index=True):
+    """FTS and vector stores over one db, for (doc_id, text, space, band, ts)."""
+    db_path = str(directory / "memory.db")
+    embedder = EmbeddingProvider(HashingEncoder(dim=64))
+    fts = FTSStore(StoreConfig(db_path=db_path))
+    vectors = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        vectors._initialize_schema(conn)
+
+    fts.store_documents_bulk(
+        FTSDocument(doc_id, space, text, "en", ts, band, "note", 5, [])
+        for doc_id, text, space, band, ts in docs
+    )
+    vectors.store_vectors_bulk(
+        VectorRow(
+            vec_id=f"vec_{i:03d}",
+            doc_id=doc_id,
+            space_id=space,
+            model_id=embedder.model_id,
+            dim=embedder.dim,
+            vector=embedder.embed(text),
+            index_name="semantic",
+        )
+        for i, (doc_id, text, space, _, _) in enumerate(docs)
+    )
+    if ann_index:
+        vectors.create_ann_index("semantic", embedder.model_id)
+    return db_path, fts, vectors, embedder
+
+
+def _fetch(db_path, fts, broker, request):
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(fts)
+    with uow:
+        return broker.fetch(request)
+
+
+@test("RetrievalBroker.fetch fuses FTS and vector hits within the space")
+def test_broker_fetch(directory=temp_dir):
+    texts = [
+        "dentist appointment on monday",
+        "grocery list with milk and bread",
+        "the dentist called about the appointment",
+        "piano lesson moved to friday",
+        "bread recipe from grandma",
+    ]
+    now = datetime.now(timezone.utc)
+    docs = [
+        (
+            f"01HX3V6MBROKEREEVDEERY7{i:03d}",
+            text,
+            ALICE if i == 2 else HOUSEHOLD,
+            "GREEN",
+            now,
+        )
+        for i, text in enumerate(texts)
+    ]
+    db_path, fts, vectors, embedder = _seed_broker_stores(directory, docs)
+
+    broker = RetrievalBroker(fts, vectors, embedder)
+    request = RetrievalRequest(
+        "dentist appointment", space_id=HOUSEHOLD, k=3, return_trace=True
+    )
+    response = _fetch(db_path, fts, broker, request)
+
+    top = response.items[0]
+    assert top.id == docs[0][0]
+    assert top.payload["ranks"] == {"fts": 1, "vector": 1}
+    assert "<mark>" in top.snippet
+    assert top.space_id == HOUSEHOLD
+    # The other dentist note lives in alice's personal space
+    assert docs[2][0] not in [item.id for item in response.items]
+    assert len(response.items) == 3
+    assert response.trace.fusion_weights == {"fts": 1.0, "vector": 1.0}
+    assert any(step.startswith("fts: read") for step in response.trace.processing_steps)
+
+    with raises(ValueError):
+        RetrievalBroker(vector_store=vectors)
+    assert RetrievalBroker().fetch(request).items == []
+
+
+@test("RetrievalBroker.fetch holds both sources to the request's bands and time")
+def test_broker_filters(directory=temp_dir):
+    now = datetime.now(timezone.utc)
+    docs = [
+        ("doc-green", "dentist appointment on monday", HOUSEHOLD, "GREEN", now),
+        ("doc-red", "dentist appointment results", HOUSEHOLD, "RED", now),
+        (
+            "doc-old",
+            "dentist appointment last year",
+            HOUSEHOLD,
+            "GREEN",
+            now - timedelta(days=400),
+        ),
+        ("doc-amber", "piano lesson moved to friday", HOUSEHOLD, "AMBER", now),
+    ]
+    db_path, fts, vectors, embedder = _seed_broker_stores(directory, docs)
+    broker = RetrievalBroker(fts, vectors, embedder)
+
+    def fetched(**filters):
+        request = RetrievalRequest(
+            "dentist appointment",
+            space_id=HOUSEHOLD,
+            k=10,
+            filters=RetrievalFilters(**filters),
+        )
+        return {item.id for item in _fetch(db_path, fts, broker, request).items}
+
+    # Unfiltered, the vector source reaches every document
+    assert fetched() == {"doc-green", "doc-red", "doc-old", "doc-amber"}
+    # The RED document matches the query in both sources, but is outside the band
+    assert fetched(bands=[SecurityBand.GREEN]) == {"doc-green", "doc-old"}
+    assert fetched(max_band=SecurityBand.AMBER) == {
+        "doc-green",
+        "doc-old",
+        "doc-amber",
+    }
+    assert fetched(bands=[SecurityBand.GREEN], within_days=30) == {"doc-green"}
+    assert fetched(before=now - timedelta(days=30)) == {"doc-old"}
+    # Without an FTS store the vector rows cannot be checked: nothing leaks
+    vector_only = RetrievalBroker(vector_store=vectors, embedder=embedder)
+    request = RetrievalRequest(
+        "dentist appointment",
+        space_id=HOUSEHOLD,
+        filters=RetrievalFilters(bands=[SecurityBand.GREEN]),
+    )
+    assert vector_only.fetch(request).items == []
+
+
+@test("RetrievalBroker.fetch scans vectors exactly when there is no ANN index")
+def test_broker_without_ann_index(directory=temp_dir):
+    now = datetime.now(timezone.utc)
+    docs = [
+        ("doc-dentist", "dentist appointment on monday", HOUSEHOLD, "GREEN", now),
+        ("doc-piano", "piano lesson moved to friday", HOUSEHOLD, "GREEN", now),
+        ("doc-alice", "dentist appointment for alice", ALICE, "GREEN", now),
+    ]
+    db_path, fts, vectors, embedder = _seed_broker_stores(
+        directory, docs, ann_index=False
+    )
+    assert vectors.get_ann_index("semantic", embedder.model_id) is None
+
+    def no_ann(*args, **kwargs):
+        raise AssertionError("ann_search without an ANN index")
+
+    vectors.ann_search = no_ann
+    broker = RetrievalBroker(fts, vectors, embedder)
+    request = RetrievalRequest("dentist appointment", space_id=HOUSEHOLD, k=5)
+    response = _fetch(db_path, fts, broker, request)
+
+    assert [item.id for item in response.items] == ["doc-dentist", "doc-piano"]
+    assert response.items[0].payload["ranks"] == {"fts": 1, "vector": 1}
+    assert response.items[1].payload["ranks"] == {"vector": 2}
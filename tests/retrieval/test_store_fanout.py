@@ -0,0 +1,102 @@
+"""
+Test suite for StoreFanoutManager's batched vector path.
+
+Validates:
+1. Vector plans embed the query and its expansions with the embedding
+   provider when the semantic store supports batched search
+2. Fan-out returns the store's rows, best score per vector, instead of
+   placeholder results
+"""
+
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from ward import fixture, test
+
+from context_bundle.orchestrator import PerformanceBudget
+from context_bundle.store_fanout import StoreAdapter, StoreFanoutManager
+from embeddings.encoders import EmbeddingProvider, HashingEncoder
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+NOTES = [
+    "dentist appointment for grandma on monday",
+    "soccer practice after school on wednesday",
+    "buy groceries for the birthday party",
+    "piano recital rehearsal on friday evening",
+]
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _store(directory: Path, provider: EmbeddingProvider) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    store.store_vectors_bulk(
+        [
+            VectorRow(
+                vec_id=f"vec_{i}",
+                doc_id=f"doc_{i}",
+                space_id="shared:household",
+                model_id=provider.model_id,
+                dim=provider.dim,
+                vector=vector.tolist(),
+            )
+            for i, vector in enumerate(provider.embed_many(NOTES))
+        ]
+    )
+    return store
+
+
+@test("vector fan-out embeds the query and searches the store in one batch")
+def test_batched_vector_fanout(directory=temp_dir):
+    provider = EmbeddingProvider(HashingEncoder(dim=128))
+    store = _store(directory, provider)
+    calls = []
+    search = store.batch_similarity_search
+
+    def counting_search(query_vectors, *args, **kwargs):
+        calls.append(len(query_vectors))
+        return search(query_vectors, *args, **kwargs)
+
+    store.batch_similarity_search = counting_search
+    manager = StoreFanoutManager(
+        store_adapters={
+            "semantic_store": StoreAdapter(
+                store_name="semantic_store",
+                store_type="vector",
+                connection_pool=store,
+                default_timeout_ms=400,
+            )
+        },
+        embedding_provider=provider,
+    )
+    query_plan = {
+        "query": NOTES[1],
+        "query_features": {"query_expansions": [NOTES[3]]},
+        "selected_stores": [
+            {"store": "semantic_store", "query_type": "vector_similarity"}
+        ],
+    }
+    budget = PerformanceBudget(
+        max_latency_ms=2000, max_stores=1, max_results_per_store=5
+    )
+
+    results = asyncio.run(manager.execute_parallel_queries(query_plan, budget))
+
+    result = results["semantic_store"]
+    assert result.status == "success"
+    assert calls == [2]
+    hits = {item["content_id"]: item for item in result.results}
+    assert sorted(hits) == ["doc_1", "doc_3"]
+    assert hits["doc_1"]["metadata"]["query_index"] == 0
+    assert hits["doc_3"]["metadata"]["query_index"] == 1
+    assert all(abs(item["relevance_score"] - 1.0) < 1e-5 for item in result.results)
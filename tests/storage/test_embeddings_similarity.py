@@ -0,0 +1,162 @@
+"""
+Test suite for EmbeddingsStore exact similarity search.
+
+Validates that similarity_search:
+1. Ranks over every vector of the model, not only the newest rows
+2. Streams in bounded chunks and still returns the exact global top-k
+3. Applies offset/limit after global ranking
+4. Honours threshold, band and space filters and each distance metric
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.embeddings_store import (
+    EmbeddingRecord,
+    EmbeddingsStore,
+    SimilarityQuery,
+)
+
+DIM = 8
+
+
+def _ulid(prefix: str, i: int) -> str:
+    return f"{prefix}{i:0{26 - len(prefix)}d}"
+
+
+@fixture
+def populated_store():
+    """EmbeddingsStore with 300 random vectors spread over two spaces and bands."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = EmbeddingsStore(
+            StoreConfig(db_path=str(Path(temp_dir) / "embeddings.db"))
+        )
+        conn = store._get_connection()
+        store.begin_transaction(conn)
+        store.register_model("test-model", DIM)
+
+        rng = np.random.default_rng(21)
+        vectors = rng.standard_normal((300, DIM)).astype(np.float32)
+        for i, vector in enumerate(vectors):
+            record = EmbeddingRecord(
+                embedding_id=_ulid("01E", i),
+                doc_id=_ulid("01D", i),
+                model_id="test-model",
+                dim=DIM,
+                sha256="0" * 64,
+                vector_ref=_ulid("01V", i),
+            )
+            assert store.store_embedding(
+                record,
+                vector.tolist(),
+                space_id="shared:household" if i % 2 else "personal:alice",
+                privacy_band="AMBER" if i % 3 == 0 else "GREEN",
+            )
+        store.commit_transaction(conn)
+        conn.commit()
+
+        yield store, vectors
+        store.close()
+
+
+def _expected_order(vectors: np.ndarray, query: np.ndarray, metric: str):
+    if metric == "cosine":
+        scores = (vectors @ query) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+        )
+        return np.argsort(-scores, kind="stable"), scores
+    if metric == "dot_product":
+        scores = vectors @ query
+        return np.argsort(-scores, kind="stable"), scores
+    scores = np.linalg.norm(vectors - query, axis=1)
+    return np.argsort(scores, kind="stable"), scores
+
+
+@test("similarity_search returns the exact global top-k across all rows")
+def test_global_top_k(fixture=populated_store):
+    store, vectors = fixture
+    store.similarity_chunk_rows = 32  # force many chunks
+    query = vectors[0] + 0.05
+
+    results = store.similarity_search(
+        SimilarityQuery(
+            vector=query.tolist(), model_id="test-model", limit=10, threshold=-1.0
+        )
+    )
+    order, scores = _expected_order(vectors, query, "cosine")
+
+    # The oldest row is the best match and must be found
+    assert results[0].doc_id == _ulid("01D", 0)
+    assert [r.doc_id for r in results] == [_ulid("01D", int(i)) for i in order[:10]]
+    assert np.allclose([r.score for r in results], scores[order[:10]], atol=1e-5)
+
+
+@test("offset and limit page through the global ranking")
+def test_offset_after_ranking(fixture=populated_store):
+    store, vectors = fixture
+    store.similarity_chunk_rows = 50
+    query = vectors[42]
+
+    full = store.similarity_search(
+        SimilarityQuery(
+            vector=query.tolist(), model_id="test-model", limit=30, threshold=-1.0
+        )
+    )
+    page = store.similarity_search(
+        SimilarityQuery(
+            vector=query.tolist(),
+            model_id="test-model",
+            limit=10,
+            offset=20,
+            threshold=-1.0,
+        )
+    )
+    assert [r.doc_id for r in page] == [r.doc_id for r in full[20:30]]
+
+
+@test("distance metrics rank like a brute-force scan")
+def test_metrics(fixture=populated_store):
+    store, vectors = fixture
+    store.similarity_chunk_rows = 64
+    query = vectors[7] * 0.5
+    for metric in ("dot_product", "euclidean"):
+        results = store.similarity_search(
+            SimilarityQuery(
+                vector=query.tolist(),
+                model_id="test-model",
+                limit=5,
+                threshold=-1e9,
+                distance_metric=metric,
+            )
+        )
+        order, _ = _expected_order(vectors, query, metric)
+        assert [r.doc_id for r in results] == [
+            _ulid("01D", int(i)) for i in order[:5]
+        ], metric
+        assert results[0].vector is not None
+
+
+@test("threshold, band and space filters are applied before ranking")
+def test_filters(fixture=populated_store):
+    store, vectors = fixture
+    query = vectors[3]
+    results = store.similarity_search(
+        SimilarityQuery(
+            vector=query.tolist(),
+            model_id="test-model",
+            limit=300,
+            threshold=0.2,
+            bands=["AMBER"],
+        ),
+        space_filter={"shared:household"},
+    )
+    assert results
+    for result in results:
+        assert result.score >= 0.2
+        assert result.metadata["privacy_band"] == "AMBER"
+        assert result.metadata["space_id"] == "shared:household"
+    assert results[0].doc_id == _ulid("01D", 3)
@@ -0,0 +1,173 @@
+"""
+Test suite for keyword search over episodic records through FTS5.
+
+Validates that EpisodicStore.query_temporal:
+1. Matches keywords against content text and feature keywords, with filters
+2. Stays in sync with updates and deletes through the triggers
+3. Ranks by time or by bm25 relevance
+4. Indexes records of a database created before the FTS index existed
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.memory.episodic_store import (
+    EpisodicRecord,
+    EpisodicStore,
+    TemporalQuery,
+)
+
+SPACE = "shared:household"
+BASE_TS = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _record(i: int, text: str, author="alice", band="GREEN", keywords=None):
+    return EpisodicRecord(
+        id=f"01HX3V6MEPSVEEVDEERY79Q{i:03d}",
+        envelope_id=f"env-{i}",
+        space_id=SPACE,
+        ts=BASE_TS + timedelta(hours=i),
+        band=band,
+        author=author,
+        content={"text": text, "lang": "en"},
+        features={"keywords": keywords or []},
+        mls_group="household",
+    )
+
+
+def _transaction(store: EpisodicStore, directory: Path) -> UnitOfWork:
+    uow = UnitOfWork(str(directory / "episodic.db"), use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _ids(records):
+    return [int(r.id[-3:]) for r in records]
+
+
+def _search(store: EpisodicStore, *keywords: str):
+    return _ids(store.query_temporal(TemporalQuery(SPACE, keywords=list(keywords))))
+
+
+def _populated(directory: Path) -> EpisodicStore:
+    store = EpisodicStore(StoreConfig(db_path=str(directory / "episodic.db")))
+    with _transaction(store, directory):
+        store.store_record(_record(0, "Booked the dentist appointment for Monday"))
+        store.store_record(_record(1, "Dentist called back", author="bob"))
+        store.store_record(_record(2, "Grocery list", keywords=["groceries", "milk"]))
+        store.store_record(
+            _record(3, "Appointments: dentist, dentist, dentist", band="AMBER")
+        )
+        store.store_record(_record(4, "Picked up milk"))
+    return store
+
+
+@test("keywords match content text and feature keywords together with filters")
+def test_keyword_match_with_filters(directory=temp_dir):
+    store = _populated(directory)
+    with _transaction(store, directory):
+        dentist = store.query_temporal(TemporalQuery(SPACE, keywords=["dentist"]))
+        assert _ids(dentist) == [3, 1, 0]
+
+        # Porter stemming: "appointment" also matches "Appointments"
+        stemmed = store.query_temporal(TemporalQuery(SPACE, keywords=["appointment"]))
+        assert _ids(stemmed) == [3, 0]
+
+        either = store.query_temporal(
+            TemporalQuery(SPACE, keywords=["groceries", "called back"])
+        )
+        assert _ids(either) == [2, 1]
+
+        filtered = store.query_temporal(
+            TemporalQuery(
+                SPACE,
+                keywords=["dentist"],
+                author="alice",
+                band_filter=["GREEN"],
+                start_time=BASE_TS,
+                end_time=BASE_TS + timedelta(hours=2),
+            )
+        )
+        assert _ids(filtered) == [0]
+        assert (
+            store.query_temporal(TemporalQuery("personal:bob", keywords=["milk"])) == []
+        )
+
+
+@test("updates and deletes keep the FTS index in sync")
+def test_index_follows_writes(directory=temp_dir):
+    store = _populated(directory)
+    with _transaction(store, directory):
+        store.store_record(_record(4, "Picked up bread"))
+        store.update(
+            "01HX3V6MEPSVEEVDEERY79Q001", {"content": {"text": "Plumber visit"}}
+        )
+        store.delete("01HX3V6MEPSVEEVDEERY79Q000")
+
+    with _transaction(store, directory):
+        assert _search(store, "milk") == [2]
+        assert _search(store, "bread") == [4]
+        assert _search(store, "plumber") == [1]
+        assert _search(store, "dentist") == [3]
+        # Raises if the index disagrees with episodic_records
+        store._connection.execute(
+            "INSERT INTO episodic_fts(episodic_fts, rank) VALUES ('integrity-check', 1)"
+        )
+
+
+@test("rank_by relevance orders keyword hits by bm25")
+def test_rank_by_relevance(directory=temp_dir):
+    store = _populated(directory)
+    with _transaction(store, directory):
+        by_time = store.query_temporal(
+            TemporalQuery(SPACE, keywords=["dentist"], order_desc=False)
+        )
+        by_relevance = store.query_temporal(
+            TemporalQuery(SPACE, keywords=["dentist"], rank_by="relevance")
+        )
+    assert _ids(by_time) == [0, 1, 3]
+    assert _ids(by_relevance)[0] == 3  # three mentions in a short text
+
+
+@test("records stored before the FTS index existed are indexed on open")
+def test_backfill_existing_database(directory=temp_dir):
+    db_path = directory / "episodic.db"
+    record = _record(7, "Old note about the piano lesson")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE episodic_records (
+                id TEXT PRIMARY KEY, envelope_id TEXT NOT NULL, space_id TEXT NOT NULL,
+                ts INTEGER NOT NULL, ts_iso TEXT NOT NULL, band TEXT NOT NULL,
+                author TEXT NOT NULL, device TEXT, content_json TEXT NOT NULL,
+                features_json TEXT NOT NULL, mls_group TEXT NOT NULL, links_json TEXT,
+                meta_json TEXT, created_at INTEGER, updated_at INTEGER
+            )
+            """)
+        conn.execute(
+            "INSERT INTO episodic_records VALUES "
+            "(?, 'env', ?, ?, ?, 'GREEN', 'alice', NULL, ?, '{}', 'g', NULL, NULL, 0, 0)",
+            (
+                record.id,
+                SPACE,
+                int(record.ts.timestamp()),
+                record.ts.isoformat(),
+                '{"text": "Old note about the piano lesson"}',
+            ),
+        )
+
+    store = EpisodicStore(StoreConfig(db_path=str(db_path)))
+    with _transaction(store, directory):
+        hits = store.query_temporal(TemporalQuery(SPACE, keywords=["piano"]))
+    assert _ids(hits) == [7]
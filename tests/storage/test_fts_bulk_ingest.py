@@ -0,0 +1,171 @@
+"""
+Test suite for FTSStore bulk ingest and background segment merging.
+
+Validates:
+1. store_documents_bulk loads documents in one transaction, restores the FTS5
+   merge settings and invalidates cached results
+2. A failed load rolls back completely, settings included
+3. Bulk loads schedule one coalesced OPTIMIZE on the IndexLifecycleManager,
+   which merges the index down to a single segment in the background, also
+   when several threads schedule it at once
+"""
+
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.monitoring.index_config_store import IndexConfigStore
+from storage.monitoring.index_lifecycle_manager import (
+    IndexLifecycleManager,
+    LifecycleOperationType,
+)
+from storage.stores.memory.fts_store import FTSDocument, FTSStore, SearchQuery
+
+HOUSEHOLD = "shared:household"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _doc(i: int, space_id: str = HOUSEHOLD) -> FTSDocument:
+    text = f"note {i} about the dentist appointment topic{i % 13}"
+    return FTSDocument(
+        doc_id=f"01HX3V6MFTSVEEVDEERY7{i:05d}",
+        space_id=space_id,
+        text=text,
+        lang="en",
+        ts=datetime.now(timezone.utc),
+        band="GREEN",
+        source="episodic",
+        tokens_count=len(text.split()),
+        segments=[],
+    )
+
+
+def _search(store: FTSStore, directory: Path, text: str, limit: int = 1000):
+    uow = UnitOfWork(str(directory / "fts.db"), use_connection_pool=False)
+    uow.register_store(store)
+    with uow:
+        return store.search(SearchQuery(text=text, limit=limit))
+
+
+def _merge_config(directory: Path):
+    with sqlite3.connect(directory / "fts.db") as conn:
+        return dict(
+            conn.execute(
+                "SELECT k, v FROM fts_documents_config "
+                "WHERE k IN ('automerge', 'crisismerge')"
+            ).fetchall()
+        )
+
+
+def _segment_count(directory: Path) -> int:
+    """Segment count from the FTS5 structure record: a 4-byte cookie followed
+    by varints nLevel and nSegment."""
+    with sqlite3.connect(directory / "fts.db") as conn:
+        block = conn.execute(
+            "SELECT block FROM fts_documents_data WHERE id = 10"
+        ).fetchone()[0]
+    values, value = [], 0
+    for byte in block[4:]:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            values.append(value)
+            value = 0
+            if len(values) == 2:
+                return values[1]
+    raise AssertionError("truncated structure record")
+
+
+@test("a bulk load is searchable, restores merge settings and invalidates the cache")
+def test_bulk_load(directory=temp_dir):
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    assert store.store_documents_bulk(_doc(i) for i in range(300)) == 300
+    assert _merge_config(directory) == {"automerge": 4, "crisismerge": 16}
+    assert len(_search(store, directory, "dentist")) == 300
+
+    store.store_documents_bulk(_doc(i) for i in range(300, 450))
+    assert len(_search(store, directory, "dentist")) == 450
+    assert len(_search(store, directory, "topic3")) == 35
+    assert store.store_documents_bulk([]) == 0
+
+
+@test("a failed bulk load rolls back documents and merge settings")
+def test_bulk_load_rollback(directory=temp_dir):
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    store.store_documents_bulk(_doc(i) for i in range(10))
+
+    with raises(sqlite3.IntegrityError):
+        store.store_documents_bulk(_doc(i) for i in range(5, 20))
+    assert len(_search(store, directory, "dentist")) == 10
+    assert _merge_config(directory) == {"automerge": 4, "crisismerge": 16}
+
+    bad = _doc(99)
+    bad.tokens_count = "seven"
+    with raises(ValueError):
+        store.store_documents_bulk([_doc(50), bad])
+    assert len(_search(store, directory, "dentist")) == 10
+
+
+@test("bulk loads schedule one background merge through the lifecycle manager")
+async def test_background_merge(directory=temp_dir):
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    manager = IndexLifecycleManager(AsyncMock(spec=IndexConfigStore))
+    store.attach_lifecycle_manager(manager)
+
+    for batch in range(12):
+        docs = (_doc(batch * 100 + i) for i in range(100))
+        store.store_documents_bulk(docs)
+    assert _segment_count(directory) > 1
+    queued = manager._operation_queue
+    assert len(queued) == 1
+    assert queued[0].operation == LifecycleOperationType.OPTIMIZE
+    assert queued[0].operation_metadata["reason"] == "bulk_ingest"
+    operation = queued[0]
+
+    await manager.start()
+    for _ in range(100):
+        if operation.status == "completed":
+            break
+        await asyncio.sleep(0.05)
+    await manager.stop()
+
+    assert operation.status == "completed"
+    assert operation.metrics["merge_steps"] >= 1
+    assert _segment_count(directory) == 1
+    assert len(_search(store, directory, "dentist", limit=2000)) == 1200
+
+
+@test("concurrent schedule_optimize calls coalesce into one operation")
+def test_schedule_optimize_threads():
+    manager = IndexLifecycleManager(AsyncMock(spec=IndexConfigStore))
+    barrier = threading.Barrier(16)
+    ids = []
+
+    def schedule(name):
+        barrier.wait()
+        for _ in range(200):
+            ids.append(manager.schedule_optimize(name, reason="bulk_ingest"))
+
+    threads = [
+        threading.Thread(target=schedule, args=(f"fts_{i % 2}",)) for i in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    queued = manager._operation_queue
+    assert sorted(op.index_name for op in queued) == ["fts_0", "fts_1"]
+    assert set(ids) == {op.operation_id for op in queued}
@@ -0,0 +1,128 @@
+"""
+Test suite for FTSStore search paging, caching and projections.
+
+Validates:
+1. Every page of a query is served from one cached ranked list
+2. Writes invalidate cached results of their own space only; rollbacks too
+3. The "snippet" projection returns ids, scores and snippets, and
+   load_details() fills in text and FTS5 highlight offsets on demand
+"""
+
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.memory.fts_store import FTSDocument, FTSStore, SearchQuery
+
+HOUSEHOLD = "shared:household"
+ALICE = "personal:alice"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _doc(i: int, text: str, space_id: str = HOUSEHOLD) -> FTSDocument:
+    return FTSDocument(
+        doc_id=f"01HX3V6MFTSVEEVDEERY79Q{i:03d}",
+        space_id=space_id,
+        text=text,
+        lang="en",
+        ts=datetime.now(timezone.utc),
+        band="GREEN",
+        source="episodic",
+        tokens_count=len(text.split()),
+        segments=[],
+    )
+
+
+def _transaction(store: FTSStore, directory: Path) -> UnitOfWork:
+    uow = UnitOfWork(str(directory / "fts.db"), use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _make_store(directory: Path, count: int = 30) -> FTSStore:
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    with _transaction(store, directory):
+        for i in range(count):
+            space_id = HOUSEHOLD if i % 2 else ALICE
+            text = f"dentist appointment {i} " + "appointments " * (i % 4)
+            assert store.store_document(_doc(i, text, space_id))
+    return store
+
+
+@test("all pages of a query come from one cached ranked list")
+def test_pages_share_one_entry(directory=temp_dir):
+    store = _make_store(directory)
+    with _transaction(store, directory):
+        full = store.search(SearchQuery(text="appointment", limit=30))
+        pages = [
+            store.search(SearchQuery(text="appointment", limit=10, offset=offset))
+            for offset in (0, 10, 20)
+        ]
+    assert len(full) == 30
+    assert [r.doc_id for page in pages for r in page] == [r.doc_id for r in full]
+    stats = store._query_cache.stats()
+    assert stats["entries"] == 1 and stats["hits"] == 3
+
+
+@test("writes invalidate cached results of their space, rollbacks too")
+def test_write_invalidation(directory=temp_dir):
+    store = _make_store(directory)
+    household = {HOUSEHOLD}
+    with _transaction(store, directory):
+        before = store.search(SearchQuery(text="appointment", limit=50), household)
+        store.search(SearchQuery(text="appointment", limit=50))
+
+    with _transaction(store, directory):
+        store.store_document(_doc(100, "appointment reminder", ALICE))
+        cached = store.search(SearchQuery(text="appointment", limit=50), household)
+        everything = store.search(SearchQuery(text="appointment", limit=50))
+    assert cached == before
+    assert len(everything) == 31
+    assert store._query_cache.stats()["stale"] == 1
+
+    try:
+        with _transaction(store, directory):
+            store.store_document(_doc(101, "appointment cancelled", HOUSEHOLD))
+            during = store.search(SearchQuery(text="cancelled"), household)
+            assert [r.doc_id for r in during] == [_doc(101, "").doc_id]
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    with _transaction(store, directory):
+        assert store.search(SearchQuery(text="cancelled"), household) == []
+
+
+@test("snippet projection defers text and highlights to load_details")
+def test_snippet_projection(directory=temp_dir):
+    store = _make_store(directory, count=8)
+    query = SearchQuery(
+        text="appointment", limit=5, projection="snippet", highlight=True
+    )
+    with _transaction(store, directory):
+        results = store.search(query)
+        assert len(results) == 5
+        assert all(r.text is None and r.highlights == [] for r in results)
+        assert all("<mark>" in r.metadata["snippet"] for r in results)
+        assert all(set(r.metadata) == {"snippet"} for r in results)
+
+        full = store.search(SearchQuery(text="appointment", limit=5, highlight=True))
+        store.load_details(query, results)
+
+    assert [r.doc_id for r in results] == [r.doc_id for r in full]
+    for lazy, eager in zip(results, full):
+        assert lazy.text == eager.text and lazy.highlights == eager.highlights
+        assert lazy.metadata["space_id"] in (HOUSEHOLD, ALICE)
+        assert lazy.metadata["snippet"] == eager.metadata["snippet"]
+        # Offsets follow the stemming tokenizer, so "appointments" matches too
+        words = {lazy.text[start:end] for start, end in lazy.highlights}
+        assert "appointment" in words
+    assert any("appointments" in {r.text[s:e] for s, e in r.highlights} for r in full)
@@ -0,0 +1,167 @@
+"""
+Test suite for FTSStore typeahead over titles and entity names.
+
+Validates:
+1. Word-prefix matching of every typed word, per-space filtering, kind
+   filtering, label de-duplication and ranking (whole-label prefix, weight,
+   recency)
+2. Cached suggestions are invalidated by writes to their spaces, and
+   deleting a document removes its suggestions
+3. Prefix lookups stay in the low milliseconds on a large index
+"""
+
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.memory.fts_store import FTSDocument, FTSStore, Suggestion
+
+HOUSEHOLD = "shared:household"
+ALICE = "personal:alice"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _transaction(store: FTSStore, directory: Path) -> UnitOfWork:
+    uow = UnitOfWork(str(directory / "fts.db"), use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _labels(suggestions):
+    return [s.label for s in suggestions]
+
+
+def _populated(directory: Path) -> FTSStore:
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    store.store_suggestions(
+        [
+            Suggestion("Dentist appointment", HOUSEHOLD, "doc-1"),
+            Suggestion("Dentist", HOUSEHOLD, "ent-1", "entity", weight=2.0),
+            Suggestion("Book the dentist", HOUSEHOLD, "doc-2"),
+            Suggestion("Dennis", HOUSEHOLD, "ent-2", "entity"),
+            Suggestion("Dentist appointment", HOUSEHOLD, "doc-3"),
+            Suggestion("Dentist bill", ALICE, "doc-4"),
+            Suggestion("Café opening hours", HOUSEHOLD, "doc-5"),
+        ]
+    )
+    return store
+
+
+@test("typeahead matches word prefixes within the requested spaces")
+def test_typeahead_matching(directory=temp_dir):
+    store = _populated(directory)
+    with _transaction(store, directory):
+        assert _labels(store.typeahead("den", {HOUSEHOLD})) == [
+            "Dentist",
+            # Newest of the two identical labels is kept
+            "Dentist appointment",
+            "Dennis",
+            "Book the dentist",
+        ]
+        assert store.typeahead("den", {HOUSEHOLD})[1].doc_id == "doc-3"
+        assert _labels(store.typeahead("dent app", {HOUSEHOLD})) == [
+            "Dentist appointment"
+        ]
+        assert _labels(store.typeahead("dentist b", {ALICE})) == ["Dentist bill"]
+        assert len(store.typeahead("dent")) == 4
+        assert _labels(store.typeahead("de", {HOUSEHOLD}, kinds=["entity"])) == [
+            "Dentist",
+            "Dennis",
+        ]
+        assert _labels(store.typeahead("cafe", {HOUSEHOLD})) == ["Café opening hours"]
+        assert len(store.typeahead("de", {HOUSEHOLD}, limit=2)) == 2
+        # Too short, punctuation only, and an unknown space
+        assert store.typeahead("d", {HOUSEHOLD}) == []
+        assert store.typeahead('"*(', {HOUSEHOLD}) == []
+        assert store.typeahead("den", {"shared:other"}) == []
+
+
+@test("cached suggestions follow writes and document deletes")
+def test_typeahead_invalidation(directory=temp_dir):
+    store = _populated(directory)
+    with _transaction(store, directory):
+        assert len(store.typeahead("bill", {ALICE})) == 1
+        assert len(store.typeahead("den", {HOUSEHOLD})) == 4
+    assert len(store._typeahead_cache) == 2
+
+    store.store_suggestions([Suggestion("Billing address", ALICE, "doc-6")])
+    with _transaction(store, directory):
+        assert _labels(store.typeahead("bill", {ALICE})) == [
+            "Billing address",
+            "Dentist bill",
+        ]
+        # The household entry was not invalidated
+        assert store._typeahead_cache.stats()["hits"] == 0
+        store.typeahead("den", {HOUSEHOLD})
+        assert store._typeahead_cache.stats()["hits"] == 1
+
+    store.store_documents_bulk(
+        [
+            FTSDocument(
+                "01HX3V6MTYPEAHEADDEERY70001",
+                ALICE,
+                "Billing address changed",
+                "en",
+                datetime.now(timezone.utc),
+                "GREEN",
+                "note",
+                3,
+                [],
+            )
+        ]
+    )
+    store.store_suggestions(
+        [Suggestion("Billing address changed", ALICE, "01HX3V6MTYPEAHEADDEERY70001")]
+    )
+    with _transaction(store, directory):
+        assert len(store.typeahead("billing", {ALICE})) == 2
+        store.delete("01HX3V6MTYPEAHEADDEERY70001")
+        assert _labels(store.typeahead("billing", {ALICE})) == ["Billing address"]
+        assert store.delete_suggestions("doc-6") == 1
+        assert _labels(store.typeahead("bill", {ALICE})) == ["Dentist bill"]
+
+
+@test("prefix lookups stay fast on a large suggestion index")
+def test_typeahead_latency(directory=temp_dir):
+    store = FTSStore(StoreConfig(db_path=str(directory / "fts.db")))
+    rng = random.Random(17)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(20000)
+    ]
+    store.store_suggestions(
+        Suggestion(" ".join(rng.choices(words, k=3)), f"space:{i % 20}", f"d{i}")
+        for i in range(200_000)
+    )
+
+    prefixes = ["ab", "de", "mo", "st", "pre", "kal", "abcd", "th x", "zz"] * 5
+    timings = []
+    with _transaction(store, directory):
+        for prefix in prefixes:
+            store._typeahead_cache.clear()
+            started = time.perf_counter()
+            suggestions = store.typeahead(prefix, {"space:3"})
+            timings.append((time.perf_counter() - started) * 1000)
+            assert all(s.space_id == "space:3" for s in suggestions)
+        assert len(store.typeahead("ab", {"space:3"})) == 8
+
+        started = time.perf_counter()
+        for prefix in prefixes:
+            store.typeahead(prefix, {"space:3"})
+        cached_ms = (time.perf_counter() - started) * 1000 / len(prefixes)
+
+    assert statistics.median(timings) < 5
+    assert cached_ms < statistics.median(timings)
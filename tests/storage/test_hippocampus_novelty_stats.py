@@ -0,0 +1,167 @@
+"""
+Test suite for HippocampusStore's running per-space novelty statistics.
+
+Validates:
+1. Committed encodings update the near-duplicate counter, the
+   nearest-distance histogram and the decayed duplicate rate, which match
+   a recomputation over the whole history
+2. The statistics are persisted, per space, and roll back with the trace
+3. DentateGyrusSeparator takes its duplicate rate from the statistics and
+   its near-duplicate threshold from the store
+"""
+
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from ward import fixture, test
+
+from hippocampus.sdr import SDRProcessor
+from hippocampus.separator import DentateGyrusSeparator
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.cognitive.hippocampus_store import HippocampusStore
+
+SPACE = "shared:household"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _transaction(store: HippocampusStore, db_path: str) -> UnitOfWork:
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _encoding(i: int, nearest, space_id: str = SPACE) -> dict:
+    rng = random.Random(i)
+    return {
+        "id": f"01HX3V6MNOVELTYSTATSDE{i:04d}",
+        "space_id": space_id,
+        "ts": "2025-03-01T09:00:00+00:00",
+        "simhash_hex": f"{rng.getrandbits(512):0128x}",
+        "minhash32": [rng.getrandbits(32) for _ in range(64)],
+        "novelty": 0.5,
+        "near_duplicates": (
+            [] if nearest is None else [("evt-y", 1.0), ("evt-x", nearest)]
+        ),
+    }
+
+
+def _expected_rate(distances, decay=0.98):
+    """Bias-corrected exponentially decayed share of near-duplicates."""
+    ema = 0.0
+    for distance in distances:
+        ema = decay * ema + (1 - decay) * (distance < 0.1)
+    return ema / (1 - decay ** len(distances))
+
+
+@test("committed encodings update the running novelty statistics")
+def test_novelty_stats_updates(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(24)
+    nearest = [rng.choice([None, rng.random() * 0.2, rng.random()]) for _ in range(300)]
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        assert store.get_novelty_stats(SPACE)["encodings"] == 0
+        for i, distance in enumerate(nearest):
+            store.create(_encoding(i, distance))
+        # Traces written without DG results do not count
+        record = _encoding(999, 0.0)
+        del record["near_duplicates"]
+        store.create(record)
+        store.create(_encoding(1000, 0.0, "personal:alice"))
+
+    distances = [1.0 if d is None else d for d in nearest]
+    histogram = [0] * HippocampusStore.NOVELTY_HISTOGRAM_BINS
+    for distance in distances:
+        histogram[min(int(distance * 20), 19)] += 1
+
+    # A fresh store instance reads the persisted row
+    reopened = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(reopened, db_path):
+        stats = reopened.get_novelty_stats(SPACE)
+        assert stats["encodings"] == 300
+        assert stats["near_duplicates"] == sum(d < 0.1 for d in distances)
+        assert stats["distance_histogram"] == histogram
+        assert abs(stats["duplicate_rate"] - _expected_rate(distances)) < 1e-9
+
+        preview = reopened.duplicate_rate_with(SPACE, 0.05)
+        assert abs(preview - _expected_rate(distances + [0.05])) < 1e-9
+        assert reopened.get_novelty_stats(SPACE)["encodings"] == 300
+
+        alice = reopened.get_novelty_stats("personal:alice")
+        assert alice["encodings"] == 1 and alice["duplicate_rate"] == 1.0
+
+
+@test("statistics roll back with the encoding that updated them")
+def test_novelty_stats_rollback(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        store.create(_encoding(1, 0.5))
+    try:
+        with _transaction(store, db_path):
+            store.create(_encoding(2, 0.0))
+            assert store.get_novelty_stats(SPACE)["near_duplicates"] == 1
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    with _transaction(store, db_path):
+        stats = store.get_novelty_stats(SPACE)
+        assert stats["encodings"] == 1 and stats["near_duplicates"] == 0
+
+
+@test("the separator's duplicate rate comes from the space statistics")
+def test_separator_uses_stats(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    processor = SDRProcessor()
+    text = "dentist appointment for grandma on monday after school pickup"
+    codes = processor.process_text(text)
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    separator = DentateGyrusSeparator()
+    separator.set_storage(store)
+    with _transaction(store, db_path):
+        store.create(
+            {
+                **_encoding(1, None),
+                "simhash_hex": codes.simhash_hex,
+                "minhash32": codes.minhash32,
+                "minhash_scheme": codes.minhash_scheme,
+            }
+        )
+        # Mostly novel history: an exact repeat is penalised lightly
+        for i in range(2, 60):
+            store.create(_encoding(i, 0.6))
+        calm = asyncio.run(separator.encode_event(SPACE, "evt-1", text))
+        assert calm.near_duplicates[0][1] == 0.0
+        assert (
+            abs(
+                calm.novelty
+                - separator._sigmoid(-store.duplicate_rate_with(SPACE, 0.0))
+            )
+            < 1e-9
+        )
+
+        # A duplicate-heavy history lowers novelty for the same event
+        for i in range(60, 120):
+            store.create(_encoding(i, 0.01))
+        busy = asyncio.run(separator.encode_event(SPACE, "evt-2", text))
+        assert busy.novelty < calm.novelty
+        assert store.get_novelty_stats(SPACE)["duplicate_rate"] > 0.6
+
+        # Without statistics the separator falls back to the store's threshold
+        def unavailable(space_id, nearest_distance, conn=None):
+            raise RuntimeError("stats unavailable")
+
+        store.duplicate_rate_with = unavailable
+        fallback = asyncio.run(separator.encode_event(SPACE, "evt-3", text))
+        assert fallback.novelty == separator._sigmoid(-1.0)
+        store.near_duplicate_distance = 0.0
+        relaxed = asyncio.run(separator.encode_event(SPACE, "evt-4", text))
+        assert relaxed.novelty == separator._sigmoid(0.0)
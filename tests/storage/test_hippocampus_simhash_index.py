@@ -0,0 +1,175 @@
+"""
+Test suite for the SimHash band index behind HippocampusStore.
+
+Validates:
+1. find_similar_by_simhash returns exactly what a brute-force scan of the
+   whole space returns, including traces older than the most recent 1000
+2. The band rows follow trace updates and deletes, and a database written
+   before the index existed is backfilled on first use
+3. A lookup only verifies the traces that collide on a band
+"""
+
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.cognitive.hippocampus_store import HippocampusStore
+
+SPACE = "shared:household"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _transaction(store: HippocampusStore, db_path: str) -> UnitOfWork:
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _hex(bits: int) -> str:
+    return f"{bits:0128x}"
+
+
+def _flip(bits: int, rng: random.Random, count: int) -> int:
+    for bit in rng.sample(range(512), count):
+        bits ^= 1 << bit
+    return bits
+
+
+def _trace(i: int, bits: int, space_id: str = SPACE) -> dict:
+    return {
+        "id": f"01HX3V6MSIMHASHBANDDEE{i:04d}",
+        "space_id": space_id,
+        "ts": f"2025-03-01T09:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+        "simhash_hex": _hex(bits),
+        "minhash32": [0] * 64,
+        "novelty": 0.5,
+        "meta": {},
+    }
+
+
+def _brute_force(traces, target: int, radius: int, space_id: str = SPACE):
+    return {
+        t["id"]: bin(int(t["simhash_hex"], 16) ^ target).count("1")
+        for t in traces
+        if t["space_id"] == space_id
+        and bin(int(t["simhash_hex"], 16) ^ target).count("1") <= radius
+    }
+
+
+def _populate(rng: random.Random, targets):
+    """Random codes plus near-duplicates of each target at varying distances."""
+    traces, i = [], 0
+    for target in targets:
+        for distance in (0, 3, 9, 25, 40, 63, 80, 95):
+            traces.append(_trace(i, _flip(target, rng, distance)))
+            i += 1
+    for _ in range(1400):
+        space_id = SPACE if i % 5 else "personal:alice"
+        traces.append(_trace(i, rng.getrandbits(512), space_id))
+        i += 1
+    # The same target in another space must never be returned
+    traces.append(_trace(i, targets[0], "personal:alice"))
+    return traces
+
+
+@test("band lookup matches a brute-force scan over the whole space")
+def test_simhash_index_exact(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(20)
+    targets = [rng.getrandbits(512) for _ in range(3)]
+    traces = _populate(rng, targets)
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        for trace in traces:
+            store.create(trace)
+
+    with _transaction(store, db_path):
+        for target in targets:
+            for radius in (10, 40, 64, 95):
+                expected = _brute_force(traces, target, radius)
+                found = store.find_similar_by_simhash(
+                    SPACE, _hex(target), radius, limit=100
+                )
+                assert {t["id"]: t["hamming_distance"] for t in found} == expected
+                distances = [t["hamming_distance"] for t in found]
+                assert distances == sorted(distances)
+
+        # The planted traces are the oldest ones, beyond the 1000 most recent
+        found = store.find_similar_by_simhash(SPACE, _hex(targets[0]), 10, limit=5)
+        assert [t["hamming_distance"] for t in found] == [0, 3, 9]
+        assert found[0]["id"] == traces[0]["id"]
+
+
+@test("band rows follow updates, deletes and backfill pre-existing traces")
+def test_simhash_index_maintenance(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(21)
+    target = rng.getrandbits(512)
+    traces = [_trace(i, rng.getrandbits(512)) for i in range(40)]
+    traces.append(_trace(40, _flip(target, rng, 4)))
+
+    # Traces written before the band index existed
+    with sqlite3.connect(db_path) as conn:
+        HippocampusStore(StoreConfig(db_path=db_path))._initialize_schema(conn)
+        conn.execute("DROP TABLE hippocampus_simhash_bands")
+        conn.executemany(
+            "INSERT INTO hippocampus_traces "
+            "(id, space_id, ts, simhash_hex, minhash32, novelty) "
+            "VALUES (?, ?, ?, ?, '[]', 0.5)",
+            [(t["id"], t["space_id"], t["ts"], t["simhash_hex"]) for t in traces],
+        )
+
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        found = store.find_similar_by_simhash(SPACE, _hex(target), 16)
+        assert [(t["id"], t["hamming_distance"]) for t in found] == [
+            (traces[40]["id"], 4)
+        ]
+
+        moved = traces[7]["id"]
+        store.update(moved, {"simhash_hex": _hex(_flip(target, rng, 2))})
+        found = store.find_similar_by_simhash(SPACE, _hex(target), 16)
+        assert [t["id"] for t in found] == [moved, traces[40]["id"]]
+
+        store.update(moved, {"space_id": "personal:alice"})
+        assert [
+            t["id"] for t in store.find_similar_by_simhash(SPACE, _hex(target), 16)
+        ] == [traces[40]["id"]]
+        assert len(store.find_similar_by_simhash("personal:alice", _hex(target))) == 1
+
+        store.delete(traces[40]["id"])
+        assert store.find_similar_by_simhash(SPACE, _hex(target), 16) == []
+        rows = store._connection.execute(
+            "SELECT COUNT(*) FROM hippocampus_simhash_bands"
+        ).fetchone()[0]
+        assert rows == 40 * HippocampusStore.SIMHASH_BANDS
+
+
+@test("a lookup verifies only the colliding candidates")
+def test_simhash_index_candidates(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(22)
+    target = rng.getrandbits(512)
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        for i in range(2000):
+            store.create(_trace(i, rng.getrandbits(512)))
+        for i in range(2000, 2005):
+            store.create(_trace(i, _flip(target, rng, 20)))
+
+    with _transaction(store, db_path):
+        candidates = store._simhash_candidates(SPACE, _hex(target), 20)
+        assert len(candidates) < 50
+        found = store.find_similar_by_simhash(SPACE, _hex(target), 20)
+        assert len(found) == 5
+        assert {t["id"] for t in found} <= candidates
@@ -0,0 +1,203 @@
+"""
+Test suite for packed SimHash codes and the in-memory SimHash matrix.
+
+Validates:
+1. SimHashMatrix distances and top-k match a brute-force popcount, across
+   inserts, replacements, removals and growth
+2. HippocampusStore packs codes into simhash_bin (backfilling older rows),
+   answers nearest_by_simhash exactly, and keeps the resident matrix in step
+   with inserts, updates, deletes and rollbacks
+3. An exact top-k scan over 1M codes takes tens of milliseconds
+"""
+
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.cognitive.hippocampus_store import HippocampusStore
+from storage.stores.cognitive.simhash_matrix import SimHashMatrix, simhash_to_blob
+
+SPACE = "shared:household"
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _hex(bits: int) -> str:
+    return f"{bits:0128x}"
+
+
+def _flip(bits: int, rng: random.Random, count: int) -> int:
+    for bit in rng.sample(range(512), count):
+        bits ^= 1 << bit
+    return bits
+
+
+def _distance(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _transaction(store: HippocampusStore, db_path: str) -> UnitOfWork:
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _trace_id(i: int) -> str:
+    return f"01HX3V6MSIMHASHMATRIXD{i:04d}"
+
+
+@test("SimHashMatrix matches brute force through adds, removes and growth")
+def test_matrix_operations():
+    rng = random.Random(22)
+    codes = {f"t{i}": _hex(rng.getrandbits(512)) for i in range(300)}
+    matrix = SimHashMatrix(capacity=4)
+    for trace_id, code in codes.items():
+        matrix.add(trace_id, simhash_to_blob(code))
+    for trace_id in list(codes)[::3]:
+        assert matrix.remove(trace_id)
+        del codes[trace_id]
+    assert not matrix.remove("t0")
+    codes["t1"] = _hex(rng.getrandbits(512))
+    matrix.add("t1", simhash_to_blob(codes["t1"]))
+    assert len(matrix) == len(codes) and "t1" in matrix and "t0" not in matrix
+
+    target = _hex(rng.getrandbits(512))
+    expected = sorted((_distance(code, target), t) for t, code in codes.items())
+    found = matrix.nearest(simhash_to_blob(target), 10)
+    assert [d for _, d in found] == [d for d, _ in expected[:10]]
+    assert {t for t, _ in found} == {t for _, t in expected[:10]}
+    assert matrix.nearest(simhash_to_blob(target), 10, max_distance=0) == []
+
+    # Ties with the k-th distance are all returned
+    same = SimHashMatrix.from_rows(
+        (f"s{i}", simhash_to_blob(codes["t1"])) for i in range(5)
+    )
+    assert len(same.nearest(simhash_to_blob(codes["t1"]), 2)) == 5
+    assert SimHashMatrix().nearest(simhash_to_blob(target), 3) == []
+    with raises(ValueError):
+        simhash_to_blob("ab")
+
+
+@test("the store packs codes and keeps the resident matrix current")
+def test_store_matrix(directory=temp_dir):
+    db_path = str(directory / "hippocampus.db")
+    rng = random.Random(23)
+    target = rng.getrandbits(512)
+    codes = [_hex(rng.getrandbits(512)) for _ in range(500)]
+    codes[100] = _hex(_flip(target, rng, 30))
+
+    # Rows written before simhash_bin existed
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE hippocampus_traces (
+                id TEXT PRIMARY KEY, space_id TEXT NOT NULL, ts TEXT NOT NULL,
+                simhash_hex TEXT NOT NULL, minhash32 TEXT NOT NULL,
+                novelty REAL NOT NULL, meta TEXT,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO hippocampus_traces "
+            "(id, space_id, ts, simhash_hex, minhash32, novelty) "
+            "VALUES (?, ?, '2025-03-01T09:00:00+00:00', ?, '[]', 0.5)",
+            [(_trace_id(i), SPACE, code) for i, code in enumerate(codes)],
+        )
+
+    store = HippocampusStore(StoreConfig(db_path=db_path))
+    with _transaction(store, db_path):
+        packed = store._connection.execute(
+            "SELECT simhash_bin FROM hippocampus_traces WHERE id = ?",
+            (_trace_id(100),),
+        ).fetchone()[0]
+        assert packed == bytes.fromhex(codes[100])
+
+        found = store.nearest_by_simhash(SPACE, _hex(target), k=3)
+        expected = sorted(_distance(code, _hex(target)) for code in codes)[:3]
+        assert [t["hamming_distance"] for t in found] == expected
+        assert found[0]["id"] == _trace_id(100)
+        matrix = store._simhash_matrices[SPACE]
+
+        # Inserts go into the resident matrix
+        store.create(
+            {
+                "id": _trace_id(900),
+                "space_id": SPACE,
+                "ts": "2025-03-02T09:00:00+00:00",
+                "simhash_hex": _hex(_flip(target, rng, 2)),
+                "minhash32": [0] * 64,
+                "novelty": 0.5,
+            }
+        )
+        assert store._simhash_matrices[SPACE] is matrix and len(matrix) == 501
+        found = store.find_similar_by_simhash(SPACE, _hex(target), 40)
+        assert [t["id"] for t in found] == [_trace_id(900), _trace_id(100)]
+        # Wider than the band index answers exactly: still a full scan
+        assert len(store.find_similar_by_simhash(SPACE, _hex(target), 512)) == 10
+
+        store.update(_trace_id(900), {"space_id": "personal:alice"})
+        assert _trace_id(900) not in matrix
+        store.update(_trace_id(5), {"simhash_hex": _hex(target)})
+        assert store.nearest_by_simhash(SPACE, _hex(target), 1)[0]["id"] == (
+            _trace_id(5)
+        )
+        store.delete(_trace_id(5))
+        assert len(matrix) == 499
+        assert store.nearest_by_simhash(SPACE, _hex(target), 1)[0]["id"] == (
+            _trace_id(100)
+        )
+
+    # A rolled back insert does not linger in the matrix
+    try:
+        with _transaction(store, db_path):
+            store.create(
+                {
+                    "id": _trace_id(901),
+                    "space_id": SPACE,
+                    "ts": "2025-03-03T09:00:00+00:00",
+                    "simhash_hex": _hex(target),
+                    "minhash32": [0] * 64,
+                    "novelty": 0.5,
+                }
+            )
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    with _transaction(store, db_path):
+        assert store.nearest_by_simhash(SPACE, _hex(target), 1)[0]["id"] == (
+            _trace_id(100)
+        )
+        assert len(store._simhash_matrices[SPACE]) == 499
+
+
+@test("an exact top-k scan over 1M codes takes tens of milliseconds")
+def test_matrix_scan_speed():
+    rng = np.random.default_rng(24)
+    packed = rng.integers(0, 2**63, size=(1_000_000, 8), dtype=np.uint64)
+    matrix = SimHashMatrix.from_rows(
+        (f"t{i}", packed[i].tobytes()) for i in range(len(packed))
+    )
+    target = packed[123_456].tobytes()
+
+    matrix.nearest(target, 10)
+    started = time.perf_counter()
+    for _ in range(5):
+        found = matrix.nearest(target, 10)
+    scan_ms = (time.perf_counter() - started) * 1000 / 5
+
+    assert found[0] == ("t123456", 0)
+    # Plus any codes tied with the 10th distance
+    assert len(found) >= 10
+    distances = matrix.distances(target)
+    assert found[9][1] == np.sort(distances)[9]
+    assert scan_ms < 150
@@ -0,0 +1,193 @@
+"""
+Test suite for the persistent HNSW index used by VectorStore.
+
+Validates:
+1. Recall against exact search and the ef_search knob
+2. Incremental insert / delete through VectorStore writes
+3. Persistence next to the SQLite file and reload on a fresh store
+4. Registration with IndexConfigStore as an embeddings index
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.monitoring.index_config_store import IndexConfigStore
+from storage.stores.memory.hnsw_index import HNSWIndex
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _make_store(directory: Path) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    return store
+
+
+def _row(i: int, vector, index_name="semantic", space_id="shared:household"):
+    return VectorRow(
+        vec_id=f"vec_{i:05d}",
+        doc_id=f"doc_{i:05d}",
+        space_id=space_id,
+        model_id="m1",
+        dim=len(vector),
+        vector=[float(x) for x in vector],
+        index_name=index_name,
+    )
+
+
+def _exact_top_k(data: np.ndarray, query: np.ndarray, k: int):
+    normed = data / np.linalg.norm(data, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return set(np.argsort(-scores)[:k].tolist())
+
+
+@test("HNSW recall against exact search improves with ef_search")
+def test_hnsw_recall():
+    rng = np.random.default_rng(11)
+    data = rng.standard_normal((1500, 24)).astype(np.float32)
+    index = HNSWIndex(dim=24, M=12, ef_construction=80, seed=1)
+    index.add_batch([str(i) for i in range(len(data))], data)
+
+    queries = rng.standard_normal((20, 24)).astype(np.float32)
+    recalls = {}
+    for ef in (10, 100):
+        hit = 0
+        for query in queries:
+            found = {int(vec_id) for vec_id, _ in index.search(query, 10, ef_search=ef)}
+            hit += len(found & _exact_top_k(data, query, 10))
+        recalls[ef] = hit / (10 * len(queries))
+
+    assert recalls[100] >= 0.9
+    assert recalls[100] >= recalls[10]
+
+
+@test("HNSW delete tombstones nodes and re-add replaces them")
+def test_hnsw_delete_and_replace():
+    index = HNSWIndex(dim=2, M=4, seed=2)
+    index.add("a", [1.0, 0.0])
+    index.add("b", [0.0, 1.0])
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert [vec_id for vec_id, _ in index.search([1.0, 0.0], 2)] == ["b"]
+
+    index.add("b", [1.0, 0.1])
+    assert len(index) == 1
+    assert index.deleted_count == 2
+    assert index.live_ids() == ["b"]
+    top = index.search([1.0, 0.0], 1)
+    assert top[0][0] == "b" and top[0][1] > 0.99
+
+
+@test("HNSW save and load round trip")
+def test_hnsw_persistence(directory=temp_dir):
+    rng = np.random.default_rng(12)
+    data = rng.standard_normal((200, 8)).astype(np.float32)
+    index = HNSWIndex(dim=8, seed=3, metadata={"index_name": "x", "model_id": "m"})
+    index.add_batch([str(i) for i in range(200)], data)
+    index.remove("5")
+
+    path = directory / "idx.hnsw.npz"
+    index.save(path)
+    loaded = HNSWIndex.load(path)
+
+    assert len(loaded) == 199
+    assert loaded.metadata["index_name"] == "x"
+    assert loaded.search(data[7], 5) == index.search(data[7], 5)
+    assert "5" not in loaded
+
+
+@test("VectorStore maintains and persists ANN index across writes")
+def test_vector_store_ann_lifecycle(directory=temp_dir):
+    rng = np.random.default_rng(13)
+    store = _make_store(directory)
+    data = rng.standard_normal((100, 16)).astype(np.float32)
+    for i, vector in enumerate(data):
+        store.store_vector(_row(i, vector))
+    store.store_vector(_row(999, data[0], index_name="other"))
+
+    index = store.create_ann_index("semantic", "m1", ef_search=50)
+    assert len(index) == 100
+    assert store._ann_path("semantic", "m1").exists()
+
+    # Incremental insert and delete
+    store.store_vector(_row(100, data[3] * 2.0))
+    store.delete_vector("vec_00003")
+    results = store.ann_search(data[3].tolist(), "semantic", "m1", limit=1)
+    assert results[0][0].vec_id == "vec_00100"
+
+    # Moving a vector to a different index_name removes it from this one
+    store.update_vector("vec_00100", _row(100, data[3], index_name="other"))
+    ids = [r.vec_id for r, _ in store.ann_search(data[3].tolist(), "semantic", "m1")]
+    assert "vec_00100" not in ids
+
+    # A fresh store reloads the index from disk after flushing
+    store.flush_ann_indexes()
+    reopened = _make_store(directory)
+    loaded = reopened.get_ann_index("semantic", "m1")
+    assert loaded is not None
+    assert len(loaded) == 99
+    assert loaded.ef_search == 50
+
+    rebuilt = reopened.rebuild_ann_index("semantic", "m1")
+    assert rebuilt.deleted_count == 0
+    assert rebuilt.metadata["rebuild_count"] == 1
+
+
+@test("ANN index registers with IndexConfigStore as an embeddings index")
+def test_register_ann_index(directory=temp_dir):
+    store = _make_store(directory)
+    for i in range(20):
+        store.store_vector(_row(i, np.eye(20)[i]))
+    store.create_ann_index("semantic", "m1")
+
+    config_store = IndexConfigStore(StoreConfig(db_path=str(directory / "configs.db")))
+    conn = sqlite3.connect(str(directory / "configs.db"))
+    config_store.begin_transaction(conn)
+    store.register_ann_index(config_store, "semantic", "m1", "shared:household")
+    config = config_store.get_config("semantic")
+    config_store.commit_transaction(conn)
+    conn.commit()
+    conn.close()
+
+    assert config is not None
+    assert config.type == "embeddings"
+    assert config.embeddings_config.model_id == "m1"
+    assert config.embeddings_config.dimensions == 20
+    assert config.metadata["engine"] == "hnsw"
+    assert config.metadata["health"]["document_count"] == 20
+
+    # Rebuilds show up in the rebuild status and the registered health
+    statuses = []
+    fill = store._fill_ann_index
+
+    def tracking_fill(index, rows):
+        with store._checkpoint_transaction() as checkpoints:
+            statuses.append(checkpoints.get_rebuild_status("semantic"))
+        fill(index, rows)
+
+    store._fill_ann_index = tracking_fill
+    conn = sqlite3.connect(str(directory / "configs.db"))
+    config_store.begin_transaction(conn)
+    store.rebuild_ann_index("semantic", "m1", config_store)
+    config = config_store.get_config("semantic")
+    config_store.commit_transaction(conn)
+    conn.commit()
+    conn.close()
+
+    assert statuses[0].target_position == 20 and statuses[0].total_shards == 1
+    with store._checkpoint_transaction() as checkpoints:
+        assert checkpoints.get_rebuild_status("semantic") is None
+    assert config.metadata["health"]["rebuild_count"] == 1
+    assert config.metadata["health"]["last_rebuild_ts"] is not None
@@ -0,0 +1,251 @@
+"""
+Test suite for keyset pagination cursors on store list/search APIs.
+
+Validates:
+1. Walking EpisodicStore.query_temporal_page by cursor returns every record
+   exactly once, in the same order as one unpaged query, for time and
+   relevance ranking
+2. FTSStore.search_page, VectorStore.list_vectors_page and
+   KGStore.list_entities_page page without gaps or duplicates, including
+   rows that share a timestamp
+3. Cursors are rejected for a different query and when malformed
+4. Deep pages cost as little as the first one
+"""
+
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.core.pagination import InvalidCursorError, keyset_condition
+from storage.core.unit_of_work import UnitOfWork
+from storage.stores.memory.episodic_store import (
+    EpisodicRecord,
+    EpisodicStore,
+    TemporalQuery,
+)
+from storage.stores.memory.fts_store import FTSDocument, FTSStore, SearchQuery
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+from storage.stores.specialized.kg_store import KGEntity, KGStore
+
+SPACE = "shared:household"
+BASE_TS = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _transaction(store, db_path: str) -> UnitOfWork:
+    uow = UnitOfWork(db_path, use_connection_pool=False)
+    uow.register_store(store)
+    return uow
+
+
+def _walk(fetch_page, cursor=None):
+    """All items of a paged listing, following next_cursor to the end."""
+    items, pages = [], 0
+    while True:
+        page = fetch_page(cursor)
+        items.extend(page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return items, pages
+
+
+def _episodic(directory: Path, count: int) -> EpisodicStore:
+    store = EpisodicStore(StoreConfig(db_path=str(directory / "episodic.db")))
+    with _transaction(store, str(directory / "episodic.db")):
+        for i in range(count):
+            text = "dentist appointment " + "dentist " * (i % 4) + f"note {i}"
+            store.store_record(
+                EpisodicRecord(
+                    id=f"01HX3V6MPAGEVEEVDEERY{i:05d}",
+                    envelope_id=f"env-{i}",
+                    space_id=SPACE,
+                    # Pairs of records share a timestamp
+                    ts=BASE_TS + timedelta(minutes=i // 2),
+                    band="GREEN",
+                    author="alice",
+                    content={"text": text, "lang": "en"},
+                    features={},
+                    mls_group="household",
+                )
+            )
+    return store
+
+
+@test("episodic cursors walk time and relevance order without gaps or duplicates")
+def test_episodic_pages(directory=temp_dir):
+    store = _episodic(directory, 45)
+    with _transaction(store, str(directory / "episodic.db")):
+        for rank_by, keywords in (("time", None), ("relevance", ["dentist"])):
+            expected = store.query_temporal(
+                TemporalQuery(SPACE, keywords=keywords, rank_by=rank_by, limit=1000)
+            )
+            paged, pages = _walk(
+                lambda cursor: store.query_temporal_page(
+                    TemporalQuery(
+                        SPACE,
+                        keywords=keywords,
+                        rank_by=rank_by,
+                        limit=10,
+                        cursor=cursor,
+                    )
+                )
+            )
+            assert [r.id for r in paged] == [r.id for r in expected]
+            assert len(paged) == 45 and pages == 5
+
+        # A cursor only continues the query it was issued for
+        first = store.query_temporal_page(TemporalQuery(SPACE, limit=10))
+        with raises(InvalidCursorError):
+            store.query_temporal_page(
+                TemporalQuery(SPACE, author="bob", cursor=first.next_cursor)
+            )
+        with raises(InvalidCursorError):
+            store.query_temporal_page(TemporalQuery(SPACE, cursor="not-a-cursor"))
+
+
+@test("FTS, vector and KG listings page by cursor in a stable order")
+def test_store_pages(directory=temp_dir):
+    db_path = str(directory / "memory.db")
+    now = datetime.now(timezone.utc)
+
+    fts = FTSStore(StoreConfig(db_path=db_path))
+    fts.store_documents_bulk(
+        FTSDocument(
+            f"01HX3V6MPAGEFTSVDEERY{i:05d}",
+            SPACE,
+            # Repeated texts give tied scores
+            "piano lesson " * (1 + i % 3),
+            "en",
+            now,
+            "GREEN",
+            "note",
+            2,
+            [],
+        )
+        for i in range(37)
+    )
+    with _transaction(fts, db_path):
+        expected = fts.search(SearchQuery(text="piano", limit=100))
+        paged, pages = _walk(
+            lambda cursor: fts.search_page(
+                SearchQuery(text="piano", limit=8, cursor=cursor)
+            )
+        )
+        assert [r.doc_id for r in paged] == [r.doc_id for r in expected]
+        assert len(paged) == 37 and pages == 5
+        first = fts.search_page(SearchQuery(text="piano", limit=8))
+        with raises(InvalidCursorError):
+            fts.search_page(SearchQuery(text="lesson", cursor=first.next_cursor))
+
+    vectors = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        vectors._initialize_schema(conn)
+    rng = np.random.default_rng(16)
+    vectors.store_vectors_bulk(
+        VectorRow(
+            vec_id=f"vec_{i:03d}",
+            doc_id=f"doc_{i:03d}",
+            space_id=SPACE if i % 4 else "personal:alice",
+            model_id="test-model",
+            dim=8,
+            vector=rng.normal(size=8).astype(np.float32),
+        )
+        for i in range(50)
+    )
+    # Every row shares created_at; vec_id alone orders them
+    listed, pages = _walk(
+        lambda cursor: vectors.list_vectors_page(SPACE, limit=10, cursor=cursor)
+    )
+    assert [row.vec_id for row in listed] == sorted(
+        (f"vec_{i:03d}" for i in range(50) if i % 4), reverse=True
+    )
+    assert pages == 4
+    with raises(InvalidCursorError):
+        first = vectors.list_vectors_page(SPACE, limit=10)
+        vectors.list_vectors_page("personal:alice", cursor=first.next_cursor)
+
+    kg = KGStore(StoreConfig(db_path=db_path))
+    with _transaction(kg, db_path):
+        for i in range(23):
+            kg.create_entity(
+                KGEntity(
+                    id=f"ent_{i:03d}",
+                    space_id=SPACE,
+                    types=["Person"],
+                    labels={"name": f"person {i}"},
+                    created_ts=(BASE_TS + timedelta(days=i // 3)).isoformat(),
+                )
+            )
+        expected = kg.list_entities(SPACE)
+        paged, pages = _walk(
+            lambda cursor: kg.list_entities_page(SPACE, limit=5, cursor=cursor)
+        )
+        assert [e.id for e in paged] == [e.id for e in expected]
+        assert len(paged) == 23 and pages == 5
+        # The cursor can also be passed to the plain listing
+        page = kg.list_entities_page(SPACE, limit=5)
+        assert kg.list_entities(SPACE, 5, page.next_cursor) == paged[5:10]
+
+
+@test("a deep page costs about as much as the first and reads few rows")
+def test_deep_page_cost(directory=temp_dir):
+    store = _episodic(directory, 0)
+    db_path = str(directory / "episodic.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO episodic_records (id, envelope_id, space_id, ts, ts_iso, "
+            "band, author, content_json, features_json, mls_group) "
+            "VALUES (?, ?, ?, ?, ?, 'GREEN', 'alice', ?, '{}', 'household')",
+            (
+                (
+                    f"01HX3V6MDEEPVEEVDEERY{i:05d}",
+                    f"env-{i}",
+                    SPACE,
+                    int(BASE_TS.timestamp()) + i,
+                    (BASE_TS + timedelta(seconds=i)).isoformat(),
+                    '{"text": "note", "lang": "en"}',
+                )
+                for i in range(20000)
+            ),
+        )
+
+    def timed(query: TemporalQuery):
+        started = time.perf_counter()
+        for _ in range(20):
+            page = store.query_temporal_page(query)
+        return page, time.perf_counter() - started
+
+    with _transaction(store, db_path):
+        first, first_s = timed(TemporalQuery(SPACE, limit=20))
+        # Seek to the end of the listing, then compare against OFFSET
+        last = TemporalQuery(SPACE, limit=20, offset=19960)
+        by_offset, offset_s = timed(last)
+        cursor = store.query_temporal_page(TemporalQuery(SPACE, limit=19960))
+        deep, deep_s = timed(TemporalQuery(SPACE, limit=20, cursor=cursor.next_cursor))
+        assert [r.id for r in deep.items] == [r.id for r in by_offset.items]
+        assert len(first.items) == 20
+        assert deep_s < offset_s
+        assert deep_s < first_s * 5
+
+    # The continuation is a row-value seek on the listing index
+    condition, params = keyset_condition([("ts", True), ("id", True)], ("t", "i"))
+    assert condition == "(ts, id) < (?, ?)" and params == ["t", "i"]
+    with sqlite3.connect(db_path) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM episodic_records "
+            f"WHERE space_id = ? AND {condition} ORDER BY ts DESC, id DESC",
+            [SPACE, *params],
+        ).fetchall()
+    assert any("idx_episodic_records_space_ts_id" in row[-1] for row in plan)
@@ -0,0 +1,77 @@
+"""
+Test suite for the write-aware query result cache.
+
+Validates:
+1. Entries are invalidated by writes to the spaces they cover, and only those
+2. The LRU evicts least recently used entries by count and by byte budget
+3. Expired entries are dropped on lookup
+"""
+
+import time
+
+from ward import raises, test
+
+from storage.stores.memory.query_cache import QueryResultCache, WriteGenerations
+
+
+@test("a write invalidates entries covering its space and unfiltered entries")
+def test_generations_invalidate_by_space():
+    generations = WriteGenerations()
+    cache = QueryResultCache()
+    household = ["shared:household"]
+    both = ["personal:alice", "shared:household"]
+
+    cache.put("household", [1], generations.stamp(household), 10)
+    cache.put("both", [2], generations.stamp(both), 10)
+    cache.put("all", [3], generations.stamp(), 10)
+    assert cache.get("household", generations.stamp(household)) == [1]
+
+    generations.bump("personal:alice")
+    assert cache.get("household", generations.stamp(household)) == [1]
+    assert cache.get("both", generations.stamp(both)) is None
+    assert cache.get("all", generations.stamp()) is None
+
+    cache.put("all", [3], generations.stamp(), 10)
+    generations.bump_all()
+    assert cache.get("household", generations.stamp(household)) is None
+    assert cache.get("all", generations.stamp()) is None
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["stale"] == 4
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+@test("the LRU evicts by entry count and by byte budget")
+def test_lru_bounds():
+    stamp = WriteGenerations().stamp()
+    cache = QueryResultCache(max_entries=3, max_bytes=100)
+    for key in "abc":
+        cache.put(key, key, stamp, 10)
+    assert cache.get("a", stamp) == "a"  # a is now most recently used
+
+    cache.put("d", "d", stamp, 10)
+    assert cache.get("b", stamp) is None
+    assert [cache.get(k, stamp) for k in "acd"] == ["a", "c", "d"]
+
+    cache.put("big", "big", stamp, 85)
+    assert cache.get("big", stamp) == "big"
+    assert cache.size_bytes <= 100
+    assert cache.get("a", stamp) is None and cache.get("c", stamp) is None
+
+    cache.put("huge", "huge", stamp, 101)  # larger than the whole budget
+    assert cache.get("huge", stamp) is None
+    assert cache.stats()["evictions"] == 3
+
+    cache.put("big", "replaced", stamp, 5)
+    assert cache.size_bytes == 15
+    with raises(ValueError):
+        QueryResultCache(max_entries=0)
+
+
+@test("expired entries are dropped on lookup")
+def test_ttl_expiry():
+    stamp = WriteGenerations().stamp(["shared:household"])
+    cache = QueryResultCache(ttl_seconds=0.01)
+    cache.put("q", [1, 2], stamp, 16)
+    time.sleep(0.02)
+    assert cache.get("q", stamp) is None
+    assert len(cache) == 0
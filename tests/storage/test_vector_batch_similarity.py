@@ -0,0 +1,152 @@
+"""
+Test suite for batched multi-query vector similarity.
+
+Validates:
+1. similarity_matrix matches per-pair cosine and scores zero vectors as 0.0
+2. VectorMatrixIndex.search_batch agrees with one search call per query
+3. VectorStore.batch_similarity_search honours space allow-lists and mapped segments
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_index import VectorMatrixIndex, similarity_matrix
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+SPACES = ["personal:alice", "shared:household", "selective:kids"]
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _make_store(directory: Path, mmap: bool = False) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    store.mmap_segments = mmap
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    return store
+
+
+def _rows(data, dtype=None):
+    return [
+        VectorRow(
+            vec_id=f"vec_{i:05d}",
+            doc_id=f"doc_{i:05d}",
+            space_id=SPACES[i % 3],
+            model_id="m1",
+            dim=data.shape[1],
+            vector=vector.tolist(),
+            dtype=dtype,
+        )
+        for i, vector in enumerate(data)
+    ]
+
+
+@test("similarity_matrix matches pairwise cosine similarity")
+def test_similarity_matrix_matches_pairwise():
+    rng = np.random.default_rng(61)
+    queries = rng.standard_normal((5, 24))
+    candidates = rng.standard_normal((40, 24))
+    candidates[7] = 0.0
+
+    sims = similarity_matrix(queries, candidates)
+
+    assert sims.shape == (5, 40) and sims.dtype == np.float32
+    store = VectorStore(StoreConfig(db_path=":memory:"))
+    for i in (0, 4):
+        for j in (0, 7, 39):
+            expected = store.cosine_similarity(
+                queries[i].tolist(), candidates[j].tolist()
+            )
+            assert abs(sims[i, j] - expected) < 1e-5
+    assert not sims[:, 7].any()
+
+    assert similarity_matrix(queries[0], candidates).shape == (1, 40)
+    assert similarity_matrix(queries, []).shape == (5, 0)
+    with raises(ValueError):
+        similarity_matrix(queries, rng.standard_normal((3, 8)))
+
+
+@test("search_batch returns the same hits as one search per query")
+def test_search_batch_matches_search():
+    rng = np.random.default_rng(62)
+    index = VectorMatrixIndex()
+    for position, dtype in enumerate(("f32", "f16", "q8")):
+        block = rng.standard_normal((300, 16)).astype(np.float32)
+        ids = [f"{dtype}_{i}" for i in range(300)]
+        index.load_partition("m1", SPACES[position], ids, block, dtype)
+    queries = rng.standard_normal((8, 16)).astype(np.float32)
+
+    batched = index.search_batch(queries, "m1", limit=10, min_similarity=-1.0)
+    assert len(batched) == 8
+    for query, hits in zip(queries, batched):
+        single = index.search(query, "m1", limit=10, min_similarity=-1.0)
+        assert len(hits) == 10
+        overlap = {v for v, _ in hits} & {v for v, _ in single}
+        assert len(overlap) >= 9  # q8 single-query search ranks on int8 codes
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    restricted = index.search_batch(
+        queries[:2], "m1", limit=5, space_ids=[SPACES[1]], min_similarity=-1.0
+    )
+    assert all(v.startswith("f16_") for hits in restricted for v, _ in hits)
+    assert index.search_batch(np.zeros((0, 16)), "m1") == []
+
+
+@test("batch_similarity_search finds each query's own row across spaces")
+def test_store_batch_similarity_search(directory=temp_dir):
+    rng = np.random.default_rng(63)
+    data = rng.standard_normal((240, 16)).astype(np.float32)
+    store = _make_store(directory, mmap=True)
+    store.store_vectors_bulk(_rows(data))
+    store.delete_vector("vec_00010")
+
+    picks = [3, 10, 77, 200]
+    results = store.batch_similarity_search([data[i].tolist() for i in picks], "m1")
+    assert len(results) == 4
+    assert results[0][0][0].vec_id == "vec_00003"
+    assert all(row.vec_id != "vec_00010" for row, _ in results[1])
+    assert results[2][0][0].vec_id == "vec_00077"
+    assert abs(results[3][0][1] - 1.0) < 1e-6
+
+    # Reopen so partitions are mapped segments with a delta
+    reopened = _make_store(directory, mmap=True)
+    reopened.store_vector(
+        VectorRow(
+            vec_id="vec_new",
+            doc_id="doc_new",
+            space_id=SPACES[0],
+            model_id="m1",
+            dim=16,
+            vector=data[10].tolist(),
+        )
+    )
+    allowed = [SPACES[0], SPACES[2]]
+    batched = reopened.batch_similarity_search(
+        [data[i].tolist() for i in picks],
+        "m1",
+        limit=15,
+        space_ids=allowed,
+        min_similarity=-1.0,
+    )
+    for query_index, hits in zip(picks, batched):
+        single = reopened.similarity_search(
+            data[query_index].tolist(),
+            "m1",
+            limit=15,
+            space_ids=allowed,
+            min_similarity=-1.0,
+        )
+        assert [r.vec_id for r, _ in hits] == [r.vec_id for r, _ in single]
+        assert {r.space_id for r, _ in hits} <= set(allowed)
+    assert batched[1][0][0].vec_id == "vec_new"
@@ -0,0 +1,130 @@
+"""
+Test suite for VectorStore bulk ingest.
+
+Validates store_vectors_bulk:
+1. Rows land in SQLite with encoded vectors and vectorized norms
+2. The warm matrix index and ANN indexes pick up every batch
+3. A failing row rolls back the whole call
+4. Mixed dims and dtypes are grouped and encoded correctly
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+
+@fixture
+def vector_store():
+    """Create a temporary VectorStore with its schema initialized."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test_vector_bulk.db")
+        store = VectorStore(StoreConfig(db_path=db_path))
+        with sqlite3.connect(db_path) as conn:
+            store._initialize_schema(conn)
+        yield store
+
+
+def _rows(vectors: np.ndarray, start: int = 0, **overrides):
+    for i, vector in enumerate(vectors, start=start):
+        fields = dict(
+            vec_id=f"vec_{i:05d}",
+            doc_id=f"doc_{i:05d}",
+            space_id="shared:household",
+            model_id="m1",
+            dim=len(vector),
+            vector=vector.tolist(),
+            index_name="semantic",
+        )
+        fields.update(overrides)
+        yield VectorRow(**fields)
+
+
+def _count(store: VectorStore) -> int:
+    with sqlite3.connect(store.config.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM vector_rows").fetchone()[0]
+
+
+@test("bulk ingest stores every row with encoded vectors and norms")
+def test_bulk_rows_stored(store=vector_store):
+    rng = np.random.default_rng(31)
+    vectors = rng.standard_normal((250, 16)).astype(np.float32)
+
+    ids = store.store_vectors_bulk(_rows(vectors), batch_size=64)
+
+    assert ids == [f"vec_{i:05d}" for i in range(250)]
+    assert _count(store) == 250
+    row = store.get_vector("vec_00123")
+    assert row is not None
+    assert row.dtype == "f32"
+    assert np.allclose(row.vector, vectors[123])
+    assert abs(row.norm - float(np.linalg.norm(vectors[123]))) < 1e-4
+
+
+@test("bulk ingest updates the warm matrix index and ANN index")
+def test_bulk_updates_indexes(store=vector_store):
+    rng = np.random.default_rng(32)
+    vectors = rng.standard_normal((200, 16)).astype(np.float32)
+    store.store_vectors_bulk(_rows(vectors[:100]))
+
+    # Warm both indexes, then ingest the rest in batches
+    store.similarity_search(vectors[0].tolist(), "m1", limit=1)
+    store.create_ann_index("semantic", "m1")
+    store.store_vectors_bulk(_rows(vectors[100:], start=100), batch_size=30)
+
+    results = store.similarity_search(vectors[150].tolist(), "m1", limit=1)
+    assert results[0][0].vec_id == "vec_00150"
+    assert store._matrix_index.stats()["vectors"] == 200
+
+    assert len(store.get_ann_index("semantic", "m1")) == 200
+    ann = store.ann_search(vectors[175].tolist(), "semantic", "m1", limit=1)
+    assert ann[0][0].vec_id == "vec_00175"
+
+
+@test("a failing row rolls back the whole bulk call")
+def test_bulk_rollback(store=vector_store):
+    rng = np.random.default_rng(33)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    store.store_vector(next(_rows(vectors[10:11], start=10)))
+
+    # Duplicate vec_id in a later batch
+    with raises(sqlite3.IntegrityError):
+        store.store_vectors_bulk(_rows(vectors), batch_size=5)
+    assert _count(store) == 1
+
+    # Vector length disagreeing with dim
+    bad = list(_rows(vectors[20:30], start=20))
+    bad[-1].dim = 9
+    with raises(ValueError):
+        store.store_vectors_bulk(bad)
+    assert _count(store) == 1
+    assert store.get_vector("vec_00020") is None
+
+
+@test("mixed dims and dtypes are grouped and encoded per group")
+def test_bulk_mixed_groups(store=vector_store):
+    rng = np.random.default_rng(34)
+    small = rng.standard_normal((20, 8)).astype(np.float32)
+    large = rng.standard_normal((20, 32)).astype(np.float32)
+    rows = list(_rows(small, dtype="q8")) + list(
+        _rows(large, start=100, model_id="m2", dtype="f16")
+    )
+    store.store_vectors_bulk(rows[::2] + rows[1::2], batch_size=7)
+
+    with sqlite3.connect(store.config.db_path) as conn:
+        sizes = dict(
+            conn.execute(
+                "SELECT dtype, MAX(LENGTH(vector_data)) FROM vector_rows GROUP BY dtype"
+            ).fetchall()
+        )
+    assert sizes == {"q8": 8 + 4, "f16": 32 * 2}
+
+    q8_row = store.get_vector("vec_00003")
+    assert np.allclose(q8_row.vector, small[3], atol=0.05)
+    top = store.similarity_search(large[5].tolist(), "m2", limit=1)
+    assert top[0][0].vec_id == "vec_00105"
@@ -0,0 +1,178 @@
+"""
+Test suite for VectorStore binary encodings.
+
+Validates f32 / f16 / bfloat16 / q8 encodings from vector_codec:
+1. Encoded sizes actually shrink for reduced-precision dtypes
+2. Round trips stay within each dtype's precision
+3. Legacy float32-packed rows still decode
+4. q8 partitions search on int8 codes and re-score exactly
+"""
+
+import sqlite3
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_codec import (
+    decode_block,
+    decode_vector,
+    encode_block,
+    encode_vector,
+    encoded_size,
+)
+from storage.stores.memory.vector_index import VectorMatrixSegment
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+
+@fixture
+def vector_store():
+    """Create a temporary VectorStore with its schema initialized."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test_vector_codec.db")
+        store = VectorStore(StoreConfig(db_path=db_path))
+        with sqlite3.connect(db_path) as conn:
+            store._initialize_schema(conn)
+        yield store
+
+
+@test("encoded sizes shrink for reduced-precision dtypes")
+def test_encoded_sizes():
+    vector = np.linspace(-1.0, 1.0, 384)
+    assert len(encode_vector(vector, "f32")) == 384 * 4
+    assert len(encode_vector(vector, "f16")) == 384 * 2
+    assert len(encode_vector(vector, "bfloat16")) == 384 * 2
+    assert len(encode_vector(vector, "q8")) == 384 + 4
+    for dtype in ("f32", "f16", "bfloat16", "q8"):
+        assert encoded_size(384, dtype) == len(encode_vector(vector, dtype))
+
+
+@test("round trips stay within dtype precision")
+def test_round_trip_precision():
+    rng = np.random.default_rng(3)
+    vector = rng.standard_normal(64).astype(np.float32)
+    tolerances = {"f32": 1e-7, "f16": 2e-3, "bfloat16": 1e-2, "q8": 1e-2}
+    for dtype, tolerance in tolerances.items():
+        decoded = decode_vector(encode_vector(vector, dtype), 64, dtype)
+        assert decoded.dtype == np.float32
+        relative = np.abs(decoded - vector) / max(np.abs(vector).max(), 1e-9)
+        assert relative.max() < tolerance, dtype
+
+
+@test("encode_block and decode_block agree with per-vector codecs")
+def test_block_codecs():
+    rng = np.random.default_rng(4)
+    block = rng.standard_normal((10, 8)).astype(np.float32)
+    for dtype in ("f32", "f16", "bfloat16", "q8"):
+        blobs = encode_block(block, dtype)
+        assert blobs == [encode_vector(row, dtype) for row in block]
+        decoded = decode_block(blobs, 8, dtype)
+        expected = np.stack([decode_vector(b, 8, dtype) for b in blobs])
+        assert np.array_equal(decoded, expected)
+
+
+@test("legacy float32-packed rows decode for every dtype")
+def test_legacy_rows_decode():
+    vector = [0.25, -0.5, 0.75, 1.0]
+    legacy = struct.pack("4f", *vector)
+    for dtype in ("f16", "bfloat16", "q8"):
+        assert decode_vector(legacy, 4, dtype).tolist() == vector
+    mixed = decode_block([legacy, encode_vector(vector, "f16")], 4, "f16")
+    assert np.allclose(mixed[0], mixed[1])
+
+
+@test("reduced-precision segments hold fewer bytes")
+def test_segment_memory():
+    block = np.ones((1000, 128), dtype=np.float32)
+    ids = [str(i) for i in range(1000)]
+    sizes = {}
+    for dtype in ("f32", "f16", "q8"):
+        segment = VectorMatrixSegment(128, capacity=1000, dtype=dtype)
+        segment.extend(ids, block)
+        sizes[dtype] = segment._matrix.nbytes
+    assert sizes["f16"] * 2 == sizes["f32"]
+    assert sizes["q8"] * 4 == sizes["f32"]
+
+
+@test("q8 search ranks on int8 codes and re-scores exactly")
+def test_q8_search(store=vector_store):
+    rng = np.random.default_rng(5)
+    vectors = rng.standard_normal((300, 32)).astype(np.float32)
+    for i, vector in enumerate(vectors):
+        store.store_vector(
+            VectorRow(
+                vec_id=f"vec_{i:04d}",
+                doc_id=f"doc_{i:04d}",
+                space_id="shared:household",
+                model_id="m1",
+                dim=32,
+                vector=vector.tolist(),
+                dtype="q8",
+            )
+        )
+
+    query = vectors[42] + 0.01 * rng.standard_normal(32).astype(np.float32)
+    results = store.similarity_search(query.tolist(), "m1", limit=5)
+    assert results[0][0].vec_id == "vec_0042"
+    assert results[0][0].dtype == "q8"
+
+    # Scores match an exact scan over the stored (dequantized) vectors
+    stored = np.stack([np.asarray(r.vector) for r, _ in results])
+    expected = stored @ query / (np.linalg.norm(stored, axis=1) * np.linalg.norm(query))
+    assert np.allclose([score for _, score in results], expected, atol=1e-5)
+
+    # The warm index holds int8 rows
+    segment = store._matrix_index._segments[("m1", "shared:household")]
+    assert segment._matrix.dtype == np.int8
+
+
+@test("mixed-dtype partitions score against the stored vectors")
+def test_mixed_dtype_partition(store=vector_store):
+    rng = np.random.default_rng(6)
+    vectors = rng.standard_normal((90, 32)).astype(np.float32)
+    dtypes = ["q8"] * 30 + ["f32"] * 30 + ["f16"] * 30
+
+    def write(i):
+        store.store_vector(
+            VectorRow(
+                vec_id=f"vec_{i:04d}",
+                doc_id=f"doc_{i:04d}",
+                space_id="shared:household",
+                model_id="m1",
+                dim=32,
+                vector=vectors[i].tolist(),
+                dtype=dtypes[i],
+            )
+        )
+
+    def check(search_store):
+        for i in (3, 45, 77):
+            query = vectors[i] + 0.01 * rng.standard_normal(32).astype(np.float32)
+            results = search_store.similarity_search(query.tolist(), "m1", limit=10)
+            assert results[0][0].vec_id == f"vec_{i:04d}"
+            assert results[0][0].dtype == dtypes[i]
+            stored = np.stack([np.asarray(r.vector) for r, _ in results])
+            expected = (stored @ query) / (
+                np.linalg.norm(stored, axis=1) * np.linalg.norm(query)
+            )
+            assert np.allclose([s for _, s in results], expected, atol=1e-6)
+
+    for i in range(30):
+        write(i)
+    store.similarity_search(vectors[0].tolist(), "m1", limit=1)
+    segment = store._matrix_index._segments[("m1", "shared:household")]
+    assert segment._matrix.dtype == np.int8
+
+    # Later writes of other dtypes promote the resident partition
+    for i in range(30, 90):
+        write(i)
+    segment = store._matrix_index._segments[("m1", "shared:household")]
+    assert segment._matrix.dtype == np.float32 and len(segment) == 90
+    check(store)
+
+    # A cold load of the same rows agrees
+    reopened = VectorStore(StoreConfig(db_path=store.config.db_path))
+    check(reopened)
@@ -0,0 +1,203 @@
+"""
+Test suite for filtered vector search with space/band allow-lists.
+
+Validates:
+1. AttributeBitmaps masks track writes and combine filters (OR within, AND across)
+2. HNSW filtered search returns exactly k allowed hits, by traversal or scan
+3. VectorStore.ann_search and similarity_search honour multi-space allow-lists
+4. Indexes saved without allow-lists are backfilled on first filtered query
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, raises, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.hnsw_index import HNSWIndex
+from storage.stores.memory.vector_filters import AttributeBitmaps
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+SPACES = ["personal:alice", "personal:bob", "shared:household", "selective:kids"]
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _make_store(directory: Path) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    return store
+
+
+def _populated_index(n=2000, dim=16, seed=51):
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((n, dim)).astype(np.float32)
+    index = HNSWIndex(
+        dim=dim, M=12, ef_construction=80, seed=seed, attributes=("space_id", "band")
+    )
+    # personal:alice is rare (1%), the rest are spread evenly
+    attributes = [
+        {
+            "space_id": SPACES[0] if i % 100 == 0 else SPACES[1 + i % 3],
+            "band": "AMBER" if i % 2 else "GREEN",
+        }
+        for i in range(n)
+    ]
+    index.add_batch([str(i) for i in range(n)], data, attributes)
+    return index, data, attributes
+
+
+def _exact_allowed(data, query, allowed, k):
+    normed = data / np.linalg.norm(data, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    scores[~allowed] = -np.inf
+    return [str(i) for i in np.argsort(-scores)[:k]]
+
+
+@test("bitmaps OR values within an attribute and AND across attributes")
+def test_bitmaps_combine():
+    bitmaps = AttributeBitmaps(("space_id", "band"))
+    bitmaps.set(0, {"space_id": "a", "band": "GREEN"})
+    bitmaps.set(1, {"space_id": "b", "band": "AMBER"})
+    bitmaps.set(200, {"space_id": "a", "band": "AMBER"})
+
+    assert np.flatnonzero(bitmaps.allowed(201, {"space_id": ["a"]})).tolist() == [
+        0,
+        200,
+    ]
+    both = bitmaps.allowed(201, {"space_id": ["a", "b"], "band": ["AMBER"]})
+    assert np.flatnonzero(both).tolist() == [1, 200]
+    assert not bitmaps.allowed(201, {"space_id": ["missing"]}).any()
+
+    bitmaps.set(200, {"space_id": "b"})
+    bitmaps.clear(1)
+    assert np.flatnonzero(bitmaps.allowed(201, {"space_id": ["b"]})).tolist() == [200]
+    assert bitmaps.get(200, "band") == "AMBER"
+    with raises(ValueError):
+        bitmaps.allowed(10, {"owner": ["x"]})
+
+    restored = AttributeBitmaps.from_arrays(bitmaps.attributes, bitmaps.to_arrays(201))
+    for filters in ({"space_id": ["a"]}, {"space_id": ["b"]}, {"band": ["AMBER"]}):
+        assert np.array_equal(
+            restored.allowed(201, filters), bitmaps.allowed(201, filters)
+        )
+
+
+@test("HNSW filtered search returns exactly k allowed hits")
+def test_hnsw_filtered_exact_k():
+    index, data, attributes = _populated_index()
+    rng = np.random.default_rng(52)
+    cases = [
+        {"space_id": [SPACES[0]]},  # 1% of nodes: exact scan
+        {"space_id": [SPACES[1], SPACES[2]]},  # ~66%: filtered traversal
+        {"space_id": [SPACES[3]], "band": ["AMBER"]},
+    ]
+    for filters in cases:
+        allowed = np.array(
+            [all(attrs[a] in v for a, v in filters.items()) for attrs in attributes]
+        )
+        hit = 0
+        for _ in range(10):
+            query = rng.standard_normal(16).astype(np.float32)
+            found = index.search(query, 10, ef_search=64, filters=filters)
+            assert len(found) == 10
+            assert all(allowed[int(vec_id)] for vec_id, _ in found)
+            hit += len(
+                {v for v, _ in found} & set(_exact_allowed(data, query, allowed, 10))
+            )
+        assert hit / 100 >= 0.85, filters
+
+
+@test("only selective filters fall back to an exact scan")
+def test_hnsw_filter_strategy():
+    index, data, attributes = _populated_index()
+    scans = []
+    exact_scan = index._scan
+
+    def counting_scan(query, labels, k):
+        scans.append(len(labels))
+        return exact_scan(query, labels, k)
+
+    index._scan = counting_scan
+    broad = {"space_id": [SPACES[1], SPACES[2]]}
+    allowed = np.array([attrs["space_id"] in broad["space_id"] for attrs in attributes])
+    found = index.search(data[5], 10, ef_search=32, filters=broad)
+    assert scans == []
+    assert len(found) == 10 and all(allowed[int(v)] for v, _ in found)
+
+    index.search(data[0], 10, ef_search=32, filters={"space_id": [SPACES[0]]})
+    assert scans == [20]
+
+
+@test("filtered search tolerates tombstones and persists allow-lists")
+def test_hnsw_filter_persistence(directory=temp_dir):
+    index, data, _ = _populated_index(n=300)
+    for i in range(0, 300, 100):
+        index.remove(str(i))  # every personal:alice node
+    assert index.search(data[0], 5, filters={"space_id": [SPACES[0]]}) == []
+
+    index.add("0", data[0], {"space_id": SPACES[0], "band": "GREEN"})
+    path = directory / "filtered.hnsw.npz"
+    index.save(path)
+    loaded = HNSWIndex.load(path)
+    assert loaded.attributes == ["space_id", "band"]
+    assert [
+        v for v, _ in loaded.search(data[0], 5, filters={"space_id": [SPACES[0]]})
+    ] == ["0"]
+    assert loaded.get_attribute("7", "space_id") == index.get_attribute("7", "space_id")
+
+
+@test("VectorStore multi-space queries return exactly limit allowed hits")
+def test_vector_store_space_allow_list(directory=temp_dir):
+    rng = np.random.default_rng(53)
+    data = rng.standard_normal((400, 16)).astype(np.float32)
+    store = _make_store(directory)
+    rows = [
+        VectorRow(
+            vec_id=f"vec_{i:05d}",
+            doc_id=f"doc_{i:05d}",
+            space_id=SPACES[i % 4],
+            model_id="m1",
+            dim=16,
+            vector=vector.tolist(),
+            index_name="semantic",
+        )
+        for i, vector in enumerate(data)
+    ]
+    store.store_vectors_bulk(rows)
+    store.create_ann_index("semantic", "m1")
+
+    allowed = {SPACES[0], SPACES[2]}
+    query = data[1].tolist()  # best overall match lives in a disallowed space
+    ann = store.ann_search(
+        query, "semantic", "m1", limit=20, space_ids=allowed, min_similarity=-1.0
+    )
+    exact = store.similarity_search(
+        query, "m1", limit=20, space_ids=allowed, min_similarity=-1.0
+    )
+    assert len(ann) == 20 and len(exact) == 20
+    assert {r.space_id for r, _ in ann} <= allowed
+    assert {r.space_id for r, _ in exact} <= allowed
+    assert len({r.vec_id for r, _ in ann} & {r.vec_id for r, _ in exact}) >= 18
+
+    # Only the allowed partitions were loaded into the matrix index
+    assert store._matrix_index.loaded_spaces("m1") == allowed
+
+    # Legacy index without allow-lists is backfilled from vector_rows
+    legacy = HNSWIndex(
+        dim=16, seed=1, metadata={"index_name": "semantic", "model_id": "m1"}
+    )
+    legacy.add_batch([r.vec_id for r in rows], data)
+    store._ann_indexes[("semantic", "m1")] = legacy
+    hits = store.ann_search(
+        query, "semantic", "m1", limit=5, space_id=SPACES[3], min_similarity=-1.0
+    )
+    assert len(hits) == 5 and {r.space_id for r, _ in hits} == {SPACES[3]}
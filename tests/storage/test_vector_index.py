@@ -0,0 +1,147 @@
+"""
+Test suite for the VectorStore matrix-scan search engine.
+
+Validates that VectorStore.similarity_search, backed by VectorMatrixIndex:
+1. Returns the same ranking as a brute-force cosine scan
+2. Stays in sync with store_vector / update_vector / delete_vector
+3. Respects space, dimension, limit and min_similarity filters
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_index import VectorMatrixIndex, VectorMatrixSegment
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+
+@fixture
+def vector_store():
+    """Create a temporary VectorStore with its schema initialized."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test_vector_index.db")
+        store = VectorStore(StoreConfig(db_path=db_path))
+        with sqlite3.connect(db_path) as conn:
+            store._initialize_schema(conn)
+        yield store
+
+
+def _row(i: int, vector, space_id: str = "shared:household", model_id: str = "m1"):
+    return VectorRow(
+        vec_id=f"vec_{i:04d}",
+        doc_id=f"doc_{i:04d}",
+        space_id=space_id,
+        model_id=model_id,
+        dim=len(vector),
+        vector=[float(x) for x in vector],
+    )
+
+
+def _brute_force(query, vectors):
+    q = np.asarray(query, dtype=np.float64)
+    scores = {}
+    for vec_id, vec in vectors.items():
+        v = np.asarray(vec, dtype=np.float64)
+        scores[vec_id] = float(q @ v / (np.linalg.norm(q) * np.linalg.norm(v)))
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+@test("similarity_search matches brute-force cosine ranking")
+def test_similarity_search_matches_brute_force(store=vector_store):
+    rng = np.random.default_rng(7)
+    vectors = {}
+    for i in range(200):
+        vec = rng.standard_normal(16).astype(np.float32)
+        row = _row(i, vec)
+        store.store_vector(row)
+        vectors[row.vec_id] = row.vector
+
+    query = rng.standard_normal(16).tolist()
+    results = store.similarity_search(query, "m1", limit=10, min_similarity=-1.0)
+    expected = _brute_force(query, vectors)[:10]
+
+    assert [r.vec_id for r, _ in results] == [vec_id for vec_id, _ in expected]
+    for (_, score), (_, expected_score) in zip(results, expected):
+        assert abs(score - expected_score) < 1e-5
+
+
+@test("index reflects store, update and delete after first load")
+def test_index_tracks_writes(store=vector_store):
+    store.store_vector(_row(1, [1.0, 0.0, 0.0, 0.0]))
+    store.store_vector(_row(2, [0.0, 1.0, 0.0, 0.0]))
+
+    # First search loads the partition
+    top = store.similarity_search([1.0, 0.0, 0.0, 0.0], "m1", limit=1)
+    assert top[0][0].vec_id == "vec_0001"
+
+    # New write lands in the loaded partition without a reload
+    store.store_vector(_row(3, [0.9, 0.1, 0.0, 0.0]))
+    ids = [r.vec_id for r, _ in store.similarity_search([1.0, 0.0, 0.0, 0.0], "m1")]
+    assert ids[:2] == ["vec_0001", "vec_0003"]
+
+    # Update moves vec_0002 next to the query
+    assert store.update_vector("vec_0002", _row(2, [1.0, 0.0, 0.0, 0.0]))
+    top = store.similarity_search([1.0, 0.0, 0.0, 0.0], "m1", limit=2)
+    assert {r.vec_id for r, _ in top} == {"vec_0001", "vec_0002"}
+
+    # Delete removes it from results
+    assert store.delete_vector("vec_0001")
+    ids = [r.vec_id for r, _ in store.similarity_search([1.0, 0.0, 0.0, 0.0], "m1")]
+    assert "vec_0001" not in ids
+    assert ids[0] == "vec_0002"
+
+
+@test("space filter and model partitioning are respected")
+def test_space_and_model_filters(store=vector_store):
+    store.store_vector(_row(1, [1.0, 0.0], space_id="personal:alice"))
+    store.store_vector(_row(2, [1.0, 0.1], space_id="shared:household"))
+    store.store_vector(_row(3, [1.0, 0.0], model_id="m2"))
+
+    alice = store.similarity_search([1.0, 0.0], "m1", space_id="personal:alice")
+    assert [r.vec_id for r, _ in alice] == ["vec_0001"]
+
+    all_spaces = store.similarity_search([1.0, 0.0], "m1")
+    assert {r.vec_id for r, _ in all_spaces} == {"vec_0001", "vec_0002"}
+
+    # A space loaded on its own still picks up later writes to other spaces
+    store.store_vector(_row(4, [1.0, 0.0], space_id="selective:bob"))
+    all_spaces = store.similarity_search([1.0, 0.0], "m1")
+    assert "vec_0004" in {r.vec_id for r, _ in all_spaces}
+
+
+@test("min_similarity and dimension mismatch filter candidates")
+def test_min_similarity_and_dim(store=vector_store):
+    store.store_vector(_row(1, [1.0, 0.0]))
+    store.store_vector(_row(2, [-1.0, 0.0]))
+
+    results = store.similarity_search([1.0, 0.0], "m1", min_similarity=0.5)
+    assert [r.vec_id for r, _ in results] == ["vec_0001"]
+
+    assert store.similarity_search([1.0, 0.0, 0.0], "m1") == []
+
+
+@test("VectorMatrixSegment remove keeps rows compact")
+def test_segment_swap_remove():
+    segment = VectorMatrixSegment(dim=2, capacity=1)
+    segment.extend(["a", "b", "c"], np.eye(3, 2, dtype=np.float32))
+    assert segment.remove("a")
+    assert len(segment) == 2
+    assert set(segment.ids) == {"b", "c"}
+    row_of_c = segment.ids.index("c")
+    assert np.allclose(segment.matrix[row_of_c], [0.0, 0.0])
+    assert not segment.remove("a")
+
+
+@test("VectorMatrixIndex ignores writes for partitions not yet loaded")
+def test_index_lazy_partitions():
+    index = VectorMatrixIndex()
+    index.upsert("a", "m1", "shared:household", [1.0, 0.0])
+    assert index.search([1.0, 0.0], "m1") == []
+
+    index.load_partition("m1", "shared:household", ["a"], np.array([[1.0, 0.0]]))
+    index.upsert("b", "m1", "shared:household", [0.0, 1.0])
+    assert [vec_id for vec_id, _ in index.search([0.0, 1.0], "m1", limit=1)] == ["b"]
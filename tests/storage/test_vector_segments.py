@@ -0,0 +1,195 @@
+"""
+Test suite for memory-mapped vector segment files.
+
+Validates that VectorStore with mmap_segments enabled:
+1. Writes a segment file on first load and maps it on the next start
+2. Keeps writes in a delta and tombstones base rows until a merge
+3. Reconciles a mapped segment with rows changed by other writers
+4. Merges in the background and replays writes made during a merge
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.stores.memory.vector_index import LayeredVectorSegment
+from storage.stores.memory.vector_segments import open_base, write_segment
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+DIM = 16
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _make_store(directory: Path, mmap: bool = True) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    store.mmap_segments = mmap
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    return store
+
+
+def _row(i: int, vector, dtype=None) -> VectorRow:
+    return VectorRow(
+        vec_id=f"vec_{i:05d}",
+        doc_id=f"doc_{i:05d}",
+        space_id="shared:household",
+        model_id="m1",
+        dim=len(vector),
+        vector=[float(x) for x in vector],
+        dtype=dtype,
+    )
+
+
+def _top_ids(store: VectorStore, query, limit=5):
+    return [
+        r.vec_id for r, _ in store.similarity_search(list(query), "m1", limit=limit)
+    ]
+
+
+@test("first load writes a segment file and a restart maps it")
+def test_warm_start_maps_segment(directory=temp_dir):
+    rng = np.random.default_rng(41)
+    data = rng.standard_normal((200, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data))
+    expected = _top_ids(store, data[17])
+    assert expected[0] == "vec_00017"
+    assert list(store.segment_dir.glob("*.segment.json"))
+
+    reopened = _make_store(directory)
+    assert _top_ids(reopened, data[17]) == expected
+    segment = reopened._matrix_index.partition("m1", "shared:household")
+    assert isinstance(segment, LayeredVectorSegment)
+    assert isinstance(segment.base._matrix, np.memmap)
+    assert segment.pending == 0
+    stats = reopened._matrix_index.stats()
+    assert stats["mapped_bytes"] >= 200 * DIM * 4
+    assert stats["vectors"] == 200
+
+
+@test("writes go to the delta and tombstone base rows until merged")
+def test_delta_and_tombstones(directory=temp_dir):
+    rng = np.random.default_rng(42)
+    data = rng.standard_normal((100, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    for i, vector in enumerate(data):
+        store.store_vector(_row(i, vector))
+    store.similarity_search(data[0].tolist(), "m1")
+
+    store.delete_vector("vec_00005")
+    store.update_vector("vec_00006", _row(6, -data[6]))
+    store.store_vector(_row(500, data[5] * 3.0))
+    segment = store._matrix_index.partition("m1", "shared:household")
+    assert segment.pending == 4  # two tombstones, two delta rows
+
+    assert _top_ids(store, data[5], 1) == ["vec_00500"]
+    assert "vec_00006" not in _top_ids(store, data[6], 10)
+
+    assert store.flush_vector_segments() == 1
+    merged = store._matrix_index.partition("m1", "shared:household")
+    assert merged.pending == 0 and merged.base.size == 100
+    assert _top_ids(store, data[5], 1) == ["vec_00500"]
+    assert _top_ids(store, -data[6], 1) == ["vec_00006"]
+
+
+@test("a mapped segment is reconciled with rows changed by other writers")
+def test_reconcile_on_open(directory=temp_dir):
+    rng = np.random.default_rng(43)
+    data = rng.standard_normal((60, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    for i, vector in enumerate(data):
+        store.store_vector(_row(i, vector))
+    store.similarity_search(data[0].tolist(), "m1")
+
+    # Another writer that does not maintain segment files
+    plain = _make_store(directory, mmap=False)
+    plain.delete_vector("vec_00001")
+    plain.update_vector("vec_00002", _row(2, -data[2]))
+    plain.store_vector(_row(99, data[1]))
+
+    reopened = _make_store(directory)
+    assert _top_ids(reopened, data[1], 1) == ["vec_00099"]
+    assert _top_ids(reopened, -data[2], 1) == ["vec_00002"]
+    assert reopened._matrix_index.stats()["vectors"] == 60
+
+
+@test("delta merges in the background once enough rows are pending")
+def test_background_merge(directory=temp_dir):
+    rng = np.random.default_rng(44)
+    data = rng.standard_normal((80, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.segment_merge_rows = 10
+    store.store_vector(_row(0, data[0]))
+    store.similarity_search(data[0].tolist(), "m1")
+
+    for i in range(1, 80):
+        store.store_vector(_row(i, data[i]))
+
+    deadline = time.time() + 10
+    while store._segment_merges and time.time() < deadline:
+        time.sleep(0.01)
+    segment = store._matrix_index.partition("m1", "shared:household")
+    assert not store._segment_merges
+    assert segment.base.size >= 10
+    assert _top_ids(store, data[33], 1) == ["vec_00033"]
+    hits = store._matrix_index.search(data[0], "m1", limit=100, min_similarity=-1.0)
+    assert len(hits) == 80
+
+
+@test("writes made during a merge are replayed on the new base")
+def test_merge_replays_journal(directory=temp_dir):
+    rng = np.random.default_rng(45)
+    data = rng.standard_normal((20, DIM)).astype(np.float32)
+    ids = [f"v{i}" for i in range(20)]
+    manifest = write_segment(
+        directory,
+        "m1",
+        "s",
+        DIM,
+        "f32",
+        (ids, data, np.linalg.norm(data, axis=1), None),
+        0,
+    )
+    segment = LayeredVectorSegment(open_base(directory, manifest), manifest)
+    segment.upsert("new", data[0])
+
+    arrays = segment.begin_merge()
+    segment.remove("v3")
+    segment.upsert("v4", -data[4])
+    segment.upsert("late", data[1])
+    new_manifest = write_segment(directory, "m1", "s", DIM, "f32", arrays, 0)
+    merged = segment.rebase(open_base(directory, new_manifest), new_manifest)
+
+    assert new_manifest["generation"] == 2
+    assert merged.base.size == 21
+    assert "v3" not in merged and "new" in merged and "late" in merged
+    assert len(merged) == 21
+    assert merged.delta.size == 2
+    rows, _ = merged.top_k(-data[4], float(np.linalg.norm(data[4])), 1, -1.0)
+    assert merged.row_ids(rows) == ["v4"]
+
+
+@test("q8 partitions map their int8 codes and scales")
+def test_q8_segment(directory=temp_dir):
+    rng = np.random.default_rng(46)
+    data = rng.standard_normal((150, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v, dtype="q8") for i, v in enumerate(data))
+    store.similarity_search(data[0].tolist(), "m1")
+
+    reopened = _make_store(directory)
+    assert _top_ids(reopened, data[77], 1) == ["vec_00077"]
+    segment = reopened._matrix_index.partition("m1", "shared:household")
+    assert segment.base._matrix.dtype == np.int8
+    assert isinstance(segment.base._scales, np.memmap)
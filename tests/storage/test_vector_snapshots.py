@@ -0,0 +1,210 @@
+"""
+Test suite for crash-safe HNSW index snapshots.
+
+Validates that VectorStore:
+1. Checkpoints every snapshot at the highest vector_rows rowid it reflects
+2. Replays only rows added, updated or deleted after the checkpoint on restart
+3. Recovers from a crash between the snapshot rename and the checkpoint write
+4. Ignores temp files left by an interrupted save
+5. Keeps only the latest checkpoint and drops it with the index
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from ward import fixture, test
+
+from storage.core.base_store import StoreConfig
+from storage.monitoring.index_checkpoint_store import IndexCheckpointStore
+from storage.stores.memory.hnsw_index import HNSWIndex
+from storage.stores.memory.vector_store import VectorRow, VectorStore
+
+DIM = 16
+
+
+@fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+def _make_store(directory: Path) -> VectorStore:
+    db_path = str(directory / "vectors.db")
+    store = VectorStore(StoreConfig(db_path=db_path))
+    with sqlite3.connect(db_path) as conn:
+        store._initialize_schema(conn)
+    return store
+
+
+def _row(i: int, vector, space_id="shared:household") -> VectorRow:
+    return VectorRow(
+        vec_id=f"vec_{i:05d}",
+        doc_id=f"doc_{i:05d}",
+        space_id=space_id,
+        model_id="m1",
+        dim=len(vector),
+        vector=[float(x) for x in vector],
+        index_name="semantic",
+    )
+
+
+def _latest_checkpoint(directory: Path):
+    checkpoints = IndexCheckpointStore(
+        StoreConfig(db_path=str(directory / "vectors.db"))
+    )
+    with sqlite3.connect(str(directory / "vectors.db")) as conn:
+        checkpoints.begin_transaction(conn)
+        try:
+            return checkpoints.get_latest_checkpoint("semantic", "hnsw:m1")
+        finally:
+            checkpoints.commit_transaction(conn)
+
+
+def _checkpoint_count(directory: Path) -> int:
+    with sqlite3.connect(str(directory / "vectors.db")) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM index_checkpoints WHERE index_name = 'semantic'"
+        ).fetchone()[0]
+
+
+def _max_rowid(directory: Path) -> int:
+    with sqlite3.connect(str(directory / "vectors.db")) as conn:
+        return conn.execute("SELECT MAX(rowid) FROM vector_rows").fetchone()[0]
+
+
+def _top_id(store: VectorStore, query) -> str:
+    hits = store.ann_search(list(query), "semantic", "m1", limit=1)
+    return hits[0][0].vec_id
+
+
+@test("each snapshot is checkpointed at the highest rowid it reflects")
+def test_snapshot_checkpoint(directory=temp_dir):
+    rng = np.random.default_rng(71)
+    data = rng.standard_normal((120, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data[:100]))
+    store.create_ann_index("semantic", "m1")
+
+    checkpoint = _latest_checkpoint(directory)
+    assert checkpoint is not None
+    assert checkpoint.position == _max_rowid(directory)
+    assert checkpoint.metadata["vectors"] == 100
+    path = store._ann_path("semantic", "m1")
+    assert checkpoint.content_hash == VectorStore._file_digest(path)
+
+    for i in range(100, 120):
+        store.store_vector(_row(i, data[i]))
+    store.flush_ann_indexes()
+    assert _latest_checkpoint(directory).position == _max_rowid(directory)
+
+    assert store.drop_ann_index("semantic", "m1")
+    assert _latest_checkpoint(directory) is None
+
+
+@test("a restart replays rows added, updated and deleted after the checkpoint")
+def test_restart_replays_delta(directory=temp_dir):
+    rng = np.random.default_rng(72)
+    data = rng.standard_normal((90, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data[:80]))
+    store.create_ann_index("semantic", "m1")
+    nodes_before = store.get_ann_index("semantic", "m1").node_count
+
+    # A writer without the ANN index loaded (e.g. another process)
+    other = _make_store(directory)
+    other._ann_discovered = True
+    for i in range(80, 90):
+        other.store_vector(_row(i, data[i]))
+    other.update_vector("vec_00003", _row(3, -data[3], space_id="personal:alice"))
+    other.delete_vector("vec_00004")
+
+    reopened = _make_store(directory)
+    index = reopened.get_ann_index("semantic", "m1")
+    assert len(index) == 89
+    # Only the 10 new rows and the updated row were re-inserted
+    assert index.node_count == nodes_before + 11
+    assert _top_id(reopened, data[85]) == "vec_00085"
+    assert _top_id(reopened, -data[3]) == "vec_00003"
+    assert index.get_attribute("vec_00003", "space_id") == "personal:alice"
+    assert "vec_00004" not in index
+    assert _latest_checkpoint(directory).position == _max_rowid(directory)
+
+    # Nothing changed since: the next start replays nothing
+    again = _make_store(directory)
+    assert again.get_ann_index("semantic", "m1").node_count == index.node_count
+
+
+@test("a crash before the checkpoint write falls back to the older position")
+def test_recover_without_checkpoint(directory=temp_dir):
+    rng = np.random.default_rng(73)
+    data = rng.standard_normal((60, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data[:50]))
+    store.create_ann_index("semantic", "m1")
+    stale = _latest_checkpoint(directory)
+
+    # New rows reach the snapshot file, but the process dies before the
+    # checkpoint is recorded
+    for i in range(50, 60):
+        store.store_vector(_row(i, data[i]))
+    store._record_ann_checkpoint = lambda *args: None
+    store.flush_ann_indexes()
+    assert _latest_checkpoint(directory).content_hash == stale.content_hash
+
+    reopened = _make_store(directory)
+    index = reopened.get_ann_index("semantic", "m1")
+    assert len(index) == 60
+    assert _top_id(reopened, data[55]) == "vec_00055"
+    checkpoint = _latest_checkpoint(directory)
+    assert checkpoint.position == _max_rowid(directory)
+    path = reopened._ann_path("semantic", "m1")
+    assert checkpoint.content_hash == VectorStore._file_digest(path)
+
+
+@test("temp files from an interrupted save are ignored and removed")
+def test_interrupted_save(directory=temp_dir):
+    rng = np.random.default_rng(74)
+    data = rng.standard_normal((40, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data))
+    store.create_ann_index("semantic", "m1")
+
+    path = store._ann_path("semantic", "m1")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(b"truncated")
+
+    reopened = _make_store(directory)
+    assert len(reopened.get_ann_index("semantic", "m1")) == 40
+    assert not tmp_path.exists()
+    assert isinstance(HNSWIndex.load(path), HNSWIndex)
+
+
+@test("old checkpoints are pruned and dropping the index removes them all")
+def test_checkpoint_retention(directory=temp_dir):
+    rng = np.random.default_rng(75)
+    data = rng.standard_normal((60, DIM)).astype(np.float32)
+    store = _make_store(directory)
+    store.store_vectors_bulk(_row(i, v) for i, v in enumerate(data[:20]))
+    store.create_ann_index("semantic", "m1")
+    for i in range(20, 60):
+        store.store_vector(_row(i, data[i]))
+        store.flush_ann_indexes()
+
+    assert _checkpoint_count(directory) == 1
+    assert _latest_checkpoint(directory).position == _max_rowid(directory)
+
+    # A long replay is fetched in IN (...) chunks
+    other = _make_store(directory)
+    other._ann_discovered = True
+    for i in range(60):
+        other.update_vector(f"vec_{i:05d}", _row(i, -data[i]))
+    reopened = _make_store(directory)
+    reopened._MAX_IN_PARAMS = 7
+    index = reopened.get_ann_index("semantic", "m1")
+    assert len(index) == 60
+    assert _top_id(reopened, -data[42]) == "vec_00042"
+
+    assert reopened.drop_ann_index("semantic", "m1")
+    assert _checkpoint_count(directory) == 0